@@ -290,6 +290,8 @@ from .subtensor import subtensor as subtensor
 from .cli import cli as cli, COMMANDS as ALL_COMMANDS
 from .btlogging import logging
 from .metagraph import metagraph as metagraph
+from .history import MetagraphHistory as MetagraphHistory
+from .async_subtensor import AsyncSubtensor as AsyncSubtensor
 from .threadpool import PriorityThreadPoolExecutor as PriorityThreadPoolExecutor
 
 from .synapse import TerminalInfo, Synapse
@@ -306,6 +308,7 @@ from .subnets import SubnetsAPI as SubnetsAPI
 
 configs = [
     axon.config(),
+    dendrite.config(),
     subtensor.config(),
     PriorityThreadPoolExecutor.config(),
     wallet.config(),
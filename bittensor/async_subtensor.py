@@ -0,0 +1,936 @@
+# The MIT License (MIT)
+# Copyright © 2023 Opentensor Foundation
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy of this software and associated
+# documentation files (the “Software”), to deal in the Software without restriction, including without limitation
+# the rights to use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies of the Software,
+# and to permit persons to whom the Software is furnished to do so, subject to the following conditions:
+
+# The above copyright notice and this permission notice shall be included in all copies or substantial portions of
+# the Software.
+
+# THE SOFTWARE IS PROVIDED “AS IS”, WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO
+# THE WARRANTIES OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL
+# THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION
+# OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER
+# DEALINGS IN THE SOFTWARE.
+
+"""
+An asyncio client for the subtensor chain.
+
+:class:`AsyncSubtensor` offers the queries of :class:`bittensor.subtensor` most used by miners and validators as
+coroutines, so they can be awaited from the event loop running an axon or a dendrite instead of blocking it.
+All queries share a single websocket, through :class:`RpcClient`, which multiplexes JSON-RPC requests: any number
+of coroutines can query the chain at once, every request awaiting its own response.
+
+The metadata of the chain's runtime is fetched on first use and decoded in a worker thread. Storage queries and
+extrinsics are encoded with it, the results of runtime API calls with :func:`bittensor.chain_data.get_rpc_runtime_config`.
+The runtime version of the latest block is looked up again at most every :data:`RUNTIME_VERSION_REFRESH_SECONDS`,
+when a storage function is not found in the metadata, and before signing an extrinsic.
+"""
+
+import copy
+import time
+import torch
+import asyncio
+import aiohttp
+import itertools
+import scalecodec
+import bittensor
+import bittensor.utils.weight_utils as weight_utils
+
+from hashlib import blake2b
+from types import SimpleNamespace
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple, Union
+from scalecodec.base import RuntimeConfigurationObject, ScaleBytes, ScaleType
+from scalecodec.type_registry import load_type_registry_preset
+from substrateinterface import Keypair
+from substrateinterface.storage import StorageKey
+from substrateinterface.exceptions import (
+    StorageFunctionNotFound,
+    SubstrateRequestException,
+)
+
+from bittensor import codec
+from .chain_data import NeuronInfo, NeuronInfoLite, get_rpc_runtime_config
+from .chain_columns import NeuronInfoLiteColumns
+from .utils.balance import Balance
+
+# The hashers of storage map keys which are followed by the key itself, and the length of their hash.
+_CONCAT_HASHERS = {"Blake2_128Concat": 16, "Twox64Concat": 8, "Identity": 0}
+
+# The fields of the signature payload, in order, and the signed extension and type of each.
+_SIGNED_EXTENSIONS = (
+    ("CheckMortality", "era", "extrinsic"),
+    ("CheckEra", "era", "extrinsic"),
+    ("CheckNonce", "nonce", "extrinsic"),
+    ("ChargeTransactionPayment", "tip", "extrinsic"),
+    ("ChargeAssetTxPayment", "asset_id", "extrinsic"),
+    ("CheckSpecVersion", "spec_version", "additional_signed"),
+    ("CheckTxVersion", "transaction_version", "additional_signed"),
+    ("CheckGenesis", "genesis_hash", "additional_signed"),
+    ("CheckMortality", "block_hash", "additional_signed"),
+    ("CheckEra", "block_hash", "additional_signed"),
+)
+
+# The time, in seconds, for which the runtime version of the latest block is reused without looking it up again.
+RUNTIME_VERSION_REFRESH_SECONDS = 60.0
+
+# The statuses of a watched extrinsic after which it will not be included.
+_FAILED_STATUSES = ("dropped", "invalid", "usurped", "finalityTimeout")
+
+
+class _Channel:
+    def __init__(self, websocket: aiohttp.ClientWebSocketResponse):
+        self.websocket = websocket
+        self.responses: Dict[int, asyncio.Future] = {}
+        self.notifications: Dict[str, asyncio.Queue] = {}
+
+
+class RpcClient:
+    """
+    A JSON-RPC client multiplexing requests over one websocket. Every request is sent with its own id and awaits
+    the response with that id, so concurrent requests do not wait for each other. Subscription notifications are
+    queued per subscription.
+
+    The websocket is opened by the first request, and opened again by the first request after it closed. Requests
+    and subscriptions pending when it closes fail with :class:`ConnectionError`. Messages which can not be decoded
+    are logged and skipped, and the websocket is closed if reading it fails otherwise.
+
+    Args:
+        url (str): The ``ws://`` or ``wss://`` endpoint.
+        timeout (float): The time, in seconds, to wait for a response.
+    """
+
+    def __init__(self, url: str, timeout: float = 60.0):
+        self.url = url
+        self.timeout = timeout
+        self._ids = itertools.count(1)
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._channel: Optional[_Channel] = None
+        self._reader: Optional[asyncio.Task] = None
+        self._lock: Optional[asyncio.Lock] = None
+
+    @property
+    def connected(self) -> bool:
+        return self._channel is not None and not self._channel.websocket.closed
+
+    async def connect(self) -> _Channel:
+        """Returns the open channel, opening the websocket if needed."""
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+        async with self._lock:
+            if self._channel is None or self._channel.websocket.closed:
+                if self._session is None:
+                    self._session = aiohttp.ClientSession()
+                websocket = await self._session.ws_connect(self.url, max_msg_size=0)
+                self._channel = _Channel(websocket)
+                self._reader = asyncio.create_task(self._read(self._channel))
+            return self._channel
+
+    async def _read(self, channel: _Channel):
+        try:
+            async for message in channel.websocket:
+                if message.type in (aiohttp.WSMsgType.TEXT, aiohttp.WSMsgType.BINARY):
+                    try:
+                        self._dispatch(channel, codec.loads(message.data))
+                    except Exception as e:
+                        bittensor.logging.warning(
+                            f"Skipping a malformed message from {self.url}: {e}"
+                        )
+        finally:
+            # Without a reader nothing would answer the requests, the next one opens a new websocket.
+            if not channel.websocket.closed:
+                await channel.websocket.close()
+            error = ConnectionError(f"The websocket connection to {self.url} closed.")
+            for response in channel.responses.values():
+                if not response.done():
+                    response.set_exception(error)
+            for notifications in channel.notifications.values():
+                notifications.put_nowait(error)
+
+    @staticmethod
+    def _dispatch(channel: _Channel, message: Dict[str, Any]):
+        if message.get("id") is not None:
+            response = channel.responses.get(message["id"])
+            if response is not None and not response.done():
+                response.set_result(message)
+        elif "params" in message:
+            # Notifications may arrive before the response holding their subscription id.
+            params = message["params"]
+            channel.notifications.setdefault(
+                params["subscription"], asyncio.Queue()
+            ).put_nowait(params["result"])
+
+    async def _request(
+        self, channel: _Channel, method: str, params: Optional[List[Any]]
+    ) -> Any:
+        request_id = next(self._ids)
+        response = asyncio.get_running_loop().create_future()
+        channel.responses[request_id] = response
+        try:
+            request = {
+                "jsonrpc": "2.0",
+                "id": request_id,
+                "method": method,
+                "params": params or [],
+            }
+            await channel.websocket.send_str(codec.dumps(request).decode())
+            message = await asyncio.wait_for(response, self.timeout)
+        finally:
+            channel.responses.pop(request_id, None)
+        if "error" in message:
+            raise SubstrateRequestException(message["error"])
+        return message.get("result")
+
+    async def request(self, method: str, params: Optional[List[Any]] = None) -> Any:
+        """
+        Sends a request and returns its result.
+
+        Raises:
+            SubstrateRequestException: If the node answers with an error.
+            ConnectionError: If the connection closes before the response arrives.
+            asyncio.TimeoutError: If no response arrives within ``timeout`` seconds.
+        """
+        return await self._request(await self.connect(), method, params)
+
+    async def subscribe(
+        self,
+        method: str,
+        params: Optional[List[Any]],
+        unsubscribe_method: str,
+    ) -> AsyncIterator[Any]:
+        """
+        Subscribes with ``method`` and yields the results of its notifications, unsubscribing once closed.
+
+        Raises:
+            ConnectionError: If the connection closes while subscribed.
+        """
+        channel = await self.connect()
+        subscription = await self._request(channel, method, params)
+        notifications = channel.notifications.setdefault(subscription, asyncio.Queue())
+        try:
+            while True:
+                result = await notifications.get()
+                if isinstance(result, Exception):
+                    raise result
+                yield result
+        finally:
+            channel.notifications.pop(subscription, None)
+            if not channel.websocket.closed:
+                try:
+                    await self._request(channel, unsubscribe_method, [subscription])
+                except Exception:
+                    pass
+
+    async def close(self):
+        """Closes the websocket and its session."""
+        if self._channel is not None:
+            await self._channel.websocket.close()
+        if self._reader is not None:
+            await self._reader
+        if self._session is not None:
+            await self._session.close()
+        self._channel = self._reader = self._session = None
+
+
+class _Runtime:
+    """The decoded metadata of one version of the chain's runtime, with a type registry holding its types."""
+
+    def __init__(self, metadata: str, spec_version: int, transaction_version: int):
+        self.spec_version = spec_version
+        self.transaction_version = transaction_version
+        self.config = RuntimeConfigurationObject(ss58_format=bittensor.__ss58_format__)
+        self.config.update_type_registry(load_type_registry_preset("core"))
+        self.config.update_type_registry(bittensor.__type_registry__)
+        self.config.set_active_spec_version_id(spec_version)
+        self.metadata = self.config.create_scale_object(
+            "MetadataVersioned", data=ScaleBytes(metadata)
+        )
+        self.metadata.decode()
+        self.config.add_portable_registry(self.metadata)
+
+    def storage_function(self, module: str, name: str) -> ScaleType:
+        pallet = self.metadata.get_metadata_pallet(module)
+        storage_function = pallet.get_storage_function(name) if pallet else None
+        if not storage_function:
+            raise StorageFunctionNotFound(
+                f'Storage function "{module}.{name}" not found'
+            )
+        return storage_function
+
+    def decode(self, type_string: str, data: Union[str, bytes, bytearray]) -> Any:
+        return self.config.create_scale_object(
+            type_string, data=ScaleBytes(data), metadata=self.metadata
+        ).decode()
+
+    def decode_key(
+        self, key: str, prefix: str, key_types: List[Tuple[str, str]]
+    ) -> Any:
+        """Decodes the parameters of a storage map key following ``prefix``, from their hashers and types."""
+        data = bytes.fromhex(key[len(prefix) :])
+        values = []
+        for hasher, type_string in key_types:
+            if hasher not in _CONCAT_HASHERS:
+                raise ValueError(
+                    f"Storage keys hashed with {hasher} can not be decoded."
+                )
+            data = data[_CONCAT_HASHERS[hasher] :]
+            obj = self.config.create_scale_object(
+                type_string, data=ScaleBytes(data), metadata=self.metadata
+            )
+            values.append(obj.decode(check_remaining=False))
+            data = data[obj.data.offset :]
+        return values[0] if len(values) == 1 else tuple(values)
+
+    def compose_call(
+        self, call_module: str, call_function: str, call_params: Dict[str, Any]
+    ) -> ScaleType:
+        call = self.config.create_scale_object("Call", metadata=self.metadata)
+        call.encode(
+            {
+                "call_module": call_module,
+                "call_function": call_function,
+                "call_args": call_params,
+            }
+        )
+        return call
+
+    def signed_extrinsic(
+        self,
+        call: ScaleType,
+        keypair: Keypair,
+        era: Dict[str, int],
+        nonce: int,
+        genesis_hash: str,
+        block_hash: str,
+    ) -> ScaleType:
+        """Signs ``call`` with ``keypair``, as ``SubstrateInterface.create_signed_extrinsic`` does."""
+        payload = self.config.create_scale_object("ExtrinsicPayloadValue")
+        payload.type_mapping = [["call", "CallBytes"]]
+        signed_extensions = self.metadata.get_signed_extensions()
+        for extension, name, kind in _SIGNED_EXTENSIONS:
+            if extension in signed_extensions:
+                payload.type_mapping.append([name, signed_extensions[extension][kind]])
+        payload.encode(
+            {
+                "call": str(call.data),
+                "era": era,
+                "nonce": nonce,
+                "tip": 0,
+                "spec_version": self.spec_version,
+                "transaction_version": self.transaction_version,
+                "genesis_hash": genesis_hash,
+                "block_hash": block_hash,
+                "asset_id": {"tip": 0, "asset_id": None},
+            }
+        )
+        # Long payloads are signed by their hash.
+        data = payload.data
+        if data.length > 256:
+            data = ScaleBytes(blake2b(data.data, digest_size=32).digest())
+        signature = keypair.sign(data)
+
+        value = {
+            "account_id": f"0x{keypair.public_key.hex()}",
+            "signature": f"0x{signature.hex()}",
+            "call_function": call.value["call_function"],
+            "call_module": call.value["call_module"],
+            "call_args": call.value["call_args"],
+            "nonce": nonce,
+            "era": era,
+            "tip": 0,
+            "asset_id": {"tip": 0, "asset_id": None},
+        }
+        signature_class = self.config.get_decoder_class("ExtrinsicSignature")
+        if issubclass(signature_class, self.config.get_decoder_class("Enum")):
+            value["signature_version"] = keypair.crypto_type
+        extrinsic = self.config.create_scale_object("Extrinsic", metadata=self.metadata)
+        extrinsic.encode(value)
+        return extrinsic
+
+    def dispatch_error(self, dispatch_error: Any) -> str:
+        """Returns a description of the ``DispatchError`` of a failed extrinsic."""
+        if isinstance(dispatch_error, dict) and "Module" in dispatch_error:
+            module = dispatch_error["Module"]
+            if isinstance(module, tuple):
+                module_index, error_index = module
+            else:
+                module_index, error_index = module["index"], module["error"]
+            if isinstance(error_index, str):
+                error_index = int(error_index[2:4], 16)
+            error = self.metadata.get_module_error(
+                module_index=module_index, error_index=error_index
+            )
+            return f"{error.name}: {' '.join(error.docs)}".strip(": ")
+        return str(dispatch_error)
+
+
+class AsyncSubtensor:
+    """
+    An asyncio interface to the subtensor chain, offering the queries of :class:`bittensor.subtensor` most used by
+    miners and validators as coroutines. All of them share one multiplexed websocket, opened on first use.
+
+    Args:
+        network (str, optional): The network name or chain endpoint to connect to, as for :class:`bittensor.subtensor`.
+        config (bittensor.config, optional): A subtensor configuration, as returned by ``bittensor.subtensor.config()``.
+        log_verbose (bool): If true, logs the endpoint connected to.
+        timeout (float): The time, in seconds, to wait for the response to a request.
+
+    Example::
+
+        async with bittensor.AsyncSubtensor(network="finney") as subtensor:
+            block, neurons = await asyncio.gather(
+                subtensor.get_current_block(), subtensor.neurons_lite(netuid=1)
+            )
+            metagraph = await subtensor.metagraph(netuid=1)
+    """
+
+    def __init__(
+        self,
+        network: Optional[str] = None,
+        config: Optional["bittensor.config"] = None,
+        log_verbose: bool = True,
+        timeout: float = 600.0,
+    ):
+        if config is None:
+            config = bittensor.subtensor.config()
+        self.config = copy.deepcopy(config)
+        self.chain_endpoint, self.network = bittensor.subtensor.setup_config(
+            network, self.config  # type: ignore
+        )
+        self.rpc = RpcClient(self.chain_endpoint, timeout=timeout)
+        self._runtimes: Dict[int, _Runtime] = {}
+        # The runtime of the latest block, and when its version was last looked up.
+        self._latest_runtime: Optional[_Runtime] = None
+        self._latest_runtime_checked = 0.0
+        if log_verbose:
+            bittensor.logging.info(
+                f"Connecting to {self.network} network and {self.chain_endpoint}."
+            )
+
+    def __str__(self) -> str:
+        if self.network == self.chain_endpoint:
+            return "AsyncSubtensor({})".format(self.chain_endpoint)
+        return "AsyncSubtensor({}, {})".format(self.network, self.chain_endpoint)
+
+    def __repr__(self) -> str:
+        return self.__str__()
+
+    async def __aenter__(self) -> "AsyncSubtensor":
+        await self.rpc.connect()
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        await self.close()
+
+    async def close(self):
+        """Closes the websocket connection."""
+        await self.rpc.close()
+
+    async def rpc_request(self, method: str, params: Optional[List[Any]] = None) -> Any:
+        """
+        Makes a JSON-RPC request and returns its result. Requests failing with a closed connection or a timeout are
+        retried twice, after 2 and 4 seconds, except for the ``author_`` methods submitting extrinsics.
+
+        Args:
+            method (str): The RPC method, such as ``"chain_getHeader"``.
+            params (Optional[List[Any]]): Its parameters.
+
+        Returns:
+            Any: The ``result`` of the response.
+        """
+        tries = 1 if method.startswith("author_") else 3
+        for attempt in range(tries):
+            try:
+                return await self.rpc.request(method, params)
+            except (ConnectionError, asyncio.TimeoutError, aiohttp.ClientError) as e:
+                if attempt + 1 == tries:
+                    raise
+                bittensor.logging.warning(f"{method} failed, retrying: {e}")
+                await asyncio.sleep(min(2 * 2**attempt, 4))
+
+    async def get_block_hash(self, block_id: int) -> str:
+        """Returns the hash of block ``block_id``."""
+        return await self.rpc_request("chain_getBlockHash", [block_id])
+
+    async def _block_hash(self, block: Optional[int]) -> Optional[str]:
+        return None if block is None else await self.get_block_hash(block)
+
+    async def get_current_block(self) -> int:
+        """Returns the number of the latest block."""
+        header = await self.rpc_request("chain_getHeader", [])
+        return int(header["number"], 16)
+
+    async def _runtime(
+        self, block_hash: Optional[str] = None, refresh: bool = False
+    ) -> _Runtime:
+        """
+        Returns the runtime at ``block_hash``, fetching and decoding its metadata once per runtime version. The
+        runtime of the latest block is reused for :data:`RUNTIME_VERSION_REFRESH_SECONDS`, unless ``refresh`` is set.
+        """
+        now = time.monotonic()
+        if (
+            block_hash is None
+            and not refresh
+            and self._latest_runtime is not None
+            and now - self._latest_runtime_checked < RUNTIME_VERSION_REFRESH_SECONDS
+        ):
+            return self._latest_runtime
+        version = await self.rpc_request("state_getRuntimeVersion", [block_hash])
+        runtime = self._runtimes.get(version["specVersion"])
+        if runtime is None:
+            metadata = await self.rpc_request("state_getMetadata", [block_hash])
+            # Decoding the metadata takes a while, it is kept off the event loop.
+            runtime = await asyncio.get_running_loop().run_in_executor(
+                None,
+                _Runtime,
+                metadata,
+                version["specVersion"],
+                version["transactionVersion"],
+            )
+            self._runtimes[version["specVersion"]] = runtime
+        if block_hash is None:
+            self._latest_runtime, self._latest_runtime_checked = runtime, now
+        return runtime
+
+    async def _storage_function(
+        self, module: str, storage_function: str, block_hash: Optional[str]
+    ) -> Tuple[_Runtime, ScaleType]:
+        """
+        Returns the runtime at ``block_hash`` and its storage function. A storage function missing from the cached
+        runtime of the latest block may come with a runtime upgrade, so the runtime is looked up again first.
+        """
+        runtime = await self._runtime(block_hash)
+        try:
+            return runtime, runtime.storage_function(module, storage_function)
+        except StorageFunctionNotFound:
+            if block_hash is not None:
+                raise
+        runtime = await self._runtime(refresh=True)
+        return runtime, runtime.storage_function(module, storage_function)
+
+    async def _query_at(
+        self,
+        module: str,
+        storage_function: str,
+        params: Optional[List[Any]],
+        block_hash: Optional[str],
+    ) -> Any:
+        runtime, storage_item = await self._storage_function(
+            module, storage_function, block_hash
+        )
+        storage_key = StorageKey.create_from_storage_function(
+            module,
+            storage_function,
+            params or [],
+            runtime_config=runtime.config,
+            metadata=runtime.metadata,
+        )
+        value = await self.rpc_request(
+            "state_getStorage", [storage_key.to_hex(), block_hash]
+        )
+        if value is None:
+            if storage_item.value["modifier"] != "Default":
+                return None
+            value = storage_item.value_object["default"].value_object
+        return runtime.decode(storage_item.get_value_type_string(), value)
+
+    async def query(
+        self,
+        module: str,
+        storage_function: str,
+        params: Optional[List[Any]] = None,
+        block: Optional[int] = None,
+    ) -> Any:
+        """
+        Queries a storage value of the chain.
+
+        Args:
+            module (str): The pallet, such as ``"SubtensorModule"``.
+            storage_function (str): The storage item, such as ``"TotalNetworks"``.
+            params (Optional[List[Any]]): The keys of a storage map.
+            block (Optional[int]): The block to query at, or ``None`` for the latest block.
+
+        Returns:
+            Any: The decoded value, its default if it is not set, or ``None`` if it has no default.
+        """
+        return await self._query_at(
+            module, storage_function, params, await self._block_hash(block)
+        )
+
+    async def query_map(
+        self,
+        module: str,
+        storage_function: str,
+        params: Optional[List[Any]] = None,
+        block: Optional[int] = None,
+        page_size: int = 1000,
+    ) -> List[Tuple[Any, Any]]:
+        """
+        Queries all entries of a storage map, or of the entries under the first keys of a double map. The values
+        are requested in concurrent pages of ``page_size`` keys.
+
+        Args:
+            module (str): The pallet, such as ``"SubtensorModule"``.
+            storage_function (str): The storage map, such as ``"Weights"``.
+            params (Optional[List[Any]]): The first keys of the map, if any.
+            block (Optional[int]): The block to query at, or ``None`` for the latest block.
+            page_size (int): The number of keys requested at once.
+
+        Returns:
+            List[Tuple[Any, Any]]: The remaining keys, as a tuple if there are several, and the decoded values.
+        """
+        params = params or []
+        block_hash = await self._block_hash(block)
+        runtime, storage_item = await self._storage_function(
+            module, storage_function, block_hash
+        )
+        key_types = list(
+            zip(storage_item.get_param_hashers(), storage_item.get_params_type_string())
+        )[len(params) :]
+        prefix = StorageKey.create_from_storage_function(
+            module,
+            storage_function,
+            params,
+            runtime_config=runtime.config,
+            metadata=runtime.metadata,
+        ).to_hex()
+
+        keys: List[str] = []
+        while True:
+            page = await self.rpc_request(
+                "state_getKeysPaged",
+                [prefix, page_size, keys[-1] if keys else None, block_hash],
+            )
+            keys.extend(page)
+            if len(page) < page_size:
+                break
+
+        pages = await asyncio.gather(
+            *(
+                self.rpc_request(
+                    "state_queryStorageAt", [keys[i : i + page_size], block_hash]
+                )
+                for i in range(0, len(keys), page_size)
+            )
+        )
+        value_type = storage_item.get_value_type_string()
+        return [
+            (
+                runtime.decode_key(key, prefix, key_types),
+                runtime.decode(value_type, value),
+            )
+            for change_sets in pages
+            for change_set in change_sets
+            for key, value in change_set["changes"]
+            if value is not None
+        ]
+
+    async def state_call(
+        self, method: str, data: str, block: Optional[int] = None
+    ) -> Dict[str, Any]:
+        """Calls the runtime API ``method`` with the SCALE encoded ``data``, returning the response."""
+        block_hash = await self._block_hash(block)
+        params = [method, data] + ([block_hash] if block_hash else [])
+        return {"result": await self.rpc_request("state_call", params)}
+
+    async def query_runtime_api(
+        self,
+        runtime_api: str,
+        method: str,
+        params: Optional[Union[List[int], Dict[str, int]]],
+        block: Optional[int] = None,
+    ) -> Optional[str]:
+        """
+        Queries the runtime API of the chain, as :func:`bittensor.subtensor.query_runtime_api` does.
+
+        Args:
+            runtime_api (str): The name of the runtime API, such as ``"NeuronInfoRuntimeApi"``.
+            method (str): The method of the runtime API, such as ``"get_neurons_lite"``.
+            params (Optional[Union[List[int], Dict[str, int]]]): The parameters of the method.
+            block (Optional[int]): The block to query at, or ``None`` for the latest block.
+
+        Returns:
+            Optional[str]: The decoded result, or ``None`` if the runtime API returned none.
+        """
+        call_definition = bittensor.__type_registry__["runtime_api"][runtime_api][  # type: ignore
+            "methods"  # type: ignore
+        ][
+            method
+        ]  # type: ignore
+        runtime_config = get_rpc_runtime_config()
+
+        data = scalecodec.ScaleBytes(b"")
+        for i, param in enumerate(call_definition["params"]):  # type: ignore
+            if isinstance(params, list):
+                value = params[i]
+            else:
+                if params is None or param["name"] not in params:
+                    raise ValueError(f"Missing param {param['name']} in params dict.")
+                value = params[param["name"]]
+            data += runtime_config.create_scale_object(param["type"]).encode(value)
+
+        json_result = await self.state_call(
+            method=f"{runtime_api}_{method}",
+            data="0x" if params is None else data.to_hex(),
+            block=block,
+        )
+
+        obj = runtime_config.create_scale_object(
+            call_definition["type"], scalecodec.ScaleBytes(json_result["result"])  # type: ignore
+        )
+        if obj.data.to_hex() == "0x0400":  # RPC returned None result
+            return None
+        return obj.decode()
+
+    async def neurons_lite(
+        self, netuid: int, block: Optional[int] = None
+    ) -> List[NeuronInfoLite]:
+        """Returns the neurons of subnet ``netuid``, without their weights and bonds."""
+        hex_bytes_result = await self.query_runtime_api(
+            runtime_api="NeuronInfoRuntimeApi",
+            method="get_neurons_lite",
+            params=[netuid],
+            block=block,
+        )
+        if hex_bytes_result is None:
+            return []
+        if hex_bytes_result.startswith("0x"):
+            hex_bytes_result = hex_bytes_result[2:]
+        return list(NeuronInfoLiteColumns.from_vec_u8(bytes.fromhex(hex_bytes_result)))
+
+    async def weights(
+        self, netuid: int, block: Optional[int] = None
+    ) -> List[Tuple[int, List[Tuple[int, int]]]]:
+        """Returns the weights set by the neurons of subnet ``netuid``, by uid."""
+        return await self.query_map("SubtensorModule", "Weights", [netuid], block)
+
+    async def bonds(
+        self, netuid: int, block: Optional[int] = None
+    ) -> List[Tuple[int, List[Tuple[int, int]]]]:
+        """Returns the bonds of the neurons of subnet ``netuid``, by uid."""
+        return await self.query_map("SubtensorModule", "Bonds", [netuid], block)
+
+    async def neurons(
+        self, netuid: int, block: Optional[int] = None
+    ) -> List[NeuronInfo]:
+        """Returns the neurons of subnet ``netuid``, with their weights and bonds."""
+        neurons_lite, weights, bonds = await asyncio.gather(
+            self.neurons_lite(netuid, block),
+            self.weights(netuid, block),
+            self.bonds(netuid, block),
+        )
+        weights_as_dict = {uid: w for uid, w in weights}
+        bonds_as_dict = {uid: b for uid, b in bonds}
+        return [
+            NeuronInfo.from_weights_bonds_and_neuron_lite(
+                neuron_lite, weights_as_dict, bonds_as_dict
+            )
+            for neuron_lite in neurons_lite
+        ]
+
+    async def get_total_subnets(self, block: Optional[int] = None) -> int:
+        """Returns the number of subnets."""
+        return await self.query("SubtensorModule", "TotalNetworks", block=block)
+
+    async def get_subnets(self, block: Optional[int] = None) -> List[int]:
+        """Returns the netuids of all subnets."""
+        networks = await self.query_map("SubtensorModule", "NetworksAdded", block=block)
+        return [netuid for netuid, _ in networks]
+
+    async def metagraph(
+        self, netuid: int, lite: bool = True, block: Optional[int] = None
+    ) -> "bittensor.metagraph":
+        """
+        Returns the metagraph of subnet ``netuid`` synced at ``block``, as :func:`bittensor.subtensor.metagraph` does.
+
+        Args:
+            netuid (int): The network UID of the subnet.
+            lite (bool, default=True): If true, the weights and bonds are not retrieved.
+            block (Optional[int]): The block to sync at, or ``None`` for the latest block.
+
+        Returns:
+            bittensor.metagraph: The synced metagraph.
+        """
+        if block is None:
+            block = await self.get_current_block()
+        metagraph_ = bittensor.metagraph(
+            network=self.network, netuid=netuid, lite=lite, sync=False
+        )
+        if lite:
+            metagraph_.neurons = await self.neurons_lite(netuid, block)
+        else:
+            metagraph_.neurons = await self.neurons(netuid, block)
+        metagraph_.lite = lite
+
+        # The values the metagraph would otherwise query from a synchronous subtensor.
+        chain = SimpleNamespace(block=block)
+        if not lite and netuid == 0:
+            n_subnets, subnets = await asyncio.gather(
+                self.get_total_subnets(block), self.get_subnets(block)
+            )
+            chain.get_total_subnets = lambda: n_subnets
+            chain.get_subnets = lambda: subnets
+        metagraph_._set_metagraph_attributes(block, chain)
+        if not lite:
+            metagraph_._set_weights_and_bonds(subtensor=chain)
+        metagraph_.changed_uids = metagraph_.uids.detach().clone()
+        return metagraph_
+
+    async def get_balance(self, address: str, block: Optional[int] = None) -> Balance:
+        """Returns the free balance of the account with the ``ss58`` address ``address``."""
+        account = await self.query("System", "Account", [address], block)
+        return Balance(account["data"]["free"])
+
+    async def submit_extrinsic(
+        self,
+        keypair: Keypair,
+        call_module: str,
+        call_function: str,
+        call_params: Dict[str, Any],
+        wait_for_inclusion: bool = False,
+        wait_for_finalization: bool = False,
+        period: int = 5,
+    ) -> Tuple[bool, Optional[str]]:
+        """
+        Signs a call with ``keypair`` and submits it, optionally waiting for the block including it.
+
+        Args:
+            keypair (Keypair): The signing keypair, whose next nonce is used.
+            call_module (str): The pallet of the call, such as ``"SubtensorModule"``.
+            call_function (str): The call, such as ``"set_weights"``.
+            call_params (Dict[str, Any]): The arguments of the call.
+            wait_for_inclusion (bool): Waits for the extrinsic to be included in a block.
+            wait_for_finalization (bool): Waits for the extrinsic to be finalized.
+            period (int): The number of blocks the extrinsic remains valid for.
+
+        Returns:
+            Tuple[bool, Optional[str]]: Whether the extrinsic was submitted, or succeeded if waited for, and the error
+            if it failed.
+        """
+        # Extrinsics signed for an outdated runtime version are invalid.
+        runtime = await self._runtime(refresh=True)
+        call = runtime.compose_call(call_module, call_function, call_params)
+        nonce, genesis_hash, finalized_head = await asyncio.gather(
+            self.rpc_request("system_accountNextIndex", [keypair.ss58_address]),
+            self.get_block_hash(0),
+            self.rpc_request("chain_getFinalizedHead"),
+        )
+        header = await self.rpc_request("chain_getHeader", [finalized_head])
+        era = {"period": period, "current": int(header["number"], 16)}
+        era_obj = runtime.config.create_scale_object("Era")
+        era_obj.encode(era)
+        birth_hash = await self.get_block_hash(era_obj.birth(era["current"]))
+        extrinsic = runtime.signed_extrinsic(
+            call, keypair, era, nonce, genesis_hash, birth_hash
+        )
+        extrinsic_data = str(extrinsic.data)
+
+        if not wait_for_inclusion and not wait_for_finalization:
+            await self.rpc_request("author_submitExtrinsic", [extrinsic_data])
+            return True, None
+
+        block_hash = None
+        updates = self.rpc.subscribe(
+            "author_submitAndWatchExtrinsic",
+            [extrinsic_data],
+            "author_unwatchExtrinsic",
+        )
+        try:
+            async for status in updates:
+                if isinstance(status, dict):
+                    if "finalized" in status or (
+                        "inBlock" in status and not wait_for_finalization
+                    ):
+                        block_hash = status.get("finalized", status.get("inBlock"))
+                        break
+                    status = next(iter(status))
+                if status in _FAILED_STATUSES:
+                    return False, f"The extrinsic was {status}."
+        finally:
+            await updates.aclose()  # type: ignore
+
+        block, events = await asyncio.gather(
+            self.rpc_request("chain_getBlock", [block_hash]),
+            self._query_at("System", "Events", None, block_hash),
+        )
+        extrinsics = [data.lower() for data in block["block"]["extrinsics"]]
+        index = extrinsics.index(extrinsic_data.lower())
+        for event in events:
+            if event["extrinsic_idx"] != index or event["module_id"] != "System":
+                continue
+            if event["event_id"] == "ExtrinsicSuccess":
+                return True, None
+            if event["event_id"] == "ExtrinsicFailed":
+                attributes = event["attributes"]
+                if isinstance(attributes, dict):
+                    attributes = attributes.get("dispatch_error", attributes)
+                return False, runtime.dispatch_error(attributes)
+        return False, "The extrinsic emitted no result."
+
+    async def set_weights(
+        self,
+        wallet: "bittensor.wallet",
+        netuid: int,
+        uids: Union[torch.LongTensor, list],
+        weights: Union[torch.FloatTensor, list],
+        version_key: int = bittensor.__version_as_int__,
+        wait_for_inclusion: bool = False,
+        wait_for_finalization: bool = False,
+    ) -> Tuple[bool, str]:
+        """
+        Sets the weights of the wallet's hotkey on subnet ``netuid``, as :func:`bittensor.subtensor.set_weights` does
+        in a single attempt.
+
+        Args:
+            wallet (bittensor.wallet): The wallet whose hotkey sets the weights.
+            netuid (int): The unique identifier of the subnet.
+            uids (Union[torch.LongTensor, list]): The uids of the neurons the weights are set for.
+            weights (Union[torch.FloatTensor, list]): The weight of each uid, normalized before being set.
+            version_key (int, optional): Version key for compatibility with the network.
+            wait_for_inclusion (bool, optional): Waits for the transaction to be included in a block.
+            wait_for_finalization (bool, optional): Waits for the transaction to be finalized on the blockchain.
+
+        Returns:
+            Tuple[bool, str]: Whether the weights were set, and a message describing the outcome.
+        """
+        if isinstance(uids, list):
+            uids = torch.tensor(uids, dtype=torch.int64)
+        if isinstance(weights, list):
+            weights = torch.tensor(weights, dtype=torch.float32)
+        weight_uids, weight_vals = weight_utils.convert_weights_and_uids_for_emit(
+            uids, weights
+        )
+
+        try:
+            success, error_message = await self.submit_extrinsic(
+                keypair=wallet.hotkey,
+                call_module="SubtensorModule",
+                call_function="set_weights",
+                call_params={
+                    "dests": weight_uids,
+                    "weights": weight_vals,
+                    "netuid": netuid,
+                    "version_key": version_key,
+                },
+                wait_for_inclusion=wait_for_inclusion,
+                wait_for_finalization=wait_for_finalization,
+            )
+        except Exception as e:
+            bittensor.logging.warning(
+                prefix="Set weights", sufix="<red>Failed: </red>" + str(e)
+            )
+            return False, str(e)
+
+        if not wait_for_finalization and not wait_for_inclusion:
+            return True, "Not waiting for finalization or inclusion."
+        if success:
+            bittensor.logging.success(
+                prefix="Set weights", sufix="<green>Finalized: </green>" + str(success)
+            )
+            return True, "Successfully set weights and Finalized."
+        bittensor.logging.warning(
+            prefix="Set weights", sufix="<red>Failed: </red>" + str(error_message)
+        )
+        return False, str(error_message)
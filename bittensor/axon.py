@@ -23,25 +23,29 @@
 import os
 import uuid
 import copy
-import json
 import time
-import asyncio
+import socket
 import inspect
 import uvicorn
 import argparse
+import tempfile
 import traceback
+import warnings
 import threading
 import bittensor
 import contextlib
+import multiprocessing
 
 from inspect import signature, Signature, Parameter
 from fastapi.responses import JSONResponse
-from substrateinterface import Keypair
 from fastapi import FastAPI, APIRouter, Request, Response, Depends
-from starlette.responses import Response
+from starlette.responses import Response, StreamingResponse
 from starlette.requests import Request
+from fastapi.encoders import jsonable_encoder
+from starlette.concurrency import run_in_threadpool
 from starlette.middleware.base import BaseHTTPMiddleware, RequestResponseEndpoint
-from typing import List, Optional, Tuple, Callable, Any, Dict
+from pydantic import BaseModel
+from typing import List, Optional, Tuple, Callable, Any, AsyncIterable, Dict, Union
 
 from bittensor.errors import (
     InvalidRequestNameError,
@@ -55,7 +59,18 @@ from bittensor.errors import (
     PostProcessException,
     InternalServerError,
 )
-from bittensor.threadpool import PriorityThreadPoolExecutor
+from bittensor.scheduler import AdmissionScheduler, AdmissionRejected
+from bittensor import codec, compression, frame
+from bittensor.verifier import SignatureVerifier
+from bittensor.nonce_store import (
+    NonceStore,
+    MemoryNonceStore,
+    SQLiteNonceStore,
+    DEFAULT_MAX_AGE as DEFAULT_NONCE_MAX_AGE,
+    is_future,
+    is_stale,
+    nonce_ttl,
+)
 
 
 class FastAPIThreadedServer(uvicorn.Server):
@@ -151,6 +166,202 @@ class FastAPIThreadedServer(uvicorn.Server):
             self.should_exit = True
 
 
+class FastAPIMultiprocessServer:
+    """
+    The ``FastAPIMultiprocessServer`` class runs the Axon's FastAPI application in several forked uvicorn worker processes.
+
+    Each worker binds its own listening socket to the same port with ``SO_REUSEPORT``, letting the kernel spread incoming
+    connections across workers so that request parsing, hashing and signature checks scale with the number of cores.
+
+    Workers are forked from the process that built the Axon, so every function attached before :func:`start` is
+    registered in every worker. The ``on_worker_start`` callback is invoked first thing in each worker with its index,
+    giving the Axon a chance to rebuild per-process state such as thread pools.
+
+    It exposes the same ``start``, ``stop`` and ``is_running`` interface as :class:`FastAPIThreadedServer`.
+    :func:`start` waits for every worker to bind its socket and raises if one of them fails, and ``is_running``
+    turns ``False`` as soon as a worker process has exited.
+
+    Args:
+        config (uvicorn.Config): The uvicorn configuration of the FastAPI application.
+        workers (int): The number of worker processes to fork.
+        on_worker_start (Callable[[int], None], optional): Called in each worker process with the worker index.
+        start_timeout (float): Seconds to wait for each worker to bind its socket.
+    """
+
+    def __init__(
+        self,
+        config: uvicorn.Config,
+        workers: int,
+        on_worker_start: Optional[Callable[[int], None]] = None,
+        start_timeout: float = 30.0,
+    ):
+        if not hasattr(socket, "SO_REUSEPORT"):
+            raise ValueError("Multiple axon workers require SO_REUSEPORT support.")
+        if "fork" not in multiprocessing.get_all_start_methods():
+            raise ValueError("Multiple axon workers require the fork start method.")
+        self.config = config
+        self.workers = workers
+        self.on_worker_start = on_worker_start
+        self.start_timeout = start_timeout
+        self.processes: List[multiprocessing.process.BaseProcess] = []
+        self._started = False
+        self._owner_pid = os.getpid()
+
+    @property
+    def is_running(self) -> bool:
+        """``True`` while the workers are started and all of them are alive."""
+        if not self._started:
+            return False
+        dead = [
+            (index, process.exitcode)
+            for index, process in enumerate(self.processes)
+            if not process.is_alive()
+        ]
+        if dead:
+            bittensor.logging.error(
+                f"Axon workers exited: {', '.join(f'worker {index} with code {code}' for index, code in dead)}"
+            )
+            return False
+        return True
+
+    def _bind(self) -> socket.socket:
+        """Creates a listening socket on the configured port which other workers can bind as well."""
+        sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEPORT, 1)
+        sock.bind((self.config.host, self.config.port))
+        sock.listen(self.config.backlog)
+        sock.setblocking(False)
+        return sock
+
+    def _run_worker(self, index: int, ready: "multiprocessing.connection.Connection"):
+        """Entry point of a worker process. Reports ``None`` on ``ready`` once bound, or the error that stopped it."""
+        try:
+            if self.on_worker_start is not None:
+                self.on_worker_start(index)
+            sock = self._bind()
+            ready.send(None)
+        except BaseException as e:
+            ready.send(f"{type(e).__name__}: {e}")
+            raise
+        finally:
+            ready.close()
+        uvicorn.Server(config=self.config).run(sockets=[sock])
+
+    def _wait_ready(self, index: int, ready: "multiprocessing.connection.Connection"):
+        """Waits for worker ``index`` to bind its socket, raising ``RuntimeError`` if it does not."""
+        try:
+            if not ready.poll(self.start_timeout):
+                raise RuntimeError(
+                    f"Axon worker {index} did not start within {self.start_timeout}s."
+                )
+            error = ready.recv()
+        except EOFError:
+            self.processes[index].join(timeout=1)
+            error = f"exited with code {self.processes[index].exitcode}"
+        finally:
+            ready.close()
+        if error is not None:
+            raise RuntimeError(f"Axon worker {index} failed to start: {error}")
+
+    def start(self):
+        """
+        Forks the worker processes if they are not already running, and waits for all of them to listen.
+
+        Raises:
+            RuntimeError: If a worker fails to start, in which case all workers are stopped.
+        """
+        if self.is_running:
+            return
+        # Clear the workers of a previous run, some of which may have died.
+        self.stop()
+        context = multiprocessing.get_context("fork")
+        receivers = []
+        self._started = True
+        for index in range(self.workers):
+            receiver, sender = context.Pipe(duplex=False)
+            process = context.Process(
+                target=self._run_worker, args=(index, sender), daemon=True
+            )
+            process.start()
+            # Only the worker holds the sending end, so a worker dying early is seen as EOF.
+            sender.close()
+            self.processes.append(process)
+            receivers.append(receiver)
+        try:
+            for index, receiver in enumerate(receivers):
+                self._wait_ready(index, receiver)
+        except RuntimeError:
+            self.stop()
+            raise
+
+    def stop(self):
+        """
+        Terminates the worker processes, letting uvicorn shut each of them down gracefully.
+        """
+        # Forked workers inherit this object, only the process that started them may stop them.
+        if not self._started or os.getpid() != self._owner_pid:
+            return
+        for process in self.processes:
+            process.terminate()
+        for process in self.processes:
+            process.join(timeout=5)
+            if process.is_alive():
+                process.kill()
+        self.processes = []
+        self._started = False
+
+
+class AxonStats:
+    """
+    Request counters of an Axon, kept per serving worker in shared memory so that the parent process can aggregate
+    them while the workers are running.
+
+    Args:
+        workers (int): The number of serving workers.
+    """
+
+    FIELDS = ["requests", "successes", "failures", "process_time"]
+
+    def __init__(self, workers: int = 1):
+        self.workers = workers
+        self.worker_index = 0
+        self._values = multiprocessing.RawArray("d", workers * len(self.FIELDS))
+
+    def record(self, status_code: Optional[int], process_time: float):
+        """
+        Records a processed request on the current worker. Only the owning worker writes to its slots.
+        """
+        offset = self.worker_index * len(self.FIELDS)
+        self._values[offset] += 1
+        if status_code is not None and int(status_code) == 200:
+            self._values[offset + 1] += 1
+        else:
+            self._values[offset + 2] += 1
+        self._values[offset + 3] += process_time
+
+    def per_worker(self) -> List[Dict[str, float]]:
+        """
+        Returns the counters of every worker.
+        """
+        return [
+            {
+                field: self._values[index * len(self.FIELDS) + position]
+                for position, field in enumerate(self.FIELDS)
+            }
+            for index in range(self.workers)
+        ]
+
+    def total(self) -> Dict[str, float]:
+        """
+        Returns the counters summed over all workers.
+        """
+        workers = self.per_worker()
+        return {
+            field: sum(worker[field] for worker in workers) for field in self.FIELDS
+        }
+
+
 class axon:
     """
     The ``axon`` class in Bittensor is a fundamental component that serves as the server-side interface for a neuron within the Bittensor network.
@@ -259,6 +470,8 @@ class axon:
         external_ip (str, optional): External IP address to broadcast.
         external_port (int, optional): External port to broadcast.
         max_workers (int, optional): Number of active threads for request handling.
+        workers (int, optional): Number of uvicorn worker processes serving requests.
+        nonce_store (bittensor.nonce_store.NonceStore, optional): Store used for replay protection.
 
     Returns:
         bittensor.axon: An instance of the axon class configured as per the provided arguments.
@@ -296,6 +509,10 @@ class axon:
         external_ip: Optional[str] = None,
         external_port: Optional[int] = None,
         max_workers: Optional[int] = None,
+        workers: Optional[int] = None,
+        nonce_store: Optional[NonceStore] = None,
+        max_concurrency: Optional[int] = None,
+        max_queue_size: Optional[int] = None,
     ):
         r"""Creates a new bittensor.Axon object from passed arguments.
         Args:
@@ -313,6 +530,16 @@ class axon:
                 The external port of the server to broadcast to the network.
             max_workers (:type:`Optional[int]`, `optional`):
                 Used to create the threadpool if not passed, specifies the number of active threads servicing requests.
+            workers (:type:`Optional[int]`, `optional`):
+                The number of uvicorn worker processes sharing the port through ``SO_REUSEPORT``. Functions must be
+                attached before :func:`start` to be served by every worker.
+            nonce_store (:obj:`Optional[bittensor.nonce_store.NonceStore]`, `optional`):
+                Store remembering the last nonce per dendrite for replay protection. If not passed, it is built from
+                ``config.axon.nonce_store_path`` and ``config.axon.nonce_capacity``.
+            max_concurrency (:type:`Optional[int]`, `optional`):
+                The maximum number of forward calls running at once. Defaults to ``max_workers``.
+            max_queue_size (:type:`Optional[int]`, `optional`):
+                The maximum number of requests waiting for a forward slot before new requests are shed with a 503.
         """
         # Build and check config.
         if config is None:
@@ -329,6 +556,51 @@ class axon:
         config.axon.max_workers = max_workers or config.axon.get(
             "max_workers", bittensor.defaults.axon.max_workers
         )
+        config.axon.workers = workers or config.axon.get(
+            "workers", bittensor.defaults.axon.workers
+        )
+        config.axon.max_concurrency = (
+            max_concurrency
+            or config.axon.get("max_concurrency", None)
+            or config.axon.max_workers
+        )
+        config.axon.max_queue_size = (
+            max_queue_size
+            if max_queue_size is not None
+            else config.axon.get(
+                "max_queue_size", bittensor.defaults.axon.max_queue_size
+            )
+        )
+        config.axon.verify_cache_size = config.axon.get(
+            "verify_cache_size", bittensor.defaults.axon.verify_cache_size
+        )
+        config.axon.verify_batch_size = config.axon.get(
+            "verify_batch_size", bittensor.defaults.axon.verify_batch_size
+        )
+        config.axon.verify_workers = config.axon.get(
+            "verify_workers", bittensor.defaults.axon.verify_workers
+        )
+        config.axon.verify_use_processes = config.axon.get(
+            "verify_use_processes", bittensor.defaults.axon.verify_use_processes
+        )
+        config.axon.nonce_capacity = config.axon.get(
+            "nonce_capacity", bittensor.defaults.axon.nonce_capacity
+        )
+        config.axon.nonce_store_path = config.axon.get(
+            "nonce_store_path", bittensor.defaults.axon.nonce_store_path
+        )
+        config.axon.nonce_max_age = config.axon.get(
+            "nonce_max_age", bittensor.defaults.axon.nonce_max_age
+        )
+        config.axon.compression = config.axon.get(
+            "compression", bittensor.defaults.axon.compression
+        )
+        config.axon.compression_threshold = config.axon.get(
+            "compression_threshold", bittensor.defaults.axon.compression_threshold
+        )
+        config.axon.max_decompressed_size = config.axon.get(
+            "max_decompressed_size", bittensor.defaults.axon.max_decompressed_size
+        )
         axon.check_config(config)
         self.config = config  # type: ignore [method-assign]
 
@@ -353,10 +625,27 @@ class axon:
         self.started = False
 
         # Build middleware
-        self.thread_pool = bittensor.PriorityThreadPoolExecutor(
-            max_workers=self.config.axon.max_workers
+        self._owner_pid = os.getpid()
+        self._temporary_nonce_path: Optional[str] = None
+        self.nonces: NonceStore = nonce_store or self._build_nonce_store(config)
+        self.nonce_max_age: float = self.config.axon.nonce_max_age
+        self.max_decompressed_size: int = self.config.axon.max_decompressed_size
+        if self.config.axon.workers > 1 and isinstance(self.nonces, MemoryNonceStore):
+            bittensor.logging.warning(
+                "Axon workers do not share an in-memory nonce store, use a SQLiteNonceStore for replay protection across workers."
+            )
+        self.verifier = SignatureVerifier(
+            cache_size=self.config.axon.verify_cache_size,
+            batch_size=self.config.axon.verify_batch_size,
+            max_workers=self.config.axon.verify_workers,
+            use_processes=self.config.axon.verify_use_processes,
+        )
+        self.stats = AxonStats(workers=self.config.axon.workers)
+        self.scheduler = AdmissionScheduler(
+            max_concurrency=self.config.axon.max_concurrency,
+            max_queue_size=self.config.axon.max_queue_size,
         )
-        self.nonces: Dict[str, int] = {}
+        self._thread_pool: Optional[bittensor.PriorityThreadPoolExecutor] = None
 
         # Request default functions.
         self.forward_class_types: Dict[str, List[Signature]] = {}
@@ -372,7 +661,15 @@ class axon:
         self.fast_config = uvicorn.Config(
             self.app, host="0.0.0.0", port=self.config.axon.port, log_level=log_level
         )
-        self.fast_server = FastAPIThreadedServer(config=self.fast_config)
+        self.fast_server: Any = (
+            FastAPIMultiprocessServer(
+                config=self.fast_config,
+                workers=self.config.axon.workers,
+                on_worker_start=self._on_worker_start,
+            )
+            if self.config.axon.workers > 1
+            else FastAPIThreadedServer(config=self.fast_config)
+        )
         self.router = APIRouter()
         self.app.include_router(self.router)
 
@@ -387,6 +684,156 @@ class axon:
             forward_fn=ping, verify_fn=None, blacklist_fn=None, priority_fn=None
         )
 
+    def _build_nonce_store(self, config: "bittensor.config") -> NonceStore:
+        """
+        Builds the nonce store from the config. Worker processes must share it, so they get a SQLite file, which is
+        created in the temporary directory and deleted on :func:`stop` unless ``config.axon.nonce_store_path`` is set.
+        """
+        path = config.axon.nonce_store_path
+        if path is None and config.axon.workers > 1:
+            path = os.path.join(
+                tempfile.gettempdir(), f"bittensor-axon-{self.uuid}-nonces.db"
+            )
+            self._temporary_nonce_path = path
+        if path:
+            return SQLiteNonceStore(path, capacity=config.axon.nonce_capacity)
+        return MemoryNonceStore(capacity=config.axon.nonce_capacity)
+
+    def _remove_temporary_nonce_store(self):
+        """Deletes the SQLite files of the nonce store built in the temporary directory, see :func:`_build_nonce_store`."""
+        path = getattr(self, "_temporary_nonce_path", None)
+        # Forked workers inherit the axon, only the process that built the store may delete it.
+        if path is None or os.getpid() != self._owner_pid:
+            return
+        self.nonces.close()
+        for suffix in ("", "-wal", "-shm"):
+            with contextlib.suppress(FileNotFoundError):
+                os.remove(path + suffix)
+
+    def _on_worker_start(self, index: int):
+        """
+        Runs first thing in each forked worker process. Threads do not survive a fork, so the signature verifier
+        is rebuilt and the deprecated :attr:`thread_pool` is dropped, and the worker records its requests into
+        its own stats slots.
+        """
+        self.stats.worker_index = index
+        self._thread_pool = None
+        self.verifier = SignatureVerifier(
+            cache_size=self.verifier.cache_size,
+            batch_size=self.verifier.batch_size,
+            max_workers=self.verifier.max_workers,
+            use_processes=self.verifier.use_processes,
+        )
+
+    @staticmethod
+    def _forward_endpoint(
+        forward_fn: Callable,
+        compression_encodings: Optional[List[str]] = None,
+        compression_threshold: int = 0,
+    ) -> Callable:
+        """
+        Wraps :func:`forward_fn` into a route handler which runs it on the synapse already parsed and verified
+        by :func:`verify_body_integrity`, instead of letting FastAPI parse and validate the body a second time.
+        Synchronous forward functions run in the threadpool, as FastAPI does for synchronous routes.
+
+        Synapses carrying tensors are returned as a binary frame (see :mod:`bittensor.frame`) to dendrites
+        which accept them, and every response tells the dendrite that frames are accepted in requests.
+
+        Responses of at least ``compression_threshold`` bytes are compressed with the first of
+        ``compression_encodings`` listed in the request's ``Accept-Encoding`` header, and every response lists
+        the encodings the axon decodes in its own ``Accept-Encoding`` header (see :mod:`bittensor.compression`).
+        """
+        headers = {
+            frame.ACCEPT_HEADER: "1",
+            "Accept-Encoding": ", ".join(compression.available_encodings()),
+        }
+
+        def compress(request: Request, response: Response) -> Response:
+            if not compression_encodings:
+                return response
+            (
+                body,
+                encoding,
+                ratio,
+                compression_time,
+            ) = compression.compress_body(
+                response.body,
+                compression_encodings,
+                request.headers.get("accept-encoding"),
+                compression_threshold,
+            )
+            if encoding is None:
+                return response
+            # Picked up by the middleware to report the compression in the response headers.
+            request.state.compression = (ratio, compression_time)
+            return Response(
+                content=body,
+                media_type=response.media_type,
+                headers={**headers, "Content-Encoding": encoding},
+            )
+
+        async def endpoint(request: Request) -> Response:
+            synapse = request.state.synapse
+            if inspect.iscoroutinefunction(forward_fn):
+                response = await forward_fn(synapse)
+            else:
+                response = await run_in_threadpool(forward_fn, synapse)
+
+            # Streaming and other custom responses are returned untouched.
+            if isinstance(response, Response):
+                return response
+            if isinstance(response, bittensor.Synapse) and frame.CONTENT_TYPE in (
+                request.headers.get("accept", "")
+            ):
+                fields = frame.tensor_fields(response)
+                if fields:
+                    return compress(
+                        request,
+                        Response(
+                            content=frame.encode(response, fields),
+                            media_type=frame.CONTENT_TYPE,
+                            headers=headers,
+                        ),
+                    )
+            if isinstance(response, BaseModel):
+                return compress(
+                    request,
+                    Response(
+                        content=codec.dumps(
+                            response.dict(), default=response.__json_encoder__  # type: ignore [arg-type]
+                        ),
+                        media_type="application/json",
+                        headers=headers,
+                    ),
+                )
+            return compress(
+                request,
+                Response(
+                    content=codec.dumps(jsonable_encoder(response)),
+                    media_type="application/json",
+                    headers=headers,
+                ),
+            )
+
+        return endpoint
+
+    @property
+    def thread_pool(self) -> "bittensor.PriorityThreadPoolExecutor":
+        """
+        Deprecated, forward calls are admitted by :attr:`scheduler` and no longer run on this pool. The pool is
+        only built on first access, for code still submitting its own work to it.
+        """
+        warnings.warn(
+            "axon.thread_pool is deprecated and no longer runs forward calls, see axon.scheduler.",
+            DeprecationWarning,
+            stacklevel=2,
+        )
+        if self._thread_pool is None:
+            self._thread_pool = bittensor.PriorityThreadPoolExecutor(
+                max_workers=self.config.axon.max_workers  # type: ignore [attr-defined]
+            )
+        return self._thread_pool
+
     def info(self) -> "bittensor.AxonInfo":
         """Returns the axon info object associated with this axon."""
         return bittensor.AxonInfo(
@@ -407,6 +854,7 @@ class axon:
         blacklist_fn: Optional[Callable] = None,
         priority_fn: Optional[Callable] = None,
         verify_fn: Optional[Callable] = None,
+        concurrency_limit: Optional[int] = None,
     ) -> "bittensor.axon":
         """
 
@@ -428,6 +876,7 @@ class axon:
             blacklist_fn (Callable, optional): Function to filter out undesired requests. It should take the same arguments as :func:`forward_fn` and return a boolean value. Defaults to ``None``, meaning no blacklist filter will be used.
             priority_fn (Callable, optional): Function to rank requests based on their priority. It should take the same arguments as :func:`forward_fn` and return a numerical value representing the request's priority. Defaults to ``None``, meaning no priority sorting will be applied.
             verify_fn (Callable, optional): Function to verify requests. It should take the same arguments as :func:`forward_fn` and return a boolean value. If ``None``, :func:`self.default_verify` function will be used.
+            concurrency_limit (int, optional): Maximum number of concurrently running :func:`forward_fn` calls. Defaults to ``None``, meaning only the axon wide ``max_concurrency`` applies.
 
         Note:
             The methods :func:`forward_fn`, :func:`blacklist_fn`, :func:`priority_fn`, and :func:`verify_fn` should be designed to receive the same parameters.
@@ -488,10 +937,15 @@ class axon:
             list(forward_sig.parameters)[0]
         ].annotation.__name__
 
-        # Add the endpoint to the router, making it available on both GET and POST methods
+        # Add the endpoint to the router, making it available on both GET and POST methods.
+        # The body is parsed once by 'verify_body_integrity' and that synapse is handed to 'forward_fn'.
         self.router.add_api_route(
             f"/{request_name}",
-            forward_fn,
+            self._forward_endpoint(
+                forward_fn,
+                compression.parse_encodings(self.config.axon.compression),  # type: ignore [attr-defined]
+                self.config.axon.compression_threshold,  # type: ignore [attr-defined]
+            ),
             methods=["GET", "POST"],
             dependencies=[Depends(self.verify_body_integrity)],
         )
@@ -565,6 +1019,7 @@ class axon:
             verify_fn or self.default_verify
         )  # Use 'default_verify' if 'verify_fn' is None
         self.forward_fns[request_name] = forward_fn
+        self.scheduler.set_limit(request_name, concurrency_limit)
 
         # Parse required hash fields from the forward function protocol defaults
         required_hash_fields = request_class.__dict__["__fields__"][
@@ -616,6 +1071,31 @@ class axon:
             default_axon_external_port = os.getenv("BT_AXON_EXTERNAL_PORT") or None
             default_axon_external_ip = os.getenv("BT_AXON_EXTERNAL_IP") or None
             default_axon_max_workers = os.getenv("BT_AXON_MAX_WORERS") or 10
+            default_axon_workers = os.getenv("BT_AXON_WORKERS") or 1
+            default_axon_max_concurrency = os.getenv("BT_AXON_MAX_CONCURRENCY") or None
+            default_axon_max_queue_size = os.getenv("BT_AXON_MAX_QUEUE_SIZE") or 256
+            default_axon_verify_cache_size = (
+                os.getenv("BT_AXON_VERIFY_CACHE_SIZE") or 4096
+            )
+            default_axon_verify_batch_size = (
+                os.getenv("BT_AXON_VERIFY_BATCH_SIZE") or 64
+            )
+            default_axon_verify_workers = os.getenv("BT_AXON_VERIFY_WORKERS") or 1
+            default_axon_nonce_capacity = os.getenv("BT_AXON_NONCE_CAPACITY") or 100000
+            default_axon_nonce_store_path = (
+                os.getenv("BT_AXON_NONCE_STORE_PATH") or None
+            )
+            default_axon_nonce_max_age = (
+                os.getenv("BT_AXON_NONCE_MAX_AGE") or DEFAULT_NONCE_MAX_AGE
+            )
+            default_axon_compression = os.getenv("BT_AXON_COMPRESSION") or "none"
+            default_axon_compression_threshold = (
+                os.getenv("BT_AXON_COMPRESSION_THRESHOLD") or 1024
+            )
+            default_axon_max_decompressed_size = (
+                os.getenv("BT_AXON_MAX_DECOMPRESSED_SIZE")
+                or compression.MAX_DECOMPRESSED_SIZE
+            )
 
             # Add command-line arguments to the parser
             parser.add_argument(
@@ -651,6 +1131,86 @@ class axon:
                         The grpc server distributes new worker threads to service requests up to this number.""",
                 default=default_axon_max_workers,
             )
+            parser.add_argument(
+                "--" + prefix_str + "axon.workers",
+                type=int,
+                help="""The number of uvicorn worker processes serving this axon, sharing the port through SO_REUSEPORT.""",
+                default=default_axon_workers,
+            )
+            parser.add_argument(
+                "--" + prefix_str + "axon.max_concurrency",
+                type=int,
+                required=False,
+                help="""The maximum number of forward calls running at once, admitted by priority. Defaults to axon.max_workers.""",
+                default=default_axon_max_concurrency,
+            )
+            parser.add_argument(
+                "--" + prefix_str + "axon.max_queue_size",
+                type=int,
+                help="""The maximum number of requests waiting for a forward slot. Further requests are rejected with a 503.""",
+                default=default_axon_max_queue_size,
+            )
+            parser.add_argument(
+                "--" + prefix_str + "axon.verify_cache_size",
+                type=int,
+                help="""The number of decoded dendrite hotkeys kept in the signature verification cache.""",
+                default=default_axon_verify_cache_size,
+            )
+            parser.add_argument(
+                "--" + prefix_str + "axon.verify_batch_size",
+                type=int,
+                help="""The maximum number of request signatures verified together in one batch.""",
+                default=default_axon_verify_batch_size,
+            )
+            parser.add_argument(
+                "--" + prefix_str + "axon.verify_workers",
+                type=int,
+                help="""The number of workers verifying request signatures off the event loop.""",
+                default=default_axon_verify_workers,
+            )
+            parser.add_argument(
+                "--" + prefix_str + "axon.verify_use_processes",
+                action="store_true",
+                help="""If set, request signatures are verified in worker processes instead of threads.""",
+                default=False,
+            )
+            parser.add_argument(
+                "--" + prefix_str + "axon.nonce_capacity",
+                type=int,
+                help="""The maximum number of dendrite nonces remembered for replay protection.""",
+                default=default_axon_nonce_capacity,
+            )
+            parser.add_argument(
+                "--" + prefix_str + "axon.nonce_store_path",
+                type=str,
+                required=False,
+                help="""If set, nonces are kept in this SQLite file, shared by all axon processes on the host.""",
+                default=default_axon_nonce_store_path,
+            )
+            parser.add_argument(
+                "--" + prefix_str + "axon.nonce_max_age",
+                type=float,
+                help="""The age in seconds after which a request nonce is rejected as a possible replay.""",
+                default=default_axon_nonce_max_age,
+            )
+            parser.add_argument(
+                "--" + prefix_str + "axon.compression",
+                type=str,
+                help="""Comma separated encodings to compress responses with, in order of preference (zstd, gzip), or none. Only used with dendrites accepting them.""",
+                default=default_axon_compression,
+            )
+            parser.add_argument(
+                "--" + prefix_str + "axon.compression_threshold",
+                type=int,
+                help="""The minimum body size in bytes for responses to be compressed.""",
+                default=default_axon_compression_threshold,
+            )
+            parser.add_argument(
+                "--" + prefix_str + "axon.max_decompressed_size",
+                type=int,
+                help="""The maximum size in bytes of a compressed request body once decompressed. Larger bodies are rejected.""",
+                default=default_axon_max_decompressed_size,
+            )
 
         except argparse.ArgumentError:
             # Exception handling for re-parsing arguments
@@ -672,7 +1232,8 @@ class axon:
 
         Returns:
             dict: Returns the parsed body of the request as a dictionary if all the hash comparisons match,
-                indicating that the body is intact and has not been tampered with.
+                indicating that the body is intact and has not been tampered with. The synapse built from it
+                is kept on ``request.state.synapse`` and passed to the forward function.
 
         Raises:
             JSONResponse: Raises a JSONResponse with a 400 status code if any of the hash comparisons fail,
@@ -692,18 +1253,27 @@ class axon:
             within the Bittensor network. It helps prevent tampering and manipulation of data during transit,
             thereby maintaining the reliability and trust in the network communication.
         """
-        # Await and load the request body so we can inspect it
-        body = await request.body()
-        request_body = body.decode() if isinstance(body, bytes) else body
-
-        # Gather the required field names from the axon's required_hash_fields dict
+        # Await and load the request body so we can inspect it. Compressed bodies are decompressed as
+        # they arrive, and the hash is checked over the decompressed content.
+        encoding = request.headers.get("content-encoding")
+        body: Union[bytes, bytearray]
+        if encoding and encoding != compression.IDENTITY:
+            body = await compression.decompress_stream(
+                request.stream(), encoding, self.max_decompressed_size
+            )
+        else:
+            body = await request.body()
         request_name = request.url.path.split("/")[1]
-        required_hash_fields = self.required_hash_fields[request_name]
 
-        # Load the body dict and check if all required field hashes match
-        body_dict = json.loads(request_body)
+        # Load the body dict. This is the only time the body is parsed. Tensors in binary frames
+        # are rebuilt as views into the body.
+        if request.headers.get("content-type", "").startswith(frame.CONTENT_TYPE):
+            body_dict = frame.decode(body)
+        else:
+            body_dict = codec.loads(body)
 
-        # Reconstruct the synapse object from the body dict and recompute the hash
+        # Reconstruct the synapse object from the body dict and recompute the hash, which only
+        # serializes the synapse's required_hash_fields.
         syn = self.forward_class_types[request_name](**body_dict)  # type: ignore
         parsed_body_hash = syn.body_hash  # Rehash the body from request
 
@@ -713,7 +1283,8 @@ class axon:
                 f"Hash mismatch between header body hash {body_hash} and parsed body hash {parsed_body_hash}"
             )
 
-        # If body is good, return the parsed body so that it can be passed onto the route function
+        # If body is good, keep the synapse for the route function and return the parsed body
+        request.state.synapse = syn
         return body_dict
 
     @classmethod
@@ -735,6 +1306,30 @@ class axon:
             config.axon.external_port > 1024 and config.axon.external_port < 65535
         ), "External port must be in range [1024, 65535]"
 
+        assert config.axon.workers >= 1, "Axon workers must be at least 1"
+
+        assert config.axon.nonce_max_age > 0, "Axon nonce_max_age must be positive"
+
+        assert (
+            config.axon.max_decompressed_size > 0
+        ), "Axon max_decompressed_size must be positive"
+
+        assert (
+            config.axon.max_concurrency >= 1
+        ), "Axon max_concurrency must be at least 1"
+
+        assert (
+            config.axon.max_queue_size >= 0
+        ), "Axon max_queue_size must not be negative"
+
+        assert compression.is_valid_setting(
+            config.axon.compression
+        ), "Axon compression must be a comma separated list of zstd and gzip, or none"
+
+        assert (
+            config.axon.compression_threshold >= 0
+        ), "Axon compression_threshold must not be negative"
+
     def to_string(self):
         """
         Provides a human-readable representation of the AxonInfo for this Axon.
@@ -789,6 +1384,10 @@ class axon:
         Note:
             After invoking this method, the Axon is ready to handle requests as per its configured endpoints and custom logic.
         """
+        # The temporary nonce store is deleted when the axon stops, a restarted axon needs a new one.
+        path = self._temporary_nonce_path
+        if path is not None and not os.path.exists(path):
+            self.nonces = self._build_nonce_store(self.config)  # type: ignore [arg-type]
         self.fast_server.start()
         self.started = True
         return self
@@ -818,6 +1417,7 @@ class axon:
             It is advisable to ensure that all ongoing processes or requests are completed or properly handled before invoking this method.
         """
         self.fast_server.stop()
+        self._remove_temporary_nonce_store()
         self.started = False
         return self
 
@@ -904,35 +1504,55 @@ class axon:
             where the sender signs the message with their private key and the receiver verifies the
             signature using the sender's public key.
         """
-        # Build the keypair from the dendrite_hotkey
         if synapse.dendrite is not None:
-            keypair = Keypair(ss58_address=synapse.dendrite.hotkey)
-
             # Build the signature messages.
             message = f"{synapse.dendrite.nonce}.{synapse.dendrite.hotkey}.{self.wallet.hotkey.ss58_address}.{synapse.dendrite.uuid}.{synapse.computed_body_hash}"
 
             # Build the unique endpoint key.
             endpoint_key = f"{synapse.dendrite.hotkey}:{synapse.dendrite.uuid}"
 
-            # Check the nonce from the endpoint key.
-            if (
-                endpoint_key in self.nonces.keys()
-                and self.nonces[endpoint_key] is not None
-                and synapse.dendrite.nonce is not None
-                and synapse.dendrite.nonce <= self.nonces[endpoint_key]
-            ):
-                raise Exception("Nonce is too small")
+            # Check the nonce from the endpoint key before paying for the signature check.
+            self._check_nonce(endpoint_key, synapse.dendrite.nonce)
 
-            if not keypair.verify(message, synapse.dendrite.signature):
+            # Verify the signature off the event loop, using the cached dendrite public key.
+            if not await self.verifier.averify(
+                synapse.dendrite.hotkey, message, synapse.dendrite.signature  # type: ignore
+            ):
                 raise Exception(
                     f"Signature mismatch with {message} and {synapse.dendrite.signature}"
                 )
 
-            # Success
-            self.nonces[endpoint_key] = synapse.dendrite.nonce  # type: ignore
+            # Store the nonce, a concurrent request may have used it while we were verifying.
+            if synapse.dendrite.nonce is not None and not self.nonces.check_and_set(
+                endpoint_key,
+                synapse.dendrite.nonce,
+                nonce_ttl(synapse.dendrite.nonce, self.nonce_max_age),
+            ):
+                raise Exception("Nonce is too small")
         else:
             raise SynapseDendriteNoneException()
 
+    def _check_nonce(self, endpoint_key: str, nonce: Optional[int]):
+        """
+        Raises if ``nonce`` is outside the replay window of ``config.axon.nonce_max_age`` seconds, or not larger
+        than the last nonce seen for ``endpoint_key``. The window does not depend on any request field, as only
+        the nonce itself is signed.
+        """
+        if nonce is None:
+            return
+
+        # Stale nonces may already have been evicted from the store, so reject them on age.
+        if is_stale(nonce, self.nonce_max_age):
+            raise Exception("Nonce is too old")
+
+        # Future nonces would outlive their store entry, and be replayable once it expired.
+        if is_future(nonce):
+            raise Exception("Nonce is in the future")
+
+        last_nonce = self.nonces.get(endpoint_key)
+        if last_nonce is not None and nonce <= last_nonce:
+            raise Exception("Nonce is too small")
+
 
 def create_error_response(synapse: bittensor.Synapse):
     if synapse.axon is None:
@@ -978,6 +1598,41 @@ def log_and_handle_error(
     return synapse
 
 
+class _SlotRelease:
+    """Frees a slot of the admission scheduler once, however many times it is called."""
+
+    def __init__(self, scheduler: AdmissionScheduler, name: str):
+        self.scheduler = scheduler
+        self.name = name
+        self.released = False
+
+    def __call__(self):
+        if not self.released:
+            self.released = True
+            self.scheduler.release(self.name)
+
+
+class _ReleasingBody:
+    """Iterates over a response body, calling ``release`` when it ends, fails, is cancelled or is discarded."""
+
+    def __init__(self, body_iterator: AsyncIterable[Any], release: _SlotRelease):
+        self.body_iterator = body_iterator.__aiter__()
+        self.release = release
+
+    def __aiter__(self) -> "_ReleasingBody":
+        return self
+
+    async def __anext__(self) -> Any:
+        try:
+            return await self.body_iterator.__anext__()
+        except BaseException:
+            self.release()
+            raise
+
+    def __del__(self):
+        self.release()
+
+
 class AxonMiddleware(BaseHTTPMiddleware):
     """
     The `AxonMiddleware` class is a key component in the Axon server, responsible for processing all incoming requests.
@@ -1032,7 +1687,7 @@ class AxonMiddleware(BaseHTTPMiddleware):
         3. Blacklist Checking: Verifies if the request is blacklisted.
         4. Request Verification: Ensures the authenticity and integrity of the request.
         5. Priority Assessment: Evaluates and assigns priority to the request.
-        6. Request Execution: Calls the next function in the middleware chain to process the request.
+        6. Request Execution: Waits for the admission scheduler, then calls the next function in the middleware chain to process the request.
         7. Response Postprocessing: Updates response headers and logs the end of the request processing.
 
         The method also handles exceptions and errors that might occur during each stage, ensuring that
@@ -1062,10 +1717,10 @@ class AxonMiddleware(BaseHTTPMiddleware):
             await self.verify(synapse)
 
             # Call the priority function
-            await self.priority(synapse)
+            priority = await self.priority(synapse)
 
-            # Call the run function
-            response = await self.run(synapse, call_next, request)
+            # Call the run function once the scheduler admits the request
+            response = await self.run(synapse, call_next, request, priority)
 
             # Call the postprocess function
             response = await self.postprocess(synapse, response, start_time)
@@ -1121,6 +1776,12 @@ class AxonMiddleware(BaseHTTPMiddleware):
 
         # Logs the end of request processing and returns the response
         finally:
+            # Count the request on this worker's stats.
+            self.axon.stats.record(
+                synapse.axon.status_code if synapse.axon is not None else None,
+                time.time() - start_time,
+            )
+
             # Log the details of the processed synapse, including total size, name, hotkey, IP, port,
             # status code, and status message, using the debug level of the logger.
             if synapse.dendrite is not None and synapse.axon is not None:
@@ -1317,7 +1978,7 @@ class AxonMiddleware(BaseHTTPMiddleware):
                 # We raise an exception to halt the process and return the error message to the requester.
                 raise BlacklistedException(f"Forbidden. Key is blacklisted: {reason}.")
 
-    async def priority(self, synapse: bittensor.Synapse):
+    async def priority(self, synapse: bittensor.Synapse) -> float:
         """
         Executes the priority function for the request. This method assesses and assigns a priority
         level to the request, determining its urgency and importance in the processing queue.
@@ -1325,49 +1986,30 @@ class AxonMiddleware(BaseHTTPMiddleware):
         Args:
             synapse (bittensor.Synapse): The Synapse object representing the request.
 
+        Returns:
+            float: The priority of the request, ``0.0`` if no priority function is attached.
+
         Raises:
             Exception: If the priority assessment process encounters issues, such as timeouts.
 
         The priority function plays a crucial role in managing the processing load and ensuring that
-        critical requests are handled promptly.
+        critical requests are handled promptly. The returned priority orders the request in the axon's
+        admission scheduler, see :func:`run`.
         """
         # Retrieve the priority function from the 'priority_fns' dictionary that corresponds
         # to the request's name (synapse name).
         priority_fn = self.axon.priority_fns.get(str(synapse.name), None)
 
-        async def submit_task(
-            executor: PriorityThreadPoolExecutor, priority: float
-        ) -> Tuple[float, Any]:
-            """
-            Submits the given priority function to the specified executor for asynchronous execution.
-            The function will run in the provided executor and return the priority value along with the result.
-
-            Args:
-                executor: The executor in which the priority function will be run.
-                priority: The priority function to be executed.
-
-            Returns:
-                tuple: A tuple containing the priority value and the result of the priority function execution.
-            """
-            loop = asyncio.get_event_loop()
-            future = loop.run_in_executor(executor, lambda: priority)
-            result = await future
-            return priority, result
-
         # If a priority function exists for the request's name
         if priority_fn:
             try:
                 # Execute the priority function and get the priority value.
-                priority = (
+                return float(
                     await priority_fn(synapse)
                     if inspect.iscoroutinefunction(priority_fn)
                     else priority_fn(synapse)
                 )
 
-                # Submit the task to the thread pool for execution with the given priority.
-                # The submit_task function will handle the execution and return the result.
-                _, result = await submit_task(self.axon.thread_pool, priority)
-
             except TimeoutError as e:
                 # If the execution of the priority function exceeds the timeout,
                 # it raises an exception to handle the timeout error.
@@ -1380,33 +2022,72 @@ class AxonMiddleware(BaseHTTPMiddleware):
                 # Raise an exception to stop the process and return an appropriate error message to the requester.
                 raise PriorityException(f"Response timeout after: {synapse.timeout}s")
 
+        return 0.0
+
     async def run(
         self,
         synapse: bittensor.Synapse,
         call_next: RequestResponseEndpoint,
         request: Request,
+        priority: float = 0.0,
     ) -> Response:
         """
-        Executes the requested function as part of the request processing pipeline. This method calls
-        the next function in the middleware chain to process the request and generate a response.
+        Executes the requested function as part of the request processing pipeline. This method waits for
+        the axon's admission scheduler to grant a slot, then calls the next function in the middleware chain
+        to process the request and generate a response.
 
         Args:
             synapse (bittensor.Synapse): The Synapse object representing the request.
             call_next (RequestResponseEndpoint): The next function in the middleware chain to process requests.
             request (Request): The original HTTP request.
+            priority (float): The request priority, higher priorities are admitted first under load.
 
         Returns:
             Response: The HTTP response generated by processing the request.
 
+        Raises:
+            PriorityException: If the scheduler sheds the request because its queue is full or the request
+                waited longer than ``synapse.timeout``.
+
         This method is a critical part of the request lifecycle, where the actual processing of the
         request takes place, leading to the generation of a response.
         """
+        try:
+            # Wait for a slot in the admission scheduler, highest priority requests are admitted first.
+            queue_time = await self.axon.scheduler.acquire(
+                str(synapse.name), priority, synapse.timeout
+            )
+        except AdmissionRejected as e:
+            bittensor.logging.trace(f"Admission rejected: {str(e)}")
+
+            # Set the status code of the synapse to "503" which indicates the axon is overloaded.
+            if synapse.axon is not None:
+                synapse.axon.status_code = 503
+
+            raise PriorityException(f"Service unavailable: {str(e)}")
+
+        # Record how long the request waited in the queue.
+        if synapse.axon is not None:
+            synapse.axon.queue_time = queue_time
+
+        release = _SlotRelease(self.axon.scheduler, str(synapse.name))
         try:
             # The requested function is executed by calling the 'call_next' function,
             # passing the original request as an argument. This function processes the request
             # and returns the response.
             response = await call_next(request)
 
+            # Report the compression of the response body, if the endpoint compressed it.
+            if (
+                synapse.axon is not None
+                and request is not None
+                and hasattr(request.state, "compression")
+            ):
+                (
+                    synapse.axon.compression_ratio,
+                    synapse.axon.compression_time,
+                ) = request.state.compression
+
         except Exception as e:
             # If an exception occurs during the execution of the requested function,
             # it is caught and handled here.
@@ -1418,9 +2099,19 @@ class AxonMiddleware(BaseHTTPMiddleware):
             if synapse.axon is not None:
                 synapse.axon.status_code = 500
 
+            # Free the slot for the next queued request.
+            release()
+
             # Raise an exception to stop the process and return an appropriate error message to the requester.
             raise RunException(f"Internal server error with error: {str(e)}")
 
+        # The response body is produced while it is sent, streaming synapses in particular, so the slot is
+        # only freed once the body is sent, fails or is discarded.
+        if isinstance(response, StreamingResponse):
+            response.body_iterator = _ReleasingBody(response.body_iterator, release)
+        else:
+            release()
+
         # Return the starlet response
         return response
 
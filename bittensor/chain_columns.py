@@ -0,0 +1,437 @@
+# The MIT License (MIT)
+# Copyright © 2023 Opentensor Foundation
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy of this software and associated
+# documentation files (the “Software”), to deal in the Software without restriction, including without limitation
+# the rights to use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies of the Software,
+# and to permit persons to whom the Software is furnished to do so, subject to the following conditions:
+
+# The above copyright notice and this permission notice shall be included in all copies or substantial portions of
+# the Software.
+
+# THE SOFTWARE IS PROVIDED “AS IS”, WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO
+# THE WARRANTIES OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL
+# THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION
+# OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER
+# DEALINGS IN THE SOFTWARE.
+
+"""
+Columnar decoding of the largest runtime API results.
+
+The generic decoders of :mod:`bittensor.chain_data` go through py-scale-codec, which builds a dict per struct
+and a decoder object per field, before ``fix_decoded_values`` walks the dicts again. The decoders here parse the
+SCALE encoded ``Vec`` of one struct type straight from a ``memoryview`` into one column per field: numpy arrays
+for integers and booleans, lists of raw bytes for account ids and ``u128`` addresses. Nested vectors, such as the
+stake of every neuron, are flattened into columns of their own, with an ``_offsets`` column delimiting the items
+of every struct.
+
+Every columns class is a read-only sequence of the dataclasses the generic decoder returns. An item is only built,
+and its account ids SS58 encoded, when it is accessed::
+
+    neurons = NeuronInfoLiteColumns.from_vec_u8(vec_u8)
+    ranks = neurons.columns["rank"]  # numpy.ndarray of the raw u16 ranks.
+    neuron = neurons[12]  # bittensor.NeuronInfoLite
+"""
+
+import functools
+import numpy
+import bittensor
+
+from abc import abstractmethod
+from collections.abc import Sequence
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
+from scalecodec.utils.ss58 import ss58_encode
+
+from .chain_data import (
+    AxonInfo,
+    DelegateInfo,
+    NeuronInfoLite,
+    PrometheusInfo,
+    RAOPERTAO,
+    StakeInfo,
+    SubnetInfo,
+    decode_compact,
+)
+from .utils import networking as net, U16_NORMALIZED_FLOAT
+from .utils.balance import Balance
+
+# A field reader returns the decoded value and the offset after it.
+Reader = Callable[[memoryview, int], Tuple[Any, int]]
+
+
+def _read_compact(data: memoryview, offset: int) -> Tuple[int, int]:
+    value, size = decode_compact(data, offset)
+    return value, offset + size
+
+
+def _read_bool(data: memoryview, offset: int) -> Tuple[bool, int]:
+    value = data[offset]
+    if value > 1:
+        raise ValueError(f"Invalid bool {value} at offset {offset}.")
+    return value == 1, offset + 1
+
+
+def _fixed_reader(size: int, as_int: bool = True) -> Reader:
+    def read(data: memoryview, offset: int) -> Tuple[Any, int]:
+        end = offset + size
+        if end > len(data):
+            raise ValueError(f"Unexpected end of data at offset {offset}.")
+        if as_int:
+            return int.from_bytes(data[offset:end], "little"), end
+        return bytes(data[offset:end]), end
+
+    return read
+
+
+# Field types, as a reader and the numpy dtype of the column, or ``None`` for a list column.
+COMPACT = (_read_compact, "<u8")
+BOOL = (_read_bool, "?")
+U8 = (_fixed_reader(1), "<u1")
+U16 = (_fixed_reader(2), "<u2")
+U32 = (_fixed_reader(4), "<u4")
+U64 = (_fixed_reader(8), "<u8")
+U128 = (_fixed_reader(16), None)
+ACCOUNT_ID = (_fixed_reader(32, as_int=False), None)
+
+# A field is its column name and type, or its name and the fields of the items of a nested vector.
+Field = Tuple[str, Any]
+
+
+def decode_columns(
+    vec_u8: Union[List[int], bytes], fields: List[Field], option: bool = False
+) -> Tuple[Dict[str, Any], int]:
+    """
+    Decodes a SCALE encoded ``Vec`` of structs into columns.
+
+    Args:
+        vec_u8 (Union[List[int], bytes]): The encoded vector. Empty input decodes to no structs.
+        fields (List[Field]): The fields of the struct, in their encoded order.
+        option (bool): If ``True``, the elements are ``Option`` structs and ``None`` elements are skipped.
+
+    Returns:
+        Tuple[Dict[str, Any], int]: The columns and the number of structs.
+
+    Raises:
+        ValueError: If the data does not match the fields.
+    """
+    data = memoryview(bytes(vec_u8) if isinstance(vec_u8, list) else vec_u8)
+    if len(data) == 0:
+        data = memoryview(b"\x00")
+
+    columns: Dict[str, List[Any]] = {}
+    plan: List[Tuple[Any, ...]] = []
+    for name, kind in fields:
+        if isinstance(kind, list):
+            offsets = columns[f"{name}_offsets"] = [0]
+            items = [
+                (kind_[0], columns.setdefault(f"{name}_{item}", []))
+                for item, kind_ in kind
+            ]
+            plan.append((None, offsets, items))
+        else:
+            plan.append((kind[0], columns.setdefault(name, []), None))
+
+    try:
+        count, offset = _read_compact(data, 0)
+        length = 0
+        for _ in range(count):
+            if option:
+                present, offset = _read_bool(data, offset)
+                if not present:
+                    continue
+            for read, column, items in plan:
+                if read is not None:
+                    value, offset = read(data, offset)
+                    column.append(value)
+                    continue
+                n, offset = _read_compact(data, offset)
+                for _ in range(n):
+                    for read_item, item_column in items:
+                        value, offset = read_item(data, offset)
+                        item_column.append(value)
+                column.append(column[-1] + n)
+            length += 1
+    except IndexError as e:
+        raise ValueError(f"Unexpected end of data: {e}") from e
+    if offset != len(data):
+        raise ValueError(f"{len(data) - offset} bytes left after decoding.")
+
+    dtypes: Dict[str, Optional[str]] = {}
+    for name, kind in fields:
+        if isinstance(kind, list):
+            dtypes[f"{name}_offsets"] = "<i8"
+            dtypes.update({f"{name}_{item}": kind_[1] for item, kind_ in kind})
+        else:
+            dtypes[name] = kind[1]
+    try:
+        arrays = {
+            name: column if dtypes[name] is None else numpy.array(column, dtypes[name])
+            for name, column in columns.items()
+        }
+    except OverflowError as e:
+        raise ValueError(f"Value out of range: {e}") from e
+    return arrays, length
+
+
+@functools.lru_cache(maxsize=2**16)
+def _ss58(public_key: bytes) -> str:
+    return ss58_encode(public_key, bittensor.__ss58_format__)
+
+
+class ChainDataColumns(Sequence):
+    """
+    Decoded columns of a vector of chain data, and a lazy sequence of its items.
+
+    Args:
+        columns (Dict[str, Any]): The columns, as returned by :func:`decode_columns`.
+        length (int): The number of items.
+    """
+
+    # The fields of the decoded struct, in their encoded order. They follow the struct's layout in
+    # :data:`bittensor.chain_data.custom_rpc_type_registry`, nested structs flattened with the prefix of their name.
+    FIELDS: List[Field] = []
+    # Whether the vector holds ``Option`` structs.
+    OPTION = False
+
+    def __init__(self, columns: Dict[str, Any], length: int):
+        self.columns = columns
+        self._length = length
+        self._items: List[Any] = [None] * length
+        self._values: Optional[Dict[str, List[Any]]] = None
+
+    @classmethod
+    def from_vec_u8(cls, vec_u8: Union[List[int], bytes]):
+        r"""Decodes the columns from a ``vec_u8``."""
+        return cls(*decode_columns(vec_u8, cls.FIELDS, cls.OPTION))
+
+    def __len__(self) -> int:
+        return self._length
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(self._length))]
+        if index < 0:
+            index += self._length
+        if not 0 <= index < self._length:
+            raise IndexError(f"Index {index} out of range for {self._length} items.")
+        item = self._items[index]
+        if item is None:
+            if self._values is None:
+                # Python values, so that items hold ints and bools rather than numpy scalars.
+                self._values = {
+                    name: column.tolist()
+                    if isinstance(column, numpy.ndarray)
+                    else column
+                    for name, column in self.columns.items()
+                }
+            item = self._items[index] = self._item(self._values, index)
+        return item
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}(length={self._length})"
+
+    @staticmethod
+    def _nested(values: Dict[str, List[Any]], name: str, index: int) -> slice:
+        offsets = values[f"{name}_offsets"]
+        return slice(offsets[index], offsets[index + 1])
+
+    @abstractmethod
+    def _item(self, values: Dict[str, List[Any]], index: int) -> Any:
+        """Builds the item at ``index`` from the columns as Python ``values``."""
+
+
+class NeuronInfoLiteColumns(ChainDataColumns):
+    r"""Columns of a ``Vec<NeuronInfoLite>``, a lazy sequence of :class:`bittensor.NeuronInfoLite`."""
+
+    FIELDS = [
+        ("hotkey", ACCOUNT_ID),
+        ("coldkey", ACCOUNT_ID),
+        ("uid", COMPACT),
+        ("netuid", COMPACT),
+        ("active", BOOL),
+        ("axon_block", U64),
+        ("axon_version", U32),
+        ("axon_ip", U128),
+        ("axon_port", U16),
+        ("axon_ip_type", U8),
+        ("axon_protocol", U8),
+        ("axon_placeholder1", U8),
+        ("axon_placeholder2", U8),
+        ("prometheus_block", U64),
+        ("prometheus_version", U32),
+        ("prometheus_ip", U128),
+        ("prometheus_port", U16),
+        ("prometheus_ip_type", U8),
+        ("stake", [("coldkey", ACCOUNT_ID), ("amount", COMPACT)]),
+        ("rank", COMPACT),
+        ("emission", COMPACT),
+        ("incentive", COMPACT),
+        ("consensus", COMPACT),
+        ("trust", COMPACT),
+        ("validator_trust", COMPACT),
+        ("dividends", COMPACT),
+        ("last_update", COMPACT),
+        ("validator_permit", BOOL),
+        ("pruning_score", COMPACT),
+    ]
+
+    def _item(self, values: Dict[str, List[Any]], index: int) -> NeuronInfoLite:
+        hotkey = _ss58(values["hotkey"][index])
+        coldkey = _ss58(values["coldkey"][index])
+        stakes = self._nested(values, "stake", index)
+        stake_dict = {
+            _ss58(stake_coldkey): Balance.from_rao(amount)
+            for stake_coldkey, amount in zip(
+                values["stake_coldkey"][stakes], values["stake_amount"][stakes]
+            )
+        }
+        stake = sum(stake_dict.values())
+        return NeuronInfoLite(
+            hotkey=hotkey,
+            coldkey=coldkey,
+            uid=values["uid"][index],
+            netuid=values["netuid"][index],
+            active=values["active"][index],
+            stake=stake,
+            stake_dict=stake_dict,
+            total_stake=stake,
+            rank=U16_NORMALIZED_FLOAT(values["rank"][index]),
+            emission=values["emission"][index] / RAOPERTAO,
+            incentive=U16_NORMALIZED_FLOAT(values["incentive"][index]),
+            consensus=U16_NORMALIZED_FLOAT(values["consensus"][index]),
+            trust=U16_NORMALIZED_FLOAT(values["trust"][index]),
+            validator_trust=U16_NORMALIZED_FLOAT(values["validator_trust"][index]),
+            dividends=U16_NORMALIZED_FLOAT(values["dividends"][index]),
+            last_update=values["last_update"][index],
+            validator_permit=values["validator_permit"][index],
+            prometheus_info=PrometheusInfo(
+                block=values["prometheus_block"][index],
+                version=values["prometheus_version"][index],
+                ip=net.int_to_ip(values["prometheus_ip"][index]),
+                port=values["prometheus_port"][index],
+                ip_type=values["prometheus_ip_type"][index],
+            ),
+            axon_info=AxonInfo(
+                version=values["axon_version"][index],
+                ip=net.int_to_ip(values["axon_ip"][index]),
+                port=values["axon_port"][index],
+                ip_type=values["axon_ip_type"][index],
+                hotkey=hotkey,
+                coldkey=coldkey,
+            ),
+            pruning_score=values["pruning_score"][index],
+        )
+
+
+class StakeInfoColumns(ChainDataColumns):
+    r"""Columns of a ``Vec<StakeInfo>``, a lazy sequence of :class:`bittensor.StakeInfo`."""
+
+    FIELDS = [
+        ("hotkey", ACCOUNT_ID),
+        ("coldkey", ACCOUNT_ID),
+        ("stake", COMPACT),
+    ]
+
+    def _item(self, values: Dict[str, List[Any]], index: int) -> StakeInfo:
+        return StakeInfo(
+            hotkey_ss58=_ss58(values["hotkey"][index]),
+            coldkey_ss58=_ss58(values["coldkey"][index]),
+            stake=Balance.from_rao(values["stake"][index]),
+        )
+
+
+class DelegateInfoColumns(ChainDataColumns):
+    r"""Columns of a ``Vec<DelegateInfo>``, a lazy sequence of :class:`bittensor.DelegateInfo`."""
+
+    FIELDS = [
+        ("delegate_ss58", ACCOUNT_ID),
+        ("take", COMPACT),
+        ("nominators", [("account", ACCOUNT_ID), ("stake", COMPACT)]),
+        ("owner_ss58", ACCOUNT_ID),
+        ("registrations", [("netuid", COMPACT)]),
+        ("validator_permits", [("netuid", COMPACT)]),
+        ("return_per_1000", COMPACT),
+        ("total_daily_return", COMPACT),
+    ]
+
+    def _item(self, values: Dict[str, List[Any]], index: int) -> DelegateInfo:
+        nominators = self._nested(values, "nominators", index)
+        nominator_stakes = values["nominators_stake"][nominators]
+        return DelegateInfo(
+            hotkey_ss58=_ss58(values["delegate_ss58"][index]),
+            owner_ss58=_ss58(values["owner_ss58"][index]),
+            take=U16_NORMALIZED_FLOAT(values["take"][index]),
+            nominators=[
+                (_ss58(account), Balance.from_rao(stake))
+                for account, stake in zip(
+                    values["nominators_account"][nominators], nominator_stakes
+                )
+            ],
+            total_stake=Balance.from_rao(sum(nominator_stakes)),
+            validator_permits=values["validator_permits_netuid"][
+                self._nested(values, "validator_permits", index)
+            ],
+            registrations=values["registrations_netuid"][
+                self._nested(values, "registrations", index)
+            ],
+            return_per_1000=Balance.from_rao(values["return_per_1000"][index]),
+            total_daily_return=Balance.from_rao(values["total_daily_return"][index]),
+        )
+
+
+class SubnetInfoColumns(ChainDataColumns):
+    r"""
+    Columns of a ``Vec<Option<SubnetInfo>>``, a lazy sequence of :class:`bittensor.SubnetInfo`. ``None`` elements
+    are skipped.
+    """
+
+    FIELDS = [
+        ("netuid", COMPACT),
+        ("rho", COMPACT),
+        ("kappa", COMPACT),
+        ("difficulty", COMPACT),
+        ("immunity_period", COMPACT),
+        ("max_allowed_validators", COMPACT),
+        ("min_allowed_weights", COMPACT),
+        ("max_weights_limit", COMPACT),
+        ("scaling_law_power", COMPACT),
+        ("subnetwork_n", COMPACT),
+        ("max_allowed_uids", COMPACT),
+        ("blocks_since_last_step", COMPACT),
+        ("tempo", COMPACT),
+        ("network_modality", COMPACT),
+        ("network_connect", [("netuid", U16), ("requirement", U16)]),
+        ("emission_values", COMPACT),
+        ("burn", COMPACT),
+        ("owner", ACCOUNT_ID),
+    ]
+    OPTION = True
+
+    def _item(self, values: Dict[str, List[Any]], index: int) -> SubnetInfo:
+        connections = self._nested(values, "network_connect", index)
+        return SubnetInfo(
+            netuid=values["netuid"][index],
+            rho=values["rho"][index],
+            kappa=values["kappa"][index],
+            difficulty=values["difficulty"][index],
+            immunity_period=values["immunity_period"][index],
+            max_allowed_validators=values["max_allowed_validators"][index],
+            min_allowed_weights=values["min_allowed_weights"][index],
+            max_weight_limit=values["max_weights_limit"][index],
+            scaling_law_power=values["scaling_law_power"][index],
+            subnetwork_n=values["subnetwork_n"][index],
+            max_n=values["max_allowed_uids"][index],
+            blocks_since_epoch=values["blocks_since_last_step"][index],
+            tempo=values["tempo"][index],
+            modality=values["network_modality"][index],
+            connection_requirements={
+                str(netuid): U16_NORMALIZED_FLOAT(requirement)
+                for netuid, requirement in zip(
+                    values["network_connect_netuid"][connections],
+                    values["network_connect_requirement"][connections],
+                )
+            },
+            emission_value=values["emission_values"][index],
+            burn=Balance.from_rao(values["burn"][index]),
+            owner_ss58=_ss58(values["owner"][index]),
+        )
@@ -14,15 +14,17 @@
 # THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION
 # OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER
 # DEALINGS IN THE SOFTWARE.
+import numpy
 import torch
 import bittensor
 
 import json
+import threading
 from enum import Enum
 from dataclasses import dataclass, asdict
 from scalecodec.types import GenericCall
 from typing import List, Tuple, Dict, Optional, Any, TypedDict, Union
-from scalecodec.base import RuntimeConfiguration, ScaleBytes
+from scalecodec.base import RuntimeConfigurationObject, ScaleBytes
 from scalecodec.type_registry import load_type_registry_preset
 from scalecodec.utils.ss58 import ss58_encode
 
@@ -312,6 +314,56 @@ def from_scale_encoding(
     return from_scale_encoding_using_type_string(input, type_string)
 
 
+class RpcRuntimeConfiguration(RuntimeConfigurationObject):
+    r"""
+    Runtime configuration decoding the results of the runtime API, with the ``legacy`` preset and
+    :data:`custom_rpc_type_registry` loaded. The decoder class of every type string, such as
+    ``Vec<NeuronInfoLite>`` and the types nested in it, is looked up once and then reused.
+
+    The registry is not changed once built, and every decoded object is bound to this configuration rather than to
+    whichever configuration last looked up its class, so several threads can decode at once. Use the process-wide
+    instance returned by :func:`get_rpc_runtime_config`.
+    """
+
+    def __init__(self):
+        self._decoder_classes: Dict[str, Any] = {}
+        super().__init__()
+        self.update_type_registry(load_type_registry_preset("legacy"))
+        self.update_type_registry(custom_rpc_type_registry)
+        # Classes looked up while the registry was loaded may since have been replaced.
+        self._decoder_classes.clear()
+
+    def get_decoder_class(self, type_string: Union[str, dict]):
+        if not isinstance(type_string, str):
+            return super().get_decoder_class(type_string)
+        decoder_class = self._decoder_classes.get(type_string)
+        if decoder_class is None:
+            # Threads racing on a new type string each build an equivalent class, the last one is kept.
+            decoder_class = super().get_decoder_class(type_string)
+            self._decoder_classes[type_string] = decoder_class
+        return decoder_class
+
+    def create_scale_object(
+        self, type_string: str, data: Optional[ScaleBytes] = None, **kwargs
+    ):
+        kwargs.setdefault("runtime_config", self)
+        return super().create_scale_object(type_string, data=data, **kwargs)
+
+
+_rpc_runtime_config: Optional[RpcRuntimeConfiguration] = None
+_rpc_runtime_config_lock = threading.Lock()
+
+
+def get_rpc_runtime_config() -> RpcRuntimeConfiguration:
+    r"""Returns the process-wide :class:`RpcRuntimeConfiguration`, built on first use."""
+    global _rpc_runtime_config
+    if _rpc_runtime_config is None:
+        with _rpc_runtime_config_lock:
+            if _rpc_runtime_config is None:
+                _rpc_runtime_config = RpcRuntimeConfiguration()
+    return _rpc_runtime_config
+
+
 def from_scale_encoding_using_type_string(
     input: Union[List[int], bytes, ScaleBytes], type_string: str
 ) -> Optional[Dict]:
@@ -328,15 +380,43 @@ def from_scale_encoding_using_type_string(
 
         as_scale_bytes = ScaleBytes(as_bytes)
 
-    rpc_runtime_config = RuntimeConfiguration()
-    rpc_runtime_config.update_type_registry(load_type_registry_preset("legacy"))
-    rpc_runtime_config.update_type_registry(custom_rpc_type_registry)
-
-    obj = rpc_runtime_config.create_scale_object(type_string, data=as_scale_bytes)
+    obj = get_rpc_runtime_config().create_scale_object(type_string, data=as_scale_bytes)
 
     return obj.decode()
 
 
+def decode_compact(data: bytes, offset: int = 0) -> Tuple[int, int]:
+    r"""Decodes a SCALE ``Compact`` integer at ``offset``, returning its value and encoded size."""
+    mode = data[offset] & 0b11
+    if mode == 0:
+        return data[offset] >> 2, 1
+    if mode == 1:
+        return int.from_bytes(data[offset : offset + 2], "little") >> 2, 2
+    if mode == 2:
+        return int.from_bytes(data[offset : offset + 4], "little") >> 2, 4
+    size = (data[offset] >> 2) + 4
+    return int.from_bytes(data[offset + 1 : offset + 1 + size], "little"), 1 + size
+
+
+def decode_vector(value: Union[None, str, bytes], dtype: str) -> numpy.ndarray:
+    r"""
+    Decodes a SCALE encoded ``Vec`` of fixed size integers or booleans, such as a ``Vec<u16>`` storage value.
+
+    Args:
+        value (Union[None, str, bytes]): The encoded vector, as bytes or a hex string. ``None`` decodes to an empty vector.
+        dtype (str): The numpy dtype of the elements, such as ``"<u2"`` for ``u16`` or ``"?"`` for ``bool``.
+
+    Returns:
+        numpy.ndarray: The decoded elements.
+    """
+    if value is None:
+        return numpy.empty(0, dtype=dtype)
+    if isinstance(value, str):
+        value = bytes.fromhex(value[2:] if value.startswith("0x") else value)
+    length, offset = decode_compact(value)
+    return numpy.frombuffer(value, dtype=dtype, count=length, offset=offset)
+
+
 # Dataclasses for chain data.
 @dataclass
 class NeuronInfo:
@@ -1113,6 +1193,21 @@ class IPInfo:
         return cls(**dict(parameter_dict))
 
 
+@dataclass
+class NeuronStorageChanges:
+    r"""
+    Dataclass for the changes to the neurons of a subnet between two blocks.
+
+    ``vectors`` holds the new raw values of the per neuron storage vectors, such as ``Rank`` or ``LastUpdate``,
+    for the uids whose value changed. ``uids`` lists the neurons whose own storage changed, their hotkey, stake,
+    axon or prometheus info, and their weights and bonds unless the changes were queried for a lite sync.
+    """
+
+    block: int
+    vectors: Dict[str, Dict[int, Any]]
+    uids: List[int]
+
+
 # Senate / Proposal data
 
 
@@ -0,0 +1,219 @@
+# The MIT License (MIT)
+# Copyright © 2023 Opentensor Foundation
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy of this software and associated
+# documentation files (the “Software”), to deal in the Software without restriction, including without limitation
+# the rights to use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies of the Software,
+# and to permit persons to whom the Software is furnished to do so, subject to the following conditions:
+
+# The above copyright notice and this permission notice shall be included in all copies or substantial portions of
+# the Software.
+
+# THE SOFTWARE IS PROVIDED “AS IS”, WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO
+# THE WARRANTIES OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL
+# THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION
+# OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER
+# DEALINGS IN THE SOFTWARE.
+
+"""
+JSON codecs for synapse bodies.
+
+Synapse bodies are encoded and decoded with the fastest available codec: `orjson <https://pypi.org/project/orjson/>`_,
+then `msgspec <https://pypi.org/project/msgspec/>`_, falling back to the standard library's :mod:`json`. The codec
+is chosen once per process and can be overridden with the ``BT_JSON_CODEC`` environment variable or
+:func:`set_codec`.
+
+All codecs produce plain JSON and read each other's output, decoding to the same values so that body hashes
+match between peers using different codecs. Values the fast codecs cannot handle, such as integers beyond 64 bits,
+fall back to the standard library. This includes non finite floats, which the fast codecs would encode as ``null``:
+objects holding them are encoded by :mod:`json` as the ``NaN`` and ``Infinity`` literals. The object is only
+searched for them when the output of a fast codec contains ``null``.
+"""
+
+import os
+import json
+import math
+import numpy
+
+from typing import Any, Callable, Dict, Optional, Union
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import msgspec
+except ImportError:
+    msgspec = None
+
+Data = Union[bytes, bytearray, memoryview, str]
+Default = Optional[Callable[[Any], Any]]
+
+
+def is_finite(obj: Any) -> bool:
+    """Returns ``False`` if ``obj`` holds a ``NaN`` or infinite float, in nested dicts, lists or numpy arrays."""
+    if isinstance(obj, (float, numpy.floating)):
+        return math.isfinite(obj)
+    if isinstance(obj, dict):
+        return all(is_finite(value) for value in obj.values())
+    if isinstance(obj, (list, tuple)):
+        try:
+            # Summing lists of numbers is much faster than checking each one, and the sum is finite unless a
+            # number is not or the sum overflows.
+            if math.isfinite(sum(obj)):
+                return True
+        except (TypeError, OverflowError):
+            pass
+        return all(is_finite(value) for value in obj)
+    if isinstance(obj, numpy.ndarray) and obj.dtype.kind in "fc":
+        return bool(numpy.isfinite(obj).all())
+    return True
+
+
+class JSONCodec:
+    r"""The standard library codec, and the interface of the other codecs."""
+
+    name = "json"
+
+    def dumps(self, obj: Any, default: Default = None) -> bytes:
+        """
+        Encodes ``obj`` into JSON.
+
+        Args:
+            obj (Any): The object to encode.
+            default (Callable, optional): Called on objects the codec cannot encode, returning an encodable object.
+
+        Returns:
+            bytes: The UTF-8 encoded JSON.
+        """
+
+        def _default(value: Any) -> Any:
+            # The fast codecs encode numpy values natively, and fall back here for non finite ones.
+            if isinstance(value, (numpy.ndarray, numpy.generic)):
+                return value.tolist()
+            if default is None:
+                raise TypeError(
+                    f"Object of type {type(value).__name__} is not JSON serializable"
+                )
+            return default(value)
+
+        return json.dumps(obj, default=_default).encode("utf-8")
+
+    def _checked(self, data: bytes, obj: Any, default: Default) -> bytes:
+        """
+        Returns the output ``data`` of a fast codec, or ``obj`` encoded by :mod:`json` if it holds non finite floats.
+        The fast codecs encode those as ``null``, so ``obj`` is only walked when ``data`` contains one.
+        """
+        if b"null" in data and not is_finite(obj):
+            return JSONCodec.dumps(self, obj, default)
+        return data
+
+    def loads(self, data: Data) -> Any:
+        """Decodes the JSON ``data``."""
+        if isinstance(data, memoryview):
+            data = data.tobytes()
+        return json.loads(data)
+
+
+class OrjsonCodec(JSONCodec):
+    r"""Codec backed by ``orjson``."""
+
+    name = "orjson"
+
+    def dumps(self, obj: Any, default: Default = None) -> bytes:
+        try:
+            data = orjson.dumps(
+                obj,
+                default=default,
+                option=orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY,
+            )
+        except TypeError:
+            return super().dumps(obj, default)
+        return self._checked(data, obj, default)
+
+    def loads(self, data: Data) -> Any:
+        try:
+            return orjson.loads(data)
+        except orjson.JSONDecodeError:
+            return super().loads(data)
+
+
+class MsgspecCodec(JSONCodec):
+    r"""Codec backed by ``msgspec``."""
+
+    name = "msgspec"
+
+    def __init__(self):
+        self._encoder = msgspec.json.Encoder()
+        self._decoder = msgspec.json.Decoder()
+
+    def dumps(self, obj: Any, default: Default = None) -> bytes:
+        try:
+            if default is None:
+                data = self._encoder.encode(obj)
+            else:
+                data = msgspec.json.encode(obj, enc_hook=default)
+        except (TypeError, OverflowError, msgspec.EncodeError):
+            return super().dumps(obj, default)
+        return self._checked(data, obj, default)
+
+    def loads(self, data: Data) -> Any:
+        try:
+            return self._decoder.decode(data)
+        except msgspec.DecodeError:
+            return super().loads(data)
+
+
+def available_codecs() -> Dict[str, type]:
+    """Returns the available codec classes by name, fastest first."""
+    codecs: Dict[str, type] = {}
+    if orjson is not None:
+        codecs[OrjsonCodec.name] = OrjsonCodec
+    if msgspec is not None:
+        codecs[MsgspecCodec.name] = MsgspecCodec
+    codecs[JSONCodec.name] = JSONCodec
+    return codecs
+
+
+def set_codec(name: Optional[str] = None) -> JSONCodec:
+    """
+    Sets the codec used for synapse bodies.
+
+    Args:
+        name (str, optional): One of :func:`available_codecs`. Defaults to the fastest available codec.
+
+    Returns:
+        JSONCodec: The codec now in use.
+
+    Raises:
+        ValueError: If the codec is not available.
+    """
+    global _codec
+    codecs = available_codecs()
+    if name is None:
+        name = next(iter(codecs))
+    if name not in codecs:
+        raise ValueError(
+            f"JSON codec {name} is not available, choose one of {list(codecs)}."
+        )
+    _codec = codecs[name]()
+    return _codec
+
+
+def get_codec() -> JSONCodec:
+    """Returns the codec used for synapse bodies."""
+    return _codec
+
+
+def dumps(obj: Any, default: Default = None) -> bytes:
+    """Encodes ``obj`` into JSON with the current codec, see :func:`JSONCodec.dumps`."""
+    return _codec.dumps(obj, default)
+
+
+def loads(data: Data) -> Any:
+    """Decodes the JSON ``data`` with the current codec."""
+    return _codec.loads(data)
+
+
+_codec: JSONCodec = set_codec(os.getenv("BT_JSON_CODEC") or None)
@@ -0,0 +1,229 @@
+# The MIT License (MIT)
+# Copyright © 2023 Opentensor Foundation
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy of this software and associated
+# documentation files (the “Software”), to deal in the Software without restriction, including without limitation
+# the rights to use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies of the Software,
+# and to permit persons to whom the Software is furnished to do so, subject to the following conditions:
+
+# The above copyright notice and this permission notice shall be included in all copies or substantial portions of
+# the Software.
+
+# THE SOFTWARE IS PROVIDED “AS IS”, WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO
+# THE WARRANTIES OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL
+# THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION
+# OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER
+# DEALINGS IN THE SOFTWARE.
+
+"""
+Content-Encoding negotiation for synapse bodies.
+
+Both the axon and the dendrite can always decode every available encoding, and say so in their
+``Accept-Encoding`` headers, the axon on its responses and the dendrite on its requests. Whether a side
+compresses the bodies it sends is configured separately (``axon.compression`` and ``dendrite.compression``),
+and only bodies of at least the configured threshold are compressed.
+
+``zstd`` requires the optional `zstandard <https://pypi.org/project/zstandard/>`_ package, ``gzip`` is always
+available.
+"""
+
+import time
+import zlib
+
+from typing import AsyncIterable, Iterable, List, Optional, Tuple, Union
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+GZIP = "gzip"
+ZSTD = "zstd"
+IDENTITY = "identity"
+
+# Decompressed bodies larger than this are rejected by default, guarding against compression bombs.
+MAX_DECOMPRESSED_SIZE = 64 * 2**20
+
+# The size of the pieces zstd bodies are decompressed in.
+_ZSTD_WRITE_SIZE = 2**17
+
+
+class CompressionError(ValueError):
+    r"""Raised when a body cannot be decompressed, or is encoded with an unsupported encoding."""
+
+    pass
+
+
+def available_encodings() -> List[str]:
+    """Returns the supported encodings, most preferred first."""
+    return [ZSTD, GZIP] if zstandard is not None else [GZIP]
+
+
+def parse_encodings(value: Union[None, str, Iterable[str]]) -> List[str]:
+    """
+    Parses a comma separated list of encodings, such as a config value or an ``Accept-Encoding`` header,
+    keeping the available ones in order. ``none`` or an empty value gives an empty list.
+    """
+    if value is None:
+        return []
+    if isinstance(value, str):
+        value = value.split(",")
+    available = available_encodings()
+    encodings = []
+    for item in value:
+        # Drop quality values, which are not used for ranking.
+        encoding = item.split(";")[0].strip().lower()
+        if encoding in available and encoding not in encodings:
+            encodings.append(encoding)
+    return encodings
+
+
+def is_valid_setting(value: str) -> bool:
+    """Returns whether ``value`` is a valid ``compression`` config value, a comma separated list of encodings or ``none``."""
+    return all(
+        item.strip().lower() in (ZSTD, GZIP, "none") for item in value.split(",")
+    )
+
+
+def negotiate(
+    preferred: List[str], accepted: Union[None, str, List[str]]
+) -> Optional[str]:
+    """Returns the first of the ``preferred`` encodings the peer ``accepted``, or ``None``."""
+    accepted = parse_encodings(accepted)
+    for encoding in preferred:
+        if encoding in accepted:
+            return encoding
+    return None
+
+
+def compress(data: bytes, encoding: str) -> bytes:
+    """
+    Compresses ``data`` with ``encoding``.
+
+    Raises:
+        CompressionError: If the encoding is not available.
+    """
+    if encoding == GZIP:
+        compressor = zlib.compressobj(6, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+        return compressor.compress(data) + compressor.flush()
+    if encoding == ZSTD and zstandard is not None:
+        return zstandard.ZstdCompressor(level=3).compress(data)
+    raise CompressionError(f"Unsupported content encoding {encoding}.")
+
+
+def compress_body(
+    data: bytes,
+    encodings: List[str],
+    accepted: Union[None, str, List[str]],
+    threshold: int,
+) -> Tuple[bytes, Optional[str], Optional[float], Optional[float]]:
+    """
+    Compresses ``data`` with the first of ``encodings`` accepted by the peer, if it is at least ``threshold`` bytes.
+
+    Returns:
+        Tuple[bytes, Optional[str], Optional[float], Optional[float]]: The body, its encoding, the compression ratio
+        (uncompressed over compressed size) and the compression time in seconds. The last three are ``None`` if the
+        body was not compressed.
+    """
+    encoding = negotiate(encodings, accepted) if len(data) >= threshold else None
+    if encoding is None:
+        return data, None, None, None
+    start = time.perf_counter()
+    compressed = compress(data, encoding)
+    return (
+        compressed,
+        encoding,
+        len(data) / max(len(compressed), 1),
+        time.perf_counter() - start,
+    )
+
+
+class _Decompressor:
+    """
+    Decompresses a body chunk by chunk into a single buffer, never producing more than ``max_size`` bytes,
+    so a small compressed body can not allocate more than the limit before being rejected.
+    """
+
+    def __init__(self, encoding: str, max_size: int):
+        if encoding == GZIP:
+            self._decompressor = zlib.decompressobj(16 + zlib.MAX_WBITS)
+        elif encoding == ZSTD and zstandard is not None:
+            # zstd decompression objects can not bound the output of a single call, a stream writer instead
+            # hands it to ``write`` piece by piece, which rejects the body as soon as it is too large.
+            self._decompressor = zstandard.ZstdDecompressor().stream_writer(
+                self, write_size=_ZSTD_WRITE_SIZE
+            )
+        else:
+            raise CompressionError(f"Unsupported content encoding {encoding}.")
+        self.encoding = encoding
+        self.max_size = max_size
+        self.buffer = bytearray()
+
+    def _remaining(self) -> int:
+        return self.max_size - len(self.buffer)
+
+    def _append(self, data: bytes):
+        if len(data) > self._remaining():
+            raise CompressionError(f"Decompressed body exceeds {self.max_size} bytes.")
+        self.buffer += data
+
+    def write(self, data: bytes) -> int:
+        """Receives the output of the zstd stream writer."""
+        self._append(data)
+        return len(data)
+
+    def feed(self, chunk: bytes):
+        try:
+            if self.encoding == ZSTD:
+                self._decompressor.write(chunk)
+            else:
+                # Asking for one byte more than allowed tells a body at the limit from a larger one.
+                self._append(
+                    self._decompressor.decompress(chunk, self._remaining() + 1)
+                )
+        except CompressionError:
+            raise
+        except Exception as e:
+            raise CompressionError(f"Could not decompress body: {e}") from e
+
+    def result(self) -> bytearray:
+        if self.encoding == GZIP:
+            try:
+                self._append(self._decompressor.flush())
+            except zlib.error as e:
+                raise CompressionError(f"Could not decompress body: {e}") from e
+        return self.buffer
+
+
+def decompress(
+    data: bytes, encoding: str, max_size: int = MAX_DECOMPRESSED_SIZE
+) -> bytearray:
+    """
+    Decompresses ``data`` encoded with ``encoding``. The result is returned in the buffer it was decompressed
+    into, without a further copy.
+
+    Raises:
+        CompressionError: If the encoding is not available, the data is corrupt or larger than ``max_size`` once decompressed.
+    """
+    decompressor = _Decompressor(encoding, max_size)
+    decompressor.feed(data)
+    return decompressor.result()
+
+
+async def decompress_stream(
+    chunks: AsyncIterable[bytes],
+    encoding: str,
+    max_size: int = MAX_DECOMPRESSED_SIZE,
+) -> bytearray:
+    """
+    Decompresses a body encoded with ``encoding`` as its chunks arrive, such as ``starlette.Request.stream()``.
+    The result is returned in the buffer it was decompressed into, without a further copy.
+
+    Raises:
+        CompressionError: If the encoding is not available, the data is corrupt or larger than ``max_size`` once decompressed.
+    """
+    decompressor = _Decompressor(encoding, max_size)
+    async for chunk in chunks:
+        if chunk:
+            decompressor.feed(chunk)
+    return decompressor.result()
@@ -19,13 +19,184 @@
 
 from __future__ import annotations
 
+import os
+import copy
+import json
 import asyncio
 import uuid
 import time
 import torch
 import aiohttp
+import argparse
 import bittensor
-from typing import Union, Optional, List, Union, AsyncGenerator, Any
+from bittensor import codec, compression, frame
+from collections import OrderedDict, deque
+from types import SimpleNamespace
+from typing import (
+    Union,
+    Optional,
+    List,
+    Union,
+    AsyncGenerator,
+    Any,
+    Deque,
+    Dict,
+    NamedTuple,
+    Tuple,
+)
+
+# The number of axons whose accepted frames and encodings a dendrite remembers.
+AXON_FEATURES_SIZE = 4096
+
+
+class SynapseRecord(NamedTuple):
+    """
+    Compact record of a single dendrite call, kept in :attr:`dendrite.synapse_history`.
+
+    Attributes:
+        timestamp (float): Unix time at which the response (or error) was received.
+        name (str): Name of the synapse class.
+        axon_hotkey (Optional[str]): Hotkey of the queried axon.
+        axon_ip (Optional[str]): IP of the queried axon.
+        axon_port (Optional[int]): Port of the queried axon.
+        status_code (Optional[int]): Status code of the call, as set on ``synapse.dendrite``.
+        status_message (Optional[str]): Status message of the call.
+        process_time (Optional[float]): Round trip time of the call in seconds, ``None`` if it failed.
+        request_size (Optional[int]): Size of the synapse in bytes, as reported in its ``total_size`` header.
+        response_size (Optional[int]): Size of the response body in bytes, if announced by the axon.
+    """
+
+    timestamp: float
+    name: str
+    axon_hotkey: Optional[str]
+    axon_ip: Optional[str]
+    axon_port: Optional[int]
+    status_code: Optional[int]
+    status_message: Optional[str]
+    process_time: Optional[float]
+    request_size: Optional[int]
+    response_size: Optional[int]
+
+    @classmethod
+    def from_synapse(
+        cls, synapse: "bittensor.Synapse", response_size: Optional[int] = None
+    ) -> "SynapseRecord":
+        process_time = synapse.dendrite.process_time  # type: ignore
+        return cls(
+            timestamp=time.time(),
+            name=synapse.__class__.__name__,
+            axon_hotkey=synapse.axon.hotkey,  # type: ignore
+            axon_ip=synapse.axon.ip,  # type: ignore
+            axon_port=synapse.axon.port,  # type: ignore
+            status_code=synapse.dendrite.status_code,  # type: ignore
+            status_message=synapse.dendrite.status_message,  # type: ignore
+            process_time=float(process_time) if process_time is not None else None,
+            request_size=synapse.total_size,
+            response_size=response_size,
+        )
+
+
+class DendritePoolStats:
+    """
+    Counters of the dendrite's connection pool, collected through `aiohttp client tracing <https://docs.aiohttp.org/en/stable/tracing_reference.html>`_.
+
+    Tracks how many requests reused a pooled keep-alive connection rather than opening (and handshaking) a new one,
+    and how long requests waited for a free connection once the pool limits were reached.
+    """
+
+    def __init__(self):
+        self.requests = 0
+        self.reused = 0
+        self.handshakes = 0
+        self.handshake_time = 0.0
+        self.queued = 0
+        self.queue_time = 0.0
+
+    def trace_config(self) -> aiohttp.TraceConfig:
+        """Returns a trace config recording into these stats, to be passed to the client session."""
+        trace_config = aiohttp.TraceConfig()
+        trace_config.on_request_start.append(self._on_request_start)  # type: ignore [arg-type]
+        trace_config.on_connection_reuseconn.append(self._on_connection_reuseconn)  # type: ignore [arg-type]
+        trace_config.on_connection_create_start.append(self._on_create_start)  # type: ignore [arg-type]
+        trace_config.on_connection_create_end.append(self._on_create_end)  # type: ignore [arg-type]
+        trace_config.on_connection_queued_start.append(self._on_queued_start)  # type: ignore [arg-type]
+        trace_config.on_connection_queued_end.append(self._on_queued_end)  # type: ignore [arg-type]
+        return trace_config
+
+    async def _on_request_start(
+        self,
+        session: aiohttp.ClientSession,
+        context: SimpleNamespace,
+        params: aiohttp.TraceRequestStartParams,
+    ):
+        self.requests += 1
+
+    async def _on_connection_reuseconn(
+        self,
+        session: aiohttp.ClientSession,
+        context: SimpleNamespace,
+        params: aiohttp.TraceConnectionReuseconnParams,
+    ):
+        self.reused += 1
+
+    async def _on_create_start(
+        self,
+        session: aiohttp.ClientSession,
+        context: SimpleNamespace,
+        params: aiohttp.TraceConnectionCreateStartParams,
+    ):
+        context.create_start = time.perf_counter()
+
+    async def _on_create_end(
+        self,
+        session: aiohttp.ClientSession,
+        context: SimpleNamespace,
+        params: aiohttp.TraceConnectionCreateEndParams,
+    ):
+        self.handshakes += 1
+        self.handshake_time += time.perf_counter() - context.create_start
+
+    async def _on_queued_start(
+        self,
+        session: aiohttp.ClientSession,
+        context: SimpleNamespace,
+        params: aiohttp.TraceConnectionQueuedStartParams,
+    ):
+        context.queued_start = time.perf_counter()
+
+    async def _on_queued_end(
+        self,
+        session: aiohttp.ClientSession,
+        context: SimpleNamespace,
+        params: aiohttp.TraceConnectionQueuedEndParams,
+    ):
+        self.queued += 1
+        self.queue_time += time.perf_counter() - context.queued_start
+
+    def to_dict(
+        self, connector: Optional[aiohttp.BaseConnector] = None
+    ) -> Dict[str, float]:
+        """
+        Returns the counters along with the derived rates, and the current pool occupancy of ``connector`` if passed.
+        """
+        connections = self.reused + self.handshakes
+        stats: Dict[str, float] = {
+            "requests": self.requests,
+            "reused": self.reused,
+            "handshakes": self.handshakes,
+            "reuse_rate": self.reused / connections if connections else 0.0,
+            "avg_handshake_time": (
+                self.handshake_time / self.handshakes if self.handshakes else 0.0
+            ),
+            "queued": self.queued,
+            "avg_queue_time": self.queue_time / self.queued if self.queued else 0.0,
+        }
+        if connector is not None and not connector.closed:
+            stats["limit"] = connector.limit
+            stats["limit_per_host"] = connector.limit_per_host
+            stats["in_use"] = len(connector._acquired)
+            stats["idle"] = sum(len(conns) for conns in connector._conns.values())
+        return stats
 
 
 class dendrite(torch.nn.Module):
@@ -43,7 +214,7 @@ class dendrite(torch.nn.Module):
     Args:
         keypair: The wallet or keypair used for signing messages.
         external_ip (str): The external IP address of the local system.
-        synapse_history (list): A list of Synapse objects representing the historical responses.
+        synapse_history (collections.deque): The :class:`SynapseRecord` of the latest ``config.dendrite.history_size`` calls, empty unless enabled.
 
     Methods:
         __str__(): Returns a string representation of the Dendrite object.
@@ -95,7 +266,9 @@ class dendrite(torch.nn.Module):
     """
 
     def __init__(
-        self, wallet: Optional[Union[bittensor.wallet, bittensor.Keypair]] = None
+        self,
+        wallet: Optional[Union[bittensor.wallet, bittensor.Keypair]] = None,
+        config: Optional[bittensor.config] = None,
     ):
         """
         Initializes the Dendrite object, setting up essential properties.
@@ -103,10 +276,41 @@ class dendrite(torch.nn.Module):
         Args:
             wallet (Optional[Union['bittensor.wallet', 'bittensor.keypair']], optional):
                 The user's wallet or keypair used for signing messages. Defaults to ``None``, in which case a new :func:`bittensor.wallet().hotkey` is generated and used.
+            config (Optional[bittensor.config], optional):
+                bittensor.dendrite.config(), configuring the connection pool shared by all requests.
         """
         # Initialize the parent class
         super(dendrite, self).__init__()
 
+        # Build and check config.
+        if config is None:
+            config = dendrite.config()
+        config = copy.deepcopy(config)
+        config.dendrite.max_connections = config.dendrite.get(
+            "max_connections", bittensor.defaults.dendrite.max_connections
+        )
+        config.dendrite.max_connections_per_host = config.dendrite.get(
+            "max_connections_per_host",
+            bittensor.defaults.dendrite.max_connections_per_host,
+        )
+        config.dendrite.keepalive_timeout = config.dendrite.get(
+            "keepalive_timeout", bittensor.defaults.dendrite.keepalive_timeout
+        )
+        config.dendrite.dns_cache_ttl = config.dendrite.get(
+            "dns_cache_ttl", bittensor.defaults.dendrite.dns_cache_ttl
+        )
+        config.dendrite.history_size = config.dendrite.get(
+            "history_size", bittensor.defaults.dendrite.history_size
+        )
+        config.dendrite.compression = config.dendrite.get(
+            "compression", bittensor.defaults.dendrite.compression
+        )
+        config.dendrite.compression_threshold = config.dendrite.get(
+            "compression_threshold", bittensor.defaults.dendrite.compression_threshold
+        )
+        dendrite.check_config(config)
+        self.config = config  # type: ignore [method-assign]
+
         # Unique identifier for the instance
         self.uuid = str(uuid.uuid1())
 
@@ -118,9 +322,173 @@ class dendrite(torch.nn.Module):
             wallet.hotkey if isinstance(wallet, bittensor.wallet) else wallet
         ) or bittensor.wallet().hotkey
 
-        self.synapse_history: list = []
+        # Ring buffer of the latest calls, a zero size disables the history.
+        self.synapse_history: Deque[SynapseRecord] = deque(
+            maxlen=config.dendrite.history_size
+        )
 
         self._session: Optional[aiohttp.ClientSession] = None
+        self._pool_stats = DendritePoolStats()
+
+        # Encodings requests are compressed with (see :mod:`bittensor.compression`).
+        self._compression_encodings = compression.parse_encodings(
+            config.dendrite.compression
+        )
+
+        # Whether each axon accepts binary frames (see :mod:`bittensor.frame`) and the encodings it accepts,
+        # learned from its latest response. The least recently used axons are forgotten first.
+        self._axon_features: "OrderedDict[Tuple[str, int], Tuple[bool, Optional[str]]]" = (
+            OrderedDict()
+        )
+
+    @classmethod
+    def config(cls) -> "bittensor.config":
+        """
+        Parses the command-line arguments to form a Bittensor configuration object.
+
+        Returns:
+            bittensor.config: Configuration object with settings from command-line arguments.
+        """
+        parser = argparse.ArgumentParser()
+        dendrite.add_args(parser)
+        return bittensor.config(parser, args=[])
+
+    @classmethod
+    def help(cls):
+        """
+        Prints the help text (list of command-line arguments and their descriptions) to stdout.
+        """
+        parser = argparse.ArgumentParser()
+        dendrite.add_args(parser)
+        print(cls.__new__.__doc__)
+        parser.print_help()
+
+    @classmethod
+    def add_args(cls, parser: argparse.ArgumentParser, prefix: Optional[str] = None):
+        """
+        Adds dendrite-specific command-line arguments to the argument parser.
+
+        Args:
+            parser (argparse.ArgumentParser): Argument parser to which the arguments will be added.
+            prefix (str, optional): Prefix to add to the argument names. Defaults to None.
+
+        Note:
+            Environment variables are used to define default values for the arguments.
+        """
+        prefix_str = "" if prefix is None else prefix + "."
+        try:
+            # Get default values from environment variables or use default values
+            default_dendrite_max_connections = (
+                os.getenv("BT_DENDRITE_MAX_CONNECTIONS") or 512
+            )
+            default_dendrite_max_connections_per_host = (
+                os.getenv("BT_DENDRITE_MAX_CONNECTIONS_PER_HOST") or 0
+            )
+            default_dendrite_keepalive_timeout = (
+                os.getenv("BT_DENDRITE_KEEPALIVE_TIMEOUT") or 15.0
+            )
+            default_dendrite_dns_cache_ttl = (
+                os.getenv("BT_DENDRITE_DNS_CACHE_TTL") or 300
+            )
+            default_dendrite_history_size = os.getenv("BT_DENDRITE_HISTORY_SIZE") or 0
+            default_dendrite_compression = (
+                os.getenv("BT_DENDRITE_COMPRESSION") or "none"
+            )
+            default_dendrite_compression_threshold = (
+                os.getenv("BT_DENDRITE_COMPRESSION_THRESHOLD") or 1024
+            )
+
+            # Add command-line arguments to the parser
+            parser.add_argument(
+                "--" + prefix_str + "dendrite.max_connections",
+                type=int,
+                help="""The maximum number of simultaneous connections to all axons, 0 for no limit.""",
+                default=default_dendrite_max_connections,
+            )
+            parser.add_argument(
+                "--" + prefix_str + "dendrite.max_connections_per_host",
+                type=int,
+                help="""The maximum number of simultaneous connections to a single axon, 0 for no limit.""",
+                default=default_dendrite_max_connections_per_host,
+            )
+            parser.add_argument(
+                "--" + prefix_str + "dendrite.keepalive_timeout",
+                type=float,
+                help="""Seconds an idle connection is kept open for reuse by later requests to the same axon.""",
+                default=default_dendrite_keepalive_timeout,
+            )
+            parser.add_argument(
+                "--" + prefix_str + "dendrite.dns_cache_ttl",
+                type=int,
+                help="""Seconds resolved axon host names are cached for.""",
+                default=default_dendrite_dns_cache_ttl,
+            )
+            parser.add_argument(
+                "--" + prefix_str + "dendrite.history_size",
+                type=int,
+                help="""The number of latest calls kept in the dendrite's synapse history, 0 to disable it.""",
+                default=default_dendrite_history_size,
+            )
+            parser.add_argument(
+                "--" + prefix_str + "dendrite.compression",
+                type=str,
+                help="""Comma separated encodings to compress requests with, in order of preference (zstd, gzip), or none. Only used with axons accepting them.""",
+                default=default_dendrite_compression,
+            )
+            parser.add_argument(
+                "--" + prefix_str + "dendrite.compression_threshold",
+                type=int,
+                help="""The minimum body size in bytes for requests to be compressed.""",
+                default=default_dendrite_compression_threshold,
+            )
+
+        except argparse.ArgumentError:
+            # Exception handling for re-parsing arguments
+            pass
+
+    @classmethod
+    def check_config(cls, config: "bittensor.config"):
+        """
+        This method checks the configuration for the dendrite's connection pool.
+
+        Args:
+            config (bittensor.config): The config object holding dendrite settings.
+
+        Raises:
+            AssertionError: If the connection limits, history size or compression threshold are negative, the timeouts are not positive or the compression encodings are unknown.
+        """
+        assert (
+            config.dendrite.max_connections >= 0
+        ), "Dendrite max_connections must not be negative"
+        assert (
+            config.dendrite.max_connections_per_host >= 0
+        ), "Dendrite max_connections_per_host must not be negative"
+        assert (
+            config.dendrite.keepalive_timeout > 0
+        ), "Dendrite keepalive_timeout must be positive"
+        assert (
+            config.dendrite.dns_cache_ttl > 0
+        ), "Dendrite dns_cache_ttl must be positive"
+        assert (
+            config.dendrite.history_size >= 0
+        ), "Dendrite history_size must not be negative"
+        assert compression.is_valid_setting(
+            config.dendrite.compression
+        ), "Dendrite compression must be a comma separated list of zstd and gzip, or none"
+        assert (
+            config.dendrite.compression_threshold >= 0
+        ), "Dendrite compression_threshold must not be negative"
+
+    @property
+    def pool_stats(self) -> Dict[str, float]:
+        """
+        Statistics of the connection pool: requests made, connections reused and newly opened, the reuse rate,
+        the average handshake and queue wait times, and, while the session is open, the number of connections
+        in use and idle.
+        """
+        return self._pool_stats.to_dict(
+            self._session.connector if self._session is not None else None
+        )
 
     @property
     async def session(self) -> aiohttp.ClientSession:
@@ -129,7 +497,8 @@ class dendrite(torch.nn.Module):
 
         This property ensures the management of HTTP connections in an efficient way. It lazily
         initializes the `aiohttp.ClientSession <https://docs.aiohttp.org/en/stable/client_reference.html#aiohttp.ClientSession>`_ on its first use. The session is then reused for subsequent
-        HTTP requests, offering performance benefits by reusing underlying connections.
+        HTTP requests, offering performance benefits by reusing underlying connections. Its connection pool is sized
+        by ``config.dendrite`` and reports into :attr:`pool_stats`.
 
         This is used internally by the dendrite when querying axons, and should not be used directly
         unless absolutely necessary for your application.
@@ -155,7 +524,17 @@ class dendrite(torch.nn.Module):
 
         """
         if self._session is None:
-            self._session = aiohttp.ClientSession()
+            pool_config = self.config.dendrite  # type: ignore [attr-defined]
+            connector = aiohttp.TCPConnector(
+                limit=pool_config.max_connections,
+                limit_per_host=pool_config.max_connections_per_host,
+                keepalive_timeout=pool_config.keepalive_timeout,
+                ttl_dns_cache=pool_config.dns_cache_ttl,
+            )
+            self._session = aiohttp.ClientSession(
+                connector=connector,
+                trace_configs=[self._pool_stats.trace_config()],
+            )
         return self._session
 
     def close_session(self):
@@ -253,6 +632,15 @@ class dendrite(torch.nn.Module):
                 f"Failed to parse response object with error: {str(exception)}"
             )
 
+    def _remember_axon_features(
+        self, axon_key: Tuple[str, int], accepts_frames: bool, encodings: Optional[str]
+    ):
+        """Records what the axon at ``axon_key`` advertised in its latest response, forgetting the least recently used axons."""
+        self._axon_features[axon_key] = (accepts_frames, encodings)
+        self._axon_features.move_to_end(axon_key)
+        while len(self._axon_features) > AXON_FEATURES_SIZE:
+            self._axon_features.popitem(last=False)
+
     def _log_outgoing_request(self, synapse):
         """
         Logs information about outgoing requests for debugging purposes.
@@ -288,6 +676,30 @@ class dendrite(torch.nn.Module):
             f"dendrite | <-- | {synapse.get_total_size()} B | {synapse.name} | {synapse.axon.hotkey} | {synapse.axon.ip}:{str(synapse.axon.port)} | {synapse.dendrite.status_code} | {synapse.dendrite.status_message}"
         )
 
+    def _record_history(self, synapse, response_size: Optional[int]):
+        # Skips building the record altogether while the history is disabled.
+        if self.synapse_history.maxlen:
+            self.synapse_history.append(
+                SynapseRecord.from_synapse(synapse, response_size)
+            )
+
+    def export_history(self, path: Optional[str] = None) -> List[Dict[str, Any]]:
+        """
+        Exports the synapse history for offline analysis.
+
+        Args:
+            path (str, optional): If given, the records are also written to this file as JSON lines.
+
+        Returns:
+            List[Dict[str, Any]]: The :class:`SynapseRecord` in the history as dictionaries, oldest first.
+        """
+        records = [record._asdict() for record in self.synapse_history]
+        if path is not None:
+            with open(os.path.expanduser(path), "w") as f:
+                for record in records:
+                    f.write(json.dumps(record) + "\n")
+        return records
+
     def query(
         self, *args, **kwargs
     ) -> List[
@@ -331,6 +743,7 @@ class dendrite(torch.nn.Module):
         deserialize: bool = True,
         run_async: bool = True,
         streaming: bool = False,
+        max_concurrency: Optional[int] = None,
     ) -> List[
         Union[AsyncGenerator[Any, Any], bittensor.Synapse, bittensor.StreamingSynapse]
     ]:
@@ -375,6 +788,8 @@ class dendrite(torch.nn.Module):
             deserialize (bool, optional): Determines if the received response should be deserialized. Defaults to ``True``.
             run_async (bool, optional): If ``True``, sends requests concurrently. Otherwise, sends requests sequentially. Defaults to ``True``.
             streaming (bool, optional): Indicates if the response is expected to be in streaming format. Defaults to ``False``.
+            max_concurrency (int, optional): Maximum number of requests in flight at once when ``run_async`` is ``True``. Defaults to ``None``, sending all requests at once.
+                Streaming requests are not bounded, as they only start once their generator is iterated.
 
         Returns:
             Union[AsyncGenerator, bittensor.Synapse, List[bittensor.Synapse]]: If a single Axon is targeted, returns its response.
@@ -395,6 +810,9 @@ class dendrite(torch.nn.Module):
                 f"Argument streaming is {streaming} while issubclass(synapse, StreamingSynapse) is {synapse.__class__.__name__}. This may cause unexpected behavior."
             )
         streaming = is_streaming_subclass or streaming
+        if max_concurrency is not None and max_concurrency <= 0:
+            raise ValueError("max_concurrency must be greater than 0")
+        semaphore = asyncio.Semaphore(max_concurrency) if max_concurrency else None
 
         async def query_all_axons(
             is_stream: bool,
@@ -462,9 +880,20 @@ class dendrite(torch.nn.Module):
                 return [
                     await single_axon_response(target_axon) for target_axon in axons
                 ]  # type: ignore
+
+            async def bounded_axon_response(target_axon):
+                # Holds one of the ``max_concurrency`` slots for the duration of the request.
+                async with semaphore:  # type: ignore
+                    return await single_axon_response(target_axon)
+
             # If run_async flag is True, get responses concurrently using asyncio.gather().
             return await asyncio.gather(
-                *(single_axon_response(target_axon) for target_axon in axons)
+                *(
+                    single_axon_response(target_axon)
+                    if semaphore is None
+                    else bounded_axon_response(target_axon)
+                    for target_axon in axons
+                )
             )  # type: ignore
 
         # Get responses for all axons.
@@ -472,6 +901,93 @@ class dendrite(torch.nn.Module):
         # Return the single response if only one axon was targeted, else return all responses
         return responses[0] if len(responses) == 1 and not is_list else responses  # type: ignore
 
+    async def as_completed(
+        self,
+        axons: Union[
+            List[Union[bittensor.AxonInfo, bittensor.axon]],
+            Union[bittensor.AxonInfo, bittensor.axon],
+        ],
+        synapse: bittensor.Synapse = bittensor.Synapse(),
+        timeout: float = 12,
+        deserialize: bool = True,
+        max_concurrency: Optional[int] = None,
+        first_k: Optional[int] = None,
+    ) -> AsyncGenerator[Tuple[int, Any], None]:
+        """
+        Sends requests to multiple Axons concurrently and yields their responses in the order they arrive.
+
+        Unlike :func:`forward`, which returns once the slowest Axon has answered or timed out, this lets
+        callers process early responses while the remaining requests are still in flight. Each response is
+        yielded along with the index of its Axon in ``axons``.
+
+        With ``first_k`` set, only successful responses are yielded and the remaining requests are cancelled
+        as soon as ``first_k`` of them have arrived, which suits redundant queries where any ``first_k``
+        answers will do. Requests still in flight are also cancelled if the caller stops iterating early.
+
+        For example::
+
+            >>> async for uid, response in dendrite.as_completed(axons, synapse, max_concurrency=64):
+            >>>     score(uid, response)
+            >>> async for uid, response in dendrite.as_completed(axons, synapse, first_k=3):
+            >>>     answers.append(response)
+
+        Args:
+            axons (Union[List[Union['bittensor.AxonInfo', 'bittensor.axon']], Union['bittensor.AxonInfo', 'bittensor.axon']]):
+                The target Axons to send requests to. Can be a single Axon or a list of Axons.
+            synapse (bittensor.Synapse, optional): The Synapse object encapsulating the data. Streaming synapses are not supported.
+            timeout (float, optional): Maximum duration to wait for a response from an Axon in seconds. Defaults to ``12.0``.
+            deserialize (bool, optional): Determines if the received responses should be deserialized. Defaults to ``True``.
+            max_concurrency (int, optional): Maximum number of requests in flight at once. Defaults to ``None``, sending all requests at once.
+            first_k (int, optional): Stop after this many successful responses. Defaults to ``None``, yielding every response.
+
+        Yields:
+            Tuple[int, Any]: The index of the responding Axon in ``axons`` and its response.
+        """
+        if isinstance(synapse, bittensor.StreamingSynapse):
+            raise ValueError(
+                "as_completed does not support streaming synapses, use forward instead."
+            )
+        if max_concurrency is not None and max_concurrency <= 0:
+            raise ValueError("max_concurrency must be greater than 0")
+        if first_k is not None and first_k <= 0:
+            raise ValueError("first_k must be greater than 0")
+        if not isinstance(axons, list):
+            axons = [axons]
+
+        semaphore = asyncio.Semaphore(max_concurrency) if max_concurrency else None
+
+        async def single_axon_response(
+            index: int, target_axon
+        ) -> Tuple[int, bittensor.Synapse]:
+            if semaphore is None:
+                return index, await self.call(
+                    target_axon, synapse.copy(), timeout, deserialize=False
+                )
+            async with semaphore:
+                return index, await self.call(
+                    target_axon, synapse.copy(), timeout, deserialize=False
+                )
+
+        tasks = [
+            asyncio.ensure_future(single_axon_response(index, target_axon))
+            for index, target_axon in enumerate(axons)
+        ]
+        successes = 0
+        try:
+            for next_response in asyncio.as_completed(tasks):
+                index, response = await next_response
+                if first_k is not None and not response.is_success:
+                    continue
+                yield index, response.deserialize() if deserialize else response
+                successes += 1
+                if first_k is not None and successes >= first_k:
+                    break
+        finally:
+            # Cancel the stragglers once the caller is done with the results.
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
     async def call(
         self,
         target_axon: Union[bittensor.AxonInfo, bittensor.axon],
@@ -511,19 +1027,65 @@ class dendrite(torch.nn.Module):
         # Preprocess synapse for making a request
         synapse = self.preprocess_synapse_for_request(target_axon, synapse, timeout)
 
+        response_size = None
         try:
             # Log outgoing request
             self._log_outgoing_request(synapse)
 
-            # Make the HTTP POST request
+            # Tensors are sent as raw buffers in a binary frame to axons which accept them, and
+            # responses may come back as frames too.
+            axon_key = (target_axon.ip, target_axon.port)
+            accepts_frames, axon_encodings = self._axon_features.get(
+                axon_key, (False, None)
+            )
+            fields = frame.tensor_fields(synapse) if accepts_frames else []
+            if fields:
+                content_type = frame.CONTENT_TYPE
+                data = frame.encode(synapse, fields)
+            else:
+                content_type = "application/json"
+                data = codec.dumps(synapse.dict())
+
+            # Large bodies are compressed for axons which advertised a configured encoding.
+            data, encoding, ratio, compression_time = compression.compress_body(
+                data,
+                self._compression_encodings,
+                axon_encodings,
+                self.config.dendrite.compression_threshold,  # type: ignore [attr-defined]
+            )
+            synapse.dendrite.compression_ratio = ratio  # type: ignore
+            synapse.dendrite.compression_time = compression_time  # type: ignore
+
+            headers = synapse.to_headers()
+            headers["Content-Type"] = content_type
+            headers["Accept"] = f"{frame.CONTENT_TYPE}, application/json"
+            headers["Accept-Encoding"] = ", ".join(compression.available_encodings())
+            if encoding is not None:
+                headers["Content-Encoding"] = encoding
+
+            # Make the HTTP POST request, responses are decompressed below as aiohttp does not know every encoding.
             async with (await self.session).post(
                 url,
-                headers=synapse.to_headers(),
-                json=synapse.dict(),
+                headers=headers,
+                data=data,
                 timeout=timeout,
+                auto_decompress=False,
             ) as response:
+                response_size = response.content_length
+                self._remember_axon_features(
+                    axon_key,
+                    frame.ACCEPT_HEADER in response.headers,
+                    response.headers.get("Accept-Encoding"),
+                )
+                content = await response.read()
+                response_encoding = response.headers.get("Content-Encoding")
+                if response_encoding and response_encoding != compression.IDENTITY:
+                    content = compression.decompress(content, response_encoding)
                 # Extract the JSON response from the server
-                json_response = await response.json()
+                if response.content_type == frame.CONTENT_TYPE:
+                    json_response = frame.decode(content)
+                else:
+                    json_response = codec.loads(content)
                 # Process the server response and fill synapse
                 self.process_server_response(response, json_response, synapse)
 
@@ -537,9 +1099,7 @@ class dendrite(torch.nn.Module):
             self._log_incoming_response(synapse)
 
             # Log synapse event history
-            self.synapse_history.append(
-                bittensor.Synapse.from_headers(synapse.to_headers())
-            )
+            self._record_history(synapse, response_size)
 
             # Return the updated synapse object after deserializing if requested
             if deserialize:
@@ -593,18 +1153,25 @@ class dendrite(torch.nn.Module):
         # Preprocess synapse for making a request
         synapse = self.preprocess_synapse_for_request(target_axon, synapse, timeout)  # type: ignore
 
+        response_size = None
+        closed = False
         try:
             # Log outgoing request
             self._log_outgoing_request(synapse)
 
+            headers = synapse.to_headers()
+            headers["Content-Type"] = "application/json"
+
             # Make the HTTP POST request
             async with (await self.session).post(
                 url,
-                headers=synapse.to_headers(),
-                json=synapse.dict(),
+                headers=headers,
+                data=codec.dumps(synapse.dict()),
                 timeout=timeout,
             ) as response:
-                # Use synapse subclass' process_streaming_response method to yield the response chunks
+                response_size = response.content_length
+                # Use synapse subclass' process_streaming_response method to yield the response chunks.
+                # Chunks are read as the caller consumes them, so a slow caller slows the axon down.
                 async for chunk in synapse.process_streaming_response(response):  # type: ignore
                     yield chunk  # Yield each chunk as it's processed
                 json_response = synapse.extract_response_json(response)
@@ -615,6 +1182,11 @@ class dendrite(torch.nn.Module):
             # Set process time and log the response
             synapse.dendrite.process_time = str(time.time() - start_time)  # type: ignore
 
+        except GeneratorExit:
+            # The caller stopped iterating, leaving the block closes the connection and the axon stops streaming.
+            closed = True
+            raise
+
         except Exception as e:
             self._handle_request_errors(synapse, request_name, e)
 
@@ -622,15 +1194,11 @@ class dendrite(torch.nn.Module):
             self._log_incoming_response(synapse)
 
             # Log synapse event history
-            self.synapse_history.append(
-                bittensor.Synapse.from_headers(synapse.to_headers())
-            )
+            self._record_history(synapse, response_size)
 
-            # Return the updated synapse object after deserializing if requested
-            if deserialize:
-                yield synapse.deserialize()
-            else:
-                yield synapse
+            # Return the updated synapse object after deserializing if requested, unless the caller is gone
+            if not closed:
+                yield synapse.deserialize() if deserialize else synapse
 
     def preprocess_synapse_for_request(
         self,
@@ -658,7 +1226,7 @@ class dendrite(torch.nn.Module):
         synapse.dendrite = bittensor.TerminalInfo(
             ip=self.external_ip,
             version=bittensor.__version_as_int__,
-            nonce=time.monotonic_ns(),
+            nonce=time.time_ns(),
             uuid=self.uuid,
             hotkey=self.keypair.ss58_address,
         )
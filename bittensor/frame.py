@@ -0,0 +1,188 @@
+# The MIT License (MIT)
+# Copyright © 2023 Opentensor Foundation
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy of this software and associated
+# documentation files (the “Software”), to deal in the Software without restriction, including without limitation
+# the rights to use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies of the Software,
+# and to permit persons to whom the Software is furnished to do so, subject to the following conditions:
+
+# The above copyright notice and this permission notice shall be included in all copies or substantial portions of
+# the Software.
+
+# THE SOFTWARE IS PROVIDED “AS IS”, WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO
+# THE WARRANTIES OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL
+# THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION
+# OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER
+# DEALINGS IN THE SOFTWARE.
+
+"""
+Binary bodies for synapses carrying :class:`bittensor.Tensor` fields.
+
+A frame sends tensor data as raw bytes instead of base64 encoded msgpack inside JSON::
+
+    b"BTF1" | header length (uint32, little endian) | header (JSON) | padding | tensor buffers
+
+The header holds the synapse's other fields under ``"body"`` and describes every tensor under ``"tensors"``
+by its offset and size in the frame, each buffer aligned to :data:`ALIGNMENT` bytes. On decoding, tensors are
+rebuilt with ``numpy.frombuffer`` as views into the received body, without copying.
+
+Frames are negotiated per request through headers. The dendrite lists :data:`CONTENT_TYPE` in the ``Accept``
+header of every request, and the axon then answers with a frame whenever the response carries tensors. Axons
+set the :data:`ACCEPT_HEADER` response header, after which the dendrite sends its requests to them as frames
+too. Peers that do not know about frames keep exchanging JSON.
+"""
+
+import struct
+import numpy
+import bittensor
+
+from typing import Any, Dict, List, Optional, Union
+from bittensor import codec
+
+CONTENT_TYPE = "application/x-bittensor-frame"
+ACCEPT_HEADER = "bt_accept_frame"
+MAGIC = b"BTF1"
+ALIGNMENT = 64
+
+_LENGTH = struct.Struct("<I")
+_PADDING = bytes(ALIGNMENT)
+
+
+class FrameError(ValueError):
+    r"""Raised when a body is not a valid frame."""
+
+    pass
+
+
+def _is_tensor_value(value: Any) -> bool:
+    if isinstance(value, bittensor.Tensor):
+        return True
+    return (
+        isinstance(value, (list, tuple))
+        and len(value) > 0
+        and all(isinstance(item, bittensor.Tensor) for item in value)
+    )
+
+
+def tensor_fields(synapse: "bittensor.Synapse") -> List[str]:
+    """Returns the fields of ``synapse`` holding a :class:`bittensor.Tensor` or a non empty list of them."""
+    return [
+        field
+        for field in synapse.__fields__
+        if _is_tensor_value(getattr(synapse, field))
+    ]
+
+
+def encode(synapse: "bittensor.Synapse", fields: Optional[List[str]] = None) -> bytes:
+    """
+    Encodes ``synapse`` into a frame.
+
+    Args:
+        synapse (bittensor.Synapse): The synapse to encode.
+        fields (List[str], optional): Its tensor fields, as returned by :func:`tensor_fields`.
+
+    Returns:
+        bytes: The frame.
+    """
+    if fields is None:
+        fields = tensor_fields(synapse)
+
+    buffers: List[memoryview] = []
+    offset = 0
+
+    def describe(tensor: "bittensor.Tensor") -> Dict[str, Any]:
+        nonlocal offset
+        array = tensor.array()
+        if not array.flags.c_contiguous:
+            array = array.copy(order="C")
+        buffer = memoryview(array).cast("B")
+        description = {
+            "dtype": tensor.dtype,
+            "shape": tensor.shape,
+            "format": array.dtype.str,
+            "array_shape": list(array.shape),
+            "offset": offset,
+            "nbytes": buffer.nbytes,
+        }
+        buffers.append(buffer)
+        offset += buffer.nbytes + (-buffer.nbytes % ALIGNMENT)
+        return description
+
+    tensors: Dict[str, Union[Dict, List[Dict]]] = {}
+    for field in fields:
+        value = getattr(synapse, field)
+        if isinstance(value, bittensor.Tensor):
+            tensors[field] = describe(value)
+        else:
+            tensors[field] = [describe(tensor) for tensor in value]
+
+    header = codec.dumps(
+        {"body": synapse.dict(exclude=set(fields)), "tensors": tensors}
+    )
+    start = len(MAGIC) + _LENGTH.size + len(header)
+
+    parts: List[Union[bytes, memoryview]] = [
+        MAGIC,
+        _LENGTH.pack(len(header)),
+        header,
+        _PADDING[: -start % ALIGNMENT],
+    ]
+    for buffer in buffers:
+        parts.append(buffer)
+        parts.append(_PADDING[: -buffer.nbytes % ALIGNMENT])
+    return b"".join(parts)
+
+
+def decode(body: bytes) -> Dict[str, Any]:
+    """
+    Decodes a frame into the keyword arguments of its synapse. Tensors are views into ``body``.
+
+    Args:
+        body (bytes): The frame.
+
+    Returns:
+        Dict[str, Any]: The synapse fields, with :class:`bittensor.Tensor` values for the tensor fields.
+
+    Raises:
+        FrameError: If ``body`` is not a valid frame.
+    """
+    if body[: len(MAGIC)] != MAGIC:
+        raise FrameError("Body is not a bittensor frame.")
+    try:
+        (length,) = _LENGTH.unpack_from(body, len(MAGIC))
+        start = len(MAGIC) + _LENGTH.size
+        header = codec.loads(body[start : start + length])
+        start += length
+        start += -start % ALIGNMENT
+
+        def rebuild(description: Dict[str, Any]) -> "bittensor.Tensor":
+            dtype = numpy.dtype(description["format"])
+            nbytes, offset = description["nbytes"], description["offset"]
+            # Descriptors come from the peer, a negative count would read the rest of the body.
+            if not isinstance(nbytes, int) or not isinstance(offset, int):
+                raise FrameError("Tensor buffer size and offset must be integers.")
+            if nbytes < 0 or offset < 0:
+                raise FrameError("Tensor buffer size and offset must not be negative.")
+            if nbytes % dtype.itemsize or offset % ALIGNMENT:
+                raise FrameError("Tensor buffer is not aligned to its dtype.")
+            offset += start
+            if offset + nbytes > len(body):
+                raise FrameError("Tensor buffer exceeds the frame.")
+            array = numpy.frombuffer(
+                body, dtype=dtype, count=nbytes // dtype.itemsize, offset=offset
+            ).reshape(description["array_shape"])
+            return bittensor.Tensor.from_array(
+                array, dtype=description["dtype"], shape=description["shape"]
+            )
+
+        inputs = header["body"]
+        for field, description in header["tensors"].items():
+            if isinstance(description, list):
+                inputs[field] = [rebuild(item) for item in description]
+            else:
+                inputs[field] = rebuild(description)
+    except FrameError:
+        raise
+    except Exception as e:
+        raise FrameError(f"Malformed bittensor frame: {e}") from e
+    return inputs
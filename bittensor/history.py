@@ -0,0 +1,267 @@
+# The MIT License (MIT)
+# Copyright © 2023 Opentensor Foundation
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy of this software and associated
+# documentation files (the “Software”), to deal in the Software without restriction, including without limitation
+# the rights to use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies of the Software,
+# and to permit persons to whom the Software is furnished to do so, subject to the following conditions:
+
+# The above copyright notice and this permission notice shall be included in all copies or substantial portions of
+# the Software.
+
+# THE SOFTWARE IS PROVIDED “AS IS”, WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO
+# THE WARRANTIES OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL
+# THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION
+# OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER
+# DEALINGS IN THE SOFTWARE.
+
+import os
+import bisect
+import hashlib
+import numpy
+import bittensor
+
+from typing import Any, Dict, List, Optional, Tuple
+from bittensor import codec
+from bittensor.metagraph import NEURON_COLUMNS, get_save_dir
+
+ALIGNMENT = 64
+
+_PADDING = bytes(ALIGNMENT)
+
+
+class MetagraphHistory:
+    """
+    Append-only, block indexed store of metagraph columns, for analysing how the neurons of a subnet evolve
+    over many blocks.
+
+    Every appended metagraph stores its :data:`COLUMNS` as raw arrays. A column equal to one already stored,
+    such as the hotkeys or the trust between two epochs, is not written again but refers to the stored array,
+    so the store grows with the changes to the subnet rather than with the number of blocks.
+
+    The store is a directory holding two files. ``columns.bin`` holds the arrays, aligned to :data:`ALIGNMENT`
+    bytes, and ``index.jsonl`` describes one stored array or one appended block per line. Queries only read
+    the index and the memory-mapped arrays they need, never whole snapshots. A store has a single writer,
+    while any number of processes can read it. Readers skip a partial last index line, which may be an append
+    in progress, and only the writer drops one left by a crash, on its first :func:`append`.
+
+    Args:
+        path (str): The directory of the store, created if needed.
+
+    Example::
+
+        history = bittensor.MetagraphHistory.for_subnet(network="finney", netuid=1)
+        metagraph = subtensor.metagraph(netuid=1, block=start)
+        for block in range(start, end, 10):
+            metagraph.sync(block=block, subtensor=subtensor, incremental=True)
+            history.append(metagraph)
+
+        blocks, incentive = history.query("incentive", start=start, end=end, uid=12)
+    """
+
+    # The stored metagraph attributes, the hotkeys and coldkeys of the neurons being taken from their axons.
+    COLUMNS = tuple(name for name, _, _ in NEURON_COLUMNS) + ("hotkeys", "coldkeys")
+
+    def __init__(self, path: str):
+        os.makedirs(path, exist_ok=True)
+        self.path = path
+        self._data_path = os.path.join(path, "columns.bin")
+        self._index_path = os.path.join(path, "index.jsonl")
+        self._arrays: List[Dict[str, Any]] = []
+        self._hashes: Dict[str, int] = {}
+        self._blocks: List[int] = []
+        self._columns: List[Dict[str, int]] = []
+        self._map: Optional[numpy.memmap] = None
+        self._writing = False
+        self._read_index()
+
+    @classmethod
+    def for_subnet(cls, network: str, netuid: int) -> "MetagraphHistory":
+        """Returns the store of subnet ``netuid``, next to the metagraphs saved by :func:`bittensor.metagraph.save`."""
+        return cls(os.path.join(get_save_dir(network, netuid), "history"))
+
+    def _read_index(self):
+        self._arrays, self._hashes, self._blocks, self._columns = [], {}, [], []
+        if not os.path.exists(self._index_path):
+            return
+        with open(self._index_path, "rb") as file:
+            lines = file.read().split(b"\n")
+        # A line is only complete once its newline is written, a partial last line is skipped.
+        for line in lines[:-1]:
+            self._add_record(codec.loads(line))
+
+    def _start_writing(self):
+        """Drops a partial last index line left by a crashed writer, and reads the index it leaves."""
+        if os.path.exists(self._index_path):
+            with open(self._index_path, "r+b") as file:
+                data = file.read()
+                end = data.rfind(b"\n") + 1
+                if end < len(data):
+                    file.truncate(end)
+        self._read_index()
+        self._writing = True
+
+    def _add_record(self, record: Dict[str, Any]):
+        if "array" in record:
+            self._hashes[record["hash"]] = record["array"]
+            self._arrays.append(record)
+        else:
+            self._blocks.append(record["block"])
+            self._columns.append(record["columns"])
+
+    @property
+    def blocks(self) -> numpy.ndarray:
+        """The blocks of the appended metagraphs, in increasing order."""
+        return numpy.array(self._blocks, dtype=numpy.int64)
+
+    def __len__(self) -> int:
+        return len(self._blocks)
+
+    def append(self, metagraph: "bittensor.metagraph"):
+        """
+        Appends the columns of ``metagraph`` at its block.
+
+        Args:
+            metagraph (bittensor.metagraph): The synced metagraph.
+
+        Raises:
+            ValueError: If the metagraph's block is not after the last appended block.
+        """
+        if not self._writing:
+            self._start_writing()
+        block = int(metagraph.block.item())
+        if self._blocks and block <= self._blocks[-1]:
+            raise ValueError(
+                f"Block {block} is not after the last appended block {self._blocks[-1]}."
+            )
+
+        columns = {
+            name: getattr(metagraph, name).detach().cpu().numpy()
+            for name, _, _ in NEURON_COLUMNS
+        }
+        columns["hotkeys"] = numpy.array(
+            [axon.hotkey for axon in metagraph.axons], dtype=numpy.str_
+        )
+        columns["coldkeys"] = numpy.array(
+            [axon.coldkey for axon in metagraph.axons], dtype=numpy.str_
+        )
+
+        records: List[Dict[str, Any]] = []
+        pending: Dict[str, int] = {}
+        ids: Dict[str, int] = {}
+        with open(self._data_path, "ab") as data:
+            offset = data.tell()
+            for name, array in columns.items():
+                array = numpy.ascontiguousarray(array)
+                digest = hashlib.blake2b(array.tobytes(), digest_size=16).hexdigest()
+                key = f"{array.dtype.str}{list(array.shape)}{digest}"
+                array_id = self._hashes.get(key, pending.get(key))
+                if array_id is None:
+                    data.write(_PADDING[: -offset % ALIGNMENT])
+                    offset += -offset % ALIGNMENT
+                    record = {
+                        "array": len(self._arrays) + len(records),
+                        "hash": key,
+                        "offset": offset,
+                        "dtype": array.dtype.str,
+                        "shape": list(array.shape),
+                    }
+                    data.write(array.tobytes())
+                    offset += array.nbytes
+                    records.append(record)
+                    array_id = pending[key] = record["array"]
+                ids[name] = array_id
+        records.append({"block": block, "columns": ids})
+
+        # The arrays are written before the index lines referring to them.
+        with open(self._index_path, "ab") as index:
+            index.write(b"".join(codec.dumps(record) + b"\n" for record in records))
+        for record in records:
+            self._add_record(record)
+
+    def _array(self, array_id: int) -> numpy.ndarray:
+        record = self._arrays[array_id]
+        dtype = numpy.dtype(record["dtype"])
+        nbytes = int(numpy.prod(record["shape"], dtype=numpy.int64)) * dtype.itemsize
+        end = record["offset"] + nbytes
+        if nbytes == 0:
+            return numpy.empty(record["shape"], dtype=dtype)
+        if self._map is None or len(self._map) < end:
+            # Map the data file again once it grew past the current mapping.
+            self._map = numpy.memmap(self._data_path, dtype=numpy.uint8, mode="r")
+        return self._map[record["offset"] : end].view(dtype).reshape(record["shape"])
+
+    def columns(self, block: int) -> Dict[str, numpy.ndarray]:
+        """
+        Returns the columns of the last metagraph appended at or before ``block``, as read-only arrays.
+
+        Raises:
+            KeyError: If no metagraph was appended at or before ``block``.
+        """
+        position = bisect.bisect_right(self._blocks, block) - 1
+        if position < 0:
+            raise KeyError(f"No metagraph was appended at or before block {block}.")
+        return {
+            name: self._array(array_id)
+            for name, array_id in self._columns[position].items()
+        }
+
+    def query(
+        self,
+        name: str,
+        start: Optional[int] = None,
+        end: Optional[int] = None,
+        uid: Optional[int] = None,
+    ) -> Tuple[numpy.ndarray, numpy.ndarray]:
+        """
+        Returns the values of column ``name`` at the appended blocks between ``start`` and ``end``, inclusive.
+        Every distinct stored array is read once, however many blocks refer to it.
+
+        Args:
+            name (str): One of :data:`COLUMNS`, such as ``"incentive"``.
+            start (Optional[int]): The first block, or ``None`` for the first appended block.
+            end (Optional[int]): The last block, or ``None`` for the last appended block.
+            uid (Optional[int]): If set, only the values of this uid are returned, at the blocks where it existed.
+
+        Returns:
+            Tuple[numpy.ndarray, numpy.ndarray]: The blocks and the values, one row of all uids per block if ``uid``
+            is ``None``.
+
+        Raises:
+            KeyError: If ``name`` is not a stored column.
+            ValueError: If ``uid`` is ``None`` and the number of neurons changed between the blocks.
+        """
+        if name not in self.COLUMNS:
+            raise KeyError(f"{name} is not a stored column, one of {self.COLUMNS}.")
+        first = 0 if start is None else bisect.bisect_left(self._blocks, start)
+        last = (
+            len(self._blocks) if end is None else bisect.bisect_right(self._blocks, end)
+        )
+        ids = [columns[name] for columns in self._columns[first:last]]
+        blocks = numpy.array(self._blocks[first:last], dtype=numpy.int64)
+
+        arrays = {array_id: self._array(array_id) for array_id in set(ids)}
+        if uid is None:
+            if len({array.shape for array in arrays.values()}) > 1:
+                raise ValueError(
+                    f"The number of neurons changed between blocks {blocks[0]} and {blocks[-1]}, query a single uid."
+                )
+            if not ids:
+                return blocks, numpy.empty((0, 0))
+            return blocks, numpy.stack([arrays[array_id] for array_id in ids])
+
+        values = {
+            array_id: array[uid]
+            for array_id, array in arrays.items()
+            if 0 <= uid < len(array)
+        }
+        present = numpy.array([array_id in values for array_id in ids], dtype=bool)
+        # The width of string columns may differ between blocks.
+        dtype = (
+            numpy.result_type(*(array.dtype for array in arrays.values()))
+            if arrays
+            else numpy.float64
+        )
+        return blocks[present], numpy.array(
+            [values[array_id] for array_id in ids if array_id in values], dtype=dtype
+        )
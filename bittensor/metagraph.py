@@ -18,13 +18,135 @@
 # DEALINGS IN THE SOFTWARE.
 
 import os
+import numpy
 import torch
 import bittensor
+import itertools
+import operator
+import warnings
+from dataclasses import asdict
 from os import listdir
 from os.path import join
-from typing import List, Optional
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
 
+from bittensor import snapshot
 from bittensor.chain_data import AxonInfo
+from bittensor.utils import RAOPERTAO, U16_NORMALIZED_FLOAT
+
+# Metagraph attributes built from the neurons, with the neuron attribute they hold and their dtype.
+NEURON_COLUMNS = (
+    ("uids", "uid", torch.int64),
+    ("trust", "trust", torch.float32),
+    ("consensus", "consensus", torch.float32),
+    ("incentive", "incentive", torch.float32),
+    ("dividends", "dividends", torch.float32),
+    ("ranks", "rank", torch.float32),
+    ("emission", "emission", torch.float32),
+    ("active", "active", torch.int64),
+    ("last_update", "last_update", torch.int64),
+    ("validator_permit", "validator_permit", torch.bool),
+    ("validator_trust", "validator_trust", torch.float32),
+    ("total_stake", "total_stake.tao", torch.float32),
+    ("stake", "stake", torch.float32),
+)
+
+# Neuron attributes held by the per neuron storage vectors of a subnet, with the conversion of their raw values.
+STORAGE_ATTRIBUTES: Dict[str, Tuple[str, Callable[[Any], Any]]] = {
+    "Active": ("active", bool),
+    "Rank": ("rank", U16_NORMALIZED_FLOAT),
+    "Trust": ("trust", U16_NORMALIZED_FLOAT),
+    "Consensus": ("consensus", U16_NORMALIZED_FLOAT),
+    "Incentive": ("incentive", U16_NORMALIZED_FLOAT),
+    "Dividends": ("dividends", U16_NORMALIZED_FLOAT),
+    "Emission": ("emission", lambda value: value / RAOPERTAO),
+    "LastUpdate": ("last_update", int),
+    "ValidatorTrust": ("validator_trust", U16_NORMALIZED_FLOAT),
+    "ValidatorPermit": ("validator_permit", bool),
+    "PruningScores": ("pruning_score", int),
+}
+
+_NUMPY_DTYPES = {
+    torch.int64: numpy.int64,
+    torch.float32: numpy.float32,
+    torch.bool: numpy.bool_,
+}
+
+
+def neuron_columns(neurons: Sequence[Any]) -> Dict[str, torch.Tensor]:
+    """
+    Builds the :data:`NEURON_COLUMNS` of the metagraph from a list of neurons in a single pass.
+
+    Every neuron's values are read at once and written into a preallocated ``float64`` table, which holds the
+    integer columns exactly. Each column is then converted to its dtype and wrapped as a tensor without copying.
+
+    Args:
+        neurons (Sequence[Any]): The ``NeuronInfo`` or ``NeuronInfoLite`` objects.
+
+    Returns:
+        Dict[str, torch.Tensor]: The tensor of every metagraph attribute in :data:`NEURON_COLUMNS`.
+    """
+    getter = operator.attrgetter(*(attribute for _, attribute, _ in NEURON_COLUMNS))
+    table = numpy.fromiter(
+        itertools.chain.from_iterable(map(getter, neurons)),
+        dtype=numpy.float64,
+        count=len(neurons) * len(NEURON_COLUMNS),
+    ).reshape(len(neurons), len(NEURON_COLUMNS))
+    return {
+        name: torch.from_numpy(table[:, column].astype(_NUMPY_DTYPES[dtype]))
+        for column, (name, _, dtype) in enumerate(NEURON_COLUMNS)
+    }
+
+
+def sparse_rows(
+    rows: Sequence[Sequence[Sequence[int]]], n: int, attribute: str
+) -> torch.Tensor:
+    """
+    Builds a sparse COO matrix from the ``(uid, value)`` pairs of every neuron's ``weights`` or ``bonds`` in one
+    vectorized pass, without materializing the dense ``len(rows) x n`` matrix.
+
+    Weights rows are normalized to sum to one as ``float32``, like
+    :func:`bittensor.utils.weight_utils.convert_weight_uids_and_vals_to_tensor`. Bonds keep their ``int64`` values.
+
+    Args:
+        rows (Sequence[Sequence[Sequence[int]]]): The ``(uid, value)`` pairs of every neuron.
+        n (int): The number of columns, the number of neurons of the subnet.
+        attribute (str): ``weights`` or ``bonds``.
+
+    Returns:
+        torch.Tensor: The coalesced sparse COO matrix.
+
+    Raises:
+        ValueError: If a uid is outside of ``[0, n)``.
+    """
+    lengths = numpy.fromiter(map(len, rows), dtype=numpy.int64, count=len(rows))
+    pairs = numpy.fromiter(
+        itertools.chain.from_iterable(itertools.chain.from_iterable(rows)),
+        dtype=numpy.int64,
+        count=2 * int(lengths.sum()),
+    ).reshape(-1, 2)
+    if len(pairs) and (pairs[:, 0].min() < 0 or pairs[:, 0].max() >= n):
+        raise ValueError(f"Neuron {attribute} reference uids outside of [0, {n}).")
+    indices = torch.from_numpy(
+        numpy.stack(
+            [
+                numpy.repeat(numpy.arange(len(rows), dtype=numpy.int64), lengths),
+                pairs[:, 0],
+            ]
+        )
+    )
+    if attribute == "weights":
+        values = torch.from_numpy(pairs[:, 1].astype(numpy.float32))
+        row_sums = torch.zeros(len(rows), dtype=torch.float32).index_add_(
+            0, indices[0], values
+        )
+        row_sums[row_sums == 0] = 1
+        values = values / row_sums[indices[0]]
+    else:
+        values = torch.from_numpy(numpy.ascontiguousarray(pairs[:, 1]))
+    with warnings.catch_warnings():
+        # The indices were checked above, recent torch versions warn about skipping the check.
+        warnings.filterwarnings("ignore", message="Sparse invariant checks")
+        return torch.sparse_coo_tensor(indices, values, (len(rows), n)).coalesce()
 
 
 def get_save_dir(network: str, netuid: int) -> str:
@@ -248,6 +370,7 @@ class metagraph(torch.nn.Module):
 
         Returns:
             torch.nn.Parameter: A tensor representing the bonds held by each neuron, where each value signifies the proportion of bonds owned by one neuron in another.
+            It is a sparse COO tensor if the metagraph was synced with ``sparse=True``, see :func:`to_dense`.
         """
         return self.bonds
 
@@ -266,6 +389,7 @@ class metagraph(torch.nn.Module):
 
         Returns:
             torch.nn.Parameter: A tensor of inter-peer weights, where each element :math:`w_{ij}` represents the weight assigned by neuron :math:`i` to neuron :math:`j`. This matrix is fundamental to the network's functioning, influencing the distribution of incentives and the inter-neuronal dynamics.
+            It is a sparse COO tensor if the metagraph was synced with ``sparse=True``, see :func:`to_dense`.
         """
         return self.weights
 
@@ -381,7 +505,12 @@ class metagraph(torch.nn.Module):
         }
 
     def __init__(
-        self, netuid: int, network: str = "finney", lite: bool = True, sync: bool = True
+        self,
+        netuid: int,
+        network: str = "finney",
+        lite: bool = True,
+        sync: bool = True,
+        sparse: bool = False,
     ):
         """
         Initializes a new instance of the metagraph object, setting up the basic structure and parameters based on the provided arguments.
@@ -394,6 +523,7 @@ class metagraph(torch.nn.Module):
             network (str): The name of the network, which can indicate specific configurations or versions of the Bittensor network.
             lite (bool): A flag indicating whether to use a lite version of the metagraph. The lite version may contain less detailed information but can be quicker to initialize and sync.
             sync (bool): A flag indicating whether to synchronize the metagraph with the network upon initialization. Synchronization involves updating the metagraph's parameters to reflect the current state of the network.
+            sparse (bool): A flag indicating whether to keep the weights and bonds as sparse COO tensors instead of dense ``n x n`` matrices when syncing with ``lite=False``.
 
         Example:
             Initializing a metagraph object for the Bittensor network with a specific network UID::
@@ -459,14 +589,18 @@ class metagraph(torch.nn.Module):
             torch.tensor([], dtype=torch.int64), requires_grad=False
         )
         self.axons: List[AxonInfo] = []
+        self.changed_uids = torch.tensor([], dtype=torch.int64)
+        self.sparse = sparse
         if sync:
-            self.sync(block=None, lite=lite)
+            self.sync(block=None, lite=lite, sparse=sparse)
 
     def sync(
         self,
         block: Optional[int] = None,
         lite: bool = True,
         subtensor: Optional["bittensor.subtensor"] = None,
+        sparse: Optional[bool] = None,
+        incremental: bool = False,
     ):
         """
         Synchronizes the metagraph with the Bittensor network's current state. It updates the metagraph's attributes
@@ -480,6 +614,14 @@ class metagraph(torch.nn.Module):
             subtensor (Optional[bittensor.subtensor]): An instance of the subtensor class from Bittensor, providing an
                                                         interface to the underlying blockchain data. If provided, this
                                                         instance is used for data retrieval during synchronization.
+            sparse (Optional[bool]): If True, the weights and bonds are kept as sparse COO tensors, built without
+                                    materializing the dense matrices. Defaults to the ``sparse`` flag of the metagraph.
+            incremental (bool): If True, only the neurons whose storage changed since the last synced block are
+                                retrieved and patched into the existing tensors. Falls back to a full sync when the
+                                metagraph was not synced before, the number of neurons changed or the changes can
+                                not be retrieved. The uids that changed are set on ``changed_uids`` either way.
+                                Changes are cheapest to find on nodes serving unsafe RPC methods, see
+                                :func:`bittensor.subtensor.neuron_storage_changes`.
 
         Returns:
             metagraph: The metagraph instance, updated to the state of the specified block or the latest network state.
@@ -493,6 +635,12 @@ class metagraph(torch.nn.Module):
 
                 metagraph.sync(block=12345, lite=False, subtensor=subtensor)
 
+            Poll for changes every few blocks, only retrieving the neurons that changed::
+
+                metagraph.sync(subtensor=subtensor, incremental=True)
+                for uid in metagraph.changed_uids.tolist():
+                    ...
+
         NOTE:
             If attempting to access data beyond the previous 300 blocks, you **must** use the ``archive`` network for subtensor.
             Light nodes are configured only to store the previous 300 blocks if connecting to finney or test networks.
@@ -515,6 +663,14 @@ class metagraph(torch.nn.Module):
                     "Attempting to sync longer than 300 blocks ago on a non-archive node. Please use the 'archive' network for subtensor and retry."
                 )
 
+        # Patch the neurons that changed since the last sync, if possible
+        if (
+            incremental
+            and (sparse is None or sparse == self.sparse)
+            and self._sync_incremental(block, lite, subtensor)
+        ):
+            return
+
         # Assign neurons based on 'lite' flag
         self._assign_neurons(block, lite, subtensor)
 
@@ -522,8 +678,103 @@ class metagraph(torch.nn.Module):
         self._set_metagraph_attributes(block, subtensor)
 
         # If not a 'lite' version, compute and set weights and bonds for each neuron
+        if sparse is not None:
+            self.sparse = sparse
         if not lite:
             self._set_weights_and_bonds(subtensor=subtensor)
+        self.changed_uids = self.uids.detach().clone()
+
+    def _sync_incremental(self, block, lite, subtensor) -> bool:
+        """
+        Patches the neurons whose storage changed since the last synced block into the existing metagraph tensors.
+
+        Changes to the per neuron storage vectors, such as ranks or last updates, are applied from their new values.
+        Neurons whose own storage changed, their hotkey, stake, axon, weights or bonds, are retrieved again. Only the
+        rows of the changed uids are rewritten, and ``changed_uids`` is set to them.
+
+        Args:
+            block: The block number to synchronize with. If ``None``, the current block is used.
+            lite: A boolean flag indicating whether the metagraph is synced without weights and bonds.
+            subtensor: The subtensor instance used for fetching the changes from the network.
+
+        Returns:
+            bool: ``False`` if the metagraph has to be synced in full instead, ``True`` otherwise.
+
+        Internal Usage:
+            Used internally by :func:`sync` with ``incremental=True``::
+
+                if self._sync_incremental(block, lite, subtensor):
+                    return
+        """
+        from_block = self.block.item()
+        if (
+            getattr(self, "lite", None) != lite
+            or len(getattr(self, "neurons", [])) != self.n.item()
+            or self.n.item() == 0
+            or from_block == 0
+        ):
+            return False
+        if block is None:
+            block = subtensor.get_current_block()
+        if block < from_block:
+            return False
+        if block == from_block:
+            self.changed_uids = torch.tensor([], dtype=torch.int64)
+            return True
+
+        try:
+            changes = subtensor.neuron_storage_changes(
+                netuid=self.netuid,
+                hotkeys=self.hotkeys,
+                from_block=from_block,
+                block=block,
+                lite=lite,
+            )
+        except Exception as e:
+            bittensor.logging.warning(
+                f"Could not retrieve the metagraph changes since block {from_block}, syncing in full: {e}"
+            )
+            return False
+        if changes is None:
+            return False
+
+        for uid in changes.uids:
+            neuron = (
+                subtensor.neuron_for_uid_lite(uid=uid, netuid=self.netuid, block=block)
+                if lite
+                else subtensor.neuron_for_uid(uid=uid, netuid=self.netuid, block=block)
+            )
+            if neuron is None or neuron.is_null:
+                return False
+            self.neurons[uid] = neuron
+            self.axons[uid] = neuron.axon_info
+        for name, values in changes.vectors.items():
+            attribute, convert = STORAGE_ATTRIBUTES[name]
+            for uid, value in values.items():
+                setattr(self.neurons[uid], attribute, convert(value))
+
+        changed = sorted(
+            set(changes.uids).union(*(values for values in changes.vectors.values()))
+        )
+        self.block = self._create_tensor(block, dtype=torch.int64)
+        self.changed_uids = torch.tensor(changed, dtype=torch.int64)
+        if changed:
+            columns = neuron_columns([self.neurons[uid] for uid in changed])
+            for name, column in columns.items():
+                getattr(self, name).data[self.changed_uids] = column
+        if not lite and changes.uids:
+            if self.netuid == 0 or self.sparse:
+                self._set_weights_and_bonds(subtensor=subtensor)
+            else:
+                rows = torch.tensor(changes.uids, dtype=torch.int64)
+                for attribute in ("weights", "bonds"):
+                    getattr(self, attribute).data[
+                        rows
+                    ] = self._process_weights_or_bonds(
+                        [getattr(self.neurons[uid], attribute) for uid in changes.uids],
+                        attribute,
+                    ).data
+        return True
 
     def _initialize_subtensor(self, subtensor):
         """
@@ -595,45 +846,8 @@ class metagraph(torch.nn.Module):
         self.block = self._create_tensor(
             block if block else subtensor.block, dtype=torch.int64
         )
-        self.uids = self._create_tensor(
-            [neuron.uid for neuron in self.neurons], dtype=torch.int64
-        )
-        self.trust = self._create_tensor(
-            [neuron.trust for neuron in self.neurons], dtype=torch.float32
-        )
-        self.consensus = self._create_tensor(
-            [neuron.consensus for neuron in self.neurons], dtype=torch.float32
-        )
-        self.incentive = self._create_tensor(
-            [neuron.incentive for neuron in self.neurons], dtype=torch.float32
-        )
-        self.dividends = self._create_tensor(
-            [neuron.dividends for neuron in self.neurons], dtype=torch.float32
-        )
-        self.ranks = self._create_tensor(
-            [neuron.rank for neuron in self.neurons], dtype=torch.float32
-        )
-        self.emission = self._create_tensor(
-            [neuron.emission for neuron in self.neurons], dtype=torch.float32
-        )
-        self.active = self._create_tensor(
-            [neuron.active for neuron in self.neurons], dtype=torch.int64
-        )
-        self.last_update = self._create_tensor(
-            [neuron.last_update for neuron in self.neurons], dtype=torch.int64
-        )
-        self.validator_permit = self._create_tensor(
-            [neuron.validator_permit for neuron in self.neurons], dtype=torch.bool
-        )
-        self.validator_trust = self._create_tensor(
-            [neuron.validator_trust for neuron in self.neurons], dtype=torch.float32
-        )
-        self.total_stake = self._create_tensor(
-            [neuron.total_stake.tao for neuron in self.neurons], dtype=torch.float32
-        )
-        self.stake = self._create_tensor(
-            [neuron.stake for neuron in self.neurons], dtype=torch.float32
-        )
+        for name, tensor in neuron_columns(self.neurons).items():
+            setattr(self, name, torch.nn.Parameter(tensor, requires_grad=False))
         self.axons = [n.axon_info for n in self.neurons]
 
     def _create_tensor(self, data, dtype) -> torch.nn.Parameter:
@@ -670,9 +884,27 @@ class metagraph(torch.nn.Module):
         """
         # TODO: Check and test the computation of weights and bonds
         if self.netuid == 0:
+            # Root weights have one column per subnet, they are kept dense.
             self.weights = self._process_root_weights(
                 [neuron.weights for neuron in self.neurons], "weights", subtensor  # type: ignore
             )
+        elif self.sparse:
+            self.weights = torch.nn.Parameter(
+                sparse_rows(
+                    [neuron.weights for neuron in self.neurons],
+                    len(self.neurons),
+                    "weights",
+                ),
+                requires_grad=False,
+            )
+            self.bonds = torch.nn.Parameter(
+                sparse_rows(
+                    [neuron.bonds for neuron in self.neurons],
+                    len(self.neurons),
+                    "bonds",
+                ),
+                requires_grad=False,
+            )
         else:
             self.weights = self._process_weights_or_bonds(
                 [neuron.weights for neuron in self.neurons], "weights"
@@ -775,10 +1007,36 @@ class metagraph(torch.nn.Module):
             )
         return tensor_param
 
+    def to_dense(self) -> "metagraph":
+        """
+        Materializes sparse weights and bonds, as synced with ``sparse=True``, into dense matrices. Dense weights and
+        bonds are left untouched.
+
+        Returns:
+            metagraph: The metagraph instance with dense weights and bonds.
+
+        Example:
+            Sync sparse weights and only materialize them when a dense matrix is needed::
+
+                metagraph.sync(lite=False, sparse=True)
+                row = metagraph.W[uid].to_dense()
+                W = metagraph.to_dense().W
+        """
+        if self.weights.is_sparse:
+            self.weights = torch.nn.Parameter(
+                self.weights.to_dense(), requires_grad=False
+            )
+        if self.bonds.is_sparse:
+            self.bonds = torch.nn.Parameter(self.bonds.to_dense(), requires_grad=False)
+        self.sparse = False
+        return self
+
     def save(self) -> "metagraph":
         """
         Saves the current state of the metagraph to a file on disk. This function is crucial for persisting the current state of the network's metagraph, which can later be reloaded or analyzed. The save operation includes all neuron attributes and parameters, ensuring a complete snapshot of the metagraph's state.
 
+        The state is written as a columnar :mod:`bittensor.snapshot`, which is memory-mapped when loaded, so that processes loading the same snapshot share it instead of each holding a copy.
+
         Returns:
             metagraph: The metagraph instance after saving its state.
 
@@ -799,11 +1057,16 @@ class metagraph(torch.nn.Module):
         """
         save_directory = get_save_dir(self.network, self.netuid)
         os.makedirs(save_directory, exist_ok=True)
-        graph_file = save_directory + f"/block-{self.block.item()}.pt"
-        state_dict = self.state_dict()
-        state_dict["axons"] = self.axons
-        torch.save(state_dict, graph_file)
-        state_dict = torch.load(graph_file)
+        graph_file = save_directory + f"/block-{self.block.item()}.snapshot"
+        snapshot.write(
+            graph_file,
+            self.state_dict(),
+            meta={
+                "netuid": self.netuid,
+                "network": self.network,
+                "axons": [asdict(axon) for axon in self.axons],
+            },
+        )
         return self
 
     def load(self):
@@ -839,6 +1102,8 @@ class metagraph(torch.nn.Module):
 
         The method first identifies the latest block file in the specified directory, then loads the metagraph state including neuron attributes and parameters from this file. This ensures that the metagraph is accurately reconstituted to reflect the network state at the time of the saved block.
 
+        Snapshots written by :func:`save` are memory-mapped copy-on-write, their tensors being views into the file. Metagraphs saved with ``torch.save`` by earlier versions are still loaded.
+
         Args:
             dir_path (str): The directory path where the metagraph's state files are stored. This path should contain one or more saved state files, typically named in a format that includes the block number.
 
@@ -859,7 +1124,15 @@ class metagraph(torch.nn.Module):
             state files within it are accurate and consistent with the expected metagraph structure.
         """
         graph_file = latest_block_path(dir_path)
-        state_dict = torch.load(graph_file)
+        state_dict: Dict[str, Any]
+        if snapshot.is_snapshot(graph_file):
+            tensors, meta = snapshot.read(graph_file)
+            state_dict = dict(
+                tensors, axons=[AxonInfo(**axon) for axon in meta["axons"]]
+            )
+        else:
+            # Metagraphs saved by earlier versions are pickled state dicts.
+            state_dict = torch.load(graph_file, weights_only=False)
         self.n = torch.nn.Parameter(state_dict["n"], requires_grad=False)
         self.block = torch.nn.Parameter(state_dict["block"], requires_grad=False)
         self.uids = torch.nn.Parameter(state_dict["uids"], requires_grad=False)
@@ -897,4 +1170,6 @@ class metagraph(torch.nn.Module):
             )
         if "bonds" in state_dict:
             self.bonds = torch.nn.Parameter(state_dict["bonds"], requires_grad=False)
+        # Sparse weights and bonds are saved and loaded as they are.
+        self.sparse = self.weights.is_sparse or self.bonds.is_sparse
         return self
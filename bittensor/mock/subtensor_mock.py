@@ -24,18 +24,20 @@ from abc import abstractclassmethod
 from collections.abc import Mapping
 
 from hashlib import sha256
+from threading import local
 from ..wallet import wallet
 
 from ..chain_data import (
     NeuronInfo,
     NeuronInfoLite,
+    NeuronStorageChanges,
     PrometheusInfo,
     DelegateInfo,
     SubnetInfo,
     AxonInfo,
 )
 from ..errors import ChainQueryError
-from ..subtensor import subtensor
+from ..subtensor import subtensor, NEURON_VECTOR_STORAGE
 from ..utils import RAOPERTAO, U16_NORMALIZED_FLOAT
 from ..utils.balance import Balance
 from ..utils.registration import POWSolution
@@ -280,6 +282,7 @@ class MockSubtensor(subtensor):
             self.network = "mock"
             self.chain_endpoint = "mock_endpoint"
             self.substrate = MagicMock()
+            self._pinned = local()
 
     def __init__(self, *args, **kwargs) -> None:
         self.__dict__ = __GLOBAL_MOCK_STATE__
@@ -624,7 +627,7 @@ class MockSubtensor(subtensor):
             state_at_block = state.get(block, None)
             while state_at_block is None and block > 0:
                 block -= 1
-                state_at_block = self.state.get(block, None)
+                state_at_block = state.get(block, None)
             if state_at_block is not None:
                 return SimpleNamespace(value=state_at_block)
 
@@ -1004,6 +1007,61 @@ class MockSubtensor(subtensor):
 
         return neurons
 
+    def neuron_storage_changes(
+        self,
+        netuid: int,
+        hotkeys: List[str],
+        from_block: int,
+        block: Optional[int] = None,
+        lite: bool = True,
+    ) -> Optional[NeuronStorageChanges]:
+        if block:
+            if self.block_number < block:
+                raise Exception("Cannot query block in the future")
+
+        else:
+            block = self.block_number
+
+        subtensor_state = self.chain_state["SubtensorModule"]
+        if netuid not in subtensor_state["NetworksAdded"]:
+            raise Exception("Subnet does not exist")
+
+        def changed(storage: Dict[BlockNumber, Any]) -> bool:
+            return self._get_most_recent_storage(
+                storage, from_block
+            ) != self._get_most_recent_storage(storage, block)
+
+        if changed(subtensor_state["SubnetworkN"][netuid]):
+            return None
+
+        vectors: Dict[str, Dict[int, Any]] = {}
+        for name in NEURON_VECTOR_STORAGE:
+            values = {
+                uid: self._get_most_recent_storage(
+                    subtensor_state[name][netuid][uid], block
+                )
+                for uid in range(len(hotkeys))
+                if changed(subtensor_state[name][netuid][uid])
+            }
+            if values:
+                vectors[name] = values
+
+        uids = []
+        for uid, hotkey in enumerate(hotkeys):
+            storage = [
+                subtensor_state["Keys"][netuid][uid],
+                subtensor_state["Axons"][netuid].get(hotkey, {}),
+                subtensor_state["Prometheus"][netuid].get(hotkey, {}),
+                *subtensor_state["Stake"].get(hotkey, {}).values(),
+            ]
+            if not lite:
+                storage.append(subtensor_state["Weights"][netuid][uid])
+                storage.append(subtensor_state["Bonds"][netuid][uid])
+            if any(changed(item) for item in storage):
+                uids.append(uid)
+
+        return NeuronStorageChanges(block=block, vectors=vectors, uids=uids)
+
     # Extrinsics
     def _do_delegation(
         self,
@@ -0,0 +1,276 @@
+# The MIT License (MIT)
+# Copyright © 2023 Opentensor Foundation
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy of this software and associated
+# documentation files (the “Software”), to deal in the Software without restriction, including without limitation
+# the rights to use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies of the Software,
+# and to permit persons to whom the Software is furnished to do so, subject to the following conditions:
+
+# The above copyright notice and this permission notice shall be included in all copies or substantial portions of
+# the Software.
+
+# THE SOFTWARE IS PROVIDED “AS IS”, WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO
+# THE WARRANTIES OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL
+# THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION
+# OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER
+# DEALINGS IN THE SOFTWARE.
+
+import os
+import math
+import time
+import sqlite3
+import hashlib
+import threading
+
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import List, Optional, Tuple
+
+# The clock drift, in seconds, allowed between the dendrite and the axon.
+ALLOWED_DELTA = 4.0
+
+# The default age, in seconds, after which the axon rejects a wall clock nonce.
+DEFAULT_MAX_AGE = 60.0
+
+# Dendrites sign ``time.time_ns()`` nonces. Anything below this value comes from an older
+# dendrite signing ``time.monotonic_ns()`` (time since boot), which cannot be checked for freshness.
+WALL_CLOCK_NONCE_FLOOR = 10**18
+
+
+def is_wall_clock(nonce: int) -> bool:
+    """Returns ``True`` if ``nonce`` is a ``time.time_ns()`` timestamp, see :data:`WALL_CLOCK_NONCE_FLOOR`."""
+    return nonce >= WALL_CLOCK_NONCE_FLOOR
+
+
+def nonce_ttl(nonce: int, max_age: float) -> float:
+    """
+    Returns how long an accepted ``nonce`` must be remembered, from the axon's ``max_age`` alone. Request
+    fields such as the timeout are not signed, so they must not widen the replay window.
+
+    A wall clock nonce accepted now is at most :data:`ALLOWED_DELTA` seconds in the future, so it is stale
+    ``max_age + 2 * ALLOWED_DELTA`` seconds from now at the latest. Other nonces can not be aged out and are
+    remembered until the store runs out of capacity.
+    """
+    if not is_wall_clock(nonce):
+        return math.inf
+    return max_age + 2 * ALLOWED_DELTA
+
+
+def is_stale(nonce: int, max_age: float) -> bool:
+    """
+    Returns ``True`` if the wall clock ``nonce`` is older than ``max_age`` seconds, allowing for clock drift.
+
+    Once a nonce is stale the store may have evicted it, so the request must be rejected on age alone.
+    Nonces from older dendrites (see :data:`WALL_CLOCK_NONCE_FLOOR`) are never considered stale.
+    """
+    if not is_wall_clock(nonce):
+        return False
+    return nonce < time.time_ns() - int((max_age + ALLOWED_DELTA) * 1e9)
+
+
+def is_future(nonce: int) -> bool:
+    """Returns ``True`` if the wall clock ``nonce`` is further ahead of the local clock than the allowed drift."""
+    if not is_wall_clock(nonce):
+        return False
+    return nonce > time.time_ns() + int(ALLOWED_DELTA * 1e9)
+
+
+def _digest(key: str) -> bytes:
+    """Compacts an endpoint key (``"{hotkey}:{uuid}"``) into a fixed 16 byte digest."""
+    return hashlib.blake2b(key.encode(), digest_size=16).digest()
+
+
+class NonceStore(ABC):
+    """
+    Remembers the last nonce seen per endpoint key for axon replay protection.
+
+    Entries expire ``ttl`` seconds after they were last written, and the store never holds more
+    than ``capacity`` entries, evicting the least recently written ones first.
+    """
+
+    @abstractmethod
+    def get(self, key: str) -> Optional[int]:
+        """Returns the last nonce stored for ``key``, or ``None`` if unknown or expired."""
+        ...
+
+    @abstractmethod
+    def check_and_set(self, key: str, nonce: int, ttl: float) -> bool:
+        """
+        Atomically stores ``nonce`` for ``key`` if it is larger than the stored nonce.
+
+        Returns:
+            bool: ``True`` if the nonce was accepted, ``False`` if it is a replay.
+        """
+        ...
+
+    @abstractmethod
+    def __len__(self) -> int:
+        ...
+
+    def __contains__(self, key: str) -> bool:
+        return self.get(key) is not None
+
+    def __getitem__(self, key: str) -> int:
+        nonce = self.get(key)
+        if nonce is None:
+            raise KeyError(key)
+        return nonce
+
+    def close(self):
+        pass
+
+
+class _Shard:
+    def __init__(self, capacity: int):
+        self.capacity = capacity
+        self.lock = threading.Lock()
+        # digest -> (nonce, expires_at), ordered from least to most recently written.
+        self.entries: "OrderedDict[bytes, Tuple[int, float]]" = OrderedDict()
+
+    def evict(self, now: float):
+        while self.entries:
+            _, (_, expires_at) = next(iter(self.entries.items()))
+            if expires_at > now and len(self.entries) <= self.capacity:
+                break
+            self.entries.popitem(last=False)
+
+
+class MemoryNonceStore(NonceStore):
+    """
+    In process :class:`NonceStore` with a fixed number of entries split across independently locked shards.
+
+    Args:
+        capacity (int): Maximum number of endpoint keys remembered.
+        num_shards (int): Number of shards, each with its own lock.
+    """
+
+    def __init__(self, capacity: int = 100000, num_shards: int = 16):
+        if capacity <= 0:
+            raise ValueError("capacity must be greater than 0")
+        if num_shards <= 0:
+            raise ValueError("num_shards must be greater than 0")
+        self.capacity = capacity
+        self._shards: List[_Shard] = [
+            _Shard(max(1, capacity // num_shards)) for _ in range(num_shards)
+        ]
+
+    def _shard(self, digest: bytes) -> _Shard:
+        return self._shards[digest[0] % len(self._shards)]
+
+    def get(self, key: str) -> Optional[int]:
+        digest = _digest(key)
+        shard = self._shard(digest)
+        with shard.lock:
+            entry = shard.entries.get(digest)
+        if entry is None or entry[1] <= time.monotonic():
+            return None
+        return entry[0]
+
+    def check_and_set(self, key: str, nonce: int, ttl: float) -> bool:
+        digest = _digest(key)
+        shard = self._shard(digest)
+        now = time.monotonic()
+        with shard.lock:
+            entry = shard.entries.get(digest)
+            if entry is not None and entry[1] > now and nonce <= entry[0]:
+                return False
+            shard.entries[digest] = (nonce, now + ttl)
+            shard.entries.move_to_end(digest)
+            shard.evict(now)
+        return True
+
+    def __len__(self) -> int:
+        return sum(len(shard.entries) for shard in self._shards)
+
+
+class SQLiteNonceStore(NonceStore):
+    """
+    :class:`NonceStore` backed by a local SQLite file, shared by every axon process on the host that opens it.
+
+    Args:
+        path (str): Path of the database file.
+        capacity (int): Maximum number of endpoint keys remembered.
+        purge_interval (int): Number of writes between purges of expired and excess entries.
+    """
+
+    def __init__(self, path: str, capacity: int = 100000, purge_interval: int = 1024):
+        if capacity <= 0:
+            raise ValueError("capacity must be greater than 0")
+        self.path = os.path.expanduser(path)
+        self.capacity = capacity
+        self.purge_interval = purge_interval
+        self._writes = 0
+        self._local = threading.local()
+
+        connection = self._connection()
+        connection.execute("PRAGMA journal_mode=WAL")
+        connection.execute(
+            "CREATE TABLE IF NOT EXISTS nonces "
+            "(key BLOB PRIMARY KEY, nonce INTEGER NOT NULL, expires_at REAL NOT NULL) WITHOUT ROWID"
+        )
+        connection.execute(
+            "CREATE INDEX IF NOT EXISTS nonces_expires_at ON nonces (expires_at)"
+        )
+        connection.commit()
+
+    def _connection(self) -> sqlite3.Connection:
+        # sqlite3 connections may not be shared between threads, nor with forked axon workers.
+        connection = getattr(self._local, "connection", None)
+        if connection is None or self._local.pid != os.getpid():
+            connection = sqlite3.connect(self.path, timeout=5.0)
+            connection.execute("PRAGMA synchronous=NORMAL")
+            self._local.connection = connection
+            self._local.pid = os.getpid()
+        return connection
+
+    def get(self, key: str) -> Optional[int]:
+        row = (
+            self._connection()
+            .execute(
+                "SELECT nonce FROM nonces WHERE key = ? AND expires_at > ?",
+                (_digest(key), time.time()),
+            )
+            .fetchone()
+        )
+        return None if row is None else row[0]
+
+    def check_and_set(self, key: str, nonce: int, ttl: float) -> bool:
+        # Expiry uses wall clock time so that it is comparable between processes.
+        now = time.time()
+        connection = self._connection()
+        with connection:
+            cursor = connection.execute(
+                "INSERT INTO nonces (key, nonce, expires_at) VALUES (?, ?, ?) "
+                "ON CONFLICT (key) DO UPDATE SET nonce = excluded.nonce, expires_at = excluded.expires_at "
+                "WHERE excluded.nonce > nonces.nonce OR nonces.expires_at <= ?",
+                (_digest(key), nonce, now + ttl, now),
+            )
+            accepted = cursor.rowcount > 0
+
+        self._writes += 1
+        if self._writes % self.purge_interval == 0:
+            self.purge()
+        return accepted
+
+    def purge(self):
+        """Deletes expired entries, then the soonest to expire entries above ``capacity``."""
+        connection = self._connection()
+        with connection:
+            connection.execute(
+                "DELETE FROM nonces WHERE expires_at <= ?", (time.time(),)
+            )
+            connection.execute(
+                "DELETE FROM nonces WHERE key IN "
+                "(SELECT key FROM nonces ORDER BY expires_at "
+                "LIMIT max(0, (SELECT count(*) FROM nonces) - ?))",
+                (self.capacity,),
+            )
+
+    def __len__(self) -> int:
+        return self._connection().execute("SELECT count(*) FROM nonces").fetchone()[0]
+
+    def close(self):
+        connection = getattr(self._local, "connection", None)
+        if connection is not None:
+            connection.close()
+            self._local.connection = None
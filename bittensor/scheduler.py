@@ -0,0 +1,230 @@
+# The MIT License (MIT)
+# Copyright © 2023 Opentensor Foundation
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy of this software and associated
+# documentation files (the “Software”), to deal in the Software without restriction, including without limitation
+# the rights to use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies of the Software,
+# and to permit persons to whom the Software is furnished to do so, subject to the following conditions:
+
+# The above copyright notice and this permission notice shall be included in all copies or substantial portions of
+# the Software.
+
+# THE SOFTWARE IS PROVIDED “AS IS”, WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO
+# THE WARRANTIES OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL
+# THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION
+# OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER
+# DEALINGS IN THE SOFTWARE.
+
+import time
+import heapq
+import asyncio
+import itertools
+import contextlib
+
+from typing import AsyncIterator, Dict, List, Optional
+
+
+class AdmissionRejected(Exception):
+    r"""Raised when a request is shed by the :class:`AdmissionScheduler` instead of being run."""
+
+    pass
+
+
+class _Waiter:
+    __slots__ = ("priority", "seq", "name", "future", "removed")
+
+    def __init__(self, priority: float, seq: int, name: str, future: asyncio.Future):
+        self.priority = priority
+        self.seq = seq
+        self.name = name
+        self.future = future
+        self.removed = False
+
+    def __lt__(self, other: "_Waiter") -> bool:
+        # Highest priority first, then first come first served.
+        return (-self.priority, self.seq) < (-other.priority, other.seq)
+
+
+class AdmissionScheduler:
+    """
+    Admits axon forward calls in priority order through a bounded queue.
+
+    At most ``max_concurrency`` calls run at once, and at most ``limits[name]`` calls of synapse ``name``.
+    Requests beyond that wait in a priority queue and are started highest priority first as slots free up.
+    When the queue holds ``max_queue_size`` requests a new request either displaces the lowest priority
+    waiter, if it outranks it, or is rejected straight away, so that the axon sheds load early instead of
+    letting every request time out.
+
+    The scheduler lives on the axon's event loop and is not thread safe.
+
+    Args:
+        max_concurrency (int): Maximum number of forward calls running at once.
+        max_queue_size (int): Maximum number of requests waiting for a slot.
+
+    Example::
+
+        scheduler = AdmissionScheduler(max_concurrency=8, max_queue_size=64)
+        scheduler.set_limit("MySynapse", 2)
+        async with scheduler.slot("MySynapse", priority=stake, timeout=12) as queue_time:
+            await forward(synapse)
+    """
+
+    def __init__(self, max_concurrency: int = 10, max_queue_size: int = 256):
+        if max_concurrency <= 0:
+            raise ValueError("max_concurrency must be greater than 0")
+        if max_queue_size < 0:
+            raise ValueError("max_queue_size must not be negative")
+        self.max_concurrency = max_concurrency
+        self.max_queue_size = max_queue_size
+        self.limits: Dict[str, int] = {}
+
+        self._running = 0
+        self._running_by_name: Dict[str, int] = {}
+        self._queue: List[_Waiter] = []
+        self._queued = 0
+        self._seq = itertools.count()
+
+        self.admitted = 0
+        self.shed = 0
+        self.expired = 0
+
+    def set_limit(self, name: str, limit: Optional[int]):
+        """Caps the number of concurrently running calls of synapse ``name``. ``None`` removes the cap."""
+        if limit is None:
+            self.limits.pop(name, None)
+        elif limit <= 0:
+            raise ValueError("limit must be greater than 0")
+        else:
+            self.limits[name] = limit
+        self._dispatch()
+
+    def _has_capacity(self, name: str) -> bool:
+        if self._running >= self.max_concurrency:
+            return False
+        limit = self.limits.get(name)
+        return limit is None or self._running_by_name.get(name, 0) < limit
+
+    def _start(self, name: str):
+        self._running += 1
+        self._running_by_name[name] = self._running_by_name.get(name, 0) + 1
+        self.admitted += 1
+
+    def _lowest(self) -> Optional[_Waiter]:
+        waiters = [waiter for waiter in self._queue if not waiter.removed]
+        return max(waiters) if waiters else None
+
+    def _drop(self, waiter: _Waiter):
+        # Lazy deletion, the entry is skipped once it reaches the top of the heap.
+        if not waiter.removed:
+            waiter.removed = True
+            self._queued -= 1
+
+    async def acquire(
+        self, name: str, priority: float = 0.0, timeout: Optional[float] = None
+    ) -> float:
+        """
+        Waits for a slot to run a call of synapse ``name``.
+
+        Args:
+            name (str): Synapse name, used for per synapse limits.
+            priority (float): Higher priorities are admitted first.
+            timeout (float, optional): Maximum time to wait in the queue.
+
+        Returns:
+            float: Time spent waiting in the queue, in seconds.
+
+        Raises:
+            AdmissionRejected: If the queue is full or the request waited longer than ``timeout``.
+        """
+        # Waiters only remain queued while they are over their limits, so free capacity can be taken directly.
+        if self._has_capacity(name):
+            self._start(name)
+            return 0.0
+
+        if self._queued >= self.max_queue_size:
+            lowest = self._lowest()
+            if lowest is None or not priority > lowest.priority:
+                self.shed += 1
+                raise AdmissionRejected(
+                    f"Axon is overloaded, {self._queued} requests are already queued."
+                )
+            self._drop(lowest)
+            self.shed += 1
+            lowest.future.set_exception(
+                AdmissionRejected(
+                    "Axon is overloaded, request was displaced by a higher priority request."
+                )
+            )
+
+        start = time.monotonic()
+        waiter = _Waiter(
+            priority, next(self._seq), name, asyncio.get_running_loop().create_future()
+        )
+        heapq.heappush(self._queue, waiter)
+        self._queued += 1
+        try:
+            await asyncio.wait_for(asyncio.shield(waiter.future), timeout)
+        except asyncio.TimeoutError:
+            self._abandon(waiter)
+            self.expired += 1
+            raise AdmissionRejected(
+                f"Request waited more than {timeout}s in the axon queue."
+            )
+        except asyncio.CancelledError:
+            self._abandon(waiter)
+            raise
+        return time.monotonic() - start
+
+    def _abandon(self, waiter: _Waiter):
+        if waiter.future.done() and not waiter.future.exception():
+            # The slot was handed over while the waiter gave up, pass it on.
+            self.release(waiter.name)
+        else:
+            self._drop(waiter)
+
+    def release(self, name: str):
+        """Frees the slot held by a call of synapse ``name`` and admits the next eligible waiters."""
+        self._running -= 1
+        self._running_by_name[name] -= 1
+        if self._running_by_name[name] == 0:
+            del self._running_by_name[name]
+        self._dispatch()
+
+    def _dispatch(self):
+        # Waiters blocked by their synapse limit keep their place while lower priority ones of other synapses run.
+        blocked: List[_Waiter] = []
+        while self._queue and self._running < self.max_concurrency:
+            waiter = heapq.heappop(self._queue)
+            if waiter.removed:
+                continue
+            if not self._has_capacity(waiter.name):
+                blocked.append(waiter)
+                continue
+            self._queued -= 1
+            waiter.removed = True
+            self._start(waiter.name)
+            waiter.future.set_result(None)
+        for waiter in blocked:
+            heapq.heappush(self._queue, waiter)
+
+    @contextlib.asynccontextmanager
+    async def slot(
+        self, name: str, priority: float = 0.0, timeout: Optional[float] = None
+    ) -> AsyncIterator[float]:
+        """Context manager around :func:`acquire` and :func:`release`, yielding the queue wait time."""
+        queue_time = await self.acquire(name, priority, timeout)
+        try:
+            yield queue_time
+        finally:
+            self.release(name)
+
+    @property
+    def stats(self) -> Dict[str, int]:
+        """Counters for the running calls, queue depth and shed requests."""
+        return {
+            "running": self._running,
+            "queued": self._queued,
+            "admitted": self.admitted,
+            "shed": self.shed,
+            "expired": self.expired,
+        }
@@ -0,0 +1,193 @@
+# The MIT License (MIT)
+# Copyright © 2023 Opentensor Foundation
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy of this software and associated
+# documentation files (the “Software”), to deal in the Software without restriction, including without limitation
+# the rights to use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies of the Software,
+# and to permit persons to whom the Software is furnished to do so, subject to the following conditions:
+
+# The above copyright notice and this permission notice shall be included in all copies or substantial portions of
+# the Software.
+
+# THE SOFTWARE IS PROVIDED “AS IS”, WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO
+# THE WARRANTIES OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL
+# THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION
+# OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER
+# DEALINGS IN THE SOFTWARE.
+
+"""
+Columnar snapshot files for metagraphs.
+
+A snapshot holds named tensors as raw, aligned arrays in one contiguous file::
+
+    b"BTMS" | format version (uint32) | header length (uint32) | header (JSON) | padding | arrays
+
+The header carries the caller's metadata under ``"meta"`` and describes every tensor under ``"tensors"`` by
+its dtype, shape and offset, each array aligned to :data:`ALIGNMENT` bytes. Sparse COO tensors are stored as
+their ``indices`` and ``values`` arrays.
+
+Snapshots are read through a copy-on-write memory map, tensors being views into the mapped file. Processes
+loading the same snapshot share its pages in the page cache instead of each holding a copy, and only the
+pages a process writes to are copied.
+"""
+
+import os
+import struct
+import tempfile
+import numpy
+import torch
+
+from typing import Any, Dict, List, Tuple
+from bittensor import codec
+
+MAGIC = b"BTMS"
+VERSION = 1
+ALIGNMENT = 64
+
+_PREFIX = struct.Struct("<II")
+_PADDING = bytes(ALIGNMENT)
+
+
+class SnapshotError(ValueError):
+    r"""Raised when a file is not a valid snapshot, or was written with a newer format version."""
+
+    pass
+
+
+def is_snapshot(path: str) -> bool:
+    """Returns whether the file at ``path`` is a snapshot."""
+    with open(path, "rb") as file:
+        return file.read(len(MAGIC)) == MAGIC
+
+
+def write(path: str, tensors: Dict[str, torch.Tensor], meta: Dict[str, Any]):
+    """
+    Writes ``tensors`` and ``meta`` to a snapshot at ``path``. The file is replaced atomically, so readers never
+    see a partially written snapshot.
+
+    Args:
+        path (str): The snapshot file.
+        tensors (Dict[str, torch.Tensor]): The dense or sparse COO tensors to store.
+        meta (Dict[str, Any]): JSON serializable metadata.
+    """
+    buffers: List[memoryview] = []
+    offset = 0
+
+    def describe(tensor: torch.Tensor) -> Dict[str, Any]:
+        nonlocal offset
+        array = numpy.ascontiguousarray(tensor.detach().cpu().numpy())
+        buffer = memoryview(array.reshape(-1).view(numpy.uint8))
+        description = {
+            "dtype": array.dtype.str,
+            "shape": list(tensor.shape),
+            "offset": offset,
+        }
+        buffers.append(buffer)
+        offset += buffer.nbytes + (-buffer.nbytes % ALIGNMENT)
+        return description
+
+    descriptions: Dict[str, Dict[str, Any]] = {}
+    for name, tensor in tensors.items():
+        if tensor.is_sparse:
+            tensor = tensor.coalesce()
+            descriptions[name] = {
+                "sparse": True,
+                "shape": list(tensor.shape),
+                "indices": describe(tensor.indices()),
+                "values": describe(tensor.values()),
+            }
+        else:
+            descriptions[name] = describe(tensor)
+
+    header = codec.dumps({"meta": meta, "tensors": descriptions})
+    start = len(MAGIC) + _PREFIX.size + len(header)
+
+    descriptor, temporary_path = tempfile.mkstemp(
+        prefix=".snapshot", suffix=".tmp", dir=os.path.dirname(path) or None
+    )
+    try:
+        # Snapshots are shared between processes, mkstemp only lets the owner read the file.
+        os.fchmod(descriptor, 0o644)
+        with os.fdopen(descriptor, "wb") as file:
+            file.write(MAGIC)
+            file.write(_PREFIX.pack(VERSION, len(header)))
+            file.write(header)
+            file.write(_PADDING[: -start % ALIGNMENT])
+            for buffer in buffers:
+                file.write(buffer)
+                file.write(_PADDING[: -buffer.nbytes % ALIGNMENT])
+        os.replace(temporary_path, path)
+    except BaseException:
+        os.unlink(temporary_path)
+        raise
+
+
+def read(
+    path: str, mmap: bool = True
+) -> Tuple[Dict[str, torch.Tensor], Dict[str, Any]]:
+    """
+    Reads a snapshot.
+
+    Args:
+        path (str): The snapshot file.
+        mmap (bool): If ``True``, dense tensors are views into a copy-on-write memory map of the file. Otherwise the
+            file is read into memory.
+
+    Returns:
+        Tuple[Dict[str, torch.Tensor], Dict[str, Any]]: The tensors and the metadata.
+
+    Raises:
+        SnapshotError: If the file is not a valid snapshot, or was written with a newer format version.
+    """
+    data: numpy.ndarray
+    if mmap:
+        data = numpy.memmap(path, dtype=numpy.uint8, mode="c")
+    else:
+        with open(path, "rb") as file:
+            data = numpy.frombuffer(bytearray(file.read()), dtype=numpy.uint8)
+
+    if bytes(data[: len(MAGIC)]) != MAGIC:
+        raise SnapshotError(f"{path} is not a metagraph snapshot.")
+    try:
+        version, length = _PREFIX.unpack_from(
+            bytes(data[: len(MAGIC) + _PREFIX.size]), len(MAGIC)
+        )
+    except struct.error as e:
+        raise SnapshotError(f"Malformed metagraph snapshot {path}: {e}") from e
+    if version > VERSION:
+        raise SnapshotError(
+            f"{path} was written with snapshot format version {version}, this version reads up to {VERSION}."
+        )
+
+    try:
+        start = len(MAGIC) + _PREFIX.size
+        header = codec.loads(bytes(data[start : start + length]))
+        start += length
+        start += -start % ALIGNMENT
+
+        def rebuild(description: Dict[str, Any]) -> torch.Tensor:
+            dtype = numpy.dtype(description["dtype"])
+            shape = description["shape"]
+            offset = start + description["offset"]
+            nbytes = int(numpy.prod(shape, dtype=numpy.int64)) * dtype.itemsize
+            if offset + nbytes > len(data):
+                raise SnapshotError(f"Tensor exceeds the snapshot {path}.")
+            return torch.from_numpy(
+                data[offset : offset + nbytes].view(dtype).reshape(shape)
+            )
+
+        tensors: Dict[str, torch.Tensor] = {}
+        for name, description in header["tensors"].items():
+            if description.get("sparse"):
+                tensors[name] = torch.sparse_coo_tensor(
+                    rebuild(description["indices"]),
+                    rebuild(description["values"]),
+                    description["shape"],
+                ).coalesce()
+            else:
+                tensors[name] = rebuild(description)
+    except SnapshotError:
+        raise
+    except Exception as e:
+        raise SnapshotError(f"Malformed metagraph snapshot {path}: {e}") from e
+    return tensors, header["meta"]
@@ -1,9 +1,11 @@
+import codecs
+import asyncio
 from aiohttp import ClientResponse
 import bittensor
 
 from starlette.responses import StreamingResponse as _StreamingResponse
-from starlette.types import Send, Receive, Scope
-from typing import Callable, Awaitable
+from starlette.types import Message, Send, Receive, Scope
+from typing import AsyncIterator, Callable, Awaitable, Optional
 from pydantic import BaseModel
 from abc import ABC, abstractmethod
 
@@ -29,6 +31,128 @@ class BTStreamingResponseModel(BaseModel):
     token_streamer: Callable[[Send], Awaitable[None]]
 
 
+class BufferedSend:
+    """
+    :func:`BufferedSend` is the send callable handed to token streamers by :func:`BTStreamingResponse`. It coalesces
+    the body messages of the token streamer into chunks of up to ``max_chunk_size`` bytes, each sent at the latest
+    ``max_delay`` seconds after its first byte was buffered, instead of sending every token as its own HTTP chunk.
+
+    Chunks wait in a bounded queue of ``max_buffered_chunks`` until the ASGI server has room to send them, which it
+    only has once the client read the previous ones. A token streamer producing tokens faster than the client consumes
+    them is therefore paused on ``await send(...)`` instead of buffering without limit.
+
+    Args:
+        send: The ASGI send callable of the response.
+        max_chunk_size (int): Size in bytes from which the buffered tokens are sent as a chunk.
+        max_delay (float): Maximum time in seconds a token is buffered before it is sent.
+        max_buffered_chunks (int): Maximum number of chunks waiting to be sent.
+    """
+
+    def __init__(
+        self,
+        send: Send,
+        max_chunk_size: int = 4096,
+        max_delay: float = 0.02,
+        max_buffered_chunks: int = 16,
+    ):
+        self._send = send
+        self.max_chunk_size = max_chunk_size
+        self.max_delay = max_delay
+        self._buffer = bytearray()
+        self._buffered_at = 0.0
+        # Set when the first byte enters the empty buffer, so that the writer starts waiting for ``max_delay``.
+        self._buffered = asyncio.Event()
+        self._queue: asyncio.Queue = asyncio.Queue(maxsize=max_buffered_chunks)
+        self._writer: Optional[asyncio.Task] = None
+
+    async def __call__(self, message: Message):
+        """
+        Buffers a body message of the token streamer. Other messages, and the last body message, are sent after
+        the buffered tokens.
+        """
+        if self._writer is None:
+            self._writer = asyncio.create_task(self._write())
+        if message["type"] != "http.response.body" or not message.get(
+            "more_body", False
+        ):
+            await self._put_buffer()
+            await self._queue.put(message)
+            return
+        if not self._buffer:
+            self._buffered_at = asyncio.get_running_loop().time()
+            self._buffered.set()
+        self._buffer += message.get("body", b"")
+        if len(self._buffer) >= self.max_chunk_size:
+            await self._put_buffer()
+
+    async def _put_buffer(self):
+        if self._buffer:
+            body, self._buffer = bytes(self._buffer), bytearray()
+            await self._queue.put(
+                {"type": "http.response.body", "body": body, "more_body": True}
+            )
+
+    async def _write(self):
+        loop = asyncio.get_running_loop()
+        # The pending get is kept across timeouts, cancelling it could lose a message.
+        get: Optional[asyncio.Future] = None
+        buffered: Optional[asyncio.Future] = None
+        try:
+            while True:
+                if get is None:
+                    get = asyncio.ensure_future(self._queue.get())
+                if self._buffer:
+                    timeout: Optional[float] = (
+                        self._buffered_at + self.max_delay - loop.time()
+                    )
+                    waiting = {get}
+                else:
+                    # Nothing to flush until a token is buffered, which restarts the wait with its deadline.
+                    if buffered is None:
+                        buffered = asyncio.ensure_future(self._buffered.wait())
+                    timeout, waiting = None, {get, buffered}
+                done, _ = await asyncio.wait(
+                    waiting, timeout=timeout, return_when=asyncio.FIRST_COMPLETED
+                )
+                if buffered in done:
+                    buffered = None
+                    self._buffered.clear()
+                if get in done:
+                    message, get = get.result(), None
+                elif done:
+                    continue
+                else:
+                    # Nothing was queued in time, so the buffer holds the latest tokens.
+                    body, self._buffer = bytes(self._buffer), bytearray()
+                    message = {
+                        "type": "http.response.body",
+                        "body": body,
+                        "more_body": True,
+                    }
+                if message is None:
+                    return
+                await self._send(message)
+        finally:
+            for future in (get, buffered):
+                if future is not None:
+                    future.cancel()
+
+    async def flush(self):
+        """Sends the buffered tokens and waits until every queued message was sent."""
+        if self._writer is None:
+            return
+        await self._put_buffer()
+        await self._queue.put(None)
+        writer, self._writer = self._writer, None
+        await writer
+
+    def cancel(self):
+        """Stops sending, dropping the buffered tokens."""
+        if self._writer is not None:
+            self._writer.cancel()
+            self._writer = None
+
+
 class StreamingSynapse(bittensor.Synapse, ABC):
     """
     The :func:`StreamingSynapse` class is designed to be subclassed for handling streaming responses in the Bittensor network.
@@ -50,16 +174,29 @@ class StreamingSynapse(bittensor.Synapse, ABC):
         provided by the subclass.
         """
 
-        def __init__(self, model: BTStreamingResponseModel, **kwargs):
+        def __init__(
+            self,
+            model: BTStreamingResponseModel,
+            max_chunk_size: int = 4096,
+            max_delay: float = 0.02,
+            max_buffered_chunks: int = 16,
+            **kwargs,
+        ):
             """
             Initializes the BTStreamingResponse with the given token streamer model.
 
             Args:
                 model: A BTStreamingResponseModel instance containing the token streamer callable, which is responsible for generating the content of the response.
+                max_chunk_size: Size in bytes from which buffered tokens are sent as a chunk, see :func:`BufferedSend`.
+                max_delay: Maximum time in seconds a token is buffered before it is sent.
+                max_buffered_chunks: Maximum number of chunks waiting for the client, beyond which the token streamer is paused.
                 **kwargs: Additional keyword arguments passed to the parent StreamingResponse class.
             """
             super().__init__(content=iter(()), **kwargs)
             self.token_streamer = model.token_streamer
+            self.max_chunk_size = max_chunk_size
+            self.max_delay = max_delay
+            self.max_buffered_chunks = max_buffered_chunks
 
         async def stream_response(self, send: Send):
             """
@@ -67,7 +204,8 @@ class StreamingSynapse(bittensor.Synapse, ABC):
 
             This method is responsible for initiating the response by sending the appropriate headers, including the
             content type for event-streaming. It then calls the token streamer to generate the content and sends the
-            response body to the client.
+            response body to the client. The token streamer sends through a :func:`BufferedSend`, which batches its
+            tokens into chunks and pauses it while the client is not keeping up.
 
             Args:
                 send: A callable to send the response, provided by the ASGI server.
@@ -78,24 +216,58 @@ class StreamingSynapse(bittensor.Synapse, ABC):
                 {"type": "http.response.start", "status": 200, "headers": headers}
             )
 
-            await self.token_streamer(send)
+            buffered_send = BufferedSend(
+                send, self.max_chunk_size, self.max_delay, self.max_buffered_chunks
+            )
+            try:
+                await self.token_streamer(buffered_send)
+                await buffered_send.flush()
+            finally:
+                buffered_send.cancel()
 
             await send({"type": "http.response.body", "body": b"", "more_body": False})
 
+        async def listen_for_disconnect(self, receive: Receive):
+            """
+            Waits until the client disconnects.
+
+            Args:
+                receive: A callable to receive messages from the client, provided by the ASGI server.
+            """
+            while True:
+                message = await receive()
+                if message["type"] == "http.disconnect":
+                    break
+
         async def __call__(self, scope: Scope, receive: Receive, send: Send):
             """
             Asynchronously calls the stream_response method, allowing the BTStreamingResponse object to be used as an ASGI
             application.
 
             This method is part of the ASGI interface and is called by the ASGI server to handle the request and send the
-            response. It delegates to the :func:`stream_response` method to perform the actual streaming process.
+            response. It delegates to the :func:`stream_response` method to perform the actual streaming process, which is
+            cancelled together with the token streamer if the client disconnects first.
 
             Args:
                 scope: The scope of the request, containing information about the client, server, and request itself.
                 receive: A callable to receive the request, provided by the ASGI server.
                 send: A callable to send the response, provided by the ASGI server.
             """
-            await self.stream_response(send)
+            stream = asyncio.ensure_future(self.stream_response(send))
+            disconnect = asyncio.ensure_future(self.listen_for_disconnect(receive))
+            try:
+                await asyncio.wait(
+                    {stream, disconnect}, return_when=asyncio.FIRST_COMPLETED
+                )
+            finally:
+                disconnect.cancel()
+                if not stream.done():
+                    bittensor.logging.trace("Client disconnected, streaming cancelled")
+                    stream.cancel()
+                    await asyncio.gather(stream, return_exceptions=True)
+            if not stream.cancelled():
+                # Raises the exception of the token streamer, if any.
+                stream.result()
 
     @abstractmethod
     async def process_streaming_response(self, response: ClientResponse):
@@ -110,6 +282,38 @@ class StreamingSynapse(bittensor.Synapse, ABC):
         """
         ...
 
+    @staticmethod
+    async def iter_text(
+        response: ClientResponse, delimiter: Optional[str] = "\n"
+    ) -> AsyncIterator[str]:
+        """
+        Helper for :func:`process_streaming_response` implementations, which yields the text of a streaming response
+        as it arrives. Chunks are decoded incrementally, so that characters split across network chunks are decoded
+        correctly, and only the unfinished tail of the text is kept in memory.
+
+        Args:
+            response: The streaming response.
+            delimiter: If set, only complete messages ending with ``delimiter`` are yielded, without the delimiter,
+                followed by the remaining text once the response ends. If ``None``, the text is yielded as it arrives.
+
+        Yields:
+            str: The decoded messages or text.
+        """
+        decoder = codecs.getincrementaldecoder("utf-8")()
+        pending = ""
+        async for chunk in response.content.iter_any():
+            text = decoder.decode(chunk)
+            if delimiter is None:
+                if text:
+                    yield text
+                continue
+            *messages, pending = (pending + text).split(delimiter)
+            for message in messages:
+                yield message
+        pending += decoder.decode(b"", final=True)
+        if pending:
+            yield pending
+
     @abstractmethod
     def extract_response_json(self, response: ClientResponse) -> dict:
         """
@@ -124,7 +328,11 @@ class StreamingSynapse(bittensor.Synapse, ABC):
         ...
 
     def create_streaming_response(
-        self, token_streamer: Callable[[Send], Awaitable[None]]
+        self,
+        token_streamer: Callable[[Send], Awaitable[None]],
+        max_chunk_size: int = 4096,
+        max_delay: float = 0.02,
+        max_buffered_chunks: int = 16,
     ) -> BTStreamingResponse:
         """
         Creates a streaming response using the provided token streamer.
@@ -132,12 +340,23 @@ class StreamingSynapse(bittensor.Synapse, ABC):
         The token streamer should be implemented to generate the content of the response according to the specific
         requirements of the subclass.
 
+        Tokens sent by the token streamer are batched into chunks of up to ``max_chunk_size`` bytes, sent at the latest
+        ``max_delay`` seconds after they were produced. Set ``max_chunk_size`` to ``0`` to send every token as its own chunk.
+
         Args:
             token_streamer: A callable that takes a send function and returns an awaitable. It's responsible for generating the content of the response.
+            max_chunk_size: Size in bytes from which buffered tokens are sent as a chunk.
+            max_delay: Maximum time in seconds a token is buffered before it is sent.
+            max_buffered_chunks: Maximum number of chunks waiting for the client, beyond which the token streamer is paused.
 
         Returns:
             BTStreamingResponse: The streaming response object, ready to be sent to the client.
         """
         model_instance = BTStreamingResponseModel(token_streamer=token_streamer)
 
-        return self.BTStreamingResponse(model_instance)
+        return self.BTStreamingResponse(
+            model_instance,
+            max_chunk_size=max_chunk_size,
+            max_delay=max_delay,
+            max_buffered_chunks=max_buffered_chunks,
+        )
@@ -0,0 +1,249 @@
+# The MIT License (MIT)
+# Copyright © 2023 Opentensor Foundation
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy of this software and associated
+# documentation files (the “Software”), to deal in the Software without restriction, including without limitation
+# the rights to use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies of the Software,
+# and to permit persons to whom the Software is furnished to do so, subject to the following conditions:
+
+# The above copyright notice and this permission notice shall be included in all copies or substantial portions of
+# the Software.
+
+# THE SOFTWARE IS PROVIDED “AS IS”, WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO
+# THE WARRANTIES OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL
+# THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION
+# OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER
+# DEALINGS IN THE SOFTWARE.
+
+"""
+A pool of websocket connections to a subtensor node.
+
+:class:`SubstratePool` stands in for a single ``SubstrateInterface``. Every thread using the pool is routed to
+a connection of its own while the pool has fewer than ``size`` connections, so threads such as a validator's
+metagraph sync and its weight setting query the chain concurrently. Once the pool is full, threads share the
+least used connection and take turns on it, one call at a time.
+
+A connection left idle for ``health_check_interval`` seconds is checked with a ``system_health`` request before
+its next use, so a connection silently dropped by the network fails fast instead of after the websocket timeout.
+Connections failing a call are reconnected with jittered exponential backoff.
+"""
+
+import time
+import random
+import weakref
+import functools
+import threading
+import bittensor
+
+from typing import Any, Callable, List, Optional
+from websocket import WebSocketConnectionClosedException, WebSocketTimeoutException
+from substrateinterface.base import SubstrateInterface
+
+# The errors after which a connection is considered dropped and is reconnected.
+CONNECTION_ERRORS = (
+    WebSocketConnectionClosedException,
+    WebSocketTimeoutException,
+    ConnectionError,
+    TimeoutError,
+)
+
+# Calls which are not repeated after a reconnect, as they may have reached the chain before the connection dropped.
+NOT_RETRIED = frozenset(["submit_extrinsic"])
+
+
+def _alive(thread: Optional[threading.Thread]) -> bool:
+    return thread is not None and thread.is_alive()
+
+
+class _Connection:
+    def __init__(self, substrate: SubstrateInterface):
+        self.substrate = substrate
+        # Held for the duration of every call, re-entrant for ``with pool:`` blocks.
+        self.lock = threading.RLock()
+        self.threads: List[weakref.ref] = []
+        self.last_used = time.monotonic()
+
+    def load(self) -> int:
+        """Returns the number of live threads routed to this connection, forgetting the others."""
+        self.threads = [ref for ref in self.threads if _alive(ref())]
+        return len(self.threads)
+
+
+class SubstratePool:
+    """
+    A pool of ``SubstrateInterface`` connections behaving as one. Attributes and methods are looked up on the
+    connection of the calling thread, and calls hold that connection until they return.
+
+    The first connection is opened on construction, so connection errors are raised right away. The others are
+    only opened once another thread uses the pool.
+
+    Args:
+        factory (Callable[[], SubstrateInterface]): Opens a new connection.
+        size (int): The maximum number of connections.
+        timeout (float): The websocket timeout of the connections, in seconds.
+        health_check_interval (float): The idle time, in seconds, after which a connection is checked before use.
+        health_check_timeout (float): The time, in seconds, a health check waits for the node to answer.
+        max_reconnect_attempts (int): The number of reconnection attempts before giving up.
+        backoff_base (float): The delay, in seconds, before the second reconnection attempt, doubling for every
+            following attempt.
+        backoff_max (float): The maximum delay, in seconds, between reconnection attempts.
+
+    Example::
+
+        pool = SubstratePool(lambda: SubstrateInterface(url="ws://127.0.0.1:9944"), size=4)
+        block = pool.get_block_number(None)
+
+        # Several calls on the same connection, without other threads taking turns in between.
+        with pool as substrate:
+            call = substrate.compose_call(...)
+            extrinsic = substrate.create_signed_extrinsic(call=call, keypair=keypair)
+    """
+
+    def __init__(
+        self,
+        factory: Callable[[], SubstrateInterface],
+        size: int = 4,
+        timeout: float = 600.0,
+        health_check_interval: float = 60.0,
+        health_check_timeout: float = 10.0,
+        max_reconnect_attempts: int = 5,
+        backoff_base: float = 0.5,
+        backoff_max: float = 30.0,
+    ):
+        if size < 1:
+            raise ValueError(f"The pool size must be at least 1, got {size}.")
+        self.factory = factory
+        self.size = size
+        self.timeout = timeout
+        self.health_check_interval = health_check_interval
+        self.health_check_timeout = health_check_timeout
+        self.max_reconnect_attempts = max_reconnect_attempts
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._connections: List[_Connection] = [self._open()]
+
+    @property
+    def connections(self) -> List[SubstrateInterface]:
+        """The open connections."""
+        return [connection.substrate for connection in self._connections]
+
+    def _open(self) -> _Connection:
+        substrate = self.factory()
+        self._set_timeout(substrate, self.timeout)
+        return _Connection(substrate)
+
+    @staticmethod
+    def _set_timeout(substrate: SubstrateInterface, timeout: float):
+        try:
+            substrate.websocket.settimeout(timeout)
+        except:
+            bittensor.logging.warning("Could not set websocket timeout.")
+
+    def _connection(self) -> _Connection:
+        """Returns the connection of the current thread, routing the thread to one on its first call."""
+        connection: Optional[_Connection] = getattr(self._local, "connection", None)
+        if connection is not None:
+            return connection
+        with self._lock:
+            loads = [
+                (connection.load(), connection) for connection in self._connections
+            ]
+            idle = [connection for load, connection in loads if load == 0]
+            if idle:
+                connection = idle[0]
+            elif len(self._connections) < self.size:
+                connection = self._open()
+                self._connections.append(connection)
+            else:
+                connection = min(loads, key=lambda item: item[0])[1]
+            connection.threads.append(weakref.ref(threading.current_thread()))
+        self._local.connection = connection
+        return connection
+
+    def _check(self, connection: _Connection):
+        """Reconnects ``connection`` if it does not answer a health check."""
+        try:
+            self._set_timeout(connection.substrate, self.health_check_timeout)
+            connection.substrate.rpc_request("system_health", [])
+            self._set_timeout(connection.substrate, self.timeout)
+        except Exception as e:
+            bittensor.logging.warning(
+                f"Subtensor connection failed its health check: {e}"
+            )
+            self._reconnect(connection)
+
+    def _reconnect(self, connection: _Connection):
+        """
+        Reconnects the websocket of ``connection``, waiting a jittered, exponentially growing delay between attempts.
+
+        Raises:
+            Exception: The error of the last attempt, once all attempts failed.
+        """
+        for attempt in range(self.max_reconnect_attempts):
+            if attempt > 0:
+                delay = min(self.backoff_max, self.backoff_base * 2 ** (attempt - 1))
+                time.sleep(delay * random.uniform(0.5, 1.0))
+            try:
+                try:
+                    connection.substrate.websocket.close()
+                except Exception:
+                    pass
+                connection.substrate.connect_websocket()
+                self._set_timeout(connection.substrate, self.timeout)
+                connection.last_used = time.monotonic()
+                return
+            except Exception as e:
+                bittensor.logging.warning(
+                    f"Could not reconnect to {connection.substrate.url} (attempt {attempt + 1}): {e}"
+                )
+                if attempt + 1 == self.max_reconnect_attempts:
+                    raise
+
+    def _call(self, name: str, *args, **kwargs) -> Any:
+        connection = self._connection()
+        with connection.lock:
+            if time.monotonic() - connection.last_used > self.health_check_interval:
+                self._check(connection)
+            try:
+                return getattr(connection.substrate, name)(*args, **kwargs)
+            except CONNECTION_ERRORS:
+                self._reconnect(connection)
+                if name in NOT_RETRIED:
+                    raise
+                return getattr(connection.substrate, name)(*args, **kwargs)
+            finally:
+                connection.last_used = time.monotonic()
+
+    def __getattr__(self, name: str) -> Any:
+        if name.startswith("_"):
+            raise AttributeError(name)
+        attribute = getattr(self._connection().substrate, name)
+        if not callable(attribute):
+            return attribute
+
+        @functools.wraps(attribute)
+        def call(*args, **kwargs):
+            return self._call(name, *args, **kwargs)
+
+        return call
+
+    def __enter__(self) -> "SubstratePool":
+        """Holds the connection of the current thread until the context exits. The connection is not closed."""
+        self._connection().lock.acquire()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self._connection().lock.release()
+
+    def connect_websocket(self):
+        """Reconnects the websockets of all connections."""
+        for connection in list(self._connections):
+            with connection.lock:
+                self._reconnect(connection)
+
+    def close(self):
+        """Closes all connections. A connection used again afterwards is reconnected."""
+        for connection in list(self._connections):
+            connection.substrate.close()
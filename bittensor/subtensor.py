@@ -19,6 +19,9 @@
 import os
 import copy
 import time
+import threading
+import contextlib
+import numpy
 import torch
 import logging
 import argparse
@@ -26,11 +29,21 @@ import bittensor
 import scalecodec
 
 from retry import retry
-from typing import List, Dict, Union, Optional, Tuple, TypedDict, Any, TypeVar
+from concurrent.futures import ThreadPoolExecutor
+from collections import OrderedDict
+from typing import (
+    List,
+    Dict,
+    Union,
+    Optional,
+    Tuple,
+    TypedDict,
+    Any,
+    TypeVar,
+    Iterator,
+)
 from substrateinterface.base import QueryMapResult, SubstrateInterface, ExtrinsicReceipt
 from substrateinterface.exceptions import SubstrateRequestException
-from scalecodec.base import RuntimeConfiguration
-from scalecodec.type_registry import load_type_registry_preset
 from scalecodec.types import GenericCall
 
 # Local imports.
@@ -42,11 +55,20 @@ from .chain_data import (
     SubnetHyperparameters,
     StakeInfo,
     NeuronInfoLite,
+    NeuronStorageChanges,
     AxonInfo,
     ProposalVoteData,
     IPInfo,
-    custom_rpc_type_registry,
+    decode_vector,
+    get_rpc_runtime_config,
+)
+from .chain_columns import (
+    DelegateInfoColumns,
+    NeuronInfoLiteColumns,
+    StakeInfoColumns,
+    SubnetInfoColumns,
 )
+from .substrate_pool import SubstratePool
 from .errors import IdentityError, NominationError, StakeError
 from .extrinsics.network import (
     register_subnetwork_extrinsic,
@@ -91,6 +113,43 @@ KEY_NONCE: Dict[str, int] = {}
 
 T = TypeVar("T")
 
+# SubtensorModule storage holding one value per neuron of a subnet, with the numpy dtype of its SCALE encoded elements.
+NEURON_VECTOR_STORAGE = {
+    "Active": "?",
+    "Rank": "<u2",
+    "Trust": "<u2",
+    "Consensus": "<u2",
+    "Incentive": "<u2",
+    "Dividends": "<u2",
+    "Emission": "<u8",
+    "LastUpdate": "<u8",
+    "ValidatorTrust": "<u2",
+    "ValidatorPermit": "?",
+    "PruningScores": "<u2",
+}
+
+# The default number of finalized block hashes kept by a subtensor.
+BLOCK_HASH_CACHE_SIZE = 1024
+# How often the finalized head is looked up, at most, to tell whether a block hash can be cached. About one block.
+FINALIZED_BLOCK_REFRESH_SECONDS = 12
+# The default maximum number of websocket connections of a subtensor, one per thread querying the chain at once.
+POOL_SIZE = 4
+
+
+# The JSON-RPC error code of methods a node does not serve, including unsafe methods on nodes serving safe ones only.
+METHOD_NOT_FOUND = -32601
+
+
+def _is_unsafe_rpc_error(error: SubstrateRequestException) -> bool:
+    """Returns whether ``error`` is the refusal of an RPC method which the node does not serve."""
+    details = error.args[0] if error.args else None
+    if isinstance(details, dict):
+        return (
+            details.get("code") == METHOD_NOT_FOUND
+            or "unsafe" in str(details.get("message", "")).lower()
+        )
+    return "unsafe" in str(error).lower()
+
 
 class ParamWithTypes(TypedDict):
     name: str  # Name of the parameter.
@@ -195,6 +254,23 @@ class subtensor:
                 help="""The subtensor endpoint flag. If set, overrides the --network flag.
                                     """,
             )
+            parser.add_argument(
+                "--" + prefix_str + "subtensor.block_hash_cache_size",
+                default=int(
+                    os.getenv("BT_SUBTENSOR_BLOCK_HASH_CACHE_SIZE")
+                    or BLOCK_HASH_CACHE_SIZE
+                ),
+                type=int,
+                help="""The number of finalized block hashes kept, so that queries at a block only look up its hash once.
+                                    """,
+            )
+            parser.add_argument(
+                "--" + prefix_str + "subtensor.pool_size",
+                default=int(os.getenv("BT_SUBTENSOR_POOL_SIZE") or POOL_SIZE),
+                type=int,
+                help="""The maximum number of websocket connections to the chain endpoint, so that threads can query it concurrently.
+                                    """,
+            )
             parser.add_argument(
                 "--" + prefix_str + "subtensor._mock",
                 default=False,
@@ -383,14 +459,31 @@ class subtensor:
             config.subtensor._mock = True
             return bittensor.MockSubtensor()  # type: ignore
 
+        # The most recently used hashes of finalized blocks.
+        self._block_hash_cache: "OrderedDict[int, str]" = OrderedDict()
+        self._block_hash_cache_size = self.config.subtensor.get(
+            "block_hash_cache_size", BLOCK_HASH_CACHE_SIZE
+        )
+        self._block_hash_lock = threading.Lock()
+        self._finalized_block = 0
+        self._finalized_block_checked = 0.0
+        # The block pinned by :func:`at_block` in each thread, and its hash.
+        self._pinned = threading.local()
+        # Cleared once the node refuses the unsafe ``state_queryStorage`` method, see :func:`neuron_storage_changes`.
+        self._query_storage_supported = True
+
         # Attempt to connect to chosen endpoint. Fallback to finney if local unavailable.
         try:
             # Set up params.
-            self.substrate = SubstrateInterface(
-                ss58_format=bittensor.__ss58_format__,
-                use_remote_preset=True,
-                url=self.chain_endpoint,
-                type_registry=bittensor.__type_registry__,
+            self.substrate = SubstratePool(
+                lambda: SubstrateInterface(
+                    ss58_format=bittensor.__ss58_format__,
+                    use_remote_preset=True,
+                    url=self.chain_endpoint,
+                    type_registry=bittensor.__type_registry__,
+                ),
+                size=self.config.subtensor.get("pool_size", POOL_SIZE),
+                timeout=600,
             )
         except ConnectionRefusedError as e:
             bittensor.logging.error(
@@ -402,11 +495,6 @@ class subtensor:
             exit(1)
             # TODO (edu/phil): Advise to run local subtensor and point to dev docs.
 
-        try:
-            self.substrate.websocket.settimeout(600)
-        except:
-            bittensor.logging.warning("Could not set websocket timeout.")
-
         if log_verbose:
             bittensor.logging.info(
                 f"Connected to {self.network} network and {self.chain_endpoint}."
@@ -428,13 +516,13 @@ class subtensor:
     ####################
     def connect_websocket(self):
         """
-        (Re)creates the websocket connection, if the URL contains a 'ws' or 'wss' scheme
+        (Re)creates the websocket connections, if the URL contains a 'ws' or 'wss' scheme
         """
-        self.subtensor.connect_websocket
+        self.substrate.connect_websocket()
 
     def close(self):
         """
-        Cleans up resources for this subtensor instance like active websocket connection and active extensions
+        Cleans up resources for this subtensor instance like active websocket connections and active extensions
         """
         self.substrate.close()
 
@@ -587,11 +675,6 @@ class subtensor:
 
         nonce = KEY_NONCE[hotkey]
 
-        # <3 parity tech
-        old_init_runtime = self.substrate.init_runtime
-        self.substrate.init_runtime = lambda: None
-        self.substrate.init_runtime = old_init_runtime
-
         for attempt in range(1, max_retries + 1):
             try:
                 # Create the extrinsic with new nonce
@@ -2202,9 +2285,7 @@ class subtensor:
                 module="Registry",
                 storage_function="IdentityOf",
                 params=[key],
-                block_hash=(
-                    None if block is None else self.substrate.get_block_hash(block)
-                ),
+                block_hash=self._block_hash(block),
             )
 
         identity_info = make_substrate_call_with_retry()
@@ -2321,9 +2402,7 @@ class subtensor:
                 module="SubtensorModule",
                 storage_function=name,
                 params=params,
-                block_hash=(
-                    None if block is None else self.substrate.get_block_hash(block)
-                ),
+                block_hash=self._block_hash(block),
             )
 
         return make_substrate_call_with_retry()
@@ -2358,9 +2437,7 @@ class subtensor:
                 module="SubtensorModule",
                 storage_function=name,
                 params=params,
-                block_hash=(
-                    None if block is None else self.substrate.get_block_hash(block)
-                ),
+                block_hash=self._block_hash(block),
             )
 
         return make_substrate_call_with_retry()
@@ -2391,9 +2468,7 @@ class subtensor:
             return self.substrate.get_constant(
                 module_name=module_name,
                 constant_name=constant_name,
-                block_hash=(
-                    None if block is None else self.substrate.get_block_hash(block)
-                ),
+                block_hash=self._block_hash(block),
             )
 
         return make_substrate_call_with_retry()
@@ -2431,9 +2506,7 @@ class subtensor:
                 module=module,
                 storage_function=name,
                 params=params,
-                block_hash=(
-                    None if block is None else self.substrate.get_block_hash(block)
-                ),
+                block_hash=self._block_hash(block),
             )
 
         return make_substrate_call_with_retry()
@@ -2470,9 +2543,7 @@ class subtensor:
                 module=module,
                 storage_function=name,
                 params=params,
-                block_hash=(
-                    None if block is None else self.substrate.get_block_hash(block)
-                ),
+                block_hash=self._block_hash(block),
             )
 
         return make_substrate_call_with_retry()
@@ -2501,7 +2572,7 @@ class subtensor:
 
         @retry(delay=2, tries=3, backoff=2, max_delay=4, logger=logger)
         def make_substrate_call_with_retry():
-            block_hash = None if block is None else self.substrate.get_block_hash(block)
+            block_hash = self._block_hash(block)
             params = [method, data]
             if block_hash:
                 params = params + [block_hash]
@@ -2556,11 +2627,7 @@ class subtensor:
 
         as_scale_bytes = scalecodec.ScaleBytes(json_result["result"])  # type: ignore
 
-        rpc_runtime_config = RuntimeConfiguration()
-        rpc_runtime_config.update_type_registry(load_type_registry_preset("legacy"))
-        rpc_runtime_config.update_type_registry(custom_rpc_type_registry)
-
-        obj = rpc_runtime_config.create_scale_object(return_type, as_scale_bytes)
+        obj = get_rpc_runtime_config().create_scale_object(return_type, as_scale_bytes)
         if obj.data.to_hex() == "0x0400":  # RPC returned None result
             return None
 
@@ -3293,7 +3360,7 @@ class subtensor:
 
         @retry(delay=2, tries=3, backoff=2, max_delay=4, logger=logger)
         def make_substrate_call_with_retry():
-            block_hash = None if block is None else self.substrate.get_block_hash(block)
+            block_hash = self._block_hash(block)
             params = []
             if block_hash:
                 params = params + [block_hash]
@@ -3308,7 +3375,7 @@ class subtensor:
         if result in (None, []):
             return []
 
-        return SubnetInfo.list_from_vec_u8(result)
+        return list(SubnetInfoColumns.from_vec_u8(result))
 
     def get_subnet_info(
         self, netuid: int, block: Optional[int] = None
@@ -3330,7 +3397,7 @@ class subtensor:
 
         @retry(delay=2, tries=3, backoff=2, max_delay=4, logger=logger)
         def make_substrate_call_with_retry():
-            block_hash = None if block is None else self.substrate.get_block_hash(block)
+            block_hash = self._block_hash(block)
             params = [netuid]
             if block_hash:
                 params = params + [block_hash]
@@ -3490,8 +3557,8 @@ class subtensor:
 
         @retry(delay=2, tries=3, backoff=2, max_delay=4, logger=logger)
         def make_substrate_call_with_retry(encoded_hotkey: List[int]):
-            block_hash = None if block == None else self.substrate.get_block_hash(block)
-            params = [encoded_hotkey]
+            block_hash = self._block_hash(block)
+            params: List[Any] = [encoded_hotkey]
             if block_hash:
                 params = params + [block_hash]
             return self.substrate.rpc_request(
@@ -3525,7 +3592,7 @@ class subtensor:
 
         @retry(delay=2, tries=3, backoff=2, max_delay=4, logger=logger)
         def make_substrate_call_with_retry():
-            block_hash = None if block == None else self.substrate.get_block_hash(block)
+            block_hash = self._block_hash(block)
             params = []
             if block_hash:
                 params = params + [block_hash]
@@ -3540,7 +3607,7 @@ class subtensor:
         if result in (None, []):
             return []
 
-        return DelegateInfo.list_from_vec_u8(result)
+        return list(DelegateInfoColumns.from_vec_u8(result))
 
     def get_delegated(
         self, coldkey_ss58: str, block: Optional[int] = None
@@ -3562,8 +3629,8 @@ class subtensor:
 
         @retry(delay=2, tries=3, backoff=2, max_delay=4, logger=logger)
         def make_substrate_call_with_retry(encoded_coldkey: List[int]):
-            block_hash = None if block == None else self.substrate.get_block_hash(block)
-            params = [encoded_coldkey]
+            block_hash = self._block_hash(block)
+            params: List[Any] = [encoded_coldkey]
             if block_hash:
                 params = params + [block_hash]
             return self.substrate.rpc_request(
@@ -3618,7 +3685,7 @@ class subtensor:
         else:
             bytes_result = bytes.fromhex(hex_bytes_result)
         # TODO: review if this is the correct type / works
-        return StakeInfo.list_from_vec_u8(bytes_result)  # type: ignore
+        return list(StakeInfoColumns.from_vec_u8(bytes_result))
 
     def get_stake_info_for_coldkeys(
         self, coldkey_ss58_list: List[str], block: Optional[int] = None
@@ -3909,7 +3976,7 @@ class subtensor:
 
         @retry(delay=2, tries=3, backoff=2, max_delay=4, logger=logger)
         def make_substrate_call_with_retry():
-            block_hash = None if block == None else self.substrate.get_block_hash(block)
+            block_hash = self._block_hash(block)
             params = [netuid, uid]
             if block_hash:
                 params = params + [block_hash]
@@ -4031,7 +4098,125 @@ class subtensor:
         else:
             bytes_result = bytes.fromhex(hex_bytes_result)
 
-        return NeuronInfoLite.list_from_vec_u8(bytes_result)  # type: ignore
+        return list(NeuronInfoLiteColumns.from_vec_u8(bytes_result))
+
+    def neuron_storage_changes(
+        self,
+        netuid: int,
+        hotkeys: List[str],
+        from_block: int,
+        block: Optional[int] = None,
+        lite: bool = True,
+    ) -> Optional[NeuronStorageChanges]:
+        """
+        Retrieves the changes to the neurons of a subnet between two blocks, reading only the storage that
+        changed instead of every neuron. A single ``state_queryStorage`` call watches the per neuron storage
+        vectors of the subnet and the storage of each of the ``hotkeys``, as they were registered at ``from_block``.
+
+        ``state_queryStorage`` is an unsafe RPC method, only served by nodes running with ``--rpc-methods unsafe``,
+        which the public finney and test endpoints do not. On such nodes the watched storage is instead read at
+        both blocks with the safe ``state_queryStorageAt`` method and compared, which transfers every watched value
+        twice. The first refusal is remembered, so later calls go to ``state_queryStorageAt`` directly.
+
+        Args:
+            netuid (int): The unique identifier of the subnet.
+            hotkeys (List[str]): The hotkeys of the subnet's neurons at ``from_block``, indexed by UID.
+            from_block (int): The block the changes are relative to.
+            block (Optional[int], optional): The block to retrieve the changes up to, the current block if ``None``.
+            lite (bool, default=True): If true, changes to the weights and bonds of the neurons are not retrieved.
+
+        Returns:
+            Optional[NeuronStorageChanges]: The changed vector values and the uids whose own storage changed, or
+            ``None`` if the number of neurons of the subnet changed and the neurons have to be retrieved again.
+
+        This function lets callers polling a subnet every few blocks, such as :func:`bittensor.metagraph.sync` with
+        ``incremental=True``, pay for the neurons that changed rather than for the size of the subnet.
+        """
+        if block is None:
+            block = self.get_current_block()
+
+        keys: Dict[str, Tuple[str, Optional[int]]] = {}
+
+        def watch(name: str, params: List[Any], uid: Optional[int] = None):
+            key = self.substrate.create_storage_key("SubtensorModule", name, params)
+            keys[key.to_hex()] = (name, uid)
+
+        watch("SubnetworkN", [netuid])
+        for name in NEURON_VECTOR_STORAGE:
+            watch(name, [netuid])
+        for uid, hotkey in enumerate(hotkeys):
+            watch("Keys", [netuid, uid], uid)
+            watch("TotalHotkeyStake", [hotkey], uid)
+            watch("Axons", [netuid, hotkey], uid)
+            watch("Prometheus", [netuid, hotkey], uid)
+            if not lite:
+                watch("Weights", [netuid, uid], uid)
+                watch("Bonds", [netuid, uid], uid)
+
+        from_hash = self.get_block_hash(from_block)
+        to_hash = self.get_block_hash(block)
+
+        @retry(delay=2, tries=3, backoff=2, max_delay=4, logger=logger)
+        def make_substrate_call_with_retry(method: str, params: List[Any]):
+            try:
+                return self.substrate.rpc_request(method=method, params=params)
+            except SubstrateRequestException as e:
+                # Refused methods are not retried.
+                if _is_unsafe_rpc_error(e):
+                    return None
+                raise
+
+        initial: Dict[str, Optional[str]] = {}
+        changed: Dict[str, Optional[str]] = {}
+        response = None
+        if self._query_storage_supported:
+            response = make_substrate_call_with_retry(
+                "state_queryStorage", [list(keys), from_hash, to_hash]
+            )
+            if response is None:
+                self._query_storage_supported = False
+                bittensor.logging.info(
+                    f"{self.chain_endpoint} does not serve the unsafe state_queryStorage RPC method, "
+                    "comparing the neuron storage at both blocks instead."
+                )
+        if response is not None:
+            # The first change set holds the values at from_block, the following ones only what changed since.
+            for change_set in response["result"]:
+                target = initial if change_set["block"] == from_hash else changed
+                for key, value in change_set["changes"]:
+                    target[key] = value
+        else:
+            for block_hash, target in ((from_hash, initial), (to_hash, changed)):
+                response = make_substrate_call_with_retry(
+                    "state_queryStorageAt", [list(keys), block_hash]
+                )
+                for change_set in response["result"]:
+                    for key, value in change_set["changes"]:
+                        target[key] = value
+            changed = {
+                key: value
+                for key, value in changed.items()
+                if value != initial.get(key)
+            }
+
+        vectors: Dict[str, Dict[int, Any]] = {}
+        uids = set()
+        for key, value in changed.items():
+            name, key_uid = keys[key]
+            if name == "SubnetworkN":
+                return None
+            if key_uid is not None:
+                uids.add(key_uid)
+                continue
+            old = decode_vector(initial.get(key), NEURON_VECTOR_STORAGE[name])
+            new = decode_vector(value, NEURON_VECTOR_STORAGE[name])
+            if len(old) != len(new):
+                return None
+            diff = numpy.flatnonzero(old != new)
+            if len(diff):
+                vectors[name] = {int(uid): new[uid].item() for uid in diff}
+
+        return NeuronStorageChanges(block=block, vectors=vectors, uids=sorted(uids))
 
     def metagraph(
         self,
@@ -4061,6 +4246,57 @@ class subtensor:
 
         return metagraph_
 
+    def metagraphs(
+        self,
+        netuids: Optional[List[int]] = None,
+        lite: bool = True,
+        block: Optional[int] = None,
+        max_workers: int = 4,
+    ) -> Dict[int, "bittensor.metagraph"]:
+        """
+        Returns synced metagraphs for several subnets, all at the same block. The subnets are synced by up to
+        ``max_workers`` threads, each using a connection of its own while there are fewer than
+        ``subtensor.pool_size`` connections. The hash of the block is looked up once and pinned for every thread,
+        so all queries read the same state.
+
+        Args:
+            netuids (Optional[List[int]]): The network UIDs of the subnets, or ``None`` for all subnets.
+            lite (bool, default=True): If true, syncs lightweight metagraphs (no weights, no bonds).
+            block (Optional[int]): Block number for synchronization, or ``None`` for the latest block.
+            max_workers (int, default=4): The maximum number of threads syncing subnets at once.
+
+        Returns:
+            Dict[int, bittensor.metagraph]: The metagraphs, keyed by network UID.
+
+        Example::
+
+            metagraphs = subtensor.metagraphs()
+            for netuid, metagraph in metagraphs.items():
+                print(netuid, metagraph.n.item())
+        """
+        with self.at_block(block) as pinned_block:
+            pinned_hash = self._pinned.hash
+            if netuids is None:
+                netuids = self.get_all_subnet_netuids(block=pinned_block)
+            if not netuids:
+                return {}
+
+            def sync(netuid: int) -> "bittensor.metagraph":
+                # Pins are per thread, so the hash pinned above is pinned again rather than looked up again.
+                with self._pin(pinned_block, pinned_hash):
+                    metagraph_ = bittensor.metagraph(
+                        network=self.network, netuid=netuid, lite=lite, sync=False
+                    )
+                    metagraph_.sync(block=pinned_block, lite=lite, subtensor=self)
+                return metagraph_
+
+            with ThreadPoolExecutor(
+                max_workers=min(max_workers, len(netuids))
+            ) as executor:
+                metagraphs = list(executor.map(sync, netuids))
+
+        return dict(zip(netuids, metagraphs))
+
     def incentive(self, netuid: int, block: Optional[int] = None) -> List[int]:
         """
         Retrieves the list of incentives for neurons within a specific subnet of the Bittensor network.
@@ -4339,9 +4575,7 @@ class subtensor:
                     module="System",
                     storage_function="Account",
                     params=[address],
-                    block_hash=(
-                        None if block is None else self.substrate.get_block_hash(block)
-                    ),
+                    block_hash=self._block_hash(block),
                 )
 
             result = make_substrate_call_with_retry()
@@ -4355,7 +4589,7 @@ class subtensor:
     def get_current_block(self) -> int:
         """
         Returns the current block number on the Bittensor blockchain. This function provides the latest block
-        number, indicating the most recent state of the blockchain.
+        number, indicating the most recent state of the blockchain. Within :func:`at_block`, it returns the pinned block.
 
         Returns:
             int: The current chain block number.
@@ -4364,6 +4598,10 @@ class subtensor:
         operations on the blockchain. It serves as a reference point for network activities and data synchronization.
         """
 
+        pinned_block = getattr(self._pinned, "block", None)
+        if pinned_block is not None:
+            return pinned_block
+
         @retry(delay=2, tries=3, backoff=2, max_delay=4, logger=logger)
         def make_substrate_call_with_retry():
             return self.substrate.get_block_number(None)
@@ -4390,9 +4628,7 @@ class subtensor:
             return self.substrate.query_map(
                 module="System",
                 storage_function="Account",
-                block_hash=(
-                    None if block is None else self.substrate.get_block_hash(block)
-                ),
+                block_hash=self._block_hash(block),
             )
 
         result = make_substrate_call_with_retry()
@@ -4443,5 +4679,84 @@ class subtensor:
         The block hash is a fundamental aspect of blockchain technology, providing a secure reference to
         each block's data. It is crucial for verifying transactions, ensuring data consistency, and
         maintaining the trustworthiness of the blockchain.
+
+        The hash of the block pinned by :func:`at_block` in this thread is returned as pinned. The hashes of finalized blocks are kept in an
+        LRU cache of ``subtensor.block_hash_cache_size`` entries, as they can no longer change.
+        """
+        if block_id == getattr(self._pinned, "block", None):
+            return self._pinned.hash
+        with self._block_hash_lock:
+            block_hash = self._block_hash_cache.get(block_id)
+            if block_hash is not None:
+                self._block_hash_cache.move_to_end(block_id)
+                return block_hash
+
+        block_hash = self.substrate.get_block_hash(block_id=block_id)
+        if block_hash is not None and self._is_finalized(block_id):
+            with self._block_hash_lock:
+                self._block_hash_cache[block_id] = block_hash
+                if len(self._block_hash_cache) > self._block_hash_cache_size:
+                    self._block_hash_cache.popitem(last=False)
+        return block_hash
+
+    def _is_finalized(self, block_id: int) -> bool:
+        """
+        Returns whether ``block_id`` is known to be finalized. The finalized head is looked up again at most once per
+        :data:`FINALIZED_BLOCK_REFRESH_SECONDS`, blocks after it being treated as not finalized in the meantime.
+        """
+        if block_id <= self._finalized_block:
+            return True
+        now = time.monotonic()
+        if now - self._finalized_block_checked < FINALIZED_BLOCK_REFRESH_SECONDS:
+            return False
+        self._finalized_block_checked = now
+        self._finalized_block = self.substrate.get_block_number(
+            self.substrate.get_chain_finalised_head()
+        )
+        return block_id <= self._finalized_block
+
+    def _block_hash(self, block: Optional[int]) -> Optional[str]:
+        """
+        Returns the hash to query at: the hash of ``block``, else of the block pinned by :func:`at_block` in this
+        thread, else ``None`` for the latest block.
+        """
+        if block is None:
+            block = getattr(self._pinned, "block", None)
+        return None if block is None else self.get_block_hash(block)
+
+    @contextlib.contextmanager
+    def at_block(self, block: Optional[int] = None) -> Iterator[int]:
+        """
+        Pins a block for the queries made by the current thread within the context. Its hash is looked up once,
+        queries passing no block are made at the pinned block, and :func:`get_current_block` returns it, so a group
+        of queries reads one consistent state of the chain.
+
+        Args:
+            block (Optional[int]): The block to pin, or ``None`` for the current block.
+
+        Yields:
+            int: The pinned block.
+
+        Example::
+
+            with subtensor.at_block() as block:
+                neurons = subtensor.neurons_lite(netuid=1)
+                delegates = subtensor.get_delegates()
         """
-        return self.substrate.get_block_hash(block_id=block_id)
+        if block is None:
+            block = self.get_current_block()
+        with self._pin(block, self.get_block_hash(block)):
+            yield block
+
+    @contextlib.contextmanager
+    def _pin(self, block: int, block_hash: str) -> Iterator[None]:
+        """Pins ``block`` with its known ``block_hash`` for the current thread, see :func:`at_block`."""
+        previous = (
+            getattr(self._pinned, "block", None),
+            getattr(self._pinned, "hash", None),
+        )
+        self._pinned.block, self._pinned.hash = block, block_hash
+        try:
+            yield
+        finally:
+            self._pinned.block, self._pinned.hash = previous
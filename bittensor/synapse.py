@@ -18,13 +18,14 @@
 
 
 import base64
+import hashlib
 import json
 import sys
+import weakref
 
 import pydantic
-from pydantic.schema import schema
 import bittensor
-from typing import Optional, List, Any, Dict
+from typing import Optional, List, Any, Dict, Tuple, Type
 
 
 def get_size(obj, seen=None) -> int:
@@ -60,6 +61,72 @@ def get_size(obj, seen=None) -> int:
     return size
 
 
+def _is_tensor(value: Any) -> bool:
+    return type(value) is bittensor.Tensor
+
+
+def _body_hash_fingerprint(value: Any) -> Optional[Tuple]:
+    """
+    Returns what a cached field hash depends on, or ``None`` if the value may be mutated in place and
+    must be rehashed on every call. Values are compared by identity first, so fingerprints are cheap to check.
+    """
+    if value is None or isinstance(value, (str, bytes, int, float)):
+        return (type(value), value)
+    if _is_tensor(value):
+        return (value, value.buffer, value.dtype, tuple(value.shape))
+    if isinstance(value, (list, tuple)) and value and all(map(_is_tensor, value)):
+        return (type(value),) + tuple(map(_body_hash_fingerprint, value))
+    return None
+
+
+# Characters which ``repr`` keeps verbatim inside single quotes, this covers the base64 alphabet.
+_VERBATIM_REPR_CHARS = bytes(range(0x20, 0x7F)).replace(b"'", b"").replace(b"\\", b"")
+
+
+def _update_tensor_hash(sha3: "hashlib._Hash", tensor: "bittensor.Tensor") -> bool:
+    """
+    Feeds ``str(tensor.dict())`` into ``sha3`` without building the string, streaming the buffer straight into
+    the hash. Returns ``False`` if the buffer would not be represented verbatim, which never happens for base64.
+    """
+    buffer = tensor.buffer
+    if buffer is None:
+        sha3.update(b"{'buffer': None")
+    else:
+        if not buffer.isascii():
+            return False
+        encoded = buffer.encode("ascii")
+        if encoded.translate(None, _VERBATIM_REPR_CHARS):
+            return False
+        sha3.update(b"{'buffer': '")
+        sha3.update(encoded)
+        sha3.update(b"'")
+    sha3.update(f", 'dtype': {tensor.dtype!r}, 'shape': {tensor.shape!r}}}".encode())
+    return True
+
+
+def _hash_tensors(value: Any) -> Optional[str]:
+    """
+    Hashes a :class:`bittensor.Tensor`, or a list or tuple of them, from their buffers. The digest is the same as
+    hashing the value's ``str`` from :func:`Synapse.dict`, so it stays compatible with other versions.
+    """
+    sha3 = hashlib.sha3_256()
+    if _is_tensor(value):
+        return sha3.hexdigest() if _update_tensor_hash(sha3, value) else None
+    if not isinstance(value, (list, tuple)) or not value:
+        return None
+
+    sha3.update(b"[" if isinstance(value, list) else b"(")
+    for index, tensor in enumerate(value):
+        if index:
+            sha3.update(b", ")
+        if not _is_tensor(tensor) or not _update_tensor_hash(sha3, tensor):
+            return None
+    if isinstance(value, tuple) and len(value) == 1:
+        sha3.update(b",")
+    sha3.update(b"]" if isinstance(value, list) else b")")
+    return sha3.hexdigest()
+
+
 def cast_int(raw: str) -> int:
     """
     Converts a string to an integer, if the string is not ``None``.
@@ -180,6 +247,42 @@ class TerminalInfo(pydantic.BaseModel):
         "process_time", pre=True, allow_reuse=True
     )(cast_float)
 
+    # Time the request waited in the axon's admission queue before its forward function ran
+    queue_time: Optional[float] = pydantic.Field(
+        title="queue_time",
+        description="Time the request waited in the axon admission queue before being run",
+        examples=0.01,
+        default=None,
+        allow_mutation=True,
+    )
+    _extract_queue_time = pydantic.validator("queue_time", pre=True, allow_reuse=True)(
+        cast_float
+    )
+
+    # Compression of the body sent by the terminal, uncompressed over compressed size
+    compression_ratio: Optional[float] = pydantic.Field(
+        title="compression_ratio",
+        description="Uncompressed over compressed size of the body sent by the terminal, if it was compressed",
+        examples=3.2,
+        default=None,
+        allow_mutation=True,
+    )
+    _extract_compression_ratio = pydantic.validator(
+        "compression_ratio", pre=True, allow_reuse=True
+    )(cast_float)
+
+    # Time the terminal spent compressing the body it sent
+    compression_time: Optional[float] = pydantic.Field(
+        title="compression_time",
+        description="Time the terminal spent compressing the body it sent, if it was compressed",
+        examples=0.002,
+        default=None,
+        allow_mutation=True,
+    )
+    _extract_compression_time = pydantic.validator(
+        "compression_time", pre=True, allow_reuse=True
+    )(cast_float)
+
     # The terminal ip.
     ip: Optional[str] = pydantic.Field(
         title="ip",
@@ -214,7 +317,7 @@ class TerminalInfo(pydantic.BaseModel):
     # A unique monotonically increasing integer nonce associate with the terminal
     nonce: Optional[int] = pydantic.Field(
         title="nonce",
-        description="A unique monotonically increasing integer nonce associate with the terminal generated from time.monotonic_ns()",
+        description="A unique monotonically increasing integer nonce associate with the terminal generated from time.time_ns()",
         examples=111111,
         default=None,
         allow_mutation=True,
@@ -249,6 +352,60 @@ class TerminalInfo(pydantic.BaseModel):
     )
 
 
+# Header keys of the terminal information fields.
+_AXON_HEADER_KEYS = {name: f"bt_header_axon_{name}" for name in TerminalInfo.__fields__}
+_DENDRITE_HEADER_KEYS = {
+    name: f"bt_header_dendrite_{name}" for name in TerminalInfo.__fields__
+}
+# Header key -> (terminal, field), for the known terminal information headers.
+_TERMINAL_HEADER_FIELDS = {
+    **{key: ("axon", name) for name, key in _AXON_HEADER_KEYS.items()},
+    **{key: ("dendrite", name) for name, key in _DENDRITE_HEADER_KEYS.items()},
+}
+
+
+class _HeaderSchema:
+    """
+    Header metadata of a :class:`Synapse` subclass, computed once per class instead of on every request.
+
+    Holds the required fields of the class, which are sent as ``bt_header_input_obj_*`` headers so that the
+    receiving side can build the synapse from its headers alone, and the encoded dummy value sent for each of them.
+    """
+
+    def __init__(self, synapse_class: Type["Synapse"]):
+        self.required = [
+            name for name, field in synapse_class.__fields__.items() if field.required
+        ]
+        self.input_obj_keys = {
+            name: f"bt_header_input_obj_{name}" for name in self.required
+        }
+        # (field, serialized value type) -> base64 encoded json of an empty instance of that type.
+        self.input_objs: Dict[Tuple[str, type], str] = {}
+
+    def input_obj(self, field: str, value: Any) -> str:
+        # Models are sent as dicts, which is the type found in ``Synapse.dict()``.
+        value_type: type = type(value)
+        if isinstance(value, (pydantic.BaseModel, dict)):
+            value_type = dict
+        encoded_value = self.input_objs.get((field, value_type))
+        if encoded_value is None:
+            try:
+                # create an empty (dummy) instance of type(value) to pass pydantic validation on the axon side
+                serialized_value = json.dumps(value_type())
+            except TypeError as e:
+                raise ValueError(
+                    f"Error serializing {field} with value {value}. Objects must be json serializable."
+                ) from e
+            encoded_value = base64.b64encode(serialized_value.encode()).decode("utf-8")
+            self.input_objs[(field, value_type)] = encoded_value
+        return encoded_value
+
+
+_header_schemas: "weakref.WeakKeyDictionary[type, _HeaderSchema]" = (
+    weakref.WeakKeyDictionary()
+)
+
+
 class Synapse(pydantic.BaseModel):
     """
     Represents a Synapse in the Bittensor network, serving as a communication schema between neurons (nodes).
@@ -489,18 +646,24 @@ class Synapse(pydantic.BaseModel):
         repr=False,
     )
 
+    # Cached per field hashes used by body_hash, as field name -> (fingerprint, hash).
+    _body_hashes: Dict[str, Tuple[Tuple, str]] = pydantic.PrivateAttr(
+        default_factory=dict
+    )
+
     def __setattr__(self, name: str, value: Any):
         """
         Override the :func:`__setattr__` method to make the ``required_hash_fields`` property read-only.
 
         This is a security mechanism such that the ``required_hash_fields`` property cannot be
-        overridden by the user or malicious code.
+        overridden by the user or malicious code. Assigning a field also drops its cached hash, see :func:`body_hash`.
         """
         if name == "body_hash":
             raise AttributeError(
                 "body_hash property is read-only and cannot be overridden."
             )
         super().__setattr__(name, value)
+        self._body_hashes.pop(name, None)
 
     def get_total_size(self) -> int:
         """
@@ -609,48 +772,28 @@ class Synapse(pydantic.BaseModel):
 
         # Adding headers for 'axon' and 'dendrite' if they are not None
         if self.axon:
-            headers.update(
-                {
-                    f"bt_header_axon_{k}": str(v)
-                    for k, v in self.axon.dict().items()
-                    if v is not None
-                }
-            )
+            for k, key in _AXON_HEADER_KEYS.items():
+                v = getattr(self.axon, k)
+                if v is not None:
+                    headers[key] = str(v)
         if self.dendrite:
-            headers.update(
-                {
-                    f"bt_header_dendrite_{k}": str(v)
-                    for k, v in self.dendrite.dict().items()
-                    if v is not None
-                }
-            )
-
-        # Getting the fields of the instance
-        instance_fields = self.dict()
+            for k, key in _DENDRITE_HEADER_KEYS.items():
+                v = getattr(self.dendrite, k)
+                if v is not None:
+                    headers[key] = str(v)
 
-        # Iterating over the fields of the instance
-        for field, value in instance_fields.items():
-            # If the object is not optional, serializing it, encoding it, and adding it to the headers
-            required = schema([self.__class__])["definitions"][self.name].get(
-                "required"
-            )
+        # Required fields are sent as empty (dummy) instances so that the axon side passes pydantic validation
+        header_schema = self._header_schema()
+        for field in header_schema.required:
+            value = getattr(self, field)
 
             # Skipping the field if it's already in the headers or its value is None
             if field in headers or value is None:
                 continue
 
-            elif required and field in required:
-                try:
-                    # create an empty (dummy) instance of type(value) to pass pydantic validation on the axon side
-                    serialized_value = json.dumps(value.__class__.__call__())
-                    encoded_value = base64.b64encode(serialized_value.encode()).decode(
-                        "utf-8"
-                    )
-                    headers[f"bt_header_input_obj_{field}"] = encoded_value
-                except TypeError as e:
-                    raise ValueError(
-                        f"Error serializing {field} with value {value}. Objects must be json serializable."
-                    ) from e
+            headers[header_schema.input_obj_keys[field]] = header_schema.input_obj(
+                field, value
+            )
 
         # Adding the size of the headers and the total size to the headers
         headers["header_size"] = str(sys.getsizeof(headers))
@@ -659,6 +802,14 @@ class Synapse(pydantic.BaseModel):
 
         return headers
 
+    @classmethod
+    def _header_schema(cls) -> _HeaderSchema:
+        """Returns the header metadata of this class, computing it on first use."""
+        header_schema = _header_schemas.get(cls)
+        if header_schema is None:
+            header_schema = _header_schemas[cls] = _HeaderSchema(cls)
+        return header_schema
+
     @property
     def body_hash(self) -> str:
         """
@@ -670,7 +821,8 @@ class Synapse(pydantic.BaseModel):
 
         Process:
 
-        1. Iterates over each required field as specified in ``required_fields_hash``.
+        1. Hashes only the required fields as specified in ``required_hash_fields``, in field order, reusing
+           the hashes of fields which have not changed since the last call.
         2. Concatenates the string representation of these fields.
         3. Applies SHA3-256 hashing to the concatenated string to produce a unique fingerprint of the data.
 
@@ -686,20 +838,36 @@ class Synapse(pydantic.BaseModel):
         # Hash the body for verification
         hashes = []
 
-        # Getting the fields of the instance
-        instance_fields = self.dict()
-
-        for field, value in instance_fields.items():
-            # If the field is required in the subclass schema, hash and add it.
-            if (
-                self.required_hash_fields is not None
-                and field in self.required_hash_fields
-            ):
-                hashes.append(bittensor.utils.hash(str(value)))
+        # Only hash the fields that are required in the subclass schema, in field order.
+        if self.required_hash_fields:
+            for field in self.__fields__:
+                if field in self.required_hash_fields:
+                    hashes.append(self._field_hash(field))
 
         # Hash and return the hashes that have been concatenated
         return bittensor.utils.hash("".join(hashes))
 
+    def _field_hash(self, field: str) -> str:
+        """
+        Returns the SHA3-256 hash of the serialized ``field``, reusing the cached hash while the field is unchanged.
+
+        Fields are dropped from the cache when assigned. Cached hashes are also checked against a fingerprint of
+        the value, catching changes made in place such as assigning a tensor's buffer. Values that can be mutated
+        in place without a trace, like lists of strings, are rehashed every time.
+        """
+        value = getattr(self, field)
+        fingerprint = _body_hash_fingerprint(value)
+        cached = self._body_hashes.get(field)
+        if cached is not None and fingerprint is not None and cached[0] == fingerprint:
+            return cached[1]
+
+        digest = _hash_tensors(value)
+        if digest is None:
+            digest = bittensor.utils.hash(str(self.dict(include={field})[field]))
+        if fingerprint is not None:
+            self._body_hashes[field] = (fingerprint, digest)
+        return digest
+
     @classmethod
     def parse_headers_to_inputs(cls, headers: dict) -> dict:
         """
@@ -739,8 +907,12 @@ class Synapse(pydantic.BaseModel):
 
         # Iterate over each item in the headers
         for key, value in headers.items():
+            # Handle the known 'axon' and 'dendrite' headers with a single lookup
+            terminal_field = _TERMINAL_HEADER_FIELDS.get(key)
+            if terminal_field is not None:
+                inputs_dict[terminal_field[0]][terminal_field[1]] = value
             # Handle 'axon' headers
-            if "bt_header_axon_" in key:
+            elif "bt_header_axon_" in key:
                 try:
                     new_key = key.split("bt_header_axon_")[1]
                     inputs_dict["axon"][new_key] = value
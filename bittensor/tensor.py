@@ -19,10 +19,11 @@
 import numpy
 import torch
 import base64
+import warnings
 import msgpack
 import pydantic
 import msgpack_numpy
-from typing import Optional, Union, List
+from typing import Any, Dict, Optional, Union, List
 
 TORCH_DTYPES = {
     "torch.float16": torch.float16,
@@ -109,6 +110,10 @@ class Tensor(pydantic.BaseModel):
     """
     Represents a Tensor object.
 
+    Tensors created by :func:`serialize` or received in a binary body (see :mod:`bittensor.frame`) keep their
+    data as a numpy array, and only encode the base64 ``buffer`` when it is first read, which a binary transport
+    never does unless the tensor is part of the body hash.
+
     Args:
         buffer (Optional[str]): Tensor buffer data.
         dtype (str): Tensor data type.
@@ -118,19 +123,84 @@ class Tensor(pydantic.BaseModel):
     class Config:
         validate_assignment = True
 
+    # Read-only array holding the tensor data, set instead of the buffer until the buffer is needed.
+    _array: Optional[numpy.ndarray] = pydantic.PrivateAttr(default=None)
+
+    @classmethod
+    def from_array(cls, array: numpy.ndarray, dtype: str, shape: List[int]) -> "Tensor":
+        """
+        Wraps ``array`` without copying it. The array must not be modified afterwards.
+
+        Args:
+            array (numpy.ndarray): The tensor data, in the numpy dtype matching ``dtype``.
+            dtype (str): Tensor data type, such as ``torch.float32``.
+            shape (List[int]): Tensor shape, ``[0]`` for scalars.
+
+        Returns:
+            Tensor: The tensor, with its ``buffer`` encoded lazily.
+        """
+        array.flags.writeable = False
+        tensor = cls(buffer=None, dtype=dtype, shape=shape)
+        tensor._array = array
+        return tensor
+
+    def __getattribute__(self, name: str) -> Any:
+        if name == "buffer":
+            self._encode_buffer()
+        return super().__getattribute__(name)
+
+    def _copy_and_set_values(
+        self, values: Dict[str, Any], fields_set: Any, *, deep: bool
+    ) -> "Tensor":
+        tensor = super()._copy_and_set_values(values, fields_set, deep=deep)
+        # Copies given another buffer, by ``copy(update=...)``, hold its data rather than this tensor's array.
+        if values.get("buffer") is not self.__dict__.get("buffer"):
+            tensor._array = None
+        return tensor
+
+    def _encode_buffer(self):
+        array = object.__getattribute__(self, "_array")
+        if array is not None and self.__dict__["buffer"] is None:
+            self.__dict__["buffer"] = base64.b64encode(
+                msgpack.packb(array, default=msgpack_numpy.encode)
+            ).decode("utf-8")
+
+    def dict(self, **kwargs) -> "pydantic.typing.DictStrAny":
+        self._encode_buffer()
+        return super().dict(**kwargs)
+
+    def json(self, **kwargs) -> str:
+        self._encode_buffer()
+        return super().json(**kwargs)
+
+    def array(self) -> "numpy.ndarray":
+        """
+        Returns the tensor data as a numpy array in its original shape, without copying it when available.
+        The array may be read-only.
+        """
+        if self._array is not None:
+            return self._array
+        buffer_bytes = base64.b64decode(self.buffer.encode("utf-8"))
+        return msgpack.unpackb(buffer_bytes, object_hook=msgpack_numpy.decode)
+
     def tensor(self) -> torch.Tensor:
         return self.deserialize()
 
     def tolist(self) -> List[object]:
-        return self.deserialize().tolist()
+        return self.deserialize(copy=False).tolist()
 
     def numpy(self) -> "numpy.ndarray":
         return self.deserialize().detach().numpy()
 
-    def deserialize(self) -> "torch.Tensor":
+    def deserialize(self, copy: bool = True) -> "torch.Tensor":
         """
         Deserializes the Tensor object.
 
+        Args:
+            copy (bool): If false, tensors holding their data as an array (see :func:`from_array`) are returned
+                without a copy. The result then shares memory with this object, and with the request body it was
+                decoded from, so it must not be modified in place.
+
         Returns:
             torch.Tensor: The deserialized tensor object.
 
@@ -138,11 +208,19 @@ class Tensor(pydantic.BaseModel):
             Exception: If the deserialization process encounters an error.
         """
         shape = tuple(self.shape)
-        buffer_bytes = base64.b64decode(self.buffer.encode("utf-8"))
-        numpy_object = msgpack.unpackb(
-            buffer_bytes, object_hook=msgpack_numpy.decode
-        ).copy()
-        torch_object = torch.as_tensor(numpy_object)
+        if self._array is not None and copy:
+            torch_object = torch.from_numpy(self._array.copy())
+        elif self._array is not None:
+            with warnings.catch_warnings():
+                # The array may be read-only, which torch warns about but does not enforce.
+                warnings.simplefilter("ignore", UserWarning)
+                torch_object = torch.from_numpy(self._array)
+        else:
+            buffer_bytes = base64.b64decode(self.buffer.encode("utf-8"))
+            numpy_object = msgpack.unpackb(
+                buffer_bytes, object_hook=msgpack_numpy.decode
+            ).copy()
+            torch_object = torch.as_tensor(numpy_object)
         # Reshape does not work for (0) or [0]
         if not (len(shape) == 1 and shape[0] == 0):
             torch_object = torch_object.reshape(shape)
@@ -167,10 +245,8 @@ class Tensor(pydantic.BaseModel):
         if len(shape) == 0:
             shape = [0]
         torch_numpy = tensor.cpu().detach().numpy().copy()
-        data_buffer = base64.b64encode(
-            msgpack.packb(torch_numpy, default=msgpack_numpy.encode)
-        ).decode("utf-8")
-        return Tensor(buffer=data_buffer, shape=shape, dtype=dtype)
+        # The base64 buffer is only encoded once it is needed, see :func:`Tensor.from_array`.
+        return Tensor.from_array(torch_numpy, dtype=dtype, shape=shape)
 
     buffer: Optional[str] = pydantic.Field(
         title="buffer",
@@ -0,0 +1,254 @@
+# The MIT License (MIT)
+# Copyright © 2023 Opentensor Foundation
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy of this software and associated
+# documentation files (the “Software”), to deal in the Software without restriction, including without limitation
+# the rights to use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies of the Software,
+# and to permit persons to whom the Software is furnished to do so, subject to the following conditions:
+
+# The above copyright notice and this permission notice shall be included in all copies or substantial portions of
+# the Software.
+
+# THE SOFTWARE IS PROVIDED “AS IS”, WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO
+# THE WARRANTIES OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL
+# THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION
+# OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER
+# DEALINGS IN THE SOFTWARE.
+
+import asyncio
+import threading
+import sr25519
+
+from collections import OrderedDict
+from concurrent.futures import Executor, Future, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Dict, List, Optional, Tuple, Union
+
+from substrateinterface.utils.ss58 import ss58_decode
+
+# (signature, message, public_key)
+_VerifyItem = Tuple[bytes, bytes, bytes]
+
+
+def _verify_one(signature: bytes, message: bytes, public_key: bytes) -> bool:
+    """Mirrors :func:`Keypair.verify` for sr25519 keys, including the ``<Bytes>`` wrapped fallback."""
+    try:
+        if sr25519.verify(signature, message, public_key):
+            return True
+        return sr25519.verify(signature, b"<Bytes>" + message + b"</Bytes>", public_key)
+    except Exception:
+        return False
+
+
+def _verify_batch(items: List[_VerifyItem]) -> List[bool]:
+    """Verifies a batch of signatures. Module level so that it can be shipped to a process pool."""
+    return [_verify_one(*item) for item in items]
+
+
+def _decode_signature(signature: Union[str, bytes, None]) -> Optional[bytes]:
+    if isinstance(signature, bytes):
+        return signature
+    if isinstance(signature, str):
+        try:
+            return bytes.fromhex(
+                signature[2:] if signature.startswith("0x") else signature
+            )
+        except ValueError:
+            return None
+    return None
+
+
+class SignatureVerifier:
+    """
+    Verifies sr25519 request signatures on behalf of the axon.
+
+    Decoded public keys are kept in an LRU cache keyed by ss58 address so that repeat callers skip the
+    ss58 decode, and signatures submitted concurrently through :func:`averify` are collected into batches
+    which are verified on a dedicated thread or process pool, keeping the asyncio loop free.
+
+    Args:
+        cache_size (int): Maximum number of decoded public keys kept in the LRU cache.
+        batch_size (int): Maximum number of signatures verified per executor call.
+        max_workers (int): Number of threads (or processes) verifying batches.
+        use_processes (bool): If ``True``, batches are verified in a process pool instead of threads.
+
+    Example::
+
+        verifier = SignatureVerifier(cache_size=4096)
+        ok = await verifier.averify(hotkey_ss58, message, "0x...")
+    """
+
+    def __init__(
+        self,
+        cache_size: int = 4096,
+        batch_size: int = 64,
+        max_workers: int = 1,
+        use_processes: bool = False,
+    ):
+        if cache_size <= 0:
+            raise ValueError("cache_size must be greater than 0")
+        if batch_size <= 0:
+            raise ValueError("batch_size must be greater than 0")
+        if max_workers <= 0:
+            raise ValueError("max_workers must be greater than 0")
+
+        self.cache_size = cache_size
+        self.batch_size = batch_size
+        self.max_workers = max_workers
+        self.use_processes = use_processes
+
+        self._keys: "OrderedDict[str, bytes]" = OrderedDict()
+        self._keys_lock = threading.Lock()
+        self._pending: List[Tuple[_VerifyItem, asyncio.Future]] = []
+        self._pending_lock = threading.Lock()
+        self._executor: Optional[Executor] = None
+
+        self.cache_hits = 0
+        self.cache_misses = 0
+        self.verified = 0
+        self.batches = 0
+
+    def public_key(self, ss58_address: str) -> bytes:
+        """
+        Returns the public key for ``ss58_address``, decoding it on a cache miss.
+
+        Raises:
+            ValueError: If the address is not a valid ss58 address.
+        """
+        with self._keys_lock:
+            public_key = self._keys.get(ss58_address)
+            if public_key is not None:
+                self._keys.move_to_end(ss58_address)
+                self.cache_hits += 1
+                return public_key
+
+        public_key = bytes.fromhex(ss58_decode(ss58_address))
+        if len(public_key) != 32:
+            raise ValueError("Public key should be 32 bytes long")
+
+        with self._keys_lock:
+            self.cache_misses += 1
+            self._keys[ss58_address] = public_key
+            if len(self._keys) > self.cache_size:
+                self._keys.popitem(last=False)
+        return public_key
+
+    def _prepare(
+        self,
+        ss58_address: str,
+        message: Union[str, bytes],
+        signature: Union[str, bytes],
+    ) -> Optional[_VerifyItem]:
+        signature_bytes = _decode_signature(signature)
+        if signature_bytes is None:
+            return None
+        message_bytes = message.encode() if isinstance(message, str) else message
+        return signature_bytes, message_bytes, self.public_key(ss58_address)
+
+    def verify(
+        self,
+        ss58_address: str,
+        message: Union[str, bytes],
+        signature: Union[str, bytes],
+    ) -> bool:
+        """Synchronously verifies ``signature`` over ``message`` for the hotkey ``ss58_address``."""
+        item = self._prepare(ss58_address, message, signature)
+        self.verified += 1
+        return item is not None and _verify_one(*item)
+
+    async def averify(
+        self,
+        ss58_address: str,
+        message: Union[str, bytes],
+        signature: Union[str, bytes],
+    ) -> bool:
+        """
+        Asynchronously verifies ``signature`` over ``message`` for the hotkey ``ss58_address``.
+
+        The request joins the pending batch, which is flushed to the executor on the next loop
+        iteration or as soon as it reaches ``batch_size``.
+        """
+        item = self._prepare(ss58_address, message, signature)
+        if item is None:
+            return False
+
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        with self._pending_lock:
+            self._pending.append((item, future))
+            pending = len(self._pending)
+
+        if pending >= self.batch_size:
+            self._flush()
+        elif pending == 1:
+            loop.call_soon(self._flush)
+        return await future
+
+    def _get_executor(self) -> Executor:
+        if self._executor is None:
+            self._executor = (
+                ProcessPoolExecutor(max_workers=self.max_workers)
+                if self.use_processes
+                else ThreadPoolExecutor(
+                    max_workers=self.max_workers, thread_name_prefix="axon-verify"
+                )
+            )
+        return self._executor
+
+    def _flush(self):
+        with self._pending_lock:
+            batch, self._pending = self._pending, []
+        if not batch:
+            return
+
+        self.batches += 1
+        self.verified += len(batch)
+        futures = [future for _, future in batch]
+        try:
+            result = self._get_executor().submit(
+                _verify_batch, [item for item, _ in batch]
+            )
+        except Exception as e:
+            for future in futures:
+                future.get_loop().call_soon_threadsafe(_set_exception, future, e)
+            return
+        result.add_done_callback(lambda done: _resolve(futures, done))
+
+    @property
+    def stats(self) -> Dict[str, int]:
+        """Counters for the key cache and batch verification."""
+        return {
+            "cached_keys": len(self._keys),
+            "cache_hits": self.cache_hits,
+            "cache_misses": self.cache_misses,
+            "verified": self.verified,
+            "batches": self.batches,
+        }
+
+    def shutdown(self, wait: bool = True):
+        """Shuts down the verification executor. It is recreated lazily on the next batch."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=wait)
+            self._executor = None
+
+
+def _set_result(future: asyncio.Future, value: bool):
+    if not future.done():
+        future.set_result(value)
+
+
+def _set_exception(future: asyncio.Future, exception: BaseException):
+    if not future.done():
+        future.set_exception(exception)
+
+
+def _resolve(futures: List[asyncio.Future], done: Future):
+    """Hands executor results back to the (possibly different) loops that are awaiting them."""
+    exception = done.exception()
+    for index, future in enumerate(futures):
+        loop = future.get_loop()
+        if loop.is_closed():
+            continue
+        if exception is not None:
+            loop.call_soon_threadsafe(_set_exception, future, exception)
+        else:
+            loop.call_soon_threadsafe(_set_result, future, done.result()[index])
@@ -0,0 +1,108 @@
+# The MIT License (MIT)
+# Copyright © 2023 Opentensor Foundation
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy of this software and associated
+# documentation files (the “Software”), to deal in the Software without restriction, including without limitation
+# the rights to use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies of the Software,
+# and to permit persons to whom the Software is furnished to do so, subject to the following conditions:
+
+# The above copyright notice and this permission notice shall be included in all copies or substantial portions of
+# the Software.
+
+# THE SOFTWARE IS PROVIDED “AS IS”, WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO
+# THE WARRANTIES OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL
+# THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION
+# OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER
+# DEALINGS IN THE SOFTWARE.
+
+"""
+Benchmarks axon request body handling for large payloads.
+
+The previous pipeline parsed and validated the body twice, once in ``verify_body_integrity`` and once by
+FastAPI for the route, hashed the full ``Synapse.dict()``, and validated the response against the route's
+response model. The current pipeline parses the body once, only serializes the ``required_hash_fields`` for
+the hash, and serializes the response directly.
+
+Usage::
+
+    python scripts/benchmarks/axon_body_parse.py --megabytes 8 --iterations 10
+"""
+
+import argparse
+import base64
+import json
+import os
+import time
+from typing import List
+
+import bittensor
+from fastapi.encoders import jsonable_encoder
+
+
+class LargeSynapse(bittensor.Synapse):
+    prompt: str = ""
+    image: str = ""
+    embedding: List[float] = []
+    required_hash_fields: List[str] = ["prompt", "image"]
+
+
+def full_body_hash(synapse: bittensor.Synapse) -> str:
+    # The previous implementation of ``Synapse.body_hash``.
+    hashes = [
+        bittensor.utils.hash(str(value))
+        for field, value in synapse.dict().items()
+        if field in synapse.required_hash_fields
+    ]
+    return bittensor.utils.hash("".join(hashes))
+
+
+def previous(body: bytes, body_hash: str) -> bytes:
+    synapse = LargeSynapse(**json.loads(body.decode()))
+    assert full_body_hash(synapse) == body_hash
+    # FastAPI parses and validates the body again for the route.
+    synapse = LargeSynapse(**json.loads(body))
+    # The returned synapse is validated against the response model and encoded.
+    response = LargeSynapse(**synapse.dict())
+    return json.dumps(jsonable_encoder(response)).encode()
+
+
+def current(body: bytes, body_hash: str) -> bytes:
+    synapse = LargeSynapse(**json.loads(body.decode()))
+    assert synapse.body_hash == body_hash
+    return synapse.json().encode()
+
+
+def bench(fn, body: bytes, body_hash: str, iterations: int) -> float:
+    start = time.perf_counter()
+    for _ in range(iterations):
+        fn(body, body_hash)
+    return (time.perf_counter() - start) / iterations
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--megabytes", type=float, default=8.0)
+    parser.add_argument("--iterations", type=int, default=10)
+    args = parser.parse_args()
+
+    size = int(args.megabytes * 2**20)
+    synapse = LargeSynapse(
+        prompt="benchmark",
+        image=base64.b64encode(os.urandom(size // 2)).decode(),
+        embedding=[0.5] * (size // 2 // 5),
+    )
+    body = json.dumps(synapse.dict()).encode()
+    body_hash = synapse.body_hash
+    assert body_hash == full_body_hash(synapse)
+
+    before = bench(previous, body, body_hash, args.iterations)
+    after = bench(current, body, body_hash, args.iterations)
+    print(f"body size         : {len(body) / 2**20:10.2f} MB")
+    print(f"double parse      : {before * 1000:10.1f} ms/request")
+    print(
+        f"single parse      : {after * 1000:10.1f} ms/request ({before / after:.2f}x)"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+# The MIT License (MIT)
+# Copyright © 2023 Opentensor Foundation
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy of this software and associated
+# documentation files (the “Software”), to deal in the Software without restriction, including without limitation
+# the rights to use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies of the Software,
+# and to permit persons to whom the Software is furnished to do so, subject to the following conditions:
+
+# The above copyright notice and this permission notice shall be included in all copies or substantial portions of
+# the Software.
+
+# THE SOFTWARE IS PROVIDED “AS IS”, WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO
+# THE WARRANTIES OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL
+# THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION
+# OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER
+# DEALINGS IN THE SOFTWARE.
+
+"""
+Benchmarks axon request signature verification.
+
+Compares the previous ``Keypair(ss58_address=...).verify`` per request on the event loop with
+:class:`bittensor.verifier.SignatureVerifier`, which caches decoded hotkeys and verifies batches
+of concurrent requests off the loop.
+
+Usage::
+
+    python scripts/benchmarks/axon_verify.py --requests 5000 --hotkeys 64 --workers 2
+"""
+
+import argparse
+import asyncio
+import time
+
+from substrateinterface import Keypair
+
+from bittensor.verifier import SignatureVerifier
+
+
+def build_requests(num_requests: int, num_hotkeys: int):
+    keypairs = [Keypair.create_from_uri(f"//Bench{i}") for i in range(num_hotkeys)]
+    requests = []
+    for i in range(num_requests):
+        keypair = keypairs[i % num_hotkeys]
+        message = f"{i}.{keypair.ss58_address}.axon_hotkey.uuid.body_hash"
+        requests.append(
+            (keypair.ss58_address, message, f"0x{keypair.sign(message).hex()}")
+        )
+    return requests
+
+
+async def baseline(requests) -> float:
+    async def verify(ss58_address, message, signature):
+        return Keypair(ss58_address=ss58_address).verify(message, signature)
+
+    start = time.perf_counter()
+    results = await asyncio.gather(*(verify(*request) for request in requests))
+    assert all(results)
+    return len(requests) / (time.perf_counter() - start)
+
+
+async def batched(requests, verifier: SignatureVerifier) -> float:
+    start = time.perf_counter()
+    results = await asyncio.gather(
+        *(verifier.averify(*request) for request in requests)
+    )
+    assert all(results)
+    return len(requests) / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requests", type=int, default=5000)
+    parser.add_argument("--hotkeys", type=int, default=64)
+    parser.add_argument("--batch_size", type=int, default=64)
+    parser.add_argument("--workers", type=int, default=1)
+    parser.add_argument("--use_processes", action="store_true")
+    args = parser.parse_args()
+
+    requests = build_requests(args.requests, args.hotkeys)
+    verifier = SignatureVerifier(
+        batch_size=args.batch_size,
+        max_workers=args.workers,
+        use_processes=args.use_processes,
+    )
+    # Warm up the executor and the key cache.
+    asyncio.run(batched(requests[: args.hotkeys], verifier))
+
+    before = asyncio.run(baseline(requests))
+    after = asyncio.run(batched(requests, verifier))
+    verifier.shutdown()
+
+    print(f"keypair per request : {before:10.1f} verifies/sec")
+    print(f"SignatureVerifier   : {after:10.1f} verifies/sec ({after / before:.2f}x)")
+    print(f"verifier stats      : {verifier.stats}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,138 @@
+# The MIT License (MIT)
+# Copyright © 2023 Opentensor Foundation
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy of this software and associated
+# documentation files (the “Software”), to deal in the Software without restriction, including without limitation
+# the rights to use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies of the Software,
+# and to permit persons to whom the Software is furnished to do so, subject to the following conditions:
+
+# The above copyright notice and this permission notice shall be included in all copies or substantial portions of
+# the Software.
+
+# THE SOFTWARE IS PROVIDED “AS IS”, WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO
+# THE WARRANTIES OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL
+# THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION
+# OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER
+# DEALINGS IN THE SOFTWARE.
+
+"""
+Benchmarks decoding a subnet's ``NeuronInfoLite`` list with :func:`NeuronInfoLite.list_from_vec_u8`.
+
+The previous implementation built a ``RuntimeConfiguration`` and loaded the ``legacy`` preset and the custom RPC
+types on every decode, the generic decoder now reuses the process-wide configuration returned by
+:func:`bittensor.chain_data.get_rpc_runtime_config` and its cached decoder classes. ``subtensor.neurons_lite``
+decodes with :class:`bittensor.chain_columns.NeuronInfoLiteColumns` instead, which parses the payload into columns
+and builds every ``NeuronInfoLite`` from them.
+
+Usage::
+
+    python scripts/benchmarks/chain_data_decode.py --neurons 4096 --iterations 5
+"""
+
+import argparse
+import random
+import time
+
+from scalecodec.base import RuntimeConfiguration, ScaleBytes
+from scalecodec.type_registry import load_type_registry_preset
+
+from bittensor.chain_columns import NeuronInfoLiteColumns
+from bittensor.chain_data import (
+    NeuronInfoLite,
+    custom_rpc_type_registry,
+    get_rpc_runtime_config,
+)
+
+
+def make_payload(n: int) -> bytes:
+    def account() -> str:
+        return "0x" + random.randbytes(32).hex()
+
+    neurons = [
+        {
+            "hotkey": account(),
+            "coldkey": account(),
+            "uid": uid,
+            "netuid": 1,
+            "active": True,
+            "axon_info": {
+                "block": random.randrange(3_000_000),
+                "version": 610,
+                "ip": random.randrange(2**32),
+                "port": 8091,
+                "ip_type": 4,
+                "protocol": 4,
+                "placeholder1": 0,
+                "placeholder2": 0,
+            },
+            "prometheus_info": {
+                "block": 0,
+                "version": 0,
+                "ip": 0,
+                "port": 0,
+                "ip_type": 0,
+            },
+            "stake": [(account(), random.randrange(10**15))],
+            "rank": random.randrange(2**16),
+            "emission": random.randrange(10**10),
+            "incentive": random.randrange(2**16),
+            "consensus": random.randrange(2**16),
+            "trust": random.randrange(2**16),
+            "validator_trust": random.randrange(2**16),
+            "dividends": random.randrange(2**16),
+            "last_update": random.randrange(3_000_000),
+            "validator_permit": uid % 4 == 0,
+            "pruning_score": random.randrange(2**16),
+        }
+        for uid in range(n)
+    ]
+    encoded = get_rpc_runtime_config().create_scale_object("Vec<NeuronInfoLite>")
+    return bytes(encoded.encode(neurons).data)
+
+
+def previous(payload: bytes):
+    rpc_runtime_config = RuntimeConfiguration()
+    rpc_runtime_config.update_type_registry(load_type_registry_preset("legacy"))
+    rpc_runtime_config.update_type_registry(custom_rpc_type_registry)
+    decoded = rpc_runtime_config.create_scale_object(
+        "Vec<NeuronInfoLite>", data=ScaleBytes(payload)
+    ).decode()
+    return [NeuronInfoLite.fix_decoded_values(neuron) for neuron in decoded]
+
+
+def current(payload: bytes):
+    return NeuronInfoLite.list_from_vec_u8(list(payload))
+
+
+def columnar(payload: bytes):
+    return list(NeuronInfoLiteColumns.from_vec_u8(payload))
+
+
+def bench(fn, payload: bytes, iterations: int) -> float:
+    start = time.perf_counter()
+    for _ in range(iterations):
+        fn(payload)
+    return (time.perf_counter() - start) / iterations
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--neurons", type=int, default=4096)
+    parser.add_argument("--iterations", type=int, default=5)
+    args = parser.parse_args()
+
+    payload = make_payload(args.neurons)
+    assert previous(payload) == current(payload) == columnar(payload)
+
+    before = bench(previous, payload, args.iterations)
+    after = bench(current, payload, args.iterations)
+    fast = bench(columnar, payload, args.iterations)
+    print(f"neurons           : {args.neurons:10}")
+    print(f"payload           : {len(payload) / 2**20:10.2f} MiB")
+    print(f"per call registry : {before * 1000:10.2f} ms")
+    print(f"cached registry   : {after * 1000:10.2f} ms ({before / after:.2f}x)")
+    print(f"columnar          : {fast * 1000:10.2f} ms ({before / fast:.2f}x)")
+
+
+if __name__ == "__main__":
+    main()
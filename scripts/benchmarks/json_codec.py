@@ -0,0 +1,156 @@
+# The MIT License (MIT)
+# Copyright © 2023 Opentensor Foundation
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy of this software and associated
+# documentation files (the “Software”), to deal in the Software without restriction, including without limitation
+# the rights to use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies of the Software,
+# and to permit persons to whom the Software is furnished to do so, subject to the following conditions:
+
+# The above copyright notice and this permission notice shall be included in all copies or substantial portions of
+# the Software.
+
+# THE SOFTWARE IS PROVIDED “AS IS”, WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO
+# THE WARRANTIES OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL
+# THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION
+# OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER
+# DEALINGS IN THE SOFTWARE.
+
+"""
+Benchmarks the JSON codecs of :mod:`bittensor.codec` on the synapses of every protocol in
+``bittensor/subnets/protocols``.
+
+Each synapse is filled with sample values for its fields, then encoded from ``Synapse.dict()`` and decoded
+again with every available codec, as the dendrite and axon do for requests and responses. Float heavy bodies of
+``--rows`` lists of ``--columns`` floats follow, without and with ``null`` values, the latter making the fast
+codecs check the body for non finite floats.
+
+Usage::
+
+    python scripts/benchmarks/json_codec.py --items 256 --iterations 200 --rows 2000 --columns 50
+"""
+
+import argparse
+import importlib.util
+import inspect
+import os
+import random
+import time
+import typing
+
+import bittensor
+from bittensor import codec
+
+PROTOCOLS = os.path.join(os.path.dirname(bittensor.__file__), "subnets", "protocols")
+
+
+def sample(annotation, items: int):
+    # A sample value for a field annotation, lists and dicts hold ``items`` values.
+    origin = typing.get_origin(annotation)
+    args = typing.get_args(annotation)
+    if origin is typing.Union:
+        return sample(next(arg for arg in args if arg is not type(None)), items)
+    if origin in (list, typing.List, tuple, set):
+        return [sample(args[0] if args else str, items // 4 or 1) for _ in range(items)]
+    if origin in (dict, typing.Dict):
+        return {f"key{i}": sample(args[1] if args else str, 1) for i in range(items)}
+    if annotation is str:
+        return "bittensor " * 8
+    if annotation is int:
+        return 123456
+    if annotation is float:
+        return 0.123456789
+    if annotation is bool:
+        return True
+    raise TypeError(annotation)
+
+
+def build(cls, items: int) -> bittensor.Synapse:
+    values = {}
+    for name, field in cls.__fields__.items():
+        if name in bittensor.Synapse.__fields__:
+            continue
+        try:
+            values[name] = sample(field.outer_type_, items)
+        except (TypeError, StopIteration):
+            pass
+    try:
+        return cls(**values)
+    except Exception:
+        return cls()
+
+
+def synapses(items: int) -> typing.Iterator[typing.Tuple[str, bittensor.Synapse]]:
+    for filename in sorted(os.listdir(PROTOCOLS)):
+        if not filename.startswith("sn") or not filename.endswith(".py"):
+            continue
+        name = filename[:-3]
+        spec = importlib.util.spec_from_file_location(
+            name, os.path.join(PROTOCOLS, filename)
+        )
+        module = importlib.util.module_from_spec(spec)
+        try:
+            spec.loader.exec_module(module)
+        except Exception as e:
+            print(f"{name:6} skipped, {type(e).__name__}: {e}")
+            continue
+        for _, cls in inspect.getmembers(module, inspect.isclass):
+            if (
+                issubclass(cls, bittensor.Synapse)
+                and cls.__module__ == name
+                and not issubclass(cls, bittensor.StreamingSynapse)
+            ):
+                try:
+                    yield f"{name}.{cls.__name__}", build(cls, items)
+                except Exception:
+                    continue
+
+
+def float_bodies(rows: int, columns: int) -> typing.Iterator[typing.Tuple[str, dict]]:
+    rng = random.Random(0)
+    floats = {f"row{i}": [rng.random() for _ in range(columns)] for i in range(rows)}
+    yield f"floats {rows}x{columns}", floats
+    yield f"floats {rows}x{columns} with nulls", {**floats, "missing": None}
+
+
+def bench(json_codec: codec.JSONCodec, body: dict, iterations: int):
+    start = time.perf_counter()
+    for _ in range(iterations):
+        data = json_codec.dumps(body)
+    encode = (time.perf_counter() - start) / iterations
+    start = time.perf_counter()
+    for _ in range(iterations):
+        json_codec.loads(data)
+    decode = (time.perf_counter() - start) / iterations
+    return encode, decode
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--items", type=int, default=256)
+    parser.add_argument("--iterations", type=int, default=200)
+    parser.add_argument("--rows", type=int, default=2000)
+    parser.add_argument("--columns", type=int, default=50)
+    args = parser.parse_args()
+
+    codecs = [cls() for cls in codec.available_codecs().values()]
+    stdlib = codecs[-1]
+    print(f"codecs: {', '.join(c.name for c in codecs)}")
+    print(
+        f"{'synapse':40} {'size':>9} "
+        + " ".join(f"{c.name + ' enc/dec us':>22}" for c in codecs)
+    )
+    bodies = [(name, synapse.dict()) for name, synapse in synapses(args.items)]
+    bodies.extend(float_bodies(args.rows, args.columns))
+    for name, body in bodies:
+        size = len(stdlib.dumps(body))
+        results = {c.name: bench(c, body, args.iterations) for c in codecs}
+        base = sum(results[stdlib.name])
+        row = " ".join(
+            f"{encode * 1e6:8.1f}/{decode * 1e6:7.1f} {base / (encode + decode):4.1f}x"
+            for encode, decode in results.values()
+        )
+        print(f"{name:40} {size:9} {row}")
+
+
+if __name__ == "__main__":
+    main()
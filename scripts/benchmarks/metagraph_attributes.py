@@ -0,0 +1,110 @@
+# The MIT License (MIT)
+# Copyright © 2023 Opentensor Foundation
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy of this software and associated
+# documentation files (the “Software”), to deal in the Software without restriction, including without limitation
+# the rights to use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies of the Software,
+# and to permit persons to whom the Software is furnished to do so, subject to the following conditions:
+
+# The above copyright notice and this permission notice shall be included in all copies or substantial portions of
+# the Software.
+
+# THE SOFTWARE IS PROVIDED “AS IS”, WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO
+# THE WARRANTIES OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL
+# THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION
+# OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER
+# DEALINGS IN THE SOFTWARE.
+
+"""
+Benchmarks building the metagraph attributes from a subnet's ``NeuronInfoLite`` list.
+
+The previous implementation ran one list comprehension and ``torch.tensor`` call per attribute, the current one
+reads every neuron once into a single numpy table, see :func:`bittensor.metagraph.neuron_columns`.
+
+Usage::
+
+    python scripts/benchmarks/metagraph_attributes.py --neurons 4096 --iterations 20
+"""
+
+import argparse
+import dataclasses
+import operator
+import random
+import time
+
+import torch
+
+import bittensor
+from bittensor.chain_data import NeuronInfoLite
+from bittensor.metagraph import NEURON_COLUMNS, neuron_columns
+
+
+def make_neurons(n: int):
+    null = NeuronInfoLite._null_neuron()
+    return [
+        dataclasses.replace(
+            null,
+            uid=uid,
+            active=1,
+            stake=bittensor.Balance.from_rao(random.randrange(10**15)),
+            total_stake=bittensor.Balance.from_rao(random.randrange(10**15)),
+            rank=random.random(),
+            emission=random.random(),
+            incentive=random.random(),
+            consensus=random.random(),
+            trust=random.random(),
+            validator_trust=random.random(),
+            dividends=random.random(),
+            last_update=random.randrange(3_000_000),
+            validator_permit=uid % 4 == 0,
+        )
+        for uid in range(n)
+    ]
+
+
+def previous(neurons):
+    return {
+        name: torch.nn.Parameter(
+            torch.tensor(
+                [operator.attrgetter(attribute)(neuron) for neuron in neurons],
+                dtype=dtype,
+            ),
+            requires_grad=False,
+        )
+        for name, attribute, dtype in NEURON_COLUMNS
+    }
+
+
+def current(neurons):
+    return {
+        name: torch.nn.Parameter(tensor, requires_grad=False)
+        for name, tensor in neuron_columns(neurons).items()
+    }
+
+
+def bench(fn, neurons, iterations: int) -> float:
+    start = time.perf_counter()
+    for _ in range(iterations):
+        fn(neurons)
+    return (time.perf_counter() - start) / iterations
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--neurons", type=int, default=4096)
+    parser.add_argument("--iterations", type=int, default=20)
+    args = parser.parse_args()
+
+    neurons = make_neurons(args.neurons)
+    expected, actual = previous(neurons), current(neurons)
+    assert all(torch.equal(expected[name], actual[name]) for name in expected)
+
+    before = bench(previous, neurons, args.iterations)
+    after = bench(current, neurons, args.iterations)
+    print(f"neurons           : {args.neurons:10}")
+    print(f"per attribute     : {before * 1000:10.2f} ms")
+    print(f"columnar          : {after * 1000:10.2f} ms ({before / after:.2f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+# The MIT License (MIT)
+# Copyright © 2023 Opentensor Foundation
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy of this software and associated
+# documentation files (the “Software”), to deal in the Software without restriction, including without limitation
+# the rights to use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies of the Software,
+# and to permit persons to whom the Software is furnished to do so, subject to the following conditions:
+
+# The above copyright notice and this permission notice shall be included in all copies or substantial portions of
+# the Software.
+
+# THE SOFTWARE IS PROVIDED “AS IS”, WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO
+# THE WARRANTIES OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL
+# THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION
+# OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER
+# DEALINGS IN THE SOFTWARE.
+
+"""
+Benchmarks saving and loading a metagraph as a pickled ``torch.save`` state dict and as a memory-mapped snapshot.
+
+Usage::
+
+    python scripts/benchmarks/metagraph_snapshot.py --neurons 4096
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+import torch
+import bittensor
+from bittensor.metagraph import NEURON_COLUMNS
+
+
+def make_metagraph(n: int) -> "bittensor.metagraph":
+    metagraph = bittensor.metagraph(1, sync=False)
+    metagraph.n = metagraph._create_tensor(n, dtype=torch.int64)
+    metagraph.block = metagraph._create_tensor(1, dtype=torch.int64)
+    for name, _, dtype in NEURON_COLUMNS:
+        setattr(
+            metagraph,
+            name,
+            torch.nn.Parameter(torch.rand(n).to(dtype), requires_grad=False),
+        )
+    metagraph.weights = torch.nn.Parameter(torch.rand(n, n), requires_grad=False)
+    metagraph.bonds = torch.nn.Parameter(
+        torch.randint(0, 65535, (n, n)), requires_grad=False
+    )
+    metagraph.axons = [
+        bittensor.AxonInfo(
+            version=1,
+            ip="10.0.0.1",
+            port=8091,
+            ip_type=4,
+            hotkey=f"hotkey-{uid}",
+            coldkey=f"coldkey-{uid}",
+        )
+        for uid in range(n)
+    ]
+    return metagraph
+
+
+def timed(function) -> float:
+    start = time.perf_counter()
+    function()
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--neurons", type=int, default=4096)
+    args = parser.parse_args()
+
+    metagraph = make_metagraph(args.neurons)
+    module = sys.modules["bittensor.metagraph"]
+    with tempfile.TemporaryDirectory() as directory:
+        module.get_save_dir = lambda network, netuid: directory
+
+        def save_pickle():
+            state_dict = metagraph.state_dict()
+            state_dict["axons"] = metagraph.axons
+            torch.save(state_dict, os.path.join(directory, "block-1.pt"))
+
+        pickle_save = timed(save_pickle)
+        pickle_load = timed(lambda: bittensor.metagraph(1, sync=False).load())
+        os.remove(os.path.join(directory, "block-1.pt"))
+
+        snapshot_save = timed(metagraph.save)
+        snapshot_load = timed(lambda: bittensor.metagraph(1, sync=False).load())
+
+    print(f"neurons           : {args.neurons:10}")
+    print(f"torch.save        : {pickle_save * 1000:10.1f} ms")
+    print(f"snapshot save     : {snapshot_save * 1000:10.1f} ms")
+    print(f"torch.load        : {pickle_load * 1000:10.1f} ms")
+    print(
+        f"snapshot load     : {snapshot_load * 1000:10.1f} ms ({pickle_load / snapshot_load:.1f}x)"
+    )
+
+
+if __name__ == "__main__":
+    main()
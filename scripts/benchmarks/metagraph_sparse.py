@@ -0,0 +1,76 @@
+# The MIT License (MIT)
+# Copyright © 2023 Opentensor Foundation
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy of this software and associated
+# documentation files (the “Software”), to deal in the Software without restriction, including without limitation
+# the rights to use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies of the Software,
+# and to permit persons to whom the Software is furnished to do so, subject to the following conditions:
+
+# The above copyright notice and this permission notice shall be included in all copies or substantial portions of
+# the Software.
+
+# THE SOFTWARE IS PROVIDED “AS IS”, WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO
+# THE WARRANTIES OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL
+# THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION
+# OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER
+# DEALINGS IN THE SOFTWARE.
+
+"""
+Benchmarks building the metagraph weights and bonds as dense matrices and as sparse COO tensors.
+
+Usage::
+
+    python scripts/benchmarks/metagraph_sparse.py --neurons 4096 --entries 64
+"""
+
+import argparse
+import random
+import time
+from types import SimpleNamespace
+
+import bittensor
+
+
+def make_neurons(n: int, entries: int):
+    def row():
+        uids = random.sample(range(n), entries)
+        return [(uid, random.randrange(1, 65535)) for uid in uids]
+
+    return [SimpleNamespace(weights=row(), bonds=row()) for _ in range(n)]
+
+
+def build(metagraph, sparse: bool) -> float:
+    metagraph.sparse = sparse
+    start = time.perf_counter()
+    metagraph._set_weights_and_bonds()
+    return time.perf_counter() - start
+
+
+def size(tensor) -> int:
+    if tensor.is_sparse:
+        return size(tensor._indices()) + size(tensor._values())
+    return tensor.numel() * tensor.element_size()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--neurons", type=int, default=4096)
+    parser.add_argument("--entries", type=int, default=64)
+    args = parser.parse_args()
+
+    metagraph = bittensor.metagraph(1, sync=False)
+    metagraph.neurons = make_neurons(args.neurons, args.entries)
+
+    dense = build(metagraph, sparse=False)
+    dense_size = size(metagraph.W) + size(metagraph.B)
+    sparse = build(metagraph, sparse=True)
+    sparse_size = size(metagraph.W) + size(metagraph.B)
+    print(f"neurons           : {args.neurons:10}")
+    print(f"dense             : {dense * 1000:10.1f} ms {dense_size / 2**20:8.1f} MB")
+    print(
+        f"sparse            : {sparse * 1000:10.1f} ms {sparse_size / 2**20:8.1f} MB ({dense / sparse:.1f}x)"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+# The MIT License (MIT)
+# Copyright © 2023 Opentensor Foundation
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy of this software and associated
+# documentation files (the “Software”), to deal in the Software without restriction, including without limitation
+# the rights to use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies of the Software,
+# and to permit persons to whom the Software is furnished to do so, subject to the following conditions:
+
+# The above copyright notice and this permission notice shall be included in all copies or substantial portions of
+# the Software.
+
+# THE SOFTWARE IS PROVIDED “AS IS”, WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO
+# THE WARRANTIES OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL
+# THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION
+# OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER
+# DEALINGS IN THE SOFTWARE.
+"""
+Benchmarks sending a synapse with tensor fields as JSON against sending it as a binary frame.
+
+The JSON body carries each tensor as base64 encoded msgpack, which is encoded on the way out and decoded and
+copied on the way in. A frame (see ``bittensor.frame``) carries the raw buffers, rebuilt as views into the body.
+
+Usage::
+
+    python scripts/benchmarks/tensor_transport.py --rows 4096 --dim 1024 --iterations 10
+"""
+
+import argparse
+import json
+import time
+from typing import List, Optional
+
+import torch
+import bittensor
+from bittensor import frame
+
+
+class Embeddings(bittensor.Synapse):
+    texts: List[str] = []
+    embeddings: Optional[bittensor.Tensor] = None
+
+
+def over_json(embeddings: torch.Tensor) -> int:
+    synapse = Embeddings(
+        texts=["benchmark"], embeddings=bittensor.Tensor.serialize(embeddings)
+    )
+    body = json.dumps(synapse.dict()).encode()
+    received = Embeddings(**json.loads(body))
+    received.embeddings.tensor()
+    return len(body)
+
+
+def over_frame(embeddings: torch.Tensor) -> int:
+    synapse = Embeddings(
+        texts=["benchmark"], embeddings=bittensor.Tensor.serialize(embeddings)
+    )
+    body = frame.encode(synapse)
+    received = Embeddings(**frame.decode(body))
+    received.embeddings.tensor()
+    return len(body)
+
+
+def bench(fn, embeddings: torch.Tensor, iterations: int):
+    start = time.perf_counter()
+    for _ in range(iterations):
+        size = fn(embeddings)
+    return (time.perf_counter() - start) / iterations, size
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=4096)
+    parser.add_argument("--dim", type=int, default=1024)
+    parser.add_argument("--iterations", type=int, default=10)
+    args = parser.parse_args()
+
+    embeddings = torch.randn(args.rows, args.dim)
+    before, json_size = bench(over_json, embeddings, args.iterations)
+    after, frame_size = bench(over_frame, embeddings, args.iterations)
+    print(f"tensor size       : {embeddings.numel() * 4 / 2**20:10.2f} MB")
+    print(
+        f"json              : {before * 1000:10.1f} ms/request {json_size / 2**20:8.2f} MB"
+    )
+    print(
+        f"frame             : {after * 1000:10.1f} ms/request {frame_size / 2**20:8.2f} MB ({before / after:.2f}x)"
+    )
+
+
+if __name__ == "__main__":
+    main()
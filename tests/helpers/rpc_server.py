@@ -0,0 +1,470 @@
+# The MIT License (MIT)
+# Copyright © 2023 Opentensor Foundation
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy of this software and associated
+# documentation files (the “Software”), to deal in the Software without restriction, including without limitation
+# the rights to use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies of the Software,
+# and to permit persons to whom the Software is furnished to do so, subject to the following conditions:
+
+# The above copyright notice and this permission notice shall be included in all copies or substantial portions of
+# the Software.
+
+# THE SOFTWARE IS PROVIDED “AS IS”, WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO
+# THE WARRANTIES OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL
+# THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION
+# OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER
+# DEALINGS IN THE SOFTWARE.
+
+"""
+A stand-in subtensor node, answering the JSON-RPC requests of :class:`bittensor.AsyncSubtensor` over a local
+websocket. It serves the metadata of a small runtime holding the storage items and calls the client uses.
+"""
+
+import json
+import asyncio
+import hashlib
+
+from aiohttp import web, WSMsgType
+from typing import Any, Callable, Dict, List, Optional
+from scalecodec.base import RuntimeConfigurationObject, ScaleBytes
+from scalecodec.type_registry import load_type_registry_preset
+from substrateinterface.storage import StorageKey
+
+SPEC_VERSION = 100
+TRANSACTION_VERSION = 1
+SUBTENSOR_PALLET_INDEX = 7
+
+
+def _type(path, definition, params=()):
+    return {
+        "path": list(path),
+        "params": [{"name": name, "type": type_} for name, type_ in params],
+        "def": definition,
+        "docs": [],
+    }
+
+
+def _field(name, type_, type_name=None):
+    return {"name": name, "type": type_, "typeName": type_name, "docs": []}
+
+
+def _variant(name, index, fields=(), docs=()):
+    return {"name": name, "fields": list(fields), "index": index, "docs": list(docs)}
+
+
+def _composite(path, *fields):
+    return _type(path, {"composite": {"fields": list(fields)}})
+
+
+def _enum(path, *variants, params=()):
+    return _type(path, {"variant": {"variants": list(variants)}}, params)
+
+
+_TYPES = [
+    _type([], {"primitive": "u8"}),  # 0
+    _type([], {"primitive": "u16"}),  # 1
+    _type([], {"primitive": "u32"}),  # 2
+    _type([], {"primitive": "u64"}),  # 3
+    _type([], {"primitive": "u128"}),  # 4
+    _type([], {"array": {"len": 32, "type": 0}}),  # 5
+    _composite(["sp_core", "crypto", "AccountId32"], _field(None, 5)),  # 6
+    _type([], {"sequence": {"type": 1}}),  # 7
+    _composite(
+        ["pallet_balances", "types", "AccountData"],
+        _field("free", 4, "Balance"),
+        _field("reserved", 4, "Balance"),
+        _field("frozen", 4, "Balance"),
+        _field("flags", 4, "ExtraFlags"),
+    ),  # 8
+    _composite(
+        ["frame_system", "AccountInfo"],
+        _field("nonce", 2, "Index"),
+        _field("consumers", 2, "RefCount"),
+        _field("providers", 2, "RefCount"),
+        _field("sufficients", 2, "RefCount"),
+        _field("data", 8, "AccountData"),
+    ),  # 9
+    _enum(
+        ["pallet_subtensor", "pallet", "Call"],
+        _variant(
+            "set_weights",
+            0,
+            [
+                _field("netuid", 1, "u16"),
+                _field("dests", 7, "Vec<u16>"),
+                _field("weights", 7, "Vec<u16>"),
+                _field("version_key", 3, "u64"),
+            ],
+        ),
+    ),  # 10
+    _enum(
+        ["node_subtensor_runtime", "RuntimeCall"],
+        _variant("SubtensorModule", SUBTENSOR_PALLET_INDEX, [_field(None, 10)]),
+    ),  # 11
+    _enum(
+        ["frame_system", "pallet", "Event"],
+        _variant("ExtrinsicSuccess", 0),
+        _variant("ExtrinsicFailed", 1, [_field("dispatch_error", 19)]),
+    ),  # 12
+    _enum(
+        ["node_subtensor_runtime", "RuntimeEvent"],
+        _variant("System", 0, [_field(None, 12)]),
+    ),  # 13
+    _enum(
+        ["frame_system", "Phase"],
+        _variant("ApplyExtrinsic", 0, [_field(None, 2)]),
+        _variant("Finalization", 1),
+        _variant("Initialization", 2),
+    ),  # 14
+    _type(
+        ["frame_system", "EventRecord"],
+        {
+            "composite": {
+                "fields": [
+                    _field("phase", 14),
+                    _field("event", 13),
+                    _field("topics", 17),
+                ]
+            }
+        },
+        [("E", 13), ("T", 16)],
+    ),  # 15
+    _composite(["primitive_types", "H256"], _field(None, 5)),  # 16
+    _type([], {"sequence": {"type": 16}}),  # 17
+    _type([], {"sequence": {"type": 15}}),  # 18
+    _enum(
+        ["sp_runtime", "DispatchError"],
+        _variant("Other", 0),
+        _variant("Module", 3, [_field(None, 20)]),
+    ),  # 19
+    _composite(
+        ["sp_runtime", "ModuleError"], _field("index", 0), _field("error", 21)
+    ),  # 20
+    _type([], {"array": {"len": 4, "type": 0}}),  # 21
+    _enum(
+        ["sp_runtime", "multiaddress", "MultiAddress"],
+        _variant("Id", 0, [_field(None, 6)]),
+        params=[("AccountId", 6), ("AccountIndex", None)],
+    ),  # 22
+    _type([], {"array": {"len": 64, "type": 0}}),  # 23
+    _composite(["sp_core", "sr25519", "Signature"], _field(None, 23)),  # 24
+    _enum(
+        ["sp_runtime", "MultiSignature"],
+        _variant("Ed25519", 0, [_field(None, 24)]),
+        _variant("Sr25519", 1, [_field(None, 24)]),
+    ),  # 25
+    _type([], {"sequence": {"type": 0}}),  # 26
+    _type(
+        ["sp_runtime", "generic", "unchecked_extrinsic", "UncheckedExtrinsic"],
+        {"sequence": {"type": 0}},
+        [("Address", 22), ("Call", 11), ("Signature", 25), ("Extra", 28)],
+    ),  # 27
+    _type([], {"tuple": []}),  # 28
+    _enum(
+        ["sp_runtime", "generic", "era", "Era"],
+        _variant("Immortal", 0),
+        *(_variant(f"Mortal{i}", i, [_field(None, 0)]) for i in range(1, 256)),
+    ),  # 29
+    _type([], {"compact": {"type": 2}}),  # 30
+    _type([], {"compact": {"type": 4}}),  # 31
+    _enum(
+        ["pallet_subtensor", "pallet", "Error"],
+        _variant("SettingWeightsTooFast", 0, docs=["Weights were set too recently."]),
+    ),  # 32
+    _type([], {"primitive": "bool"}),  # 33
+    _type([], {"tuple": [1, 1]}),  # 34
+    _type([], {"sequence": {"type": 34}}),  # 35
+]
+
+
+def _storage(name, type_, default="0x00", modifier="Default"):
+    return {
+        "name": name,
+        "modifier": modifier,
+        "type": type_,
+        "default": default,
+        "documentation": [],
+    }
+
+
+def _map(hashers, key, value):
+    return {"Map": {"hashers": hashers, "key": key, "value": value}}
+
+
+def _extension(identifier, ty, additional_signed):
+    return {"identifier": identifier, "ty": ty, "additional_signed": additional_signed}
+
+
+_METADATA = [
+    "0x6d657461",
+    {
+        "V14": {
+            "types": {"types": [{"id": i, "type": t} for i, t in enumerate(_TYPES)]},
+            "pallets": [
+                {
+                    "name": "System",
+                    "storage": {
+                        "prefix": "System",
+                        "entries": [
+                            _storage(
+                                "Account",
+                                _map(["Blake2_128Concat"], 6, 9),
+                                default="0x" + "00" * 80,
+                            ),
+                            _storage("Events", {"Plain": 18}),
+                        ],
+                    },
+                    "calls": None,
+                    "event": {"ty": 12},
+                    "constants": [],
+                    "error": None,
+                    "index": 0,
+                },
+                {
+                    "name": "SubtensorModule",
+                    "storage": {
+                        "prefix": "SubtensorModule",
+                        "entries": [
+                            _storage("TotalNetworks", {"Plain": 1}, default="0x0000"),
+                            _storage("NetworksAdded", _map(["Identity"], 1, 33)),
+                            _storage("Weights", _map(["Identity", "Identity"], 34, 35)),
+                            _storage("Bonds", _map(["Identity", "Identity"], 34, 35)),
+                        ],
+                    },
+                    "calls": {"ty": 10},
+                    "event": None,
+                    "constants": [],
+                    "error": {"ty": 32},
+                    "index": SUBTENSOR_PALLET_INDEX,
+                },
+            ],
+            "extrinsic": {
+                "ty": 27,
+                "version": 4,
+                "signed_extensions": [
+                    _extension("CheckSpecVersion", 28, 2),
+                    _extension("CheckTxVersion", 28, 2),
+                    _extension("CheckGenesis", 28, 16),
+                    _extension("CheckMortality", 29, 16),
+                    _extension("CheckNonce", 30, 28),
+                    _extension("ChargeTransactionPayment", 31, 28),
+                ],
+            },
+            "runtime_type": 11,
+        }
+    },
+]
+
+
+def block_hash(block: int) -> str:
+    return "0x" + hashlib.sha256(str(block).encode()).hexdigest()
+
+
+class MockRpcServer:
+    """
+    A stand-in subtensor node on a local websocket. Storage values are set with :func:`set_storage` and runtime API
+    results with ``state_calls``. Submitted extrinsics are included in the next block and recorded in
+    ``extrinsics``, failing with ``extrinsic_error`` if it is set. Every request is recorded in ``requests``.
+
+    Example::
+
+        server = MockRpcServer()
+        url = await server.start()
+        server.set_storage("SubtensorModule", "TotalNetworks", [], 3)
+        ...
+        await server.stop()
+    """
+
+    def __init__(self, block: int = 1000, finalized_block: int = 998):
+        self.block = block
+        self.finalized_block = finalized_block
+        self.nonce = 0
+        self.storage: Dict[str, str] = {}
+        self.block_storage: Dict[str, Dict[str, str]] = {}
+        self.blocks: Dict[str, List[str]] = {}
+        self.state_calls: Dict[str, Callable[[str], str]] = {}
+        self.extrinsics: List[str] = []
+        self.extrinsic_error: Optional[int] = None
+        self.requests: List[Dict[str, Any]] = []
+        # Delays the response to a method, in seconds.
+        self.delays: Dict[str, float] = {}
+        # Raw messages sent instead of the response to a method.
+        self.raw_responses: Dict[str, str] = {}
+        self.runtime = RuntimeConfigurationObject()
+        self.runtime.update_type_registry(load_type_registry_preset("core"))
+        self.metadata_hex = (
+            self.runtime.create_scale_object("MetadataVersioned")
+            .encode(_METADATA)
+            .to_hex()
+        )
+        self.metadata = self.runtime.create_scale_object(
+            "MetadataVersioned", data=ScaleBytes(self.metadata_hex)
+        )
+        self.metadata.decode()
+        self.runtime.add_portable_registry(self.metadata)
+        self._runner: Optional[web.AppRunner] = None
+        self._subscriptions = 0
+
+    async def start(self) -> str:
+        """Starts the server on a free local port, returning its url."""
+        app = web.Application()
+        app.router.add_get("/", self._handle)
+        self._runner = web.AppRunner(app)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, "127.0.0.1", 0)
+        await site.start()
+        port = site._server.sockets[0].getsockname()[1]  # type: ignore
+        return f"ws://127.0.0.1:{port}"
+
+    async def stop(self):
+        if self._runner is not None:
+            await self._runner.cleanup()
+
+    def storage_key(self, module: str, name: str, params: List[Any]) -> str:
+        return StorageKey.create_from_storage_function(
+            module, name, params, runtime_config=self.runtime, metadata=self.metadata
+        ).to_hex()
+
+    def encode(self, module: str, name: str, value: Any) -> str:
+        storage_function = self.metadata.get_metadata_pallet(
+            module
+        ).get_storage_function(name)
+        return (
+            self.runtime.create_scale_object(
+                storage_function.get_value_type_string(), metadata=self.metadata
+            )
+            .encode(value)
+            .to_hex()
+        )
+
+    def set_storage(self, module: str, name: str, params: List[Any], value: Any):
+        self.storage[self.storage_key(module, name, params)] = self.encode(
+            module, name, value
+        )
+
+    def _storage_at(self, key: str, at: Optional[str]) -> Optional[str]:
+        return self.block_storage.get(at or "", {}).get(key, self.storage.get(key))
+
+    def _include(self, extrinsic: str) -> str:
+        """Includes ``extrinsic`` in a new block, with the events of its outcome."""
+        self.extrinsics.append(extrinsic)
+        self.block += 1
+        included_in = block_hash(self.block)
+        self.blocks[included_in] = ["0x00", extrinsic]
+        if self.extrinsic_error is None:
+            event = {"System": {"ExtrinsicSuccess": None}}
+        else:
+            error = {
+                "Module": {
+                    "index": SUBTENSOR_PALLET_INDEX,
+                    "error": f"0x{self.extrinsic_error:02x}000000",
+                }
+            }
+            event = {"System": {"ExtrinsicFailed": {"dispatch_error": error}}}
+        events = [
+            {
+                "phase": {"ApplyExtrinsic": 0},
+                "event": {"System": {"ExtrinsicSuccess": None}},
+                "topics": [],
+            },
+            {"phase": {"ApplyExtrinsic": 1}, "event": event, "topics": []},
+        ]
+        self.block_storage[included_in] = {
+            self.storage_key("System", "Events", []): self.encode(
+                "System", "Events", events
+            )
+        }
+        return included_in
+
+    async def _answer(self, method: str, params: List[Any]) -> Any:
+        if method == "chain_getHeader":
+            return {"number": hex(self.block)}
+        if method == "chain_getBlockHash":
+            return block_hash(params[0])
+        if method == "chain_getFinalizedHead":
+            return block_hash(self.finalized_block)
+        if method == "chain_getBlock":
+            return {"block": {"extrinsics": self.blocks[params[0]]}}
+        if method == "state_getRuntimeVersion":
+            return {
+                "specVersion": SPEC_VERSION,
+                "transactionVersion": TRANSACTION_VERSION,
+            }
+        if method == "state_getMetadata":
+            return self.metadata_hex
+        if method == "state_getStorage":
+            return self._storage_at(params[0], params[1] if len(params) > 1 else None)
+        if method == "state_getKeysPaged":
+            prefix, count, start = params[:3]
+            keys = sorted(
+                key
+                for key in self.storage
+                if key.startswith(prefix) and (start is None or key > start)
+            )
+            return keys[:count]
+        if method == "state_queryStorageAt":
+            at = params[1] if len(params) > 1 else None
+            changes = [[key, self._storage_at(key, at)] for key in params[0]]
+            return [{"block": at, "changes": changes}]
+        if method == "state_call":
+            return self.state_calls[params[0]](params[1])
+        if method == "system_accountNextIndex":
+            return self.nonce
+        if method == "author_submitExtrinsic":
+            self._include(params[0])
+            return (
+                "0x"
+                + hashlib.blake2b(
+                    bytes.fromhex(params[0][2:]), digest_size=32
+                ).hexdigest()
+            )
+        if method == "author_unwatchExtrinsic":
+            return True
+        raise KeyError(method)
+
+    async def _handle(self, request: web.Request) -> web.WebSocketResponse:
+        websocket = web.WebSocketResponse(max_msg_size=0)
+        await websocket.prepare(request)
+
+        async def respond(message: Dict[str, Any]):
+            method, params = message["method"], message.get("params", [])
+            await asyncio.sleep(self.delays.get(method, 0))
+            if method == "author_submitAndWatchExtrinsic":
+                self._subscriptions += 1
+                subscription = f"subscription-{self._subscriptions}"
+                await websocket.send_json(
+                    {"jsonrpc": "2.0", "id": message["id"], "result": subscription}
+                )
+                included_in = self._include(params[0])
+                for status in [
+                    "ready",
+                    {"inBlock": included_in},
+                    {"finalized": included_in},
+                ]:
+                    await websocket.send_json(
+                        {
+                            "jsonrpc": "2.0",
+                            "method": "author_extrinsicUpdate",
+                            "params": {"subscription": subscription, "result": status},
+                        }
+                    )
+                return
+            if method in self.raw_responses:
+                await websocket.send_str(self.raw_responses[method])
+                return
+            try:
+                response = {"result": await self._answer(method, params)}
+            except KeyError as e:
+                response = {"error": {"code": -32601, "message": f"Unknown {e}"}}
+            await websocket.send_json(
+                {"jsonrpc": "2.0", "id": message["id"], **response}
+            )
+
+        tasks = []
+        async for message in websocket:
+            if message.type == WSMsgType.TEXT:
+                request_message = json.loads(message.data)
+                self.requests.append(request_message)
+                tasks.append(asyncio.create_task(respond(request_message)))
+        await asyncio.gather(*tasks, return_exceptions=True)
+        return websocket
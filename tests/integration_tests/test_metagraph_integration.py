@@ -20,6 +20,7 @@ import bittensor
 from bittensor.mock import MockSubtensor
 import torch
 import pytest
+from unittest.mock import MagicMock
 
 _subtensor_mock: MockSubtensor = MockSubtensor()
 
@@ -99,3 +100,129 @@ class TestMetagraph:
         params = list(self.metagraph.parameters())
         assert len(params) > 0
         assert isinstance(params[0], torch.nn.parameter.Parameter)
+
+
+class TestIncrementalSync:
+    def setup_method(self):
+        self.sub = MockSubtensor()
+        if not self.sub.subnet_exists(5):
+            self.sub.create_subnet(netuid=5)
+        for uid in range(4):
+            if self.sub.get_uid_for_hotkey_on_subnet(f"hotkey-{uid}", 5) is None:
+                self.sub.force_register_neuron(
+                    netuid=5, hotkey=f"hotkey-{uid}", coldkey=f"coldkey-{uid}"
+                )
+        self.sub.do_block_step()
+        self.state = self.sub.chain_state["SubtensorModule"]
+
+    def _assert_matches_full_sync(self, metagraph, lite):
+        full = bittensor.metagraph(netuid=5, network="mock", sync=False)
+        full.sync(lite=lite, subtensor=self.sub)
+        for name, tensor in full.state_dict().items():
+            assert torch.equal(metagraph.state_dict()[name], tensor), name
+        assert metagraph.axons == full.axons
+        assert metagraph.neurons == full.neurons
+
+    @pytest.mark.parametrize("lite", [True, False])
+    def test_incremental_sync_patches_changed_uids(self, lite, monkeypatch):
+        metagraph = bittensor.metagraph(netuid=5, network="mock", sync=False)
+        metagraph.sync(lite=lite, subtensor=self.sub)
+        assert metagraph.changed_uids.tolist() == [0, 1, 2, 3]
+
+        self.sub.do_block_step()
+        block = self.sub.block_number
+        # Values depend on the block, as the mock chain state is shared between tests.
+        self.state["Rank"][5][1][block] = 1_000 * block
+        self.state["Emission"][5][1][block] = 1_000_000_000 * block
+        self.state["LastUpdate"][5][2][block] = block
+        self.state["Stake"]["hotkey-3"]["coldkey-3"][block] = 1_000_000_000 * block
+        self.state["Weights"][5][0][block] = [[1, block], [2, 300]]
+        for name in ("neuron_for_uid_lite", "neuron_for_uid"):
+            monkeypatch.setattr(
+                self.sub, name, MagicMock(wraps=getattr(self.sub, name))
+            )
+
+        metagraph.sync(lite=lite, subtensor=self.sub, incremental=True)
+
+        fetched = self.sub.neuron_for_uid_lite if lite else self.sub.neuron_for_uid
+        assert [call.kwargs["uid"] for call in fetched.call_args_list] == (
+            [3] if lite else [0, 3]
+        )
+        assert metagraph.changed_uids.tolist() == ([1, 2, 3] if lite else [0, 1, 2, 3])
+        assert metagraph.block.item() == block
+        self._assert_matches_full_sync(metagraph, lite)
+
+    def test_incremental_sync_without_changes(self):
+        metagraph = bittensor.metagraph(netuid=5, network="mock", sync=False)
+        metagraph.sync(subtensor=self.sub)
+        self.sub.do_block_step()
+
+        metagraph.sync(subtensor=self.sub, incremental=True)
+
+        assert metagraph.changed_uids.tolist() == []
+        assert metagraph.block.item() == self.sub.block_number
+        self._assert_matches_full_sync(metagraph, lite=True)
+
+    def test_incremental_sync_falls_back_when_neurons_are_added(self):
+        metagraph = bittensor.metagraph(netuid=5, network="mock", sync=False)
+        metagraph.sync(subtensor=self.sub)
+        self.sub.do_block_step()
+        self.sub.force_register_neuron(
+            netuid=5,
+            hotkey=f"hotkey-{metagraph.n.item()}",
+            coldkey=f"coldkey-{metagraph.n.item()}",
+        )
+
+        metagraph.sync(subtensor=self.sub, incremental=True)
+
+        assert metagraph.changed_uids.tolist() == list(range(metagraph.n.item()))
+        self._assert_matches_full_sync(metagraph, lite=True)
+
+
+class TestMetagraphs:
+    def setup_method(self):
+        self.sub = MockSubtensor()
+        for netuid in (3, 5):
+            if not self.sub.subnet_exists(netuid):
+                self.sub.create_subnet(netuid=netuid)
+        for uid in range(3):
+            if self.sub.get_uid_for_hotkey_on_subnet(f"hotkey-{uid}", 5) is None:
+                self.sub.force_register_neuron(
+                    netuid=5, hotkey=f"hotkey-{uid}", coldkey=f"coldkey-{uid}"
+                )
+        self.sub.do_block_step()
+
+    def test_metagraphs_match_single_syncs(self, monkeypatch):
+        block = self.sub.block_number
+        self.sub.do_block_step()
+        pinned_hashes = []
+
+        def neurons_lite(netuid, block=None):
+            pinned_hashes.append(getattr(self.sub._pinned, "hash", None))
+            return neurons_lite_(netuid=netuid, block=block)
+
+        neurons_lite_ = self.sub.neurons_lite
+        monkeypatch.setattr(self.sub, "neurons_lite", neurons_lite)
+        get_block_hash = MagicMock(wraps=self.sub.get_block_hash)
+        monkeypatch.setattr(self.sub, "get_block_hash", get_block_hash)
+
+        metagraphs = self.sub.metagraphs(netuids=[3, 5], block=block, max_workers=2)
+
+        assert list(metagraphs) == [3, 5]
+        # The hash is looked up once and pinned in every worker.
+        get_block_hash.assert_called_once_with(block)
+        assert pinned_hashes == [self.sub.get_block_hash(block)] * 2
+        assert getattr(self.sub._pinned, "block", None) is None
+        for netuid, metagraph in metagraphs.items():
+            single = self.sub.metagraph(netuid=netuid, block=block)
+            assert metagraph.netuid == netuid
+            assert metagraph.block.item() == block
+            for name, tensor in single.state_dict().items():
+                assert torch.equal(metagraph.state_dict()[name], tensor), name
+            assert metagraph.axons == single.axons
+
+    def test_metagraphs_of_all_subnets(self):
+        metagraphs = self.sub.metagraphs()
+
+        assert list(metagraphs) == self.sub.get_all_subnet_netuids()
+        assert metagraphs[5].n.item() == self.sub.metagraph(netuid=5).n.item() > 0
@@ -0,0 +1,280 @@
+# The MIT License (MIT)
+# Copyright © 2023 Opentensor Foundation
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy of this software and associated
+# documentation files (the “Software”), to deal in the Software without restriction, including without limitation
+# the rights to use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies of the Software,
+# and to permit persons to whom the Software is furnished to do so, subject to the following conditions:
+
+# The above copyright notice and this permission notice shall be included in all copies or substantial portions of
+# the Software.
+
+# THE SOFTWARE IS PROVIDED “AS IS”, WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO
+# THE WARRANTIES OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL
+# THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION
+# OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER
+# DEALINGS IN THE SOFTWARE.
+
+import time
+import asyncio
+import pytest
+import pytest_asyncio
+import bittensor
+
+from scalecodec.base import ScaleBytes
+from substrateinterface.exceptions import StorageFunctionNotFound
+from bittensor.async_subtensor import RUNTIME_VERSION_REFRESH_SECONDS
+from bittensor.chain_data import get_rpc_runtime_config
+from tests.helpers import _get_mock_wallet
+from tests.helpers.rpc_server import MockRpcServer, block_hash
+
+
+def _neuron_info_lite(uid, stake):
+    return {
+        "hotkey": "0x" + bytes([uid + 1] * 32).hex(),
+        "coldkey": "0x" + bytes([uid + 101] * 32).hex(),
+        "uid": uid,
+        "netuid": 1,
+        "active": True,
+        "axon_info": {
+            "block": 0,
+            "version": 0,
+            "ip": 0,
+            "port": 0,
+            "ip_type": 4,
+            "protocol": 0,
+            "placeholder1": 0,
+            "placeholder2": 0,
+        },
+        "prometheus_info": {
+            "block": 0,
+            "version": 0,
+            "ip": 0,
+            "port": 0,
+            "ip_type": 4,
+        },
+        "stake": [("0x" + bytes([uid + 101] * 32).hex(), stake)],
+        "rank": 0,
+        "emission": 0,
+        "incentive": 0,
+        "consensus": 0,
+        "trust": 0,
+        "validator_trust": 0,
+        "dividends": 0,
+        "last_update": 990,
+        "validator_permit": uid == 0,
+        "pruning_score": 0,
+    }
+
+
+def _neurons_lite_result(neurons):
+    runtime_config = get_rpc_runtime_config()
+    vec_u8 = runtime_config.create_scale_object("Vec<NeuronInfoLite>").encode(neurons)
+    return (
+        runtime_config.create_scale_object("Vec<u8>")
+        .encode(list(bytes(vec_u8.data)))
+        .to_hex()
+    )
+
+
+@pytest_asyncio.fixture
+async def server():
+    server = MockRpcServer()
+    server.url = await server.start()
+    yield server
+    await server.stop()
+
+
+@pytest_asyncio.fixture
+async def subtensor(server):
+    async with bittensor.AsyncSubtensor(network=server.url) as subtensor:
+        yield subtensor
+
+
+@pytest.mark.asyncio
+async def test_get_current_block(subtensor, server):
+    assert await subtensor.get_current_block() == 1000
+    assert server.requests[-1]["method"] == "chain_getHeader"
+
+
+@pytest.mark.asyncio
+async def test_requests_are_multiplexed(subtensor, server):
+    server.delays["chain_getBlockHash"] = 0.5
+    start = time.monotonic()
+    hashes = await asyncio.gather(
+        *(subtensor.get_block_hash(block) for block in range(10))
+    )
+    # Every request awaits its own response, all of them sent before the first is answered.
+    assert hashes == [block_hash(block) for block in range(10)]
+    assert time.monotonic() - start < 2.5
+    assert len({request["id"] for request in server.requests}) == 10
+
+
+@pytest.mark.asyncio
+async def test_neurons_lite(subtensor, server):
+    neurons = [_neuron_info_lite(0, 5_000_000_000), _neuron_info_lite(1, 0)]
+    server.state_calls["NeuronInfoRuntimeApi_get_neurons_lite"] = lambda params: (
+        _neurons_lite_result(neurons)
+    )
+
+    result = await subtensor.neurons_lite(netuid=1, block=999)
+
+    assert [neuron.uid for neuron in result] == [0, 1]
+    assert result[0].stake == bittensor.Balance.from_tao(5)
+    assert result[0].validator_permit and not result[1].validator_permit
+    request = server.requests[-1]
+    assert request["params"] == [
+        "NeuronInfoRuntimeApi_get_neurons_lite",
+        "0x0100",
+        block_hash(999),
+    ]
+
+
+@pytest.mark.asyncio
+async def test_get_balance(subtensor, server):
+    wallet = _get_mock_wallet()
+    address = wallet.coldkeypub.ss58_address
+    server.set_storage(
+        "System",
+        "Account",
+        [address],
+        {
+            "nonce": 1,
+            "consumers": 0,
+            "providers": 1,
+            "sufficients": 0,
+            "data": {"free": 3_000_000_000, "reserved": 0, "frozen": 0, "flags": 0},
+        },
+    )
+
+    assert await subtensor.get_balance(address) == bittensor.Balance.from_tao(3)
+    # Accounts without storage hold the default balance.
+    other = _get_mock_wallet().coldkeypub.ss58_address
+    assert await subtensor.get_balance(other) == bittensor.Balance(0)
+
+
+@pytest.mark.asyncio
+async def test_query_map_pages_through_keys(subtensor, server):
+    for uid in range(5):
+        server.set_storage("SubtensorModule", "Weights", [1, uid], [(uid, 65535)])
+    server.set_storage("SubtensorModule", "Weights", [2, 0], [(1, 1)])
+
+    weights = await subtensor.query_map("SubtensorModule", "Weights", [1], page_size=2)
+
+    assert sorted(weights) == [(uid, [(uid, 65535)]) for uid in range(5)]
+    pages = [r for r in server.requests if r["method"] == "state_getKeysPaged"]
+    assert len(pages) == 3
+
+
+@pytest.mark.asyncio
+async def test_metagraph(subtensor, server):
+    neurons = [_neuron_info_lite(0, 5_000_000_000), _neuron_info_lite(1, 0)]
+    server.state_calls["NeuronInfoRuntimeApi_get_neurons_lite"] = lambda params: (
+        _neurons_lite_result(neurons)
+    )
+    server.set_storage("SubtensorModule", "Weights", [1, 0], [(1, 65535)])
+    server.set_storage("SubtensorModule", "Bonds", [1, 0], [(1, 100)])
+
+    metagraph = await subtensor.metagraph(netuid=1, lite=False)
+
+    assert metagraph.n.item() == 2
+    assert metagraph.block.item() == 1000
+    assert metagraph.uids.tolist() == [0, 1]
+    assert metagraph.S.tolist() == [5.0, 0.0]
+    assert metagraph.W[0].tolist() == [0.0, 1.0]
+    assert metagraph.W[1].tolist() == [0.0, 0.0]
+    assert metagraph.B[0, 1].item() > 0
+
+
+@pytest.mark.asyncio
+async def test_set_weights(subtensor, server):
+    wallet = _get_mock_wallet()
+    server.nonce = 7
+
+    success, message = await subtensor.set_weights(
+        wallet, netuid=1, uids=[0, 1], weights=[0.25, 0.75], wait_for_inclusion=True
+    )
+
+    assert success, message
+    extrinsic = server.runtime.create_scale_object(
+        "Extrinsic",
+        data=ScaleBytes(server.extrinsics[-1]),
+        metadata=server.metadata,
+    )
+    extrinsic.decode()
+    assert extrinsic.value["address"] == f"0x{wallet.hotkey.public_key.hex()}"
+    assert extrinsic.value["nonce"] == 7
+    call = extrinsic.value["call"]
+    assert call["call_function"] == "set_weights"
+    args = {arg["name"]: arg["value"] for arg in call["call_args"]}
+    assert args["netuid"] == 1
+    assert args["dests"] == [0, 1]
+    assert args["weights"] == [21845, 65535]
+
+
+@pytest.mark.asyncio
+async def test_set_weights_failure(subtensor, server):
+    server.extrinsic_error = 0
+
+    success, message = await subtensor.set_weights(
+        _get_mock_wallet(),
+        netuid=1,
+        uids=[0],
+        weights=[1.0],
+        wait_for_finalization=True,
+    )
+
+    assert not success
+    assert message == "SettingWeightsTooFast: Weights were set too recently."
+
+
+@pytest.mark.asyncio
+async def test_dropped_connection_is_reopened(subtensor, server):
+    assert await subtensor.get_current_block() == 1000
+    channel = await subtensor.rpc.connect()
+    await channel.websocket.close()
+    server.block = 1001
+
+    assert await subtensor.get_current_block() == 1001
+
+
+@pytest.mark.asyncio
+async def test_malformed_messages_are_skipped(subtensor, server):
+    server.raw_responses["chain_getHeader"] = "{not json"
+    with pytest.raises(asyncio.TimeoutError):
+        await asyncio.wait_for(subtensor.rpc.request("chain_getHeader"), 0.5)
+
+    # The reader is still running, so later requests are answered.
+    del server.raw_responses["chain_getHeader"]
+    assert await subtensor.get_current_block() == 1000
+    assert subtensor.rpc.connected
+
+
+@pytest.mark.asyncio
+async def test_runtime_version_is_cached_for_latest_queries(subtensor, server):
+    address = _get_mock_wallet().coldkeypub.ss58_address
+
+    def version_requests():
+        return [
+            request
+            for request in server.requests
+            if request["method"] == "state_getRuntimeVersion"
+        ]
+
+    for _ in range(3):
+        await subtensor.get_balance(address)
+    assert len(version_requests()) == 1
+
+    # The version is looked up again once it is old.
+    subtensor._latest_runtime_checked -= RUNTIME_VERSION_REFRESH_SECONDS
+    await subtensor.get_balance(address)
+    assert len(version_requests()) == 2
+
+    # And when a storage function is missing, in case the runtime was upgraded.
+    with pytest.raises(StorageFunctionNotFound):
+        await subtensor.query("System", "Unknown")
+    assert len(version_requests()) == 3
+
+    # Queries at a block look up the version at that block.
+    await subtensor.query("System", "Account", [address], block=999)
+    assert version_requests()[-1]["params"] == [block_hash(999)]
@@ -18,19 +18,35 @@
 # DEALINGS IN THE SOFTWARE.
 
 # Standard Lib
+import os
+import json
+import asyncio
+import time
+import typing
+import socket
 import pytest
+import requests
 import unittest
+from types import SimpleNamespace
 from typing import Any
 from unittest import IsolatedAsyncioTestCase
 from unittest.mock import AsyncMock, MagicMock, patch
 
 # Third Party
+import torch
+import uvicorn
+from fastapi import FastAPI
 from starlette.requests import Request
+from starlette.responses import StreamingResponse
 
 # Bittensor
 import bittensor
 from bittensor.axon import AxonMiddleware
 from bittensor.axon import axon as Axon
+from bittensor.errors import PriorityException, RunException
+from bittensor.nonce_store import SQLiteNonceStore
+from bittensor import compression, frame
+from bittensor.scheduler import AdmissionScheduler
 
 
 def test_attach():
@@ -110,6 +126,19 @@ def test_attach():
         server.attach(wrong_forward_fn)
 
 
+def test_thread_pool_is_deprecated():
+    from tests.helpers import _get_mock_wallet
+
+    server = Axon(wallet=_get_mock_wallet(), external_ip="127.0.0.1")
+
+    with pytest.warns(DeprecationWarning):
+        pool = server.thread_pool
+    assert isinstance(pool, bittensor.PriorityThreadPoolExecutor)
+    assert pool._max_workers == server.config.axon.max_workers
+    with pytest.warns(DeprecationWarning):
+        assert server.thread_pool is pool
+
+
 def test_log_and_handle_error():
     from bittensor.axon import log_and_handle_error
 
@@ -184,7 +213,7 @@ class AxonMock:
         self.priority_fns = {}
         self.forward_fns = {}
         self.verify_fns = {}
-        self.thread_pool = bittensor.PriorityThreadPoolExecutor(max_workers=1)
+        self.scheduler = AdmissionScheduler(max_concurrency=1, max_queue_size=0)
 
 
 class SynapseMock(bittensor.Synapse):
@@ -253,10 +282,54 @@ async def test_blacklist_fail(middleware):
 async def test_priority_pass(middleware):
     synapse = SynapseMock()
     middleware.axon.priority_fns = {"SynapseMock": priority_fn_pass}
-    await middleware.priority(synapse)
+    assert await middleware.priority(synapse) == 0.0
     assert synapse.axon.status_code != 408
 
 
+@pytest.mark.asyncio
+async def test_run_records_queue_time_and_sheds(middleware):
+    synapse = SynapseMock(name="SynapseMock")
+    call_next = AsyncMock(return_value="response")
+
+    assert await middleware.run(synapse, call_next, None, priority=1.0) == "response"
+    assert synapse.axon.queue_time == 0.0
+    assert middleware.axon.scheduler.stats["running"] == 0
+
+    # The only slot is taken and the queue has no room, so the request is shed.
+    await middleware.axon.scheduler.acquire("SynapseMock")
+    shed = SynapseMock(name="SynapseMock")
+    with pytest.raises(PriorityException):
+        await middleware.run(shed, call_next, None)
+    assert shed.axon.status_code == 503
+    assert call_next.await_count == 1
+
+
+@pytest.mark.asyncio
+async def test_run_holds_slot_until_streamed_body_is_sent(middleware):
+    async def body():
+        yield b"first"
+        yield b"second"
+
+    response = StreamingResponse(body())
+    call_next = AsyncMock(return_value=response)
+
+    assert (
+        await middleware.run(SynapseMock(name="SynapseMock"), call_next, None)
+        is response
+    )
+    # The body is produced while it is sent, so the slot stays taken until the last chunk.
+    assert middleware.axon.scheduler.stats["running"] == 1
+    chunks = [chunk async for chunk in response.body_iterator]
+    assert chunks == [b"first", b"second"]
+    assert middleware.axon.scheduler.stats["running"] == 0
+
+    # A failing call_next frees the slot straight away.
+    call_next = AsyncMock(side_effect=ValueError("failed"))
+    with pytest.raises(RunException):
+        await middleware.run(SynapseMock(name="SynapseMock"), call_next, None)
+    assert middleware.axon.scheduler.stats["running"] == 0
+
+
 @pytest.mark.parametrize(
     "body, expected",
     [
@@ -323,6 +396,96 @@ async def test_verify_body_integrity_error_cases(
     assert "Hash mismatch" in str(exc_info.value), "Expected a hash mismatch error."
 
 
+class BodySynapse(bittensor.Synapse):
+    text: str = ""
+    required_hash_fields: typing.List[str] = ["text"]
+
+
+@pytest.mark.asyncio
+async def test_verify_body_integrity_keeps_parsed_synapse(mock_request):
+    from tests.helpers import _get_mock_wallet
+
+    axon = Axon(wallet=_get_mock_wallet(), external_ip="127.0.0.1")
+    axon.forward_class_types = {"test_endpoint": BodySynapse}
+    synapse = BodySynapse(text="hello")
+    mock_request.body.return_value = synapse.json().encode()
+    mock_request.headers["computed_body_hash"] = synapse.body_hash
+
+    body = await axon.verify_body_integrity(mock_request)
+
+    assert body["text"] == "hello"
+    assert isinstance(mock_request.state.synapse, BodySynapse)
+    assert mock_request.state.synapse.text == "hello"
+
+
+@pytest.mark.parametrize("is_async", [False, True])
+def test_forward_endpoint_runs_on_parsed_synapse(is_async):
+    def forward(synapse: BodySynapse) -> BodySynapse:
+        synapse.text = synapse.text.upper()
+        return synapse
+
+    async def aforward(synapse: BodySynapse) -> BodySynapse:
+        return forward(synapse)
+
+    endpoint = Axon._forward_endpoint(aforward if is_async else forward)
+    request = MagicMock()
+    request.state.synapse = BodySynapse(text="hello")
+
+    # Synchronous forward functions run in the anyio threadpool, which is torn down with the loop's main task.
+    response = asyncio.run(endpoint(request))
+
+    assert response.media_type == "application/json"
+    assert json.loads(response.body)["text"] == "HELLO"
+
+
+class TensorSynapse(bittensor.Synapse):
+    inputs: typing.Optional[bittensor.Tensor] = None
+    outputs: typing.Optional[typing.List[bittensor.Tensor]] = None
+    required_hash_fields: typing.List[str] = ["inputs"]
+
+
+@pytest.mark.asyncio
+async def test_verify_body_integrity_decodes_frames(mock_request):
+    from tests.helpers import _get_mock_wallet
+
+    axon = Axon(wallet=_get_mock_wallet(), external_ip="127.0.0.1")
+    axon.forward_class_types = {"test_endpoint": TensorSynapse}
+    inputs = torch.randn(4, 3)
+    synapse = TensorSynapse(inputs=bittensor.Tensor.serialize(inputs))
+    mock_request.body.return_value = frame.encode(synapse)
+    mock_request.headers["content-type"] = frame.CONTENT_TYPE
+    mock_request.headers["computed_body_hash"] = synapse.body_hash
+
+    await axon.verify_body_integrity(mock_request)
+
+    assert torch.equal(mock_request.state.synapse.inputs.tensor(), inputs)
+
+
+@pytest.mark.parametrize("accept", ["application/json", frame.CONTENT_TYPE])
+def test_forward_endpoint_negotiates_frames(accept):
+    async def forward(synapse: TensorSynapse) -> TensorSynapse:
+        synapse.outputs = [bittensor.Tensor.serialize(synapse.inputs.tensor() * 2)]
+        return synapse
+
+    endpoint = Axon._forward_endpoint(forward)
+    request = MagicMock()
+    request.headers = {"accept": accept}
+    request.state.synapse = TensorSynapse(
+        inputs=bittensor.Tensor.serialize(torch.ones(3))
+    )
+
+    response = asyncio.run(endpoint(request))
+
+    assert response.headers[frame.ACCEPT_HEADER] == "1"
+    if accept == frame.CONTENT_TYPE:
+        assert response.media_type == frame.CONTENT_TYPE
+        outputs = frame.decode(response.body)["outputs"]
+    else:
+        assert response.media_type == "application/json"
+        outputs = TensorSynapse(**json.loads(response.body)).outputs
+    assert outputs[0].tensor().tolist() == [2.0, 2.0, 2.0]
+
+
 @pytest.mark.parametrize(
     "info_return, expected_output, test_id",
     [
@@ -440,5 +603,182 @@ class TestAxonMiddleware(IsolatedAsyncioTestCase):
         assert synapse.name == "request_name"
 
 
+@pytest.mark.asyncio
+async def test_default_verify_signature_and_nonce():
+    from tests.helpers import _get_mock_wallet
+
+    server_wallet = _get_mock_wallet()
+    client_keypair = bittensor.Keypair.create_from_uri("//Alice")
+    axon = Axon(wallet=server_wallet, external_ip="127.0.0.1")
+
+    def signed_synapse(nonce: int) -> SynapseMock:
+        synapse = SynapseMock()
+        synapse.dendrite = bittensor.TerminalInfo(
+            nonce=nonce, uuid="uuid", hotkey=client_keypair.ss58_address
+        )
+        message = f"{nonce}.{client_keypair.ss58_address}.{server_wallet.hotkey.ss58_address}.uuid.{synapse.computed_body_hash}"
+        synapse.dendrite.signature = f"0x{client_keypair.sign(message).hex()}"
+        return synapse
+
+    await axon.default_verify(signed_synapse(1))
+    assert axon.nonces[f"{client_keypair.ss58_address}:uuid"] == 1
+
+    # Replayed nonces are rejected.
+    with pytest.raises(Exception, match="Nonce is too small"):
+        await axon.default_verify(signed_synapse(1))
+
+    # Tampered signatures are rejected.
+    tampered = signed_synapse(2)
+    tampered.dendrite.nonce = 3
+    with pytest.raises(Exception, match="Signature mismatch"):
+        await axon.default_verify(tampered)
+
+    # Wall clock nonces outside of the replay window are rejected, whatever the unsigned timeout says.
+    old = signed_synapse(time.time_ns() - 600 * 10**9)
+    old.timeout = 3600
+    with pytest.raises(Exception, match="Nonce is too old"):
+        await axon.default_verify(old)
+    with pytest.raises(Exception, match="Nonce is in the future"):
+        await axon.default_verify(signed_synapse(time.time_ns() + 60 * 10**9))
+
+
+def test_axon_stats_aggregate_workers():
+    from bittensor.axon import AxonStats
+
+    stats = AxonStats(workers=2)
+    stats.record(200, 0.5)
+    stats.worker_index = 1
+    stats.record(401, 0.25)
+    stats.record(200, 0.25)
+
+    assert stats.per_worker() == [
+        {"requests": 1, "successes": 1, "failures": 0, "process_time": 0.5},
+        {"requests": 2, "successes": 1, "failures": 1, "process_time": 0.5},
+    ]
+    assert stats.total() == {
+        "requests": 3,
+        "successes": 2,
+        "failures": 1,
+        "process_time": 1.0,
+    }
+
+
+@pytest.mark.skipif(not hasattr(socket, "SO_REUSEPORT"), reason="requires SO_REUSEPORT")
+def test_axon_workers_serve_on_shared_port():
+    from tests.helpers import _get_mock_wallet
+
+    with socket.socket() as sock:
+        sock.bind(("", 0))
+        port = sock.getsockname()[1]
+
+    axon = Axon(
+        wallet=_get_mock_wallet(), port=port, external_ip="127.0.0.1", workers=2
+    )
+    assert isinstance(axon.nonces, SQLiteNonceStore)
+    nonce_path = axon.nonces.path
+    axon.start()
+    try:
+        url = f"http://127.0.0.1:{port}/Synapse"
+        for _ in range(100):
+            try:
+                requests.post(url, json={}, timeout=1)
+                break
+            except requests.ConnectionError:
+                time.sleep(0.05)
+
+        # Unsigned requests are rejected by every worker's default verify.
+        for _ in range(10):
+            assert requests.post(url, json={}, timeout=5).status_code == 401
+
+        assert len(axon.stats.per_worker()) == 2
+        assert axon.stats.total()["failures"] >= 10
+        # A worker which dies is no longer reported as running.
+        assert axon.fast_server.is_running
+        axon.fast_server.processes[0].kill()
+        axon.fast_server.processes[0].join()
+        assert not axon.fast_server.is_running
+    finally:
+        axon.stop()
+    assert axon.fast_server.processes == []
+    # The temporary nonce store is deleted with its WAL files.
+    assert not any(
+        os.path.exists(nonce_path + suffix) for suffix in ("", "-wal", "-shm")
+    )
+
+
+@pytest.mark.skipif(not hasattr(socket, "SO_REUSEPORT"), reason="requires SO_REUSEPORT")
+def test_axon_workers_failing_to_bind_are_reported():
+    from bittensor.axon import FastAPIMultiprocessServer
+
+    # A socket bound without SO_REUSEPORT keeps the workers from binding the port.
+    with socket.socket() as sock:
+        sock.bind(("", 0))
+        sock.listen()
+        config = uvicorn.Config(FastAPI(), port=sock.getsockname()[1])
+        server = FastAPIMultiprocessServer(config=config, workers=2)
+
+        with pytest.raises(RuntimeError, match="Axon worker 0 failed to start"):
+            server.start()
+    assert not server.is_running
+    assert server.processes == []
+
+
 if __name__ == "__main__":
     unittest.main()
+
+
+@pytest.mark.asyncio
+async def test_verify_body_integrity_decompresses_body(mock_request):
+    from tests.helpers import _get_mock_wallet
+
+    axon = Axon(wallet=_get_mock_wallet(), external_ip="127.0.0.1")
+    axon.forward_class_types = {"test_endpoint": TensorSynapse}
+    inputs = torch.randn(4, 3)
+    synapse = TensorSynapse(inputs=bittensor.Tensor.serialize(inputs))
+    compressed = compression.compress(synapse.json().encode(), compression.GZIP)
+
+    async def stream():
+        yield compressed[:10]
+        yield compressed[10:]
+
+    mock_request.stream = stream
+    mock_request.headers["content-encoding"] = compression.GZIP
+    mock_request.headers["computed_body_hash"] = synapse.body_hash
+
+    await axon.verify_body_integrity(mock_request)
+
+    mock_request.body.assert_not_called()
+    assert torch.equal(mock_request.state.synapse.inputs.tensor(), inputs)
+
+    # Bodies larger than axon.max_decompressed_size once decompressed are rejected.
+    axon.max_decompressed_size = len(synapse.json()) - 1
+    mock_request.stream = stream
+    with pytest.raises(compression.CompressionError):
+        await axon.verify_body_integrity(mock_request)
+
+
+@pytest.mark.parametrize("accept_encoding", [None, "gzip"])
+def test_forward_endpoint_compresses_responses(accept_encoding):
+    async def forward(synapse: TensorSynapse) -> TensorSynapse:
+        synapse.outputs = [bittensor.Tensor.serialize(torch.zeros(1024))]
+        return synapse
+
+    endpoint = Axon._forward_endpoint(forward, ["gzip"], 1024)
+    request = MagicMock()
+    request.headers = {"accept": "application/json"}
+    if accept_encoding:
+        request.headers["accept-encoding"] = accept_encoding
+    request.state = SimpleNamespace(synapse=TensorSynapse())
+
+    response = asyncio.run(endpoint(request))
+
+    assert compression.GZIP in response.headers["accept-encoding"]
+    if accept_encoding:
+        assert response.headers["content-encoding"] == "gzip"
+        body = compression.decompress(response.body, "gzip")
+        ratio, _ = request.state.compression
+        assert ratio == len(body) / len(response.body)
+    else:
+        assert "content-encoding" not in response.headers
+        body = response.body
+    assert TensorSynapse(**json.loads(body)).outputs[0].tensor().sum() == 0
@@ -0,0 +1,266 @@
+import random
+
+import numpy
+import pytest
+
+from bittensor import chain_columns
+from bittensor.chain_columns import (
+    ChainDataColumns,
+    DelegateInfoColumns,
+    NeuronInfoLiteColumns,
+    StakeInfoColumns,
+    SubnetInfoColumns,
+)
+from bittensor.chain_data import (
+    DelegateInfo,
+    NeuronInfoLite,
+    StakeInfo,
+    SubnetInfo,
+    custom_rpc_type_registry,
+    get_rpc_runtime_config,
+)
+
+
+def _account(rng):
+    return "0x" + rng.randbytes(32).hex()
+
+
+def _compact(rng, bits):
+    # Cover every compact encoding mode, not only small values.
+    return rng.choice(
+        [0, rng.randrange(64), rng.randrange(2**14)] + [rng.randrange(2**bits)]
+    )
+
+
+def _neuron_info_lite(rng):
+    coldkeys = [_account(rng) for _ in range(2)]
+    return {
+        "hotkey": _account(rng),
+        "coldkey": coldkeys[0],
+        "uid": _compact(rng, 16),
+        "netuid": _compact(rng, 16),
+        "active": rng.random() < 0.5,
+        "axon_info": {
+            "block": rng.randrange(2**64),
+            "version": rng.randrange(2**32),
+            "ip": rng.choice([rng.randrange(2**32), rng.randrange(2**128)]),
+            "port": rng.randrange(2**16),
+            "ip_type": rng.choice([4, 6]),
+            "protocol": rng.randrange(2**8),
+            "placeholder1": rng.randrange(2**8),
+            "placeholder2": rng.randrange(2**8),
+        },
+        "prometheus_info": {
+            "block": rng.randrange(2**64),
+            "version": rng.randrange(2**32),
+            "ip": rng.randrange(2**32),
+            "port": rng.randrange(2**16),
+            "ip_type": 4,
+        },
+        # Repeated coldkeys are merged in the stake dict.
+        "stake": [
+            (rng.choice(coldkeys), _compact(rng, 64)) for _ in range(rng.randrange(4))
+        ],
+        "rank": _compact(rng, 16),
+        "emission": _compact(rng, 64),
+        "incentive": _compact(rng, 16),
+        "consensus": _compact(rng, 16),
+        "trust": _compact(rng, 16),
+        "validator_trust": _compact(rng, 16),
+        "dividends": _compact(rng, 16),
+        "last_update": _compact(rng, 64),
+        "validator_permit": rng.random() < 0.5,
+        "pruning_score": _compact(rng, 16),
+    }
+
+
+def _stake_info(rng):
+    return {
+        "hotkey": _account(rng),
+        "coldkey": _account(rng),
+        "stake": _compact(rng, 64),
+    }
+
+
+def _delegate_info(rng):
+    return {
+        "delegate_ss58": _account(rng),
+        "take": _compact(rng, 16),
+        "nominators": [
+            (_account(rng), _compact(rng, 64)) for _ in range(rng.randrange(4))
+        ],
+        "owner_ss58": _account(rng),
+        "registrations": [_compact(rng, 16) for _ in range(rng.randrange(4))],
+        "validator_permits": [_compact(rng, 16) for _ in range(rng.randrange(4))],
+        "return_per_1000": _compact(rng, 64),
+        "total_daily_return": _compact(rng, 64),
+    }
+
+
+def _subnet_info(rng):
+    return {
+        "netuid": _compact(rng, 16),
+        "rho": _compact(rng, 16),
+        "kappa": _compact(rng, 16),
+        "difficulty": _compact(rng, 64),
+        "immunity_period": _compact(rng, 16),
+        "max_allowed_validators": _compact(rng, 16),
+        "min_allowed_weights": _compact(rng, 16),
+        "max_weights_limit": _compact(rng, 16),
+        "scaling_law_power": _compact(rng, 16),
+        "subnetwork_n": _compact(rng, 16),
+        "max_allowed_uids": _compact(rng, 16),
+        "blocks_since_last_step": _compact(rng, 64),
+        "tempo": _compact(rng, 16),
+        "network_modality": _compact(rng, 16),
+        "network_connect": [
+            [rng.randrange(2**16), rng.randrange(2**16)]
+            for _ in range(rng.randrange(3))
+        ],
+        "emission_values": _compact(rng, 64),
+        "burn": _compact(rng, 64),
+        "owner": _account(rng),
+    }
+
+
+CASES = {
+    "NeuronInfoLite": (
+        "Vec<NeuronInfoLite>",
+        _neuron_info_lite,
+        NeuronInfoLiteColumns,
+        NeuronInfoLite.list_from_vec_u8,
+    ),
+    "StakeInfo": (
+        "Vec<StakeInfo>",
+        _stake_info,
+        StakeInfoColumns,
+        StakeInfo.list_from_vec_u8,
+    ),
+    "DelegateInfo": (
+        "Vec<DelegateInfo>",
+        _delegate_info,
+        DelegateInfoColumns,
+        DelegateInfo.list_from_vec_u8,
+    ),
+    "SubnetInfo": (
+        "Vec<Option<SubnetInfo>>",
+        _subnet_info,
+        SubnetInfoColumns,
+        SubnetInfo.list_from_vec_u8,
+    ),
+}
+
+
+def _encode(type_string, values):
+    encoded = get_rpc_runtime_config().create_scale_object(type_string).encode(values)
+    return bytes(encoded.data)
+
+
+@pytest.mark.parametrize("name", CASES)
+@pytest.mark.parametrize("seed", range(10))
+def test_matches_generic_decoder(name, seed):
+    type_string, generate, columns_class, generic = CASES[name]
+    rng = random.Random(f"{name}-{seed}")
+    vec_u8 = _encode(type_string, [generate(rng) for _ in range(rng.randrange(6))])
+
+    columns = columns_class.from_vec_u8(vec_u8)
+
+    assert list(columns) == generic(vec_u8)
+    assert columns_class.from_vec_u8(list(vec_u8))[:] == list(columns)
+
+
+def _registry_kind(type_string):
+    """The column type of a registry type, or the types of its items or fields if it has several."""
+    types = custom_rpc_type_registry["types"]
+    if type_string in types:
+        return [
+            _registry_kind(field_type)
+            for _, field_type in types[type_string]["type_mapping"]
+        ]
+    if type_string.startswith("Compact<"):
+        return chain_columns.COMPACT
+    if type_string.startswith("Vec<("):
+        return [_registry_kind(item) for item in type_string[5:-2].split(", ")]
+    if type_string.startswith("Vec<["):
+        item, count = type_string[5:-2].split("; ")
+        return [_registry_kind(item)] * int(count)
+    if type_string.startswith("Vec<"):
+        return [_registry_kind(type_string[4:-1])]
+    return {"AccountId": chain_columns.ACCOUNT_ID, "bool": chain_columns.BOOL}.get(
+        type_string, getattr(chain_columns, type_string.upper(), None)
+    )
+
+
+@pytest.mark.parametrize("name", CASES)
+def test_fields_match_type_registry(name):
+    columns_class = CASES[name][2]
+    layout = []
+    for field, type_string in custom_rpc_type_registry["types"][name]["type_mapping"]:
+        nested = custom_rpc_type_registry["types"].get(type_string)
+        if nested is None:
+            layout.append((field, _registry_kind(type_string)))
+            continue
+        # Nested structs are flattened, their fields prefixed with the struct's name.
+        prefix = field[: -len("_info")] if field.endswith("_info") else field
+        layout.extend(
+            (f"{prefix}_{nested_field}", _registry_kind(nested_type))
+            for nested_field, nested_type in nested["type_mapping"]
+        )
+
+    fields = [
+        (field, [item for _, item in kind] if isinstance(kind, list) else kind)
+        for field, kind in columns_class.FIELDS
+    ]
+    assert fields == layout
+
+
+def test_item_is_abstract():
+    with pytest.raises(TypeError):
+        ChainDataColumns({}, 0)
+
+
+def test_neuron_info_lite_columns():
+    rng = random.Random(0)
+    neurons = [_neuron_info_lite(rng) for _ in range(3)]
+    columns = NeuronInfoLiteColumns.from_vec_u8(_encode("Vec<NeuronInfoLite>", neurons))
+
+    assert len(columns) == 3
+    assert columns.columns["rank"].dtype == numpy.uint64
+    assert columns.columns["rank"].tolist() == [neuron["rank"] for neuron in neurons]
+    assert columns.columns["stake_offsets"].tolist() == list(
+        numpy.cumsum([0] + [len(neuron["stake"]) for neuron in neurons])
+    )
+    assert columns.columns["hotkey"][1] == bytes.fromhex(neurons[1]["hotkey"][2:])
+    # Items are built once, on first access.
+    assert columns[-1] is columns[2]
+    assert type(columns[0].uid) is int
+    with pytest.raises(IndexError):
+        columns[3]
+
+
+def test_subnet_info_columns_skip_none():
+    rng = random.Random(0)
+    subnet = _subnet_info(rng)
+
+    columns = SubnetInfoColumns.from_vec_u8(
+        _encode("Vec<Option<SubnetInfo>>", [None, subnet, None])
+    )
+
+    assert len(columns) == 1
+    assert columns[0].netuid == subnet["netuid"]
+
+
+def test_empty_input():
+    assert list(StakeInfoColumns.from_vec_u8(b"")) == []
+    assert list(StakeInfoColumns.from_vec_u8([0])) == []
+
+
+@pytest.mark.parametrize("cut", [1, 40, -1])
+def test_malformed_input(cut):
+    rng = random.Random(0)
+    vec_u8 = _encode("Vec<StakeInfo>", [_stake_info(rng) for _ in range(2)])
+
+    with pytest.raises(ValueError):
+        StakeInfoColumns.from_vec_u8(vec_u8[:cut])
+    with pytest.raises(ValueError):
+        StakeInfoColumns.from_vec_u8(vec_u8 + b"\x00")
@@ -1,7 +1,15 @@
 import pytest
 import torch
 import bittensor
-from bittensor.chain_data import AxonInfo, ChainDataType, DelegateInfo, NeuronInfo
+from bittensor.chain_data import (
+    AxonInfo,
+    ChainDataType,
+    DelegateInfo,
+    NeuronInfo,
+    decode_vector,
+    from_scale_encoding_using_type_string,
+    get_rpc_runtime_config,
+)
 
 SS58_FORMAT = bittensor.__ss58_format__
 RAOPERTAO = 10**18
@@ -555,3 +563,44 @@ def test_list_from_vec_u8_error_cases(
     # Act & Assert
     with pytest.raises(expected_exception):
         _ = DelegateInfo.list_from_vec_u8(vec_u8)
+
+
+@pytest.mark.parametrize(
+    "value, dtype, expected",
+    [
+        ("0x0c00000a00ffff", "<u2", [0, 10, 65535]),
+        (bytes([8, 1, 0]), "?", [True, False]),
+        ("0x00", "<u8", []),
+        (None, "<u2", []),
+        # Two byte compact length prefix.
+        ("0x" + (bytes([0x01, 0x01]) + bytes(64 * 8)).hex(), "<u8", [0] * 64),
+    ],
+)
+def test_decode_vector(value, dtype, expected):
+    assert decode_vector(value, dtype).tolist() == expected
+
+
+def test_get_rpc_runtime_config_is_built_once():
+    from concurrent.futures import ThreadPoolExecutor
+
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        configs = list(executor.map(lambda _: get_rpc_runtime_config(), range(8)))
+
+    assert all(config is configs[0] for config in configs)
+
+
+def test_rpc_runtime_config_caches_decoder_classes():
+    config = get_rpc_runtime_config()
+    encoded = config.create_scale_object("Vec<(Compact<u16>, Compact<u16>)>").encode(
+        [(1, 2), (3, 40000)]
+    )
+
+    decoded = from_scale_encoding_using_type_string(
+        bytes(encoded.data), "Vec<(Compact<u16>, Compact<u16>)>"
+    )
+
+    assert decoded == [(1, 2), (3, 40000)]
+    assert config.get_decoder_class(
+        "Vec<(Compact<u16>, Compact<u16>)>"
+    ) is config.get_decoder_class("Vec<(Compact<u16>, Compact<u16>)>")
+    assert config.create_scale_object("Compact<u16>").runtime_config is config
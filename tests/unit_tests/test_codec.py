@@ -0,0 +1,96 @@
+# The MIT License (MIT)
+# Copyright © 2023 Opentensor Foundation
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy of this software and associated
+# documentation files (the “Software”), to deal in the Software without restriction, including without limitation
+# the rights to use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies of the Software,
+# and to permit persons to whom the Software is furnished to do so, subject to the following conditions:
+
+# The above copyright notice and this permission notice shall be included in all copies or substantial portions of
+# the Software.
+
+# THE SOFTWARE IS PROVIDED “AS IS”, WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO
+# THE WARRANTIES OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL
+# THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION
+# OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER
+# DEALINGS IN THE SOFTWARE.
+
+import json
+import math
+import numpy
+import datetime
+import pytest
+
+import bittensor
+from bittensor import codec
+
+CODECS = [cls() for cls in codec.available_codecs().values()]
+
+
+@pytest.fixture(params=CODECS, ids=lambda c: c.name)
+def json_codec(request):
+    return request.param
+
+
+def test_round_trip(json_codec):
+    value = {"name": "Synapse", "timeout": 12.0, "list": [1, "ü", None, True]}
+    assert json_codec.loads(json_codec.dumps(value)) == value
+    assert json_codec.loads(memoryview(json_codec.dumps(value))) == value
+    assert json_codec.loads(json_codec.dumps(value).decode()) == value
+
+
+def test_output_is_read_by_stdlib(json_codec):
+    value = {"a": [1.5, -2], "b": {"c": "d"}, 3: "non string key"}
+    assert json.loads(json_codec.dumps(value)) == json.loads(json.dumps(value))
+
+
+def test_falls_back_to_stdlib(json_codec):
+    big = 2**70
+    assert json_codec.loads(json_codec.dumps({"big": big})) == {"big": big}
+    assert json_codec.loads('{"a": NaN}')["a"] != json_codec.loads('{"a": NaN}')["a"]
+    with pytest.raises(ValueError):
+        json_codec.loads(b"{not json")
+
+
+def test_non_finite_floats_are_kept(json_codec):
+    value = {"a": [1.0, float("inf")], "b": {"c": -float("inf")}}
+    # Every codec writes the same literals, so peers decode the same values and body hashes match.
+    assert json.loads(json_codec.dumps(value)) == value
+    assert json_codec.loads(json_codec.dumps(value)) == value
+    assert math.isnan(json_codec.loads(json_codec.dumps({"a": float("nan")}))["a"])
+    array = numpy.array([1.0, numpy.nan], dtype=numpy.float32)
+    assert math.isnan(json_codec.loads(json_codec.dumps({"a": array}))["a"][1])
+    assert not codec.is_finite({"a": array}) and codec.is_finite({"a": [1.0, "x"]})
+    # Lists whose sum overflows or is not a number are checked one value at a time.
+    assert codec.is_finite([1e308, 1e308]) and codec.is_finite([2**2000, 1.0])
+    assert not codec.is_finite([1.0, None, float("nan")])
+
+
+def test_bodies_without_null_are_not_searched(json_codec, monkeypatch):
+    monkeypatch.setattr(codec, "is_finite", lambda obj: pytest.fail("searched"))
+    assert json_codec.loads(json_codec.dumps({"a": [1.5, 2.5]})) == {"a": [1.5, 2.5]}
+
+
+def test_default_hook(json_codec):
+    date = datetime.date(2024, 1, 2)
+    assert json_codec.loads(json_codec.dumps({"d": date}, default=str)) == {
+        "d": "2024-01-02"
+    }
+
+
+def test_synapse_round_trip(json_codec):
+    synapse = bittensor.Synapse(timeout=3.5)
+    synapse.dendrite.hotkey = "hotkey"
+    decoded = bittensor.Synapse(**json_codec.loads(json_codec.dumps(synapse.dict())))
+    assert decoded == synapse
+
+
+def test_set_codec():
+    current = codec.get_codec().name
+    try:
+        assert codec.set_codec("json").name == "json"
+        assert codec.dumps({"a": 1}) == b'{"a": 1}'
+        with pytest.raises(ValueError):
+            codec.set_codec("unknown")
+    finally:
+        codec.set_codec(current)
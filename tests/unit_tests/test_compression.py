@@ -0,0 +1,133 @@
+# The MIT License (MIT)
+# Copyright © 2023 Opentensor Foundation
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy of this software and associated
+# documentation files (the “Software”), to deal in the Software without restriction, including without limitation
+# the rights to use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies of the Software,
+# and to permit persons to whom the Software is furnished to do so, subject to the following conditions:
+
+# The above copyright notice and this permission notice shall be included in all copies or substantial portions of
+# the Software.
+
+# THE SOFTWARE IS PROVIDED “AS IS”, WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO
+# THE WARRANTIES OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL
+# THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION
+# OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER
+# DEALINGS IN THE SOFTWARE.
+
+import os
+import gzip
+import asyncio
+import tracemalloc
+import pytest
+
+from bittensor import compression
+
+
+def test_gzip_round_trip():
+    data = b"bittensor " * 1000
+    compressed = compression.compress(data, compression.GZIP)
+    assert len(compressed) < len(data)
+    # Bodies are standard gzip streams.
+    assert gzip.decompress(compressed) == data
+    assert compression.decompress(compressed, compression.GZIP) == data
+
+
+@pytest.mark.skipif(compression.zstandard is None, reason="zstandard not installed")
+def test_zstd_round_trip():
+    data = b"bittensor " * 1000
+    compressed = compression.compress(data, compression.ZSTD)
+    assert compression.decompress(compressed, compression.ZSTD) == data
+
+
+def test_parse_encodings():
+    assert compression.parse_encodings(None) == []
+    assert compression.parse_encodings("none") == []
+    assert compression.parse_encodings("gzip;q=0.5, deflate, br, GZIP") == ["gzip"]
+    assert compression.parse_encodings("zstd,gzip") == compression.available_encodings()
+
+
+def test_is_valid_setting():
+    assert compression.is_valid_setting("none")
+    assert compression.is_valid_setting("zstd, gzip")
+    assert not compression.is_valid_setting("brotli")
+
+
+def test_negotiate_prefers_own_order():
+    assert compression.negotiate(["gzip"], "zstd, gzip") == "gzip"
+    assert compression.negotiate(["gzip"], "deflate") is None
+    assert compression.negotiate([], "gzip") is None
+    assert compression.negotiate(["gzip"], None) is None
+
+
+def test_compress_body_threshold():
+    data = os.urandom(16) * 64
+    body, encoding, ratio, compression_time = compression.compress_body(
+        data, ["gzip"], "gzip", threshold=len(data) + 1
+    )
+    assert (body, encoding, ratio, compression_time) == (data, None, None, None)
+
+    body, encoding, ratio, compression_time = compression.compress_body(
+        data, ["gzip"], "gzip", threshold=len(data)
+    )
+    assert encoding == "gzip"
+    assert ratio == len(data) / len(body)
+    assert compression_time >= 0
+    assert compression.decompress(body, encoding) == data
+
+
+def test_decompress_limits_size():
+    compressed = compression.compress(bytes(1 << 20), compression.GZIP)
+    with pytest.raises(compression.CompressionError):
+        compression.decompress(compressed, compression.GZIP, max_size=1 << 19)
+
+
+def test_decompress_is_bounded_while_decompressing():
+    compressed = compression.compress(bytes(64 << 20), compression.GZIP)
+    assert compression.decompress(compressed, compression.GZIP, max_size=64 << 20)
+
+    tracemalloc.start()
+    with pytest.raises(compression.CompressionError):
+        compression.decompress(compressed, compression.GZIP, max_size=1 << 20)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    # Decompression stops at the limit instead of inflating the whole body first.
+    assert peak < 8 << 20
+
+
+@pytest.mark.skipif(compression.zstandard is None, reason="zstandard not installed")
+def test_zstd_decompress_is_bounded_while_streaming():
+    compressed = compression.compress(bytes(64 << 20), compression.ZSTD)
+
+    async def chunks():
+        for i in range(0, len(compressed), 16):
+            yield compressed[i : i + 16]
+
+    tracemalloc.start()
+    with pytest.raises(compression.CompressionError):
+        asyncio.run(compression.decompress_stream(chunks(), compression.ZSTD, 1 << 20))
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    assert peak < 8 << 20
+    assert asyncio.run(
+        compression.decompress_stream(chunks(), compression.ZSTD, 64 << 20)
+    ) == bytes(64 << 20)
+
+
+def test_decompress_errors():
+    with pytest.raises(compression.CompressionError):
+        compression.decompress(b"not gzip", compression.GZIP)
+    with pytest.raises(compression.CompressionError):
+        compression.decompress(b"", "br")
+
+
+def test_decompress_stream():
+    data = os.urandom(1 << 16)
+    compressed = compression.compress(data, compression.GZIP)
+
+    async def chunks():
+        for i in range(0, len(compressed), 1000):
+            yield compressed[i : i + 1000]
+        yield b""
+
+    assert asyncio.run(compression.decompress_stream(chunks(), "gzip")) == data
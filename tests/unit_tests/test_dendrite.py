@@ -18,6 +18,12 @@
 # DEALINGS IN THE SOFTWARE.
 
 from pydantic import ValidationError
+from aiohttp import web
+import sys
+import json
+import socket
+import asyncio
+import torch
 import pytest
 import typing
 import bittensor
@@ -270,3 +276,292 @@ def test_terminal_info_error_cases(
             version=version,
             nonce=nonce,
         )
+
+
+@pytest.fixture
+def pool_dendrite():
+    with patch("bittensor.utils.networking.get_external_ip", return_value="127.0.0.1"):
+        config = bittensor.dendrite.config()
+        config.dendrite.max_connections = 4
+        config.dendrite.max_connections_per_host = 1
+        config.dendrite.keepalive_timeout = 30.0
+        yield bittensor.dendrite(_get_mock_wallet(), config=config)
+
+
+def test_dendrite_config_defaults():
+    config = bittensor.dendrite.config()
+    assert config.dendrite.max_connections == 512
+    assert config.dendrite.max_connections_per_host == 0
+    assert config.dendrite.keepalive_timeout == 15.0
+    assert config.dendrite.dns_cache_ttl == 300
+    assert bittensor.defaults.dendrite.max_connections == 512
+
+    config.dendrite.keepalive_timeout = 0
+    with pytest.raises(AssertionError):
+        bittensor.dendrite.check_config(config)
+
+
+@pytest.mark.asyncio
+async def test_session_uses_pool_config(pool_dendrite):
+    session = await pool_dendrite.session
+    assert session.connector.limit == 4
+    assert session.connector.limit_per_host == 1
+    assert pool_dendrite.pool_stats["limit"] == 4
+    await pool_dendrite.aclose_session()
+    assert "limit" not in pool_dendrite.pool_stats
+
+
+@pytest.mark.asyncio
+async def test_pool_stats_count_reuse_and_queueing(pool_dendrite):
+    async def handler(request):
+        await asyncio.sleep(0.05)
+        return web.Response(text="ok")
+
+    app = web.Application()
+    app.router.add_get("/", handler)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    port = site._server.sockets[0].getsockname()[1]
+
+    async def get():
+        session = await pool_dendrite.session
+        async with session.get(f"http://127.0.0.1:{port}/") as response:
+            return await response.text()
+
+    try:
+        # Three concurrent requests share the single connection allowed per host.
+        assert await asyncio.gather(get(), get(), get()) == ["ok"] * 3
+        stats = pool_dendrite.pool_stats
+    finally:
+        await pool_dendrite.aclose_session()
+        await runner.cleanup()
+
+    assert stats["requests"] == 3
+    assert stats["handshakes"] == 1
+    assert stats["reused"] == 2
+    assert stats["reuse_rate"] == pytest.approx(2 / 3)
+    assert stats["queued"] == 2
+    assert stats["avg_queue_time"] > 0
+    assert stats["idle"] == 1
+
+
+def _delayed_call(delays, failures=(), in_flight=None):
+    async def call(target_axon, synapse, timeout, deserialize=True):
+        index = target_axon
+        if in_flight is not None:
+            in_flight.append(len(in_flight) + 1)
+        try:
+            await asyncio.sleep(delays[index])
+        finally:
+            if in_flight is not None:
+                in_flight.pop()
+        synapse = synapse.copy()
+        synapse.dendrite.status_code = 500 if index in failures else 200
+        synapse.output = index
+        return synapse
+
+    return call
+
+
+@pytest.mark.asyncio
+async def test_as_completed_yields_in_arrival_order(pool_dendrite):
+    pool_dendrite.call = _delayed_call([0.06, 0.0, 0.03])
+    results = [
+        (index, response.output)
+        async for index, response in pool_dendrite.as_completed(
+            [0, 1, 2], SynapseDummy(input=1), deserialize=False
+        )
+    ]
+    assert results == [(1, 1), (2, 2), (0, 0)]
+
+
+@pytest.mark.asyncio
+async def test_as_completed_first_k_skips_failures_and_cancels(pool_dendrite):
+    pool_dendrite.call = _delayed_call([0.0, 0.01, 0.02, 5.0], failures={0})
+    start = asyncio.get_running_loop().time()
+    results = [
+        index
+        async for index, _ in pool_dendrite.as_completed(
+            [0, 1, 2, 3], SynapseDummy(input=1), first_k=2
+        )
+    ]
+    assert results == [1, 2]
+    # The slow axon was cancelled instead of awaited.
+    assert asyncio.get_running_loop().time() - start < 1.0
+
+
+@pytest.mark.asyncio
+async def test_max_concurrency_bounds_requests_in_flight(pool_dendrite):
+    in_flight = []
+    peak = []
+
+    async def call(target_axon, synapse, timeout, deserialize=True):
+        peak.append(len(in_flight) + 1)
+        return await _delayed_call([0.01] * 6, in_flight=in_flight)(
+            target_axon, synapse, timeout, deserialize
+        )
+
+    pool_dendrite.call = call
+    responses = await pool_dendrite.forward(
+        list(range(6)), SynapseDummy(input=1), max_concurrency=2
+    )
+    assert [response.output for response in responses] == list(range(6))
+    assert max(peak) == 2
+
+    peak.clear()
+    [
+        _
+        async for _ in pool_dendrite.as_completed(
+            list(range(6)), SynapseDummy(input=1), max_concurrency=3
+        )
+    ]
+    assert max(peak) == 3
+
+    with pytest.raises(ValueError):
+        await pool_dendrite.forward([0], SynapseDummy(input=1), max_concurrency=0)
+
+
+@pytest.mark.asyncio
+async def test_synapse_history_is_opt_in_and_bounded(pool_dendrite, tmp_path):
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        port = sock.getsockname()[1]
+    target = bittensor.AxonInfo(
+        version=1,
+        ip="127.0.0.1",
+        port=port,
+        ip_type=4,
+        hotkey="5CiPPseXPECbkjWCa6MnjNokrgYjMqmKndv2rSnekmSK2DjL",
+        coldkey="5CiPPseXPECbkjWCa6MnjNokrgYjMqmKndv2rSnekmSK2DjL",
+    )
+
+    # Disabled by default.
+    await pool_dendrite.call(target, SynapseDummy(input=1), timeout=1)
+    assert len(pool_dendrite.synapse_history) == 0
+
+    with patch("bittensor.utils.networking.get_external_ip", return_value="127.0.0.1"):
+        config = bittensor.dendrite.config()
+        config.dendrite.history_size = 2
+        dendrite_obj = bittensor.dendrite(_get_mock_wallet(), config=config)
+    for i in range(3):
+        await dendrite_obj.call(target, SynapseDummy(input=i), timeout=1)
+    await dendrite_obj.aclose_session()
+    await pool_dendrite.aclose_session()
+
+    assert len(dendrite_obj.synapse_history) == 2
+    record = dendrite_obj.synapse_history[-1]
+    assert record.name == "SynapseDummy"
+    assert record.axon_port == port
+    assert record.status_code == 503
+    assert record.request_size > 0
+
+    path = tmp_path / "history.jsonl"
+    records = dendrite_obj.export_history(str(path))
+    assert [r["timestamp"] for r in records] == [
+        r.timestamp for r in dendrite_obj.synapse_history
+    ]
+    assert [json.loads(line) for line in path.read_text().splitlines()] == records
+
+
+class TensorSynapse(bittensor.Synapse):
+    inputs: typing.Optional[bittensor.Tensor] = None
+    outputs: typing.Optional[bittensor.Tensor] = None
+    required_hash_fields: typing.List[str] = ["inputs"]
+
+
+@pytest.mark.asyncio
+async def test_call_negotiates_binary_frames(pool_dendrite):
+    received = []
+
+    async def forward(synapse: TensorSynapse) -> TensorSynapse:
+        # Tensors decoded from a frame keep their data as an array.
+        received.append(synapse.inputs._array is not None)
+        synapse.outputs = bittensor.Tensor.serialize(synapse.inputs.tensor() + 1)
+        return synapse
+
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        port = sock.getsockname()[1]
+    axon = bittensor.axon(wallet=_get_mock_wallet(), external_ip="127.0.0.1", port=port)
+    axon.attach(forward_fn=forward).start()
+    for _ in range(500):
+        if axon.fast_server.started:
+            break
+        await asyncio.sleep(0.01)
+    inputs = torch.randn(8, 4)
+    try:
+        responses = [
+            await pool_dendrite.call(
+                axon.info(),
+                TensorSynapse(inputs=bittensor.Tensor.serialize(inputs)),
+                deserialize=False,
+            )
+            for _ in range(2)
+        ]
+    finally:
+        await pool_dendrite.aclose_session()
+        axon.stop()
+
+    # The first request is sent as JSON, the axon then advertises frames.
+    assert received == [False, True]
+    for response in responses:
+        assert response.is_success
+        assert response.outputs._array is not None
+        assert torch.equal(response.outputs.tensor(), inputs + 1)
+
+
+@pytest.mark.asyncio
+async def test_call_negotiates_compression():
+    async def forward(synapse: TensorSynapse) -> TensorSynapse:
+        synapse.outputs = bittensor.Tensor.serialize(torch.zeros(4096))
+        return synapse
+
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        port = sock.getsockname()[1]
+    axon = bittensor.axon(wallet=_get_mock_wallet(), external_ip="127.0.0.1", port=port)
+    axon.config.axon.compression = "gzip"
+    axon.attach(forward_fn=forward).start()
+    with patch("bittensor.utils.networking.get_external_ip", return_value="127.0.0.1"):
+        config = bittensor.dendrite.config()
+        config.dendrite.compression = "gzip"
+        dendrite_obj = bittensor.dendrite(_get_mock_wallet(), config=config)
+    for _ in range(500):
+        if axon.fast_server.started:
+            break
+        await asyncio.sleep(0.01)
+    try:
+        responses = [
+            await dendrite_obj.call(
+                axon.info(),
+                TensorSynapse(inputs=bittensor.Tensor.serialize(torch.zeros(4096))),
+                deserialize=False,
+            )
+            for _ in range(2)
+        ]
+    finally:
+        await dendrite_obj.aclose_session()
+        axon.stop()
+
+    # The first request is sent uncompressed, the axon then advertises the encodings it accepts.
+    assert responses[0].dendrite.compression_ratio is None
+    assert responses[1].dendrite.compression_ratio > 1
+    for response in responses:
+        assert response.is_success
+        assert response.axon.compression_ratio > 1
+        assert response.axon.compression_time >= 0
+        assert torch.equal(response.outputs.tensor(), torch.zeros(4096))
+
+
+def test_axon_features_are_bounded(pool_dendrite, monkeypatch):
+    monkeypatch.setattr(sys.modules["bittensor.dendrite"], "AXON_FEATURES_SIZE", 2)
+    pool_dendrite._remember_axon_features(("1.1.1.1", 1), True, "gzip")
+    pool_dendrite._remember_axon_features(("1.1.1.1", 2), True, None)
+    pool_dendrite._remember_axon_features(("1.1.1.1", 1), False, "gzip")
+    pool_dendrite._remember_axon_features(("1.1.1.1", 3), True, None)
+
+    # The least recently used axon is forgotten, and axons which stop advertising frames lose them.
+    assert list(pool_dendrite._axon_features) == [("1.1.1.1", 1), ("1.1.1.1", 3)]
+    assert pool_dendrite._axon_features[("1.1.1.1", 1)] == (False, "gzip")
@@ -0,0 +1,131 @@
+# The MIT License (MIT)
+# Copyright © 2023 Opentensor Foundation
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy of this software and associated
+# documentation files (the “Software”), to deal in the Software without restriction, including without limitation
+# the rights to use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies of the Software,
+# and to permit persons to whom the Software is furnished to do so, subject to the following conditions:
+
+# The above copyright notice and this permission notice shall be included in all copies or substantial portions of
+# the Software.
+
+# THE SOFTWARE IS PROVIDED “AS IS”, WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO
+# THE WARRANTIES OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL
+# THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION
+# OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER
+# DEALINGS IN THE SOFTWARE.
+
+import numpy
+import typing
+import pytest
+import torch
+import bittensor
+
+from bittensor import frame
+
+
+class FrameSynapse(bittensor.Synapse):
+    text: str = ""
+    embedding: typing.Optional[bittensor.Tensor] = None
+    images: typing.Optional[typing.List[bittensor.Tensor]] = None
+    required_hash_fields: typing.List[str] = ["text", "embedding"]
+
+
+@pytest.mark.parametrize(
+    "value",
+    [
+        torch.randn(3, 5),
+        torch.tensor(1.5),
+        torch.zeros(0),
+        torch.tensor([True, False]),
+        torch.randint(0, 255, (2, 7, 3), dtype=torch.uint8),
+        torch.randn(4, dtype=torch.float16),
+        torch.arange(10, dtype=torch.int64),
+    ],
+)
+def test_round_trip(value):
+    synapse = FrameSynapse(text="a", embedding=bittensor.Tensor.serialize(value))
+
+    decoded = FrameSynapse(**frame.decode(frame.encode(synapse)))
+
+    assert decoded.text == "a"
+    assert decoded.embedding.dtype == str(value.dtype)
+    assert decoded.embedding.shape == synapse.embedding.shape
+    assert torch.equal(decoded.embedding.tensor(), value)
+
+
+def test_tensor_lists_and_buffers_are_aligned():
+    images = [torch.randn(3, 3), torch.randint(0, 9, (5,), dtype=torch.uint8)]
+    synapse = FrameSynapse(images=[bittensor.Tensor.serialize(t) for t in images])
+    assert frame.tensor_fields(synapse) == ["images"]
+
+    decoded = frame.decode(frame.encode(synapse))
+
+    for tensor, expected in zip(decoded["images"], images):
+        assert tensor.array().ctypes.data % frame.ALIGNMENT == (
+            decoded["images"][0].array().ctypes.data % frame.ALIGNMENT
+        )
+        assert torch.equal(tensor.tensor(), expected)
+
+
+def test_body_hash_matches_json_transport():
+    embedding = torch.randn(16)
+    synapse = FrameSynapse(text="a", embedding=bittensor.Tensor.serialize(embedding))
+    legacy = FrameSynapse(
+        text="a",
+        embedding=bittensor.Tensor(
+            buffer=synapse.embedding.buffer, dtype="torch.float32", shape=[16]
+        ),
+    )
+
+    decoded = FrameSynapse(**frame.decode(frame.encode(synapse)))
+
+    assert decoded.body_hash == synapse.body_hash == legacy.body_hash
+    assert decoded.dict() == legacy.dict()
+
+
+def test_decoded_tensors_are_views_of_the_body():
+    synapse = FrameSynapse(embedding=bittensor.Tensor.serialize(torch.randn(8)))
+    body = frame.encode(synapse)
+
+    array = frame.decode(body)["embedding"].array()
+
+    assert not array.flags.writeable
+    while isinstance(array, numpy.ndarray):
+        array = array.base
+    assert array is body
+
+
+@pytest.mark.parametrize(
+    "body", [b"{}", b"BTF1", b"BTF1\x05\x00\x00\x00{}", b"BTF1\x02\x00\x00\x00{}"]
+)
+def test_malformed_frames(body):
+    with pytest.raises(frame.FrameError):
+        frame.decode(body)
+
+
+def test_truncated_buffer():
+    synapse = FrameSynapse(embedding=bittensor.Tensor.serialize(torch.randn(64)))
+    with pytest.raises(frame.FrameError, match="exceeds"):
+        frame.decode(frame.encode(synapse)[:-32])
+
+
+@pytest.mark.parametrize(
+    "descriptor",
+    [{"nbytes": -4}, {"nbytes": 6}, {"offset": -64}, {"offset": 4}, {"nbytes": 4096}],
+)
+def test_invalid_descriptors(descriptor):
+    synapse = FrameSynapse(embedding=bittensor.Tensor.serialize(torch.randn(8)))
+    body = frame.encode(synapse)
+    (length,) = frame._LENGTH.unpack_from(body, len(frame.MAGIC))
+    start = len(frame.MAGIC) + frame._LENGTH.size
+    header = bittensor.codec.loads(body[start : start + length])
+    header["tensors"]["embedding"].update(descriptor)
+    # Rebuild the frame around the tampered header, keeping the buffers.
+    tampered = bittensor.codec.dumps(header)
+    buffers = body[start + length + (-(start + length) % frame.ALIGNMENT) :]
+    prefix = frame.MAGIC + frame._LENGTH.pack(len(tampered)) + tampered
+    padding = b"\x00" * (-len(prefix) % frame.ALIGNMENT)
+
+    with pytest.raises(frame.FrameError, match="Tensor buffer"):
+        frame.decode(prefix + padding + buffers)
@@ -16,11 +16,15 @@
 # DEALINGS IN THE SOFTWARE.
 
 from unittest.mock import Mock
+import os
+import sys
+import operator
 import pytest
 import torch
 import bittensor
 
 from bittensor.metagraph import metagraph as Metagraph
+from bittensor.metagraph import NEURON_COLUMNS, neuron_columns, sparse_rows
 from unittest.mock import MagicMock
 from loguru import logger
 
@@ -94,6 +98,26 @@ def test_set_metagraph_attributes(mock_environment):
     assert metagraph.axons == [n.axon_info for n in neurons]
 
 
+def test_neuron_columns_match_per_attribute_tensors(mock_environment):
+    _, neurons = mock_environment
+    neurons[3].stake = bittensor.Balance.from_tao(1.25)
+    neurons[4].last_update = 2**40
+
+    columns = neuron_columns(neurons)
+
+    for name, attribute, dtype in NEURON_COLUMNS:
+        expected = torch.tensor(
+            [operator.attrgetter(attribute)(neuron) for neuron in neurons], dtype=dtype
+        )
+        assert columns[name].dtype == dtype
+        assert torch.equal(columns[name], expected), name
+
+
+def test_neuron_columns_empty():
+    columns = neuron_columns([])
+    assert all(len(tensor) == 0 for tensor in columns.values())
+
+
 def test_process_weights_or_bonds(mock_environment):
     _, neurons = mock_environment
     metagraph = bittensor.metagraph(1, sync=False)
@@ -125,6 +149,127 @@ def test_process_weights_or_bonds(mock_environment):
     # TODO: Add more checks to ensure the bonds have been processed correctly
 
 
+@pytest.fixture
+def sparse_neurons():
+    # Chain values, every row has at least one entry so that dense bonds keep their int64 dtype.
+    return [
+        Mock(
+            weights=[(j, (i * 7 + j * 13) % 65535) for j in range(i % 5, 10, 3)],
+            bonds=[(j, i * 1000 + j) for j in range(0, 10, i + 1)],
+        )
+        for i in range(10)
+    ]
+
+
+def test_sparse_weights_and_bonds_match_dense(sparse_neurons):
+    metagraph = bittensor.metagraph(1, sync=False)
+    metagraph.neurons = sparse_neurons
+    metagraph._set_weights_and_bonds()
+    dense_weights, dense_bonds = metagraph.W, metagraph.B
+
+    metagraph.sparse = True
+    metagraph._set_weights_and_bonds()
+
+    assert metagraph.W.is_sparse and metagraph.B.is_sparse
+    assert metagraph.W._nnz() == sum(len(n.weights) for n in sparse_neurons)
+    assert torch.allclose(metagraph.W.to_dense(), dense_weights)
+    assert torch.equal(metagraph.B.to_dense(), dense_bonds)
+    assert torch.allclose(metagraph.W[3].to_dense(), dense_weights[3])
+
+    metagraph.to_dense()
+    assert not metagraph.sparse
+    assert not metagraph.W.is_sparse
+    assert torch.equal(metagraph.B, dense_bonds)
+
+
+def test_sparse_rows_empty_and_out_of_range():
+    weights = sparse_rows([[], [(1, 5)], []], 3, "weights")
+    assert torch.equal(
+        weights.to_dense(), torch.tensor([[0, 0, 0], [0, 1, 0], [0, 0, 0]]).float()
+    )
+    assert sparse_rows([], 0, "bonds").shape == (0, 0)
+    with pytest.raises(ValueError):
+        sparse_rows([[(3, 1)]], 3, "bonds")
+
+
+def test_sparse_save_and_load(sparse_neurons, tmp_path, monkeypatch):
+    monkeypatch.setattr(
+        sys.modules["bittensor.metagraph"],
+        "get_save_dir",
+        lambda network, netuid: str(tmp_path),
+    )
+    metagraph = bittensor.metagraph(1, sync=False, sparse=True)
+    metagraph.neurons = sparse_neurons
+    metagraph._set_weights_and_bonds()
+    metagraph.save()
+
+    loaded = bittensor.metagraph(1, sync=False)
+    loaded.load()
+
+    assert loaded.sparse
+    assert loaded.W.is_sparse and loaded.B.is_sparse
+    assert torch.equal(loaded.W.to_dense(), metagraph.W.to_dense())
+    assert torch.equal(loaded.B.to_dense(), metagraph.B.to_dense())
+
+
+def _saved_metagraph(tmp_path, monkeypatch):
+    monkeypatch.setattr(
+        sys.modules["bittensor.metagraph"],
+        "get_save_dir",
+        lambda network, netuid: str(tmp_path),
+    )
+    metagraph = bittensor.metagraph(1, sync=False)
+    metagraph.n = metagraph._create_tensor(3, dtype=torch.int64)
+    metagraph.block = metagraph._create_tensor(42, dtype=torch.int64)
+    metagraph.uids = metagraph._create_tensor([0, 1, 2], dtype=torch.int64)
+    metagraph.stake = metagraph._create_tensor([1.0, 2.5, 0.0], dtype=torch.float32)
+    metagraph.validator_permit = metagraph._create_tensor(
+        [True, False, True], dtype=torch.bool
+    )
+    metagraph.weights = metagraph._create_tensor(
+        torch.rand(3, 3).tolist(), dtype=torch.float32
+    )
+    metagraph.axons = [
+        bittensor.AxonInfo(
+            version=1,
+            ip=f"10.0.0.{uid}",
+            port=8091,
+            ip_type=4,
+            hotkey=f"hotkey-{uid}",
+            coldkey=f"coldkey-{uid}",
+        )
+        for uid in range(3)
+    ]
+    return metagraph
+
+
+def test_save_and_load_snapshot(tmp_path, monkeypatch):
+    metagraph = _saved_metagraph(tmp_path, monkeypatch)
+    metagraph.save()
+    assert os.listdir(tmp_path) == ["block-42.snapshot"]
+
+    loaded = bittensor.metagraph(1, sync=False)
+    loaded.load()
+
+    for name, tensor in metagraph.state_dict().items():
+        assert torch.equal(loaded.state_dict()[name], tensor), name
+    assert loaded.axons == metagraph.axons
+    assert loaded.hotkeys == ["hotkey-0", "hotkey-1", "hotkey-2"]
+
+
+def test_load_legacy_torch_save(tmp_path, monkeypatch):
+    metagraph = _saved_metagraph(tmp_path, monkeypatch)
+    state_dict = metagraph.state_dict()
+    state_dict["axons"] = metagraph.axons
+    torch.save(state_dict, str(tmp_path / "block-42.pt"))
+
+    loaded = bittensor.metagraph(1, sync=False)
+    loaded.load()
+
+    assert torch.equal(loaded.W, metagraph.W)
+    assert loaded.axons == metagraph.axons
+
+
 # Mocking the bittensor.subtensor class for testing purposes
 @pytest.fixture
 def mock_subtensor():
@@ -0,0 +1,110 @@
+# The MIT License (MIT)
+# Copyright © 2023 Opentensor Foundation
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy of this software and associated
+# documentation files (the “Software”), to deal in the Software without restriction, including without limitation
+# the rights to use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies of the Software,
+# and to permit persons to whom the Software is furnished to do so, subject to the following conditions:
+
+# The above copyright notice and this permission notice shall be included in all copies or substantial portions of
+# the Software.
+
+# THE SOFTWARE IS PROVIDED “AS IS”, WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO
+# THE WARRANTIES OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL
+# THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION
+# OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER
+# DEALINGS IN THE SOFTWARE.
+
+import math
+import time
+import pytest
+
+from bittensor.nonce_store import (
+    MemoryNonceStore,
+    SQLiteNonceStore,
+    ALLOWED_DELTA,
+    is_future,
+    is_stale,
+    nonce_ttl,
+)
+
+
+@pytest.fixture(params=["memory", "sqlite"])
+def store(request, tmp_path):
+    if request.param == "memory":
+        yield MemoryNonceStore(capacity=64, num_shards=4)
+    else:
+        store = SQLiteNonceStore(str(tmp_path / "nonces.db"), capacity=64)
+        yield store
+        store.close()
+
+
+def test_check_and_set_rejects_replays(store):
+    assert store.check_and_set("hotkey:uuid", 10, ttl=60)
+    assert not store.check_and_set("hotkey:uuid", 10, ttl=60)
+    assert not store.check_and_set("hotkey:uuid", 9, ttl=60)
+    assert store.check_and_set("hotkey:uuid", 11, ttl=60)
+    assert store["hotkey:uuid"] == 11
+    assert "hotkey:other_uuid" not in store
+
+
+def test_entries_expire(store):
+    assert store.check_and_set("hotkey:uuid", 10, ttl=0.05)
+    time.sleep(0.1)
+    assert store.get("hotkey:uuid") is None
+    assert store.check_and_set("hotkey:uuid", 5, ttl=60)
+
+
+def test_memory_store_is_bounded():
+    store = MemoryNonceStore(capacity=32, num_shards=4)
+    for i in range(1000):
+        store.check_and_set(f"hotkey:{i}", 1, ttl=60)
+    assert len(store) <= 32
+    # The most recently written keys are kept.
+    assert store.get("hotkey:999") == 1
+
+
+def test_sqlite_store_is_bounded_and_shared(tmp_path):
+    path = str(tmp_path / "nonces.db")
+    first = SQLiteNonceStore(path, capacity=16, purge_interval=8)
+    second = SQLiteNonceStore(path, capacity=16, purge_interval=8)
+
+    assert first.check_and_set("hotkey:uuid", 10, ttl=60)
+    assert not second.check_and_set("hotkey:uuid", 10, ttl=60)
+
+    for i in range(100):
+        second.check_and_set(f"hotkey:{i}", 1, ttl=60)
+    assert len(first) <= 16 + 8
+
+    first.close()
+    second.close()
+
+
+def test_is_stale():
+    now = time.time_ns()
+    assert not is_stale(now, max_age=12)
+    assert is_stale(now - int((12 + ALLOWED_DELTA + 1) * 1e9), max_age=12)
+    # Nonces from older dendrites are not wall clock times and are never stale.
+    assert not is_stale(time.monotonic_ns(), max_age=12)
+
+
+def test_is_future():
+    now = time.time_ns()
+    assert not is_future(now)
+    assert is_future(now + int((ALLOWED_DELTA + 1) * 1e9))
+    assert not is_future(time.monotonic_ns())
+
+
+def test_nonces_are_kept_until_stale(store):
+    nonce = time.time_ns() + int(ALLOWED_DELTA * 1e9)
+    # A nonce at the edge of the future window is remembered until it is stale.
+    assert (
+        nonce_ttl(nonce, max_age=12) * 1e9
+        >= nonce - time.time_ns() + (12 + ALLOWED_DELTA) * 1e9
+    )
+    # Nonces which can not be aged out are never expired.
+    legacy = time.monotonic_ns()
+    assert nonce_ttl(legacy, max_age=12) == math.inf
+    assert store.check_and_set("hotkey:uuid", legacy, nonce_ttl(legacy, max_age=12))
+    assert not store.check_and_set("hotkey:uuid", legacy, ttl=60)
+    assert store.get("hotkey:uuid") == legacy
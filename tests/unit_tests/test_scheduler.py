@@ -0,0 +1,126 @@
+# The MIT License (MIT)
+# Copyright © 2023 Opentensor Foundation
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy of this software and associated
+# documentation files (the “Software”), to deal in the Software without restriction, including without limitation
+# the rights to use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies of the Software,
+# and to permit persons to whom the Software is furnished to do so, subject to the following conditions:
+
+# The above copyright notice and this permission notice shall be included in all copies or substantial portions of
+# the Software.
+
+# THE SOFTWARE IS PROVIDED “AS IS”, WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO
+# THE WARRANTIES OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL
+# THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION
+# OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER
+# DEALINGS IN THE SOFTWARE.
+
+import asyncio
+import pytest
+
+from bittensor.scheduler import AdmissionRejected, AdmissionScheduler
+
+
+async def _run(scheduler, name, priority, order, hold):
+    async with scheduler.slot(name, priority):
+        order.append((name, priority))
+        await hold.wait()
+
+
+async def _drain(scheduler, tasks, hold):
+    hold.set()
+    await asyncio.gather(*tasks)
+    assert scheduler.stats["running"] == 0
+    assert scheduler.stats["queued"] == 0
+
+
+@pytest.mark.asyncio
+async def test_admits_highest_priority_first():
+    scheduler = AdmissionScheduler(max_concurrency=1, max_queue_size=8)
+    order = []
+    hold = asyncio.Event()
+
+    await scheduler.acquire("A")
+    tasks = [
+        asyncio.create_task(_run(scheduler, "A", priority, order, hold))
+        for priority in [1.0, 3.0, 2.0]
+    ]
+    await asyncio.sleep(0)
+    assert scheduler.stats["queued"] == 3
+
+    scheduler.release("A")
+    await _drain(scheduler, tasks, hold)
+    assert order == [("A", 3.0), ("A", 2.0), ("A", 1.0)]
+
+
+@pytest.mark.asyncio
+async def test_synapse_limit_lets_other_synapses_run():
+    scheduler = AdmissionScheduler(max_concurrency=4, max_queue_size=8)
+    scheduler.set_limit("A", 1)
+    order = []
+    hold = asyncio.Event()
+
+    tasks = [
+        asyncio.create_task(_run(scheduler, name, priority, order, hold))
+        for name, priority in [("A", 1.0), ("A", 5.0), ("B", 0.0)]
+    ]
+    await asyncio.sleep(0)
+    # The second "A" waits for the first, "B" runs next to it regardless of priority.
+    assert order == [("A", 1.0), ("B", 0.0)]
+    assert scheduler.stats == {
+        "running": 2,
+        "queued": 1,
+        "admitted": 2,
+        "shed": 0,
+        "expired": 0,
+    }
+
+    await _drain(scheduler, tasks, hold)
+    assert order[-1] == ("A", 5.0)
+
+
+@pytest.mark.asyncio
+async def test_full_queue_sheds_lowest_priority():
+    scheduler = AdmissionScheduler(max_concurrency=1, max_queue_size=1)
+    await scheduler.acquire("A")
+
+    low = asyncio.create_task(scheduler.acquire("A", priority=1.0))
+    await asyncio.sleep(0)
+
+    # Equal or lower priority requests are rejected straight away.
+    with pytest.raises(AdmissionRejected):
+        await scheduler.acquire("A", priority=1.0)
+
+    # A higher priority request displaces the queued one.
+    high = asyncio.create_task(scheduler.acquire("A", priority=2.0))
+    await asyncio.sleep(0)
+    with pytest.raises(AdmissionRejected):
+        await low
+    assert scheduler.stats["shed"] == 2
+
+    scheduler.release("A")
+    assert await high >= 0.0
+    scheduler.release("A")
+    assert scheduler.stats["running"] == 0
+
+
+@pytest.mark.asyncio
+async def test_queue_timeout_expires_waiter():
+    scheduler = AdmissionScheduler(max_concurrency=1, max_queue_size=4)
+    await scheduler.acquire("A")
+
+    with pytest.raises(AdmissionRejected):
+        await scheduler.acquire("A", timeout=0.01)
+    assert scheduler.stats["expired"] == 1
+    assert scheduler.stats["queued"] == 0
+
+    # The expired waiter does not hold on to the slot once it frees up.
+    scheduler.release("A")
+    assert await scheduler.acquire("A") == 0.0
+
+
+def test_invalid_arguments():
+    with pytest.raises(ValueError):
+        AdmissionScheduler(max_concurrency=0)
+    with pytest.raises(ValueError):
+        AdmissionScheduler().set_limit("A", 0)
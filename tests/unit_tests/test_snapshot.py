@@ -0,0 +1,96 @@
+# The MIT License (MIT)
+# Copyright © 2023 Opentensor Foundation
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy of this software and associated
+# documentation files (the “Software”), to deal in the Software without restriction, including without limitation
+# the rights to use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies of the Software,
+# and to permit persons to whom the Software is furnished to do so, subject to the following conditions:
+
+# The above copyright notice and this permission notice shall be included in all copies or substantial portions of
+# the Software.
+
+# THE SOFTWARE IS PROVIDED “AS IS”, WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO
+# THE WARRANTIES OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL
+# THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION
+# OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER
+# DEALINGS IN THE SOFTWARE.
+
+import os
+import pytest
+import torch
+
+from bittensor import snapshot
+
+
+def _tensors():
+    return {
+        "n": torch.tensor(3, dtype=torch.int64),
+        "stake": torch.tensor([1.5, 0.0, 2.25], dtype=torch.float32),
+        "validator_permit": torch.tensor([True, False, True]),
+        "weights": torch.rand(3, 3),
+        "bonds": torch.tensor([], dtype=torch.int64),
+        "sparse": torch.sparse_coo_tensor(
+            torch.tensor([[0, 2], [1, 0]]), torch.tensor([0.25, 0.75]), (3, 3)
+        ),
+    }
+
+
+@pytest.mark.parametrize("mmap", [True, False])
+def test_write_read_roundtrip(tmp_path, mmap):
+    path = str(tmp_path / "block-1.snapshot")
+    snapshot.write(path, _tensors(), meta={"netuid": 1, "axons": [{"ip": "1.2.3.4"}]})
+
+    assert snapshot.is_snapshot(path)
+    tensors, meta = snapshot.read(path, mmap=mmap)
+
+    assert meta == {"netuid": 1, "axons": [{"ip": "1.2.3.4"}]}
+    for name, expected in _tensors().items():
+        if name == "weights":
+            continue
+        assert tensors[name].dtype == expected.dtype
+        if expected.is_sparse:
+            assert tensors[name].is_sparse
+            assert torch.equal(tensors[name].to_dense(), expected.to_dense())
+        else:
+            assert torch.equal(tensors[name], expected)
+    assert os.listdir(tmp_path) == ["block-1.snapshot"]
+
+
+@pytest.mark.skipif(
+    not os.path.exists("/proc/self/maps"), reason="Requires /proc/self/maps"
+)
+def test_read_maps_the_file_copy_on_write(tmp_path):
+    path = str(tmp_path / "block-1.snapshot")
+    weights = torch.rand(4, 4)
+    snapshot.write(path, {"weights": weights}, meta={})
+
+    tensors, _ = snapshot.read(path)
+    with open("/proc/self/maps") as maps:
+        assert path in maps.read()
+    assert tensors["weights"].data_ptr() % snapshot.ALIGNMENT == 0
+
+    # Writes stay private to the process.
+    tensors["weights"][0, 0] = -1
+    assert torch.equal(snapshot.read(path)[0]["weights"], weights)
+
+
+def test_read_rejects_invalid_files(tmp_path):
+    path = str(tmp_path / "block-1.snapshot")
+    with open(path, "wb") as file:
+        file.write(b"PK\x03\x04 not a snapshot")
+    assert not snapshot.is_snapshot(path)
+    with pytest.raises(snapshot.SnapshotError, match="not a metagraph snapshot"):
+        snapshot.read(path)
+
+    snapshot.write(path, {"stake": torch.rand(16)}, meta={})
+    with open(path, "r+b") as file:
+        data = file.read()
+        file.seek(0)
+        file.write(data[:4] + (snapshot.VERSION + 1).to_bytes(4, "little"))
+    with pytest.raises(snapshot.SnapshotError, match="format version"):
+        snapshot.read(path)
+
+    with open(path, "wb") as file:
+        file.write(data[:-32])
+    with pytest.raises(snapshot.SnapshotError, match="exceeds"):
+        snapshot.read(path)
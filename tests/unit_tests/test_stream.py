@@ -0,0 +1,256 @@
+# The MIT License (MIT)
+# Copyright © 2023 Opentensor Foundation
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy of this software and associated
+# documentation files (the “Software”), to deal in the Software without restriction, including without limitation
+# the rights to use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies of the Software,
+# and to permit persons to whom the Software is furnished to do so, subject to the following conditions:
+
+# The above copyright notice and this permission notice shall be included in all copies or substantial portions of
+# the Software.
+
+# THE SOFTWARE IS PROVIDED “AS IS”, WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO
+# THE WARRANTIES OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL
+# THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION
+# OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER
+# DEALINGS IN THE SOFTWARE.
+
+import socket
+import asyncio
+import pytest
+
+from typing import List, Optional
+from unittest.mock import MagicMock, patch
+
+import bittensor
+from bittensor.stream import BufferedSend
+from tests.helpers import _get_mock_wallet
+
+
+def body(message):
+    return {"type": "http.response.body", "body": message, "more_body": True}
+
+
+class Recorder:
+    def __init__(self, delay: float = 0.0):
+        self.delay = delay
+        self.messages: List[dict] = []
+
+    async def __call__(self, message):
+        await asyncio.sleep(self.delay)
+        self.messages.append(message)
+
+    @property
+    def bodies(self) -> List[bytes]:
+        return [
+            message["body"]
+            for message in self.messages
+            if message["type"] == "http.response.body" and message["body"]
+        ]
+
+
+def test_buffered_send_coalesces_tokens():
+    async def run():
+        send = Recorder()
+        buffered = BufferedSend(send, max_chunk_size=64, max_delay=10)
+        for i in range(100):
+            await buffered(body(b"token%03d\n" % i))
+        await buffered.flush()
+        return send
+
+    send = asyncio.run(run())
+    assert b"".join(send.bodies) == b"".join(b"token%03d\n" % i for i in range(100))
+    assert len(send.bodies) == 13
+    assert all(len(chunk) >= 64 for chunk in send.bodies[:-1])
+
+
+def test_buffered_send_flushes_after_delay():
+    async def run():
+        send = Recorder()
+        buffered = BufferedSend(send, max_chunk_size=1024, max_delay=0.01)
+        await buffered(body(b"first"))
+        await asyncio.sleep(0.1)
+        sent = list(send.bodies)
+        await buffered(body(b"second"))
+        await buffered.flush()
+        return sent, send.bodies
+
+    sent, bodies = asyncio.run(run())
+    assert sent == [b"first"]
+    assert bodies == [b"first", b"second"]
+
+
+def test_buffered_send_flushes_slow_producers_within_delay():
+    async def run():
+        loop = asyncio.get_running_loop()
+        arrivals = []
+
+        async def send(message):
+            arrivals.append((message["body"], loop.time()))
+
+        buffered = BufferedSend(send, max_chunk_size=4096, max_delay=0.02)
+        sent = []
+        for i in range(5):
+            sent.append(loop.time())
+            await buffered(body(b"%d" % i))
+            await asyncio.sleep(0.2)
+        await buffered.flush()
+        return sent, arrivals
+
+    sent, arrivals = asyncio.run(run())
+    # Every token is sent on its own, within max_delay of being buffered, even once the stream is idle.
+    assert [chunk for chunk, _ in arrivals] == [b"%d" % i for i in range(5)]
+    assert all(
+        arrived - buffered < 0.1 for buffered, (_, arrived) in zip(sent, arrivals)
+    )
+
+
+def test_buffered_send_applies_backpressure():
+    async def run():
+        send = Recorder(delay=0.01)
+        buffered = BufferedSend(
+            send, max_chunk_size=1, max_delay=10, max_buffered_chunks=2
+        )
+        backlog = []
+        for i in range(20):
+            await buffered(body(b"%d" % i))
+            backlog.append(i + 1 - len(send.messages))
+        await buffered.flush()
+        return backlog, send.bodies
+
+    backlog, bodies = asyncio.run(run())
+    # The queue and the chunk being sent, the producer waits for the rest.
+    assert max(backlog) <= 3
+    assert bodies == [b"%d" % i for i in range(20)]
+
+
+def test_buffered_send_passes_other_messages_in_order():
+    async def run():
+        send = Recorder()
+        buffered = BufferedSend(send, max_chunk_size=1024, max_delay=10)
+        await buffered(body(b"a"))
+        await buffered({"type": "http.response.trailers", "headers": []})
+        await buffered.flush()
+        return send.messages
+
+    messages = asyncio.run(run())
+    assert [m["type"] for m in messages] == [
+        "http.response.body",
+        "http.response.trailers",
+    ]
+
+
+class StreamingDummy(bittensor.StreamingSynapse):
+    tokens: int = 0
+    completion: Optional[str] = None
+
+    async def process_streaming_response(self, response):
+        self.completion = ""
+        async for token in self.iter_text(response):
+            self.completion += token
+            yield token
+
+    def extract_response_json(self, response) -> dict:
+        return {"completion": self.completion}
+
+
+def test_streaming_response_cancels_on_disconnect():
+    cancelled = asyncio.Event()
+
+    async def streamer(send):
+        try:
+            while True:
+                await send(body(b"token\n"))
+                await asyncio.sleep(0.001)
+        except asyncio.CancelledError:
+            cancelled.set()
+            raise
+
+    async def run():
+        response = StreamingDummy().create_streaming_response(streamer)
+
+        async def receive():
+            await asyncio.sleep(0.05)
+            return {"type": "http.disconnect"}
+
+        send = Recorder()
+        await asyncio.wait_for(response(MagicMock(), receive, send), 1)
+        return send
+
+    send = asyncio.run(run())
+    assert cancelled.is_set()
+    assert send.messages[0]["type"] == "http.response.start"
+    assert send.bodies and all(b"token\n" in chunk for chunk in send.bodies)
+
+
+def test_iter_text_decodes_split_characters():
+    text = "héllo\nwörld\n€nd"
+    data = text.encode("utf-8")
+
+    async def iter_any():
+        # One byte at a time, splitting every multi byte character.
+        for i in range(len(data)):
+            yield data[i : i + 1]
+
+    response = MagicMock()
+    response.content.iter_any = iter_any
+
+    async def collect(delimiter):
+        return [
+            part
+            async for part in StreamingDummy.iter_text(response, delimiter=delimiter)
+        ]
+
+    assert asyncio.run(collect("\n")) == ["héllo", "wörld", "€nd"]
+    assert "".join(asyncio.run(collect(None))) == text
+
+
+@pytest.mark.asyncio
+async def test_call_stream_end_to_end():
+    cancelled = asyncio.Event()
+
+    async def forward(synapse: StreamingDummy) -> StreamingDummy:
+        async def streamer(send):
+            try:
+                for i in range(synapse.tokens):
+                    await send(body(b"%d\n" % i))
+                    await asyncio.sleep(0.001)
+            except asyncio.CancelledError:
+                cancelled.set()
+                raise
+
+        return synapse.create_streaming_response(streamer, max_delay=0.005)
+
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        port = sock.getsockname()[1]
+    axon = bittensor.axon(wallet=_get_mock_wallet(), external_ip="127.0.0.1", port=port)
+    axon.attach(forward_fn=forward).start()
+    with patch("bittensor.utils.networking.get_external_ip", return_value="127.0.0.1"):
+        dendrite_obj = bittensor.dendrite(_get_mock_wallet())
+    for _ in range(500):
+        if axon.fast_server.started:
+            break
+        await asyncio.sleep(0.01)
+    try:
+        items = [
+            item
+            async for item in dendrite_obj.call_stream(
+                axon.info(), StreamingDummy(tokens=50), deserialize=False
+            )
+        ]
+        assert items[-1].is_success
+        assert items[-1].completion == "".join(str(i) for i in range(50))
+        assert items[:-1] == [str(i) for i in range(50)]
+
+        # Closing the stream early disconnects, which cancels the token streamer on the axon.
+        stream = dendrite_obj.call_stream(
+            axon.info(), StreamingDummy(tokens=100000), deserialize=False
+        )
+        async for _ in stream:
+            break
+        await stream.aclose()
+        await asyncio.wait_for(cancelled.wait(), 5)
+    finally:
+        await dendrite_obj.aclose_session()
+        axon.stop()
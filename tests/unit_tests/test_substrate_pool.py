@@ -0,0 +1,154 @@
+# The MIT License (MIT)
+# Copyright © 2023 Opentensor Foundation
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy of this software and associated
+# documentation files (the “Software”), to deal in the Software without restriction, including without limitation
+# the rights to use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies of the Software,
+# and to permit persons to whom the Software is furnished to do so, subject to the following conditions:
+
+# The above copyright notice and this permission notice shall be included in all copies or substantial portions of
+# the Software.
+
+# THE SOFTWARE IS PROVIDED “AS IS”, WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO
+# THE WARRANTIES OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL
+# THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION
+# OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER
+# DEALINGS IN THE SOFTWARE.
+
+import threading
+import pytest
+
+from unittest.mock import MagicMock
+from websocket import WebSocketConnectionClosedException
+from bittensor import substrate_pool
+from bittensor.substrate_pool import SubstratePool
+
+
+def _pool(**kwargs):
+    factory = MagicMock(side_effect=lambda: MagicMock(url="ws://127.0.0.1:9944"))
+    return SubstratePool(factory, **kwargs), factory
+
+
+def _in_thread(function):
+    result = []
+    thread = threading.Thread(target=lambda: result.append(function()))
+    thread.start()
+    thread.join()
+    return result[0]
+
+
+def test_threads_are_routed_to_their_own_connections():
+    pool, factory = _pool(size=2)
+    barrier = threading.Barrier(2, timeout=5)
+    used = []
+
+    def query():
+        connection = pool._connection()
+        connection.substrate.query.side_effect = lambda *args: barrier.wait()
+        pool.query("SubtensorModule", "Rank")
+        used.append(connection.substrate)
+
+    threads = [threading.Thread(target=query) for _ in range(2)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    # Both threads only pass the barrier if neither waits for the other's connection.
+    assert len(used) == 2
+    assert used[0] is not used[1]
+    assert factory.call_count == 2
+
+
+def test_threads_share_connections_once_the_pool_is_full():
+    pool, factory = _pool(size=2)
+    routed = threading.Barrier(3, timeout=5)
+    connections = []
+
+    def route():
+        connections.append(pool._connection())
+        assert pool._connection() is connections[-1]
+        routed.wait()
+
+    threads = [threading.Thread(target=route) for _ in range(3)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert factory.call_count == 2
+    assert len({id(connection) for connection in connections}) == 2
+    # The connections of finished threads are handed out again.
+    assert _in_thread(lambda: pool._connection().load()) == 1
+    assert factory.call_count == 2
+
+
+def test_call_reconnects_with_jittered_backoff(monkeypatch):
+    delays = []
+    monkeypatch.setattr(substrate_pool.time, "sleep", delays.append)
+    pool, _ = _pool(backoff_base=1.0, backoff_max=3.0)
+    substrate = pool.connections[0]
+    substrate.query.side_effect = [WebSocketConnectionClosedException(), "rank"]
+    substrate.connect_websocket.side_effect = [
+        ConnectionRefusedError(),
+        ConnectionRefusedError(),
+        ConnectionRefusedError(),
+        None,
+    ]
+
+    assert pool.query("SubtensorModule", "Rank") == "rank"
+    assert substrate.connect_websocket.call_count == 4
+    assert len(delays) == 3
+    for delay, limit in zip(delays, [1.0, 2.0, 3.0]):
+        assert limit / 2 <= delay <= limit
+
+
+def test_reconnect_gives_up_after_max_attempts(monkeypatch):
+    monkeypatch.setattr(substrate_pool.time, "sleep", lambda delay: None)
+    pool, _ = _pool(max_reconnect_attempts=2)
+    substrate = pool.connections[0]
+    substrate.query.side_effect = WebSocketConnectionClosedException()
+    substrate.connect_websocket.side_effect = ConnectionRefusedError()
+
+    with pytest.raises(ConnectionRefusedError):
+        pool.query("SubtensorModule", "Rank")
+    assert substrate.connect_websocket.call_count == 2
+
+
+def test_submitted_extrinsics_are_not_repeated():
+    pool, _ = _pool()
+    substrate = pool.connections[0]
+    substrate.submit_extrinsic.side_effect = WebSocketConnectionClosedException()
+
+    with pytest.raises(WebSocketConnectionClosedException):
+        pool.submit_extrinsic("extrinsic")
+    substrate.submit_extrinsic.assert_called_once_with("extrinsic")
+    substrate.connect_websocket.assert_called_once()
+
+
+def test_idle_connections_are_checked_before_use():
+    pool, _ = _pool(health_check_interval=0.0)
+    substrate = pool.connections[0]
+    substrate.rpc_request.side_effect = WebSocketConnectionClosedException()
+
+    pool.get_block_number(None)
+
+    substrate.rpc_request.assert_called_once_with("system_health", [])
+    substrate.connect_websocket.assert_called_once()
+    substrate.get_block_number.assert_called_once_with(None)
+
+
+def test_context_holds_the_connection_without_closing_it():
+    pool, _ = _pool(size=1)
+    substrate = pool.connections[0]
+
+    with pool as held:
+        held.compose_call("SubtensorModule", "set_weights")
+        # Other threads wait for the context to exit.
+        assert not _in_thread(lambda: pool._connections[0].lock.acquire(False))
+    assert _in_thread(lambda: pool.get_block_number(None)) is not None
+
+    substrate.compose_call.assert_called_once()
+    substrate.close.assert_not_called()
+    pool.close()
+    substrate.close.assert_called_once()
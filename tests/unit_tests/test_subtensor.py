@@ -18,6 +18,7 @@
 # Standard Lib
 import argparse
 import unittest.mock as mock
+from concurrent.futures import ThreadPoolExecutor
 from unittest.mock import MagicMock
 
 # 3rd Party
@@ -272,3 +273,225 @@ def test_determine_chain_endpoint_and_network(
     # Assert
     assert result_network == expected_network
     assert result_endpoint == expected_endpoint
+
+
+def _encode_vector(values, dtype):
+    import numpy
+
+    return (
+        "0x" + (bytes([len(values) << 2]) + numpy.array(values, dtype).tobytes()).hex()
+    )
+
+
+def _storage_changes_subtensor(change_sets, rpc_request=None):
+    def create_storage_key(pallet, name, params):
+        return MagicMock(to_hex=MagicMock(return_value=f"{name}{params}"))
+
+    return MagicMock(
+        spec=bittensor.subtensor,
+        substrate=MagicMock(
+            create_storage_key=MagicMock(side_effect=create_storage_key),
+            rpc_request=rpc_request or MagicMock(return_value={"result": change_sets}),
+        ),
+        get_block_hash=MagicMock(side_effect=lambda block: f"hash-{block}"),
+        chain_endpoint="wss://entrypoint-finney.opentensor.ai:443",
+        _query_storage_supported=True,
+    )
+
+
+def test_neuron_storage_changes():
+    mock_subtensor = _storage_changes_subtensor(
+        [
+            {
+                "block": "hash-10",
+                "changes": [
+                    ["Rank[1]", _encode_vector([0, 10, 20], "<u2")],
+                    ["LastUpdate[1]", _encode_vector([5, 5, 5], "<u8")],
+                    ["SubnetworkN[1]", "0x0300"],
+                ],
+            },
+            {
+                "block": "hash-11",
+                "changes": [["Rank[1]", _encode_vector([0, 11, 20], "<u2")]],
+            },
+            {
+                "block": "hash-12",
+                "changes": [
+                    ["Rank[1]", _encode_vector([0, 11, 21], "<u2")],
+                    ["LastUpdate[1]", _encode_vector([5, 5, 5], "<u8")],
+                    ["TotalHotkeyStake['hk2']", "0x00"],
+                ],
+            },
+        ]
+    )
+
+    changes = bittensor.subtensor.neuron_storage_changes(
+        mock_subtensor, netuid=1, hotkeys=["hk0", "hk1", "hk2"], from_block=10, block=12
+    )
+
+    assert changes.block == 12
+    assert changes.vectors == {"Rank": {1: 11, 2: 21}}
+    assert changes.uids == [2]
+    keys, from_hash, to_hash = mock_subtensor.substrate.rpc_request.call_args.kwargs[
+        "params"
+    ]
+    assert (from_hash, to_hash) == ("hash-10", "hash-12")
+    assert "Keys[1, 2]" in keys and "Axons[1, 'hk0']" in keys
+    # Weights and bonds are not watched for a lite sync.
+    assert "Weights[1, 0]" not in keys
+
+
+def test_neuron_storage_changes_when_neurons_are_added():
+    mock_subtensor = _storage_changes_subtensor(
+        [
+            {"block": "hash-10", "changes": [["SubnetworkN[1]", "0x0300"]]},
+            {"block": "hash-11", "changes": [["SubnetworkN[1]", "0x0400"]]},
+        ]
+    )
+
+    assert (
+        bittensor.subtensor.neuron_storage_changes(
+            mock_subtensor,
+            netuid=1,
+            hotkeys=["hk0", "hk1", "hk2"],
+            from_block=10,
+            block=11,
+        )
+        is None
+    )
+
+
+def test_neuron_storage_changes_without_unsafe_rpc_methods():
+    from substrateinterface.exceptions import SubstrateRequestException
+
+    storage = {
+        "hash-10": [
+            ["Rank[1]", _encode_vector([0, 10, 20], "<u2")],
+            ["SubnetworkN[1]", "0x0300"],
+            ["TotalHotkeyStake['hk2']", "0x00"],
+        ],
+        "hash-12": [
+            ["Rank[1]", _encode_vector([0, 11, 20], "<u2")],
+            ["SubnetworkN[1]", "0x0300"],
+            ["TotalHotkeyStake['hk2']", "0x01"],
+        ],
+    }
+
+    def rpc_request(method, params):
+        if method == "state_queryStorage":
+            raise SubstrateRequestException(
+                {
+                    "code": -32601,
+                    "message": "RPC call is unsafe to be called externally",
+                }
+            )
+        return {"result": [{"block": params[1], "changes": storage[params[1]]}]}
+
+    mock_subtensor = _storage_changes_subtensor(
+        None, rpc_request=MagicMock(side_effect=rpc_request)
+    )
+
+    for _ in range(2):
+        changes = bittensor.subtensor.neuron_storage_changes(
+            mock_subtensor,
+            netuid=1,
+            hotkeys=["hk0", "hk1", "hk2"],
+            from_block=10,
+            block=12,
+        )
+        assert changes.vectors == {"Rank": {1: 11}}
+        assert changes.uids == [2]
+
+    # The refusal is remembered, later calls only use the safe method.
+    methods = [
+        call.kwargs["method"]
+        for call in mock_subtensor.substrate.rpc_request.call_args_list
+    ]
+    assert methods == ["state_queryStorage"] + ["state_queryStorageAt"] * 4
+    assert not mock_subtensor._query_storage_supported
+
+
+def _offline_subtensor(monkeypatch, block_hash_cache_size=None):
+    import sys
+
+    substrate = MagicMock()
+    substrate.get_block_hash.side_effect = lambda block_id: f"hash-{block_id}"
+    substrate.get_chain_finalised_head.return_value = "finalized"
+    substrate.get_block_number.side_effect = lambda block_hash: (
+        100 if block_hash == "finalized" else 150
+    )
+    monkeypatch.setattr(
+        sys.modules["bittensor.subtensor"],
+        "SubstrateInterface",
+        MagicMock(return_value=substrate),
+    )
+    config = bittensor.subtensor.config()
+    if block_hash_cache_size is not None:
+        config.subtensor.block_hash_cache_size = block_hash_cache_size
+    return (
+        bittensor.subtensor(network="local", config=config, log_verbose=False),
+        substrate,
+    )
+
+
+def test_get_block_hash_caches_finalized_blocks(monkeypatch):
+    subtensor, substrate = _offline_subtensor(monkeypatch)
+
+    assert [subtensor.get_block_hash(block) for block in (90, 90, 101, 101)] == [
+        "hash-90",
+        "hash-90",
+        "hash-101",
+        "hash-101",
+    ]
+
+    block_ids = [
+        call.kwargs["block_id"] for call in substrate.get_block_hash.call_args_list
+    ]
+    # Block 101 is after the finalized head, its hash may still change.
+    assert block_ids == [90, 101, 101]
+    # The finalized head is looked up at most once per refresh interval.
+    substrate.get_chain_finalised_head.assert_called_once()
+
+
+def test_get_block_hash_cache_is_bounded(monkeypatch):
+    subtensor, substrate = _offline_subtensor(monkeypatch, block_hash_cache_size=2)
+
+    for block in (1, 2, 3, 1):
+        subtensor.get_block_hash(block)
+
+    assert list(subtensor._block_hash_cache) == [3, 1]
+    assert substrate.get_block_hash.call_count == 4
+
+
+def test_at_block_pins_a_block_for_queries(monkeypatch):
+    subtensor, substrate = _offline_subtensor(monkeypatch)
+
+    with subtensor.at_block() as block:
+        assert block == 150
+        assert subtensor.get_current_block() == 150
+        subtensor.query_subtensor("Rank", params=[1])
+        subtensor.query_subtensor("Trust", params=[1], block=150)
+
+    subtensor.query_subtensor("Rank", params=[1])
+
+    block_hashes = [
+        call.kwargs["block_hash"] for call in substrate.query.call_args_list
+    ]
+    assert block_hashes == ["hash-150", "hash-150", None]
+    # The hash of the unfinalized block is looked up once, for the context.
+    substrate.get_block_hash.assert_called_once_with(block_id=150)
+    assert subtensor._pinned.block is None
+
+
+def test_at_block_pins_only_the_current_thread(monkeypatch):
+    subtensor, substrate = _offline_subtensor(monkeypatch)
+
+    with subtensor.at_block(120):
+        # Other threads neither see the pinned block nor its hash.
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            assert executor.submit(subtensor.get_current_block).result() == 150
+            assert executor.submit(subtensor._block_hash, None).result() is None
+            assert executor.submit(subtensor.get_block_hash, 120).result() == "hash-120"
+        assert subtensor.get_block_hash(120) == "hash-120"
+
+    assert substrate.get_block_hash.call_count == 2
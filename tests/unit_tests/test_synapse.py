@@ -19,6 +19,7 @@ import torch
 import base64
 import typing
 import pytest
+import pydantic
 import bittensor
 
 
@@ -201,6 +202,9 @@ def test_default_instance_fields_dict_consistency():
             "status_code": None,
             "status_message": None,
             "process_time": None,
+            "queue_time": None,
+            "compression_ratio": None,
+            "compression_time": None,
             "ip": None,
             "port": None,
             "version": None,
@@ -213,6 +217,9 @@ def test_default_instance_fields_dict_consistency():
             "status_code": None,
             "status_message": None,
             "process_time": None,
+            "queue_time": None,
+            "compression_ratio": None,
+            "compression_time": None,
             "ip": None,
             "port": None,
             "version": None,
@@ -224,3 +231,104 @@ def test_default_instance_fields_dict_consistency():
         "computed_body_hash": "",
         "required_hash_fields": [],
     }
+
+
+def test_body_hash_only_serializes_required_fields():
+    class Test(bittensor.Synapse):
+        b: typing.List[int] = []
+        a: str = ""
+        c: bittensor.Tensor = bittensor.Tensor.serialize(torch.ones(2))
+        required_hash_fields: typing.List[str] = ["c", "a"]
+
+    synapse = Test(a="a", b=[1, 2, 3])
+    # Hashes are concatenated in field order, over the serialized field values.
+    expected = bittensor.utils.hash(
+        bittensor.utils.hash(str("a")) + bittensor.utils.hash(str(synapse.dict()["c"]))
+    )
+    assert synapse.body_hash == expected
+
+    synapse.b = [4]
+    assert synapse.body_hash == expected
+    synapse.a = "b"
+    assert synapse.body_hash != expected
+
+    assert bittensor.Synapse().body_hash == bittensor.utils.hash("")
+
+
+def test_body_hash_is_cached_and_invalidated():
+    class Test(bittensor.Synapse):
+        tensor: bittensor.Tensor = bittensor.Tensor.serialize(torch.ones(2))
+        tensors: typing.List[bittensor.Tensor] = []
+        words: typing.List[str] = []
+        count: int = 0
+        required_hash_fields: typing.List[str] = ["tensor", "tensors", "words", "count"]
+
+    def uncached_body_hash(synapse):
+        return bittensor.utils.hash(
+            "".join(
+                bittensor.utils.hash(str(value))
+                for field, value in synapse.dict().items()
+                if field in synapse.required_hash_fields
+            )
+        )
+
+    synapse = Test(
+        tensor=bittensor.Tensor.serialize(torch.randn(16, 16)),
+        tensors=[bittensor.Tensor.serialize(torch.zeros(3)) for _ in range(2)],
+    )
+    # Tensors hashed from their buffers match the hash of their string.
+    assert synapse.body_hash == uncached_body_hash(synapse)
+    assert set(synapse._body_hashes) == {"tensor", "tensors", "count"}
+    assert "_body_hashes" not in synapse.dict()
+
+    # Assigned fields are dropped from the cache.
+    synapse.count = 1
+    assert "count" not in synapse._body_hashes
+    assert synapse.body_hash == uncached_body_hash(synapse)
+
+    # Changes made in place are still picked up.
+    synapse.tensors.append(bittensor.Tensor.serialize(torch.ones(1)))
+    synapse.words.append("hello")
+    assert synapse.body_hash == uncached_body_hash(synapse)
+
+    # Shallow copies share the cache.
+    copy = synapse.copy()
+    assert copy._body_hashes is synapse._body_hashes
+    copy.tensor = bittensor.Tensor.serialize(torch.ones(4))
+    assert copy.body_hash == uncached_body_hash(copy)
+    assert synapse.body_hash == uncached_body_hash(synapse)
+
+
+def test_header_schema_is_computed_once_per_class():
+    class Inner(pydantic.BaseModel):
+        value: int = 0
+
+    class Test(bittensor.Synapse):
+        a: int
+        b: typing.Dict[str, int]
+        c: Inner
+        d: typing.List[int] = []
+
+    class Other(bittensor.Synapse):
+        e: str
+
+    header_schema = Test._header_schema()
+    assert Test._header_schema() is header_schema
+    assert Other._header_schema() is not header_schema
+    assert header_schema.required == ["a", "b", "c"]
+
+    synapse = Test(a=1, b={"x": 1}, c=Inner(value=2))
+    synapse.dendrite.hotkey = "hotkey"
+    headers = synapse.to_headers()
+    assert headers["bt_header_dendrite_hotkey"] == "hotkey"
+    assert "bt_header_axon_hotkey" not in headers
+    assert "bt_header_input_obj_d" not in headers
+    # Models are sent as empty dicts, like the value found in synapse.dict().
+    assert json.loads(base64.b64decode(headers["bt_header_input_obj_c"])) == {}
+    assert set(header_schema.input_objs) == {("a", int), ("b", dict), ("c", dict)}
+
+    next_synapse = Test.from_headers(synapse.to_headers())
+    assert next_synapse.a == 0
+    assert next_synapse.b == {}
+    assert next_synapse.c == Inner()
+    assert next_synapse.dendrite.hotkey == "hotkey"
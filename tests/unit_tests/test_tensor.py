@@ -39,6 +39,25 @@ def test_deserialize(example_tensor):
     assert tensor.tolist() == [1, 2, 3, 4]
 
 
+def test_deserialize_copies(example_tensor):
+    # In place changes to the result do not change the Tensor.
+    example_tensor.deserialize().add_(100)
+    assert example_tensor.deserialize().tolist() == [1, 2, 3, 4]
+
+    # Unless the copy is opted out of.
+    view = example_tensor.deserialize(copy=False)
+    assert view.data_ptr() == example_tensor.deserialize(copy=False).data_ptr()
+
+
+def test_copies_with_another_buffer_hold_its_data(example_tensor):
+    other = bittensor.tensor(torch.tensor([5.0, 6.0, 7.0]))
+
+    copied = example_tensor.copy(update={"buffer": other.buffer, "shape": [3]})
+    assert copied.deserialize().tolist() == [5.0, 6.0, 7.0]
+    # Plain copies keep sharing the array.
+    assert example_tensor.copy().array() is example_tensor.array()
+
+
 def test_serialize(example_tensor):
     # Check that the serialized tensor is an instance of Tensor
     assert isinstance(example_tensor, bittensor.Tensor)
@@ -0,0 +1,81 @@
+# The MIT License (MIT)
+# Copyright © 2023 Opentensor Foundation
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy of this software and associated
+# documentation files (the “Software”), to deal in the Software without restriction, including without limitation
+# the rights to use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies of the Software,
+# and to permit persons to whom the Software is furnished to do so, subject to the following conditions:
+
+# The above copyright notice and this permission notice shall be included in all copies or substantial portions of
+# the Software.
+
+# THE SOFTWARE IS PROVIDED “AS IS”, WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO
+# THE WARRANTIES OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL
+# THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION
+# OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER
+# DEALINGS IN THE SOFTWARE.
+
+import asyncio
+import pytest
+
+import bittensor
+from bittensor.verifier import SignatureVerifier
+
+
+@pytest.fixture
+def keypair():
+    return bittensor.Keypair.create_from_uri("//Alice")
+
+
+def test_verify_matches_keypair(keypair):
+    verifier = SignatureVerifier()
+    message = "1.hotkey.axon.uuid.hash"
+    signature = f"0x{keypair.sign(message).hex()}"
+
+    assert verifier.verify(keypair.ss58_address, message, signature)
+    assert not verifier.verify(keypair.ss58_address, message + "x", signature)
+    assert not verifier.verify(keypair.ss58_address, message, "0xnothex")
+
+
+def test_public_key_cache_is_lru():
+    verifier = SignatureVerifier(cache_size=2)
+    alice, bob, charlie = (
+        bittensor.Keypair.create_from_uri(uri).ss58_address
+        for uri in ["//Alice", "//Bob", "//Charlie"]
+    )
+
+    verifier.public_key(alice)
+    verifier.public_key(bob)
+    verifier.public_key(alice)  # Alice is now the most recently used.
+    verifier.public_key(charlie)  # Evicts Bob.
+
+    assert list(verifier._keys.keys()) == [alice, charlie]
+    assert verifier.cache_hits == 1
+    assert verifier.cache_misses == 3
+
+
+def test_public_key_invalid_address():
+    verifier = SignatureVerifier()
+    with pytest.raises(ValueError):
+        verifier.public_key("not_an_ss58_address")
+
+
+@pytest.mark.asyncio
+async def test_averify_batches_concurrent_requests(keypair):
+    verifier = SignatureVerifier(batch_size=8)
+    messages = [f"{i}.hotkey.axon.uuid.hash" for i in range(20)]
+    signatures = [f"0x{keypair.sign(message).hex()}" for message in messages]
+    # Swap two signatures so that those requests fail.
+    signatures[0], signatures[1] = signatures[1], signatures[0]
+
+    results = await asyncio.gather(
+        *(
+            verifier.averify(keypair.ss58_address, message, signature)
+            for message, signature in zip(messages, signatures)
+        )
+    )
+
+    assert results == [False, False] + [True] * 18
+    assert verifier.verified == 20
+    assert verifier.batches < 20
+    verifier.shutdown()